@@ -0,0 +1 @@
+"""Offline benchmark suite for EssayForge."""
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""Run the EssayForge benchmark suite.
+
+Usage (from the essayforge_python directory):
+
+    python -m benchmarks --quick
+    python -m benchmarks -o benchmarks/results/after.json --baseline benchmarks/results/before.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+from essayforge.llm import SimulationProfile
+
+from . import bench_formatter, bench_import, bench_incremental, bench_knowledge, bench_links, bench_offload, bench_orchestrator, bench_refinement, bench_replay, bench_scheduling, bench_storage, bench_tenancy
+from .common import compare, write_results
+
+
+def create_parser():
+    """Create the benchmark argument parser."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--quick', action='store_true', help='Run a reduced parameter sweep')
+    parser.add_argument('--suite', action='append',
+                        choices=['orchestrator', 'formatter', 'imports', 'storage', 'scheduling',
+                                 'knowledge', 'refinement', 'tenancy', 'links', 'offload', 'incremental',
+                                 'replay'],
+                        help='Suite to run (repeatable; default: all)')
+    parser.add_argument('-o', '--output', type=str, default='',
+                        help='Result JSON path (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--baseline', type=str, default='',
+                        help='Earlier result JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Relative change reported by --baseline (default: 0.10)')
+    parser.add_argument('--no-memory', action='store_true', help='Skip peak-memory measurement')
+    parser.add_argument('--cassette', type=str, default='',
+                        help='Recorded cassette (main.py --record) to replay as the "replay" suite')
+    parser.add_argument('--replay-latency-scale', type=float, default=1.0,
+                        help='Multiply recorded latencies when replaying (default: 1.0)')
+    
+    # Simulated backend distributions
+    parser.add_argument('--latency', type=float, default=0.05, help='Median call latency (s)')
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help='Log-normal latency shape')
+    parser.add_argument('--tokens', type=int, default=500, help='Median completion tokens')
+    parser.add_argument('--tokens-sigma', type=float, default=0.3, help='Log-normal length shape')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probability a call fails')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the backend')
+    return parser
+
+
+def main():
+    """Run the selected suites, write JSON and optionally compare."""
+    args = create_parser().parse_args()
+    # A cassette alone selects just its replay
+    default = ['replay'] if args.cassette else [
+        'orchestrator', 'formatter', 'imports', 'storage', 'scheduling', 'knowledge', 'refinement',
+        'tenancy', 'links', 'offload', 'incremental'
+    ]
+    suites = args.suite or default
+    profile = SimulationProfile(
+        latency_mean=args.latency,
+        latency_sigma=args.latency_sigma,
+        tokens_mean=args.tokens,
+        tokens_sigma=args.tokens_sigma,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    
+    results = {}
+    if 'orchestrator' in suites:
+        print("Running orchestrator benchmarks...")
+        results['orchestrator'] = bench_orchestrator.run(args.quick, profile, not args.no_memory)
+    if 'formatter' in suites:
+        print("Running formatter benchmarks...")
+        results['formatter'] = bench_formatter.run(args.quick)
+    if 'storage' in suites:
+        print("Running result storage benchmarks...")
+        results['storage'] = bench_storage.run(args.quick)
+    if 'scheduling' in suites:
+        print("Running dispatch scheduling simulation...")
+        results['scheduling'] = bench_scheduling.run(args.quick, args.seed)
+        for case in results['scheduling']:
+            p, m = case['params'], case['metrics']
+            print(f"  {p['agents']:>3} agents x{p['parallelism']:<3} sigma {p['sigma']}: "
+                  f"FIFO {m['fifo_makespan_s']:6.1f}s  LEPT {m['lept_makespan_s']:6.1f}s  "
+                  f"({m['speedup']:.2f}x)")
+    if 'knowledge' in suites:
+        print("Running knowledge store benchmarks...")
+        results['knowledge'] = bench_knowledge.run(args.quick, args.seed)
+        for case in results['knowledge']:
+            m = case['metrics']
+            print(f"  {case['params']['passages']:>8,} passages: "
+                  f"index {m['index_passages_per_s']:8,.0f}/s  "
+                  f"query p50 {m['query_p50_s'] * 1000:6.2f} ms  p95 {m['query_p95_s'] * 1000:6.2f} ms")
+    if 'refinement' in suites:
+        print("Running refinement benchmarks...")
+        results['refinement'] = bench_refinement.run(args.quick)
+        for case in results['refinement']:
+            p, m = case['params'], case['metrics']
+            print(f"  {p['sections']:>3} sections {p['mode']:<8} {m['round_s'] * 1000:7.1f} ms/round "
+                  f"({m['calls']} calls)")
+    if 'tenancy' in suites:
+        print("Running multi-tenant scheduling benchmarks...")
+        results['tenancy'] = bench_tenancy.run(args.quick)
+        for case in results['tenancy']:
+            p, m = case['params'], case['metrics']
+            print(f"  {p['workers']:>2} workers, {p['heavy_jobs']} heavy + {p['small_jobs']} small jobs: "
+                  f"small p50 FIFO {m['fifo_small_job_p50_s'] * 1000:6.0f} ms  "
+                  f"fair {m['fair_small_job_p50_s'] * 1000:6.0f} ms  ({m['small_job_speedup']:.1f}x)")
+    if 'links' in suites:
+        print("Running citation link checking benchmarks...")
+        results['links'] = bench_links.run(args.quick)
+        for case in results['links']:
+            p, m = case['params'], case['metrics']
+            print(f"  {p['urls']:>5} URLs on {p['hosts']} hosts: "
+                  f"sequential {m['sequential_urls_per_s']:6.0f}/s  "
+                  f"pooled {m['concurrent_urls_per_s']:6.0f}/s ({m['speedup']:.1f}x, "
+                  f"{m['connections']} connections)  cached {m['warm_s'] * 1000:5.0f} ms")
+    if 'offload' in suites:
+        print("Running CPU pool post-processing benchmarks...")
+        results['offload'] = bench_offload.run(args.quick)
+        for case in results['offload']:
+            p, m = case['params'], case['metrics']
+            print(f"  {p['workers']:>2} workers, {p['topics']:>2} topics: "
+                  f"threads {m['threaded_items_per_s']:6.0f}/s  pool {m['pooled_items_per_s']:6.0f}/s "
+                  f"({m['speedup']:.2f}x, {m['scaling_speedup']:.2f}x the 1-worker pool)")
+    if 'incremental' in suites:
+        print("Running incremental re-run benchmarks...")
+        results['incremental'] = bench_incremental.run(args.quick)
+        for case in results['incremental']:
+            p, m = case['params'], case['metrics']
+            print(f"  {p['change']:<26} full {m['full_s']:6.2f}s ({m['full_calls']:>3} calls)  "
+                  f"incremental {m['incremental_s']:6.2f}s ({m['incremental_calls']:>3} calls, "
+                  f"{m['steps_reused']} steps reused)  {m['speedup']:.1f}x")
+    if 'replay' in suites:
+        if not args.cassette:
+            sys.exit("The replay suite needs --cassette FILE")
+        print(f"Replaying {args.cassette}...")
+        results['replay'] = bench_replay.run(args.cassette, args.quick, args.replay_latency_scale)
+    if 'imports' in suites:
+        print("Running CLI start-up benchmarks...")
+        results['imports'] = bench_import.run(args.quick)
+        for case in results['imports']:
+            status = "OK" if case['within_target'] else "OVER TARGET"
+            print(f"  {case['params']['command']:<8} {case['metrics']['startup_s'] * 1000:6.1f} ms "
+                  f"(target {bench_import.TARGET_S * 1000:.0f} ms) {status}")
+    
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'results',
+        datetime.now().strftime('%Y%m%d-%H%M%S') + '.json'
+    )
+    write_results(output, results)
+    print(f"Results written to {output}")
+    
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(output, encoding='utf-8') as f:
+            current = json.load(f)
+        changes = compare(current, baseline, args.threshold)
+        print("\n".join(changes) if changes else "No changes beyond threshold.")
+        if any(line.startswith("REGRESSION") for line in changes):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Formatter throughput benchmarks across essay sizes and output formats."""
+
+from datetime import timedelta
+from typing import Any, Dict, List
+
+from essayforge.models import Essay, Metadata, OutputFormat
+from essayforge.output import Formatter
+
+from .common import best_of
+
+
+_PARAGRAPH = (
+    "Artificial intelligence systems are increasingly used to support clinical "
+    "decisions, triage patients and summarize records. Evidence of benefit "
+    "varies by setting, and costs & risks (e.g. 5% error rates) must be weighed."
+)
+
+
+def make_essay(sections: int, paragraphs_per_section: int = 4) -> Essay:
+    """Build a synthetic essay with the given number of ``##`` sections."""
+    parts = ["# Benchmark Essay\n"]
+    for i in range(sections):
+        parts.append(f"## Section {i + 1}\n")
+        parts.extend(_PARAGRAPH + "\n" for _ in range(paragraphs_per_section))
+    content = "\n".join(parts)
+    return Essay(
+        title="Benchmark Essay",
+        content=content,
+        metadata=Metadata(
+            topic="benchmark",
+            research_depth="synthetic",
+            agents_used=sections,
+            total_variations=1,
+            synthesis_method="synthetic",
+            generation_time=timedelta(seconds=0),
+            total_tokens=0,
+            estimated_cost=0.0,
+        ),
+        word_count=len(content.split()),
+    )
+
+
+def run(quick: bool = False) -> List[Dict[str, Any]]:
+    """Time each output format over a range of essay sizes."""
+    formatter = Formatter()
+    sizes = [10, 100, 1000] if quick else [10, 50, 100, 500, 1000, 5000]
+    repeat = 3 if quick else 5
+    
+    cases = []
+    for sections in sizes:
+        essay = make_essay(sections)
+        for output_format in (OutputFormat.MARKDOWN, OutputFormat.LATEX, OutputFormat.HTML):
+            seconds = best_of(repeat, lambda: formatter.format(essay, output_format))
+            cases.append({
+                "params": {"sections": sections, "format": output_format.value},
+                "metrics": {
+                    "format_s": seconds,
+                    "words_per_s": essay.word_count / seconds if seconds else 0.0,
+                    "input_bytes": len(essay.content),
+                },
+            })
+    return cases
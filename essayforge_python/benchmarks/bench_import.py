@@ -0,0 +1,56 @@
+"""CLI startup benchmarks for the lightweight subcommands."""
+
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+from .common import best_of
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGET_S = 0.050  # Budget for `essayforge version`, interpreter start-up included
+
+
+def _run(args: List[str]) -> float:
+    """Wall time of one subprocess run with an isolated environment."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    env.pop("ANTHROPIC_API_KEY", None)
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, cwd=ROOT, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def imported_modules(command: str) -> List[str]:
+    """EssayForge modules loaded while running a subcommand."""
+    code = (
+        "import sys, runpy; sys.argv = ['main.py', %r]; "
+        "runpy.run_path('main.py', run_name='__main__'); "
+        "print('\\n'.join(m for m in sys.modules if m.startswith('essayforge')))" % command
+    )
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return [line for line in output.splitlines() if line.startswith("essayforge")]
+
+
+def run(quick: bool = False) -> List[Dict[str, Any]]:
+    """Time interpreter start-up alone and each lightweight subcommand."""
+    repeat = 5 if quick else 20
+    baseline = best_of(repeat, lambda: _run(["-c", "pass"]))
+    
+    cases = []
+    for command in ("version", "models"):
+        seconds = best_of(repeat, lambda: _run(["main.py", command]))
+        cases.append({
+            "params": {"command": command},
+            "metrics": {
+                "startup_s": seconds,
+                "interpreter_s": baseline,
+                "overhead_s": seconds - baseline,
+                "modules_loaded": len(imported_modules(command)),
+            },
+            "within_target": seconds < TARGET_S,
+        })
+    return cases
@@ -0,0 +1,79 @@
+"""Re-running a topic after a config change: full re-runs versus the run graph.
+
+A first run at one intensity records its graph. Each scenario then changes
+one setting, as a user iterating on an essay would, and runs the topic
+again twice from that same recorded graph: once with ``full_rerun``,
+which runs every step, and once incrementally, which runs only the steps
+whose inputs changed. Model calls take a fixed simulated latency, so the
+time saved is mostly the calls not made.
+"""
+
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, List
+
+from essayforge.llm import StubClient
+from essayforge.models import OutputFormat
+from essayforge.orchestrator import Orchestrator
+
+from .common import make_config, quietly, timed
+
+
+def _run(directory: str, client: StubClient, **overrides) -> Orchestrator:
+    options = dict(
+        topic="urban heat islands and city planning",
+        intensity=5,
+        run_graph_dir=os.path.join(directory, "runs"),
+        output_file=os.path.join(directory, "essay.md"),
+    )
+    options.update(overrides)
+    orchestrator = Orchestrator(make_config(**options), client=client)
+    quietly(orchestrator.execute)
+    return orchestrator
+
+
+def _scenario(latency: float, first: Dict[str, Any], change: Dict[str, Any]) -> Dict[str, float]:
+    directory = tempfile.mkdtemp(prefix="essayforge-incremental-")
+    try:
+        _run(directory, StubClient(latency=latency), **first)
+        recorded = os.path.join(directory, "recorded")
+        shutil.copytree(os.path.join(directory, "runs"), recorded)
+        options = dict(first, **change)
+
+        full_client = StubClient(latency=latency)
+        full_s, _ = timed(lambda: _run(directory, full_client, full_rerun=True, **options))
+
+        shutil.rmtree(os.path.join(directory, "runs"))
+        shutil.copytree(recorded, os.path.join(directory, "runs"))
+        client = StubClient(latency=latency)
+        incremental_s, orchestrator = timed(lambda: _run(directory, client, **options))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {
+        "full_s": full_s,
+        "incremental_s": incremental_s,
+        "speedup": full_s / incremental_s,
+        "full_calls": full_client.calls,
+        "incremental_calls": client.calls,
+        "steps_reused": len(orchestrator.graph.reused),
+        "steps_run": len(orchestrator.graph.executed),
+    }
+
+
+def run(quick: bool = False) -> List[Dict[str, Any]]:
+    """Intensity bumps and a format switch, with and without a critic phase."""
+    latency = 0.02 if quick else 0.05
+    scenarios = [
+        ("intensity 5 -> 8", {"intensity": 5}, {"intensity": 8}),
+        ("markdown -> html", {"intensity": 8}, {"output_format": OutputFormat.HTML}),
+        ("unchanged", {"intensity": 8}, {}),
+    ]
+    if not quick:
+        scenarios.append(("refined, intensity 5 -> 8", {"intensity": 5, "max_iterations": 2},
+                          {"intensity": 8}))
+    return [
+        {"params": {"change": name, "latency_ms": latency * 1000},
+         "metrics": _scenario(latency, first, change)}
+        for name, first, change in scenarios
+    ]
@@ -0,0 +1,67 @@
+"""Incremental indexing throughput and query latency of the knowledge store."""
+
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from essayforge.models import ResearchResult
+from essayforge.storage import KnowledgeStore
+
+
+def _vocabulary(size: int, rng: random.Random) -> List[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(4, 10))) for _ in range(size)]
+
+
+def _result(vocabulary: List[str], rng: random.Random, paragraphs: int = 6) -> ResearchResult:
+    """A result whose paragraphs each become one passage."""
+    # Zipf-like word frequencies, as in natural text
+    words = [vocabulary[min(len(vocabulary) - 1, int(rng.paretovariate(1.1)) - 1)]
+             for _ in range(paragraphs * 120)]
+    content = "\n\n".join(" ".join(words[i:i + 120]) for i in range(0, len(words), 120))
+    return ResearchResult(agent_id="bench", agent_type="bench", content=content)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(quick: bool = False, seed: int = 0) -> List[Dict[str, Any]]:
+    """Grow one store in steps, timing indexing of each step and queries at each size."""
+    sizes = [10_000, 50_000] if quick else [10_000, 100_000, 300_000]
+    rng = random.Random(seed)
+    vocabulary = _vocabulary(20_000, rng)
+    cases = []
+    with tempfile.TemporaryDirectory(prefix="essayforge-bench-") as directory:
+        with KnowledgeStore(os.path.join(directory, "knowledge.db")) as store:
+            indexed = 0
+            for size in sizes:
+                # Index run-sized batches (ten results) until the store reaches ``size``
+                start = time.perf_counter()
+                added = 0
+                while indexed < size:
+                    batch = [_result(vocabulary, rng) for _ in range(10)]
+                    count = store.add_results("benchmark topic", batch)
+                    indexed += count
+                    added += count
+                index_s = time.perf_counter() - start
+                
+                latencies = []
+                for _ in range(200):
+                    query = " ".join(rng.choice(vocabulary[:2000]) for _ in range(4))
+                    start = time.perf_counter()
+                    store.search(query, 5)
+                    latencies.append(time.perf_counter() - start)
+                cases.append({
+                    "params": {"passages": size},
+                    "metrics": {
+                        "index_passages_per_s": added / index_s,
+                        "query_p50_s": _percentile(latencies, 0.5),
+                        "query_p95_s": _percentile(latencies, 0.95),
+                        "db_bytes": os.path.getsize(store.path),
+                    },
+                })
+    return cases
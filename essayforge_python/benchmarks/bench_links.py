@@ -0,0 +1,170 @@
+"""Citation link checking: one URL at a time versus the pooled concurrent verifier.
+
+A handful of local HTTP/1.1 servers stand in for the hosts a reference
+list points at. Each answers after a fixed delay, like a remote server a
+few milliseconds away; most links are fine, some are missing, some
+redirect and some refuse HEAD. The sequential baseline checks a sample
+with urllib, one connection per request, as a straightforward checker
+would; the verifier checks every URL with per-host limits and keep-alive
+connections, then again against the verdict cache it just filled.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+from essayforge.models import Citation
+from essayforge.verification import LinkCache, LinkVerifier
+
+from .common import timed
+
+
+class _Host:
+    """One stand-in site on its own port; counts connections and requests."""
+
+    def __init__(self, delay: float):
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler(delay))
+        self._server.daemon_threads = True
+        self._server.request_queue_size = 128
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _count(self, connection: bool):
+        with self._lock:
+            if connection:
+                self.connections += 1
+            else:
+                self.requests += 1
+
+    def _handler(self, delay: float):
+        host = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, as real sites allow
+
+            def log_message(self, format, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                host._count(connection=True)
+
+            def do_HEAD(self):
+                self._answer(head=True)
+
+            def do_GET(self):
+                self._answer(head=False)
+
+            def _answer(self, head: bool):
+                host._count(connection=False)
+                time.sleep(delay)
+                kind = self.path.split("/")[1]
+                if kind == "nohead" and head:
+                    return self._send(405)
+                if kind == "missing":
+                    return self._send(404)
+                if kind == "redirect":
+                    return self._send(301, location="/ok" + self.path[len("/redirect"):])
+                return self._send(200, b"<html>cited page</html>" * 40, head)
+
+            def _send(self, code: int, body: bytes = b"", head: bool = False, location: str = ""):
+                self.send_response(code)
+                if location:
+                    self.send_header("Location", location)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if not head:
+                    self.wfile.write(body)
+
+        return Handler
+
+
+def _citations(hosts: List[_Host], count: int) -> List[Citation]:
+    """``count`` citations spread over the hosts: 80% ok, 10% missing, 5% redirects, 5% no HEAD."""
+    kinds = ["ok"] * 16 + ["missing"] * 2 + ["redirect", "nohead"]
+    return [
+        Citation(id=str(i), type="web", title=f"Source {i}", source="bench",
+                 url=f"{hosts[i % len(hosts)].url}/{kinds[i % len(kinds)]}/{i}")
+        for i in range(count)
+    ]
+
+
+def _check_sequentially(citations: List[Citation], timeout: float):
+    """The baseline: a HEAD per URL over a fresh connection, falling back to GET."""
+    for citation in citations:
+        for method in ("HEAD", "GET"):
+            request = urllib.request.Request(citation.url, method=method)
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    response.read()
+                break
+            except urllib.error.HTTPError as e:
+                if e.code != 405:
+                    break
+            except OSError:
+                break
+
+
+def _scenario(urls: int, hosts: int, delay: float, sample: int) -> Dict[str, float]:
+    sites = [_Host(delay) for _ in range(hosts)]
+    directory = tempfile.mkdtemp(prefix="essayforge-links-")
+    cache_path = os.path.join(directory, "links.json")
+    try:
+        citations = _citations(sites, urls)
+        sequential_s, _ = timed(lambda: _check_sequentially(citations[:sample], 5.0))
+
+        verifier = LinkVerifier(workers=32, per_host=8, timeout=5.0, cache=LinkCache(cache_path))
+        before = sum(site.connections for site in sites)
+        requests_before = sum(site.requests for site in sites)
+        cold_s, _ = timed(lambda: verifier.verify(citations))
+        connections = sum(site.connections for site in sites) - before
+        requests = sum(site.requests for site in sites) - requests_before
+        counts = verifier.summary(verifier.verify(citations))
+        verifier.close()
+
+        # A later run reads the saved verdicts instead of asking the hosts again
+        warm = LinkVerifier(workers=32, per_host=8, timeout=5.0, cache=LinkCache(cache_path))
+        warm_s, _ = timed(lambda: warm.verify(_citations(sites, urls)))
+        warm.close()
+    finally:
+        for site in sites:
+            site.close()
+
+    sequential_rate = sample / sequential_s
+    return {
+        "sequential_urls_per_s": sequential_rate,
+        "concurrent_urls_per_s": urls / cold_s,
+        "speedup": (urls / cold_s) / sequential_rate,
+        "cold_s": cold_s,
+        "warm_s": warm_s,
+        "warm_urls_per_s": urls / warm_s,
+        "requests": requests,
+        "connections": connections,
+        "ok": counts.get("ok", 0),
+        "broken": counts.get("broken", 0),
+    }
+
+
+def run(quick: bool = False) -> List[Dict[str, Any]]:
+    """Check thousands of URLs against the local stand-in hosts."""
+    sweep = [(1000, 4)] if quick else [(1000, 4), (4000, 8)]
+    cases = []
+    for urls, hosts in sweep:
+        cases.append({
+            "params": {"urls": urls, "hosts": hosts, "delay_ms": 5},
+            "metrics": _scenario(urls, hosts, 0.005, sample=min(urls, 200)),
+        })
+    return cases
@@ -0,0 +1,110 @@
+"""Post-processing throughput of concurrent topic runs, on their threads versus the CPU pool.
+
+Each topic of a batch run parses and scores its agents' structured
+responses and formats its essay. With one thread per topic that work is
+serialized by the interpreter lock however many cores there are; with a
+CPUPool it spreads over worker processes. The sweep doubles the worker
+count up to the number of cores, with twice as many concurrent topics as
+workers, so throughput should grow about linearly with the pool while the
+threaded baseline stays flat. On a single core the pool only adds the cost
+of moving work between processes.
+"""
+
+import json
+import os
+import threading
+from datetime import timedelta
+from typing import Any, Callable, Dict, List
+
+from essayforge.models import Essay, Metadata, OutputFormat
+from essayforge.orchestrator.offload import CPUPool, analyze_research, format_essay
+
+from .common import timed
+
+
+def _response(index: int, sections: int = 12, claims: int = 8) -> str:
+    """A structured agent response of about 60 KB."""
+    sentence = f"Finding {index} on the benchmark topic is supported by several independent studies."
+    citations = [{"id": f"c{i}", "title": f"Study {i}", "source": "Journal of Benchmarks",
+                  "url": f"https://example.org/study-{index}-{i}", "authors": ["A. Author"],
+                  "date": "2024"} for i in range(30)]
+    data = {
+        "sections": [{
+            "heading": f"Aspect {s}",
+            "body": " ".join([sentence] * 20),
+            "claims": [{"text": sentence, "citations": [f"c{(s + c) % 30}"], "confidence": 0.8}
+                       for c in range(claims)],
+        } for s in range(sections)],
+        "citations": citations,
+        "confidence": 0.75,
+    }
+    return json.dumps(data)
+
+
+def _essay(index: int, sections: int = 40) -> Essay:
+    body = " ".join(["Evidence and analysis of the topic, with its caveats."] * 60)
+    content = f"# Essay {index}\n\n" + "".join(f"## Section {s}\n\n{body}\n\n" for s in range(sections))
+    return Essay(
+        title=f"Essay {index}", content=content, citations=[],
+        metadata=Metadata(topic=f"topic {index}", research_depth="bench", agents_used=10,
+                          total_variations=1, synthesis_method="parallel",
+                          generation_time=timedelta(seconds=1), total_tokens=0,
+                          estimated_cost=0.0),
+        word_count=len(content.split()),
+    )
+
+
+def _topic(index: int, responses: int, call: Callable) -> None:
+    """One topic's post-processing: every agent response, then the essay."""
+    for r in range(responses):
+        call(analyze_research, _response(index * 100 + r), True)
+    essay = _essay(index)
+    content, essay.content = essay.content, ""
+    call(format_essay, content, essay, OutputFormat.HTML)
+
+
+def _run_topics(topics: int, responses: int, call: Callable) -> float:
+    def all_topics():
+        threads = [threading.Thread(target=_topic, args=(i, responses, call))
+                   for i in range(topics)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    elapsed, _ = timed(all_topics)
+    return elapsed
+
+
+def run(quick: bool = False) -> List[Dict[str, Any]]:
+    """Sweep pool sizes 1, 2, 4, ... up to the core count."""
+    cores = os.cpu_count() or 1
+    sizes = [1]
+    while sizes[-1] * 2 <= cores:
+        sizes.append(sizes[-1] * 2)
+    if sizes[-1] != cores:
+        sizes.append(cores)
+    responses = 4 if quick else 10
+    cases = []
+    base_rate = 0.0
+    for workers in sizes:
+        topics = workers * 2
+        items = topics * (responses + 1)
+        threaded_s = _run_topics(topics, responses, lambda func, *args: func(*args))
+        with CPUPool(workers) as pool:
+            pool.warm()
+            pooled_s = _run_topics(topics, responses, pool.run)
+            shared_mb = pool.shared_bytes / 1e6
+        rate = items / pooled_s
+        base_rate = base_rate or rate
+        cases.append({
+            "params": {"workers": workers, "topics": topics, "responses": responses, "cores": cores},
+            "metrics": {
+                "threaded_items_per_s": items / threaded_s,
+                "pooled_items_per_s": rate,
+                "speedup": threaded_s / pooled_s,
+                "scaling_speedup": rate / base_rate,  # Against the one-worker pool
+                "shared_mb": shared_mb,
+            },
+        })
+    return cases
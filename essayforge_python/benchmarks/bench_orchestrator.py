@@ -0,0 +1,64 @@
+"""End-to-end orchestrator benchmarks against the simulated backend."""
+
+from typing import Any, Dict, List, Optional
+
+from essayforge.llm import SimulatedClient, SimulationProfile
+from essayforge.orchestrator import Orchestrator
+from essayforge.tracing import Tracer
+
+from .common import make_config, peak_memory, quietly, timed
+
+
+def run_case(intensity: int, parallelism: int, best_of_n: int,
+             profile: SimulationProfile, memory: bool = True) -> Dict[str, Any]:
+    """Run one full pipeline and report timing, throughput and memory."""
+    def build() -> Orchestrator:
+        config = make_config(intensity=intensity, parallelism=parallelism, best_of_n=best_of_n)
+        orchestrator = Orchestrator(config, client=SimulatedClient(profile))
+        orchestrator.tracer = Tracer()
+        return orchestrator
+    
+    orchestrator = build()
+    elapsed, _ = timed(lambda: quietly(orchestrator.execute))
+    phases = {row["name"]: row["total"] for row in orchestrator.tracer.summary()}
+    calls = orchestrator.client.calls
+    research = phases.get("research", elapsed)
+    
+    metrics = {
+        "wall_s": elapsed,
+        "research_s": research,
+        "synthesis_s": phases.get("synthesis", 0.0),
+        "formatting_s": phases.get("formatting", 0.0),
+        "agent_calls": calls,
+        "agent_calls_per_s": calls / research if research else 0.0,
+        "tokens": orchestrator.token_tracker.total_tokens,
+    }
+    if memory:
+        metrics["peak_bytes"] = peak_memory(lambda: quietly(build().execute))
+    
+    return {
+        "params": {
+            "intensity": intensity,
+            "parallelism": parallelism,
+            "best_of_n": best_of_n,
+            "latency_mean": profile.latency_mean,
+            "error_rate": profile.error_rate,
+        },
+        "metrics": metrics,
+    }
+
+
+def run(quick: bool = False, profile: Optional[SimulationProfile] = None,
+        memory: bool = True) -> List[Dict[str, Any]]:
+    """Sweep intensity, parallelism and best-of-N."""
+    profile = profile or SimulationProfile()
+    intensities = [1, 5, 10] if quick else list(range(1, 11))
+    parallelisms = [1, 4] if quick else [1, 3, 5, 10]
+    best_of = [1, 3] if quick else [1, 2, 3, 5]
+    
+    cases = []
+    for intensity in intensities:
+        for parallelism in parallelisms:
+            for best_of_n in best_of:
+                cases.append(run_case(intensity, parallelism, best_of_n, profile, memory))
+    return cases
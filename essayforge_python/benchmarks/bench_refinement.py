@@ -0,0 +1,70 @@
+"""Latency of one refinement round, whole-essay versus section-sharded, as essays grow."""
+
+import threading
+from typing import Any, Dict, List
+
+from essayforge.critics import CriticType, Verdict
+from essayforge.llm import StubClient
+from essayforge.llm.pricing import estimate_tokens
+from essayforge.orchestrator import Orchestrator
+
+from .common import make_config, quietly, timed
+
+
+class ProportionalClient(StubClient):
+    """Stub whose reply is as long as the text being revised, generated at a fixed rate.
+
+    That is the property that makes whole-essay revision slow: output, and
+    with it latency, grows with the essay.
+    """
+
+    def __init__(self, seconds_per_token: float):
+        super().__init__()
+        self.seconds_per_token = seconds_per_token
+        self._request = threading.local()
+
+    def complete(self, layout, model, *args, **kwargs):
+        self._request.tokens = estimate_tokens(layout.cached_prefix + layout.user_suffix)
+        return super().complete(layout, model, *args, **kwargs)
+
+    def _draw(self):
+        tokens = self._request.tokens
+        return tokens * self.seconds_per_token, tokens, None
+
+
+def _draft(sections: int, words: int = 300) -> str:
+    body = " ".join(["Evidence and analysis of the topic."] * (words // 6))
+    parts = ["# Benchmark Essay\n\n"]
+    parts.extend(f"## Section {i}\n\n{body}\n\n" for i in range(sections))
+    return "".join(parts)
+
+
+def _verdicts() -> Dict[CriticType, Verdict]:
+    return {
+        critic: Verdict(critic.value, 0.6, ["Strengthen the argument.", "Section 1 repeats itself."])
+        for critic in CriticType
+    }
+
+
+def run_case(sections: int, mode: str, seconds_per_token: float) -> Dict[str, Any]:
+    """Time one revision round of a draft with ``sections`` sections."""
+    config = make_config(refine_mode=mode, max_iterations=1)
+    orchestrator = Orchestrator(config, client=ProportionalClient(seconds_per_token))
+    draft = _draft(sections)
+    elapsed, revised = timed(lambda: quietly(lambda: orchestrator._revise(draft, _verdicts(), 0)))
+    orchestrator.events.close()
+    return {
+        "params": {"sections": sections, "mode": mode},
+        "metrics": {
+            "round_s": elapsed,
+            "calls": orchestrator.client.calls,
+            "tokens": orchestrator.token_tracker.total_tokens,
+            "draft_words": len(draft.split()),
+        },
+    }
+
+
+def run(quick: bool = False, seconds_per_token: float = 0.00005) -> List[Dict[str, Any]]:
+    """Sweep essay length for both refinement modes."""
+    sizes = [4, 16] if quick else [4, 8, 16, 32]
+    return [run_case(n, mode, seconds_per_token) for n in sizes for mode in ("whole", "sections")]
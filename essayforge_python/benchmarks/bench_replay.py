@@ -0,0 +1,38 @@
+"""Replay a recorded cassette through the orchestrator for deterministic comparisons."""
+
+from typing import Any, Dict, List
+
+from essayforge.llm import ReplayClient
+from essayforge.orchestrator import Orchestrator
+from essayforge.tracing import Tracer
+
+from .common import make_config, quietly, timed
+
+
+def run_case(cassette: str, parallelism: int, latency_scale: float) -> Dict[str, Any]:
+    """Replay every call of ``cassette`` once with the recorded run's settings."""
+    client = ReplayClient(cassette, latency_scale)
+    settings = {k: v for k, v in client.metadata.items() if k != 'parallelism'}
+    orchestrator = Orchestrator(make_config(parallelism=parallelism, **settings), client=client)
+    orchestrator.tracer = Tracer()
+    elapsed, _ = timed(lambda: quietly(orchestrator.execute))
+    phases = {row["name"]: row["total"] for row in orchestrator.tracer.summary()}
+    return {
+        "params": {"parallelism": parallelism, "latency_scale": latency_scale},
+        "metrics": {
+            "wall_s": elapsed,
+            "research_s": phases.get("research", elapsed),
+            "synthesis_s": phases.get("synthesis", 0.0),
+            "formatting_s": phases.get("formatting", 0.0),
+            "replayed_calls": client.calls,
+            "missing_calls": client.misses,
+            "tokens": orchestrator.token_tracker.total_tokens,
+        },
+    }
+
+
+def run(cassette: str, quick: bool = False, latency_scale: float = 1.0) -> List[Dict[str, Any]]:
+    """Replay at the recorded parallelism and, unless ``quick``, a few others."""
+    recorded = ReplayClient(cassette).metadata.get('parallelism', 3)
+    parallelisms = [recorded] if quick else sorted({1, recorded, recorded * 2, 10})
+    return [run_case(cassette, parallelism, latency_scale) for parallelism in parallelisms]
@@ -0,0 +1,47 @@
+"""Memory and throughput of in-memory results versus the spill-to-disk store."""
+
+import tracemalloc
+from typing import Any, Dict, List
+
+from essayforge.models import ResearchResult
+from essayforge.storage import ResultRecord, ResultStore
+
+from .common import timed
+
+
+def _body(i: int, size: int) -> str:
+    line = f"Result {i}: findings, evidence and sources for the benchmark topic.\n"
+    return line * (size // len(line) + 1)
+
+
+def _hold(count: int, size: int, store: ResultStore = None) -> Dict[str, float]:
+    """Keep ``count`` results alive and report peak traced memory and timings."""
+    tracemalloc.start()
+    try:
+        kept = []
+        for i in range(count):
+            result = ResearchResult(agent_id=str(i), agent_type="bench", content=_body(i, size))
+            kept.append(ResultRecord.from_result(store, result) if store else result)
+            del result
+        write_peak = tracemalloc.get_traced_memory()[1]
+        read_s, total = timed(lambda: sum(len(r.content) for r in kept))
+        return {"peak_bytes": write_peak, "read_s": read_s, "bytes_read": total}
+    finally:
+        tracemalloc.stop()
+
+
+def run(quick: bool = False) -> List[Dict[str, Any]]:
+    """Compare peak memory of holding N results in memory versus spilled."""
+    counts = [100, 1000] if quick else [100, 1000, 5000]
+    size = 32 * 1024
+    cases = []
+    for count in counts:
+        cases.append({"params": {"mode": "memory", "count": count, "size": size},
+                      "metrics": _hold(count, size)})
+        for compress in (False, True):
+            with ResultStore(compress=compress) as store:
+                metrics = _hold(count, size, store)
+                metrics["disk_bytes"] = store.bytes_written
+            cases.append({"params": {"mode": "store", "compress": compress, "count": count, "size": size},
+                          "metrics": metrics})
+    return cases
@@ -0,0 +1,80 @@
+"""Small-job latency under a heavy tenant, first-come-first-served versus weighted fair queuing.
+
+Heavy jobs (intensity 10, best-of-5) and a stream of small jobs from other
+tenants share one FairScheduler whose workers stand in for the deployment's
+concurrency limit. Every job is a real Orchestrator run on a stub backend.
+"""
+
+import os
+import statistics
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List
+
+from essayforge.llm import StubClient
+from essayforge.orchestrator import FairScheduler, Orchestrator
+
+from .common import make_config, quietly
+
+
+def _scenario(policy: str, workers: int, heavy_jobs: int, small_jobs: int,
+              latency: float) -> Dict[str, float]:
+    """Run the mixed load once; returns small-job latency and scheduler stats."""
+    client = StubClient(latency=latency)
+    directory = tempfile.mkdtemp(prefix="essayforge-tenancy-")
+    small_latencies: List[float] = []
+    threads = []
+
+    def job(tenant: str, index: int, intensity: int, best_of: int, parallelism: int):
+        config = make_config(
+            topic=f"{tenant} topic {index}", intensity=intensity, best_of_n=best_of,
+            parallelism=parallelism, tenant=tenant,
+            output_file=os.path.join(directory, f"{tenant}-{index}.md"),
+        )
+        started = time.perf_counter()
+        Orchestrator(config, client=client, scheduler=scheduler).execute()
+        if tenant != "heavy":
+            small_latencies.append(time.perf_counter() - started)
+
+    with FairScheduler(workers, policy=policy) as scheduler:
+        for i in range(heavy_jobs):
+            threads.append(threading.Thread(target=job, args=("heavy", i, 10, 5, 10)))
+            threads[-1].start()
+        time.sleep(latency)  # Heavy work is queued before the small jobs arrive
+        for i in range(small_jobs):
+            threads.append(threading.Thread(target=job, args=(f"team-{i % 3}", i, 2, 1, 2)))
+            threads[-1].start()
+            time.sleep(latency / 2)
+        for thread in threads:
+            thread.join()
+        stats = {row["tenant"]: row for row in scheduler.stats()}
+
+    small_latencies.sort()
+    return {
+        "small_job_p50_s": statistics.median(small_latencies),
+        "small_job_max_s": small_latencies[-1],
+        "heavy_max_depth": stats["heavy"]["max_depth"],
+        "heavy_wait_p95_s": stats["heavy"]["wait_p95"],
+        "small_wait_p95_s": max(row["wait_p95"] for name, row in stats.items() if name != "heavy"),
+    }
+
+
+def run(quick: bool = False) -> List[Dict[str, Any]]:
+    """Compare FIFO and fair scheduling under the same mixed load."""
+    sweep = [(6, 2, 6)] if quick else [(6, 2, 6), (6, 4, 12), (12, 4, 12)]
+    cases = []
+    for workers, heavy_jobs, small_jobs in sweep:
+        results = {
+            policy: quietly(lambda: _scenario(policy, workers, heavy_jobs, small_jobs, 0.05))
+            for policy in ("fifo", "fair")
+        }
+        metrics = {f"{policy}_{name}": value
+                   for policy, result in results.items() for name, value in result.items()}
+        metrics["small_job_speedup"] = (results["fifo"]["small_job_p50_s"]
+                                        / results["fair"]["small_job_p50_s"])
+        cases.append({
+            "params": {"workers": workers, "heavy_jobs": heavy_jobs, "small_jobs": small_jobs},
+            "metrics": metrics,
+        })
+    return cases
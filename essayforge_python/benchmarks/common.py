@@ -0,0 +1,135 @@
+"""Shared helpers for the EssayForge benchmark suite."""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from essayforge import __version__
+from essayforge.models import OutputFormat
+from essayforge.orchestrator import Config
+
+
+def make_config(**overrides) -> Config:
+    """Build an offline orchestrator config writing into a temporary directory."""
+    options = dict(
+        topic="the impact of artificial intelligence on healthcare",
+        intensity=5,
+        parallelism=3,
+        best_of_n=1,
+        output_file=os.path.join(tempfile.gettempdir(), "essayforge-bench.md"),
+        demo_mode=False,
+        auto_open=False,
+        api_key="",
+        output_format=OutputFormat.MARKDOWN,
+        show_dashboard=False,
+        token_limit=0,
+        cost_limit=0,
+        claude_model="claude-3-sonnet-20240229",
+    )
+    options.update(overrides)
+    return Config(**options)
+
+
+def quietly(func: Callable[[], Any]) -> Any:
+    """Call ``func`` with stdout suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func()
+
+
+def timed(func: Callable[[], Any]) -> Tuple[float, Any]:
+    """Return (wall seconds, result) for a single call."""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    """Return the peak traced Python allocation, in bytes, during ``func``."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> float:
+    """Return the fastest wall time over ``repeat`` calls."""
+    return min(timed(func)[0] for _ in range(max(1, repeat)))
+
+
+def _git_revision() -> str:
+    """Return the current git revision, or an empty string outside a checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and code revision a result set was produced on."""
+    return {
+        "essayforge": __version__,
+        "git_revision": _git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def write_results(path: str, suites: Dict[str, List[Dict[str, Any]]]):
+    """Write benchmark results and environment info as JSON."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"environment": environment(), "suites": suites}, f, indent=2)
+
+
+def case_key(case: Dict[str, Any]) -> str:
+    """Identify a case by its parameters, ignoring measured metrics."""
+    params = case.get("params", {})
+    return ",".join(f"{k}={params[k]}" for k in sorted(params))
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = 0.10) -> List[str]:
+    """Compare two result files and describe metrics that moved past ``threshold``.
+    
+    Metrics ending in ``_per_s`` or ``speedup`` are better when higher; all
+    others are better when lower.
+    """
+    lines = []
+    for suite, cases in current["suites"].items():
+        previous = {case_key(c): c for c in baseline.get("suites", {}).get(suite, [])}
+        for case in cases:
+            old = previous.get(case_key(case))
+            if old is None:
+                continue
+            for metric, value in case["metrics"].items():
+                before = old["metrics"].get(metric)
+                if not before or not isinstance(value, (int, float)):
+                    continue
+                change = (value - before) / before
+                worse = change < 0 if metric.endswith(("_per_s", "speedup")) else change > 0
+                if abs(change) >= threshold:
+                    verdict = "REGRESSION" if worse else "improvement"
+                    lines.append(
+                        f"{verdict:<11} {suite}[{case_key(case)}] {metric}: "
+                        f"{before:.4g} -> {value:.4g} ({change:+.1%})"
+                    )
+    return lines
@@ -0,0 +1,26 @@
+"""Helpers for lazily loaded package exports."""
+
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """Return module-level ``__getattr__`` and ``__dir__`` for a package.
+    
+    ``exports`` maps each public name to the submodule that defines it.
+    The submodule is imported the first time the name is accessed, and the
+    value is cached on the package so later lookups are plain attribute reads.
+    """
+    def __getattr__(name: str):
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+    
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+    
+    return __getattr__, __dir__
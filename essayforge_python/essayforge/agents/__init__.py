@@ -1,6 +1,32 @@
 """Agents package for EssayForge research agents."""
 
-from .agents import Agent, AgentType, create_agents
-from .advanced_agents import AdvancedAgent
+from typing import TYPE_CHECKING
 
-__all__ = ['Agent', 'AgentType', 'create_agents', 'AdvancedAgent']
\ No newline at end of file
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .agents import Agent, AgentType, create_agents
+    from .advanced_agents import AdvancedAgent
+    from .prompts import PromptLayout, build_layout, with_context, with_seed, with_structured_output
+    from .structured import ResearchParser, parse_research, render_markdown
+
+# Submodules are imported on first attribute access to keep startup fast
+_EXPORTS = {
+    'Agent': '.agents',
+    'AgentType': '.agents',
+    'create_agents': '.agents',
+    'AdvancedAgent': '.advanced_agents',
+    'PromptLayout': '.prompts',
+    'build_layout': '.prompts',
+    'with_context': '.prompts',
+    'with_seed': '.prompts',
+    'with_structured_output': '.prompts',
+    'ResearchParser': '.structured',
+    'parse_research': '.structured',
+    'render_markdown': '.structured'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = ['Agent', 'AgentType', 'create_agents', 'AdvancedAgent', 'PromptLayout', 'build_layout', 'with_context', 'with_seed',
+           'with_structured_output', 'ResearchParser', 'parse_research', 'render_markdown']
\ No newline at end of file
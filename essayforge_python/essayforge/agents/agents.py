@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import List
 
+from .prompts import PromptLayout, build_layout
+
 
 class AgentType(Enum):
     """Types of research agents available."""
@@ -21,14 +23,22 @@ class AgentType(Enum):
 
 @dataclass
 class Agent:
-    """Represents a research agent with its type and prompt template."""
+    """Represents a research agent with its type and prompt template.
+
+    The template holds only the agent-specific instructions; the topic is
+    carried by the shared, cacheable prefix of the prompt layout.
+    """
     type: AgentType
     description: str
     prompt_template: str
     
+    def build_prompt(self, topic: str) -> PromptLayout:
+        """Build the cache-friendly prompt layout for this agent."""
+        return build_layout(topic, self.prompt_template)
+    
     def generate_prompt(self, topic: str) -> str:
-        """Generate a prompt for this agent with the given topic."""
-        return self.prompt_template % topic
+        """Generate a flat, single-string prompt for this agent."""
+        return self.build_prompt(topic).flatten()
 
 
 def create_agents(intensity: int) -> List[Agent]:
@@ -37,7 +47,7 @@ def create_agents(intensity: int) -> List[Agent]:
         Agent(
             type=AgentType.FACT_GATHERER,
             description="Gathers core facts and verifiable information",
-            prompt_template="""You are a fact-gathering research agent. Your task is to research "%s" and provide:
+            prompt_template="""You are a fact-gathering research agent. Your task is to research the topic and provide:
 1. Key facts and statistics
 2. Verified information from reliable sources
 3. Important definitions and concepts
@@ -48,7 +58,7 @@ Focus on accuracy and cite all sources. Output in markdown with proper citations
         Agent(
             type=AgentType.CURRENT_STATE,
             description="Analyzes current state and recent developments",
-            prompt_template="""You are a current affairs research agent. Research the current state of "%s" including:
+            prompt_template="""You are a current affairs research agent. Research the current state of the topic including:
 1. Latest developments and news
 2. Current trends and patterns
 3. Recent changes or updates
@@ -59,7 +69,7 @@ Provide timely, up-to-date information with sources. Output in markdown."""
         Agent(
             type=AgentType.EXPERT_OPINIONS,
             description="Collects expert opinions and authoritative perspectives",
-            prompt_template="""You are an expert opinion researcher. For the topic "%s", gather:
+            prompt_template="""You are an expert opinion researcher. For the topic, gather:
 1. Opinions from recognized experts in the field
 2. Academic perspectives
 3. Industry leader insights
@@ -70,7 +80,7 @@ Quote experts directly when possible and cite sources. Output in markdown."""
         Agent(
             type=AgentType.HISTORICAL_CONTEXT,
             description="Provides historical background and evolution",
-            prompt_template="""You are a historical research agent. Provide historical context for "%s" including:
+            prompt_template="""You are a historical research agent. Provide historical context for the topic including:
 1. Origins and historical development
 2. Key milestones and turning points
 3. Evolution over time
@@ -81,7 +91,7 @@ Focus on how the past informs the present. Output in markdown with citations."""
         Agent(
             type=AgentType.COUNTER_ARGUMENTS,
             description="Explores opposing views and criticisms",
-            prompt_template="""You are a critical analysis agent. For "%s", research:
+            prompt_template="""You are a critical analysis agent. For the topic, research:
 1. Common criticisms and counter-arguments
 2. Alternative perspectives
 3. Potential weaknesses or limitations
@@ -92,7 +102,7 @@ Be balanced and fair in presenting different sides. Output in markdown."""
         Agent(
             type=AgentType.FUTURE_PROJECTIONS,
             description="Analyzes future trends and projections",
-            prompt_template="""You are a future trends analyst. For "%s", research and analyze:
+            prompt_template="""You are a future trends analyst. For the topic, research and analyze:
 1. Future projections and forecasts
 2. Emerging trends and possibilities
 3. Potential scenarios and outcomes
@@ -103,7 +113,7 @@ Base projections on current data and expert analysis. Output in markdown."""
         Agent(
             type=AgentType.CASE_STUDIES,
             description="Provides relevant case studies and examples",
-            prompt_template="""You are a case study researcher. For "%s", provide:
+            prompt_template="""You are a case study researcher. For the topic, provide:
 1. Relevant case studies and real-world examples
 2. Success stories and failures
 3. Practical implementations
@@ -114,7 +124,7 @@ Focus on concrete examples with details. Output in markdown with sources."""
         Agent(
             type=AgentType.DATA_ANALYSIS,
             description="Performs data-driven analysis",
-            prompt_template="""You are a data analysis agent. For "%s", provide:
+            prompt_template="""You are a data analysis agent. For the topic, provide:
 1. Statistical analysis and data visualization descriptions
 2. Quantitative trends and patterns
 3. Data-driven insights
@@ -125,7 +135,7 @@ Focus on numbers and measurable outcomes. Output in markdown."""
         Agent(
             type=AgentType.THEORETICAL_FRAMEWORK,
             description="Explores theoretical foundations and frameworks",
-            prompt_template="""You are a theoretical research agent. For "%s", explore:
+            prompt_template="""You are a theoretical research agent. For the topic, explore:
 1. Theoretical frameworks and models
 2. Academic theories and concepts
 3. Philosophical underpinnings
@@ -136,7 +146,7 @@ Connect theory to practical understanding. Output in markdown."""
         Agent(
             type=AgentType.PRACTICAL_APPLICATIONS,
             description="Focuses on practical applications and implementations",
-            prompt_template="""You are a practical applications researcher. For "%s", detail:
+            prompt_template="""You are a practical applications researcher. For the topic, detail:
 1. Real-world applications and uses
 2. Implementation strategies
 3. Best practices and guidelines
@@ -0,0 +1,216 @@
+"""Cache-friendly prompt layout shared by all research agents."""
+
+import hashlib
+import json
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List
+
+from ..llm.pricing import estimate_tokens
+
+
+SYSTEM_PROMPT = """You are a specialized research agent in EssayForge, a multi-agent research synthesis system.
+Several agents research the same topic in parallel, each from a different perspective, and their
+findings are later synthesized into a single publication-quality essay.
+
+General guidelines:
+- Stay within the perspective assigned to you; other agents cover the rest.
+- Prefer verifiable, specific information over generalities.
+- Cite sources for every factual claim and list them at the end.
+- Be balanced: note uncertainty, disagreement and limitations where they exist.
+- Write in clear, well-structured markdown with headings and lists where helpful."""
+
+TOPIC_CONTEXT_TEMPLATE = """Research topic: "{topic}"
+
+Every agent in this run receives the topic above. Your specific assignment follows."""
+
+SEED_TEMPLATE = """
+
+Earlier research on the closely related topic "{topic}" is included below. Build on it:
+keep what still applies to the current topic, correct what does not, and add what is missing.
+
+<earlier_research>
+{content}
+</earlier_research>"""
+
+KNOWN_CONTEXT_TEMPLATE = """
+
+The following passages come from earlier research on related topics. Treat them as known
+context: extend, update or challenge them rather than re-deriving what they already establish.
+
+<known_context>
+{passages}
+</known_context>"""
+
+STRUCTURED_INSTRUCTIONS = """
+
+Instead of free-form markdown, record your findings by calling the record_research tool once.
+Put your prose in the section bodies, state each factual claim separately with the ids of the
+citations that support it, and give every claim and the whole result a confidence from 0 to 1."""
+
+# Tool the model is made to call for structured research output. Sections
+# and citations are top-level arrays so they can be parsed as they stream.
+RESEARCH_TOOL = {
+    "name": "record_research",
+    "description": "Record the research findings as sections, claims and citations.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "sections": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "heading": {"type": "string"},
+                        "body": {"type": "string", "description": "Markdown prose of the section"},
+                        "claims": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "text": {"type": "string"},
+                                    "citations": {"type": "array", "items": {"type": "string"}},
+                                    "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+                                },
+                                "required": ["text", "citations", "confidence"],
+                            },
+                        },
+                    },
+                    "required": ["heading", "body", "claims"],
+                },
+            },
+            "citations": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "string"},
+                        "type": {"type": "string", "description": "article, book, web, report, ..."},
+                        "title": {"type": "string"},
+                        "source": {"type": "string", "description": "Publisher, journal or site"},
+                        "url": {"type": "string"},
+                        "authors": {"type": "array", "items": {"type": "string"}},
+                        "date": {"type": "string"},
+                        "quote": {"type": "string"},
+                    },
+                    "required": ["id", "title", "source"],
+                },
+            },
+            "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+        },
+        "required": ["sections", "citations", "confidence"],
+    },
+}
+
+TOOLS = {RESEARCH_TOOL["name"]: RESEARCH_TOOL}
+
+# Marker understood by the Messages API: everything up to and including the
+# marked block is eligible for provider-side prompt caching.
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+@dataclass(frozen=True)
+class PromptLayout:
+    """A prompt split into a stable, cacheable prefix and a per-agent suffix.
+
+    ``system`` is identical for every agent in every run, ``cached_prefix``
+    is identical for every agent within one run (it carries the topic), and
+    ``user_suffix`` holds the agent-specific instructions. ``tool`` names an
+    entry of ``TOOLS`` the model must answer with instead of text.
+    """
+    system: str
+    cached_prefix: str
+    user_suffix: str
+    tool: str = ""
+
+    def to_request(self, min_cache_tokens: int = 0) -> Dict[str, Any]:
+        """Return the ``system``/``messages`` (and tool) arguments for a Messages API call.
+        
+        A breakpoint is only marked where the prompt up to it reaches
+        ``min_cache_tokens``, the model's shortest cacheable prefix; the API
+        would ignore a shorter one.
+        """
+        cacheable = self.cacheable(min_cache_tokens)
+        system = {"type": "text", "text": self.system}
+        prefix = {"type": "text", "text": self.cached_prefix}
+        if "system" in cacheable:
+            system["cache_control"] = CACHE_CONTROL
+        if "prefix" in cacheable:
+            prefix["cache_control"] = CACHE_CONTROL
+        request = {
+            "system": [system],
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [prefix, {"type": "text", "text": self.user_suffix}],
+                }
+            ],
+        }
+        if self.tool:
+            # Tools precede the system prompt, so its breakpoint caches them too
+            request["tools"] = [TOOLS[self.tool]]
+            request["tool_choice"] = {"type": "tool", "name": self.tool}
+        return request
+    
+    def prefix_tokens(self) -> Dict[str, int]:
+        """Estimated tokens of the prompt up to each cache breakpoint, tools included."""
+        system = estimate_tokens(self.system)
+        if self.tool:
+            system += estimate_tokens(json.dumps(TOOLS[self.tool]))
+        return {"system": system, "prefix": system + estimate_tokens(self.cached_prefix)}
+    
+    def cacheable(self, min_tokens: int) -> List[str]:
+        """Breakpoints whose prefix is long enough to be cached, shortest first."""
+        return [name for name, tokens in self.prefix_tokens().items() if tokens >= min_tokens]
+    
+    def cache_keys(self) -> Dict[str, str]:
+        """Return cache keys for each cache breakpoint, shortest first."""
+        system = self.tool + "\x00" + self.system if self.tool else self.system
+        system_key = hashlib.sha256(system.encode("utf-8")).hexdigest()
+        prefix_key = hashlib.sha256(
+            (system + "\x00" + self.cached_prefix).encode("utf-8")
+        ).hexdigest()
+        return {"system": system_key, "prefix": prefix_key}
+
+    def flatten(self) -> str:
+        """Return the layout as a single plain-text prompt."""
+        return "\n\n".join([self.system, self.cached_prefix, self.user_suffix])
+
+
+def build_layout(topic: str, instructions: str, system: str = SYSTEM_PROMPT) -> PromptLayout:
+    """Build a prompt layout for the given topic and agent instructions."""
+    return PromptLayout(
+        system=system,
+        cached_prefix=TOPIC_CONTEXT_TEMPLATE.format(topic=topic),
+        user_suffix=instructions,
+    )
+
+
+def with_seed(layout: PromptLayout, topic: str, content: str, max_chars: int = 6000) -> PromptLayout:
+    """Append earlier research on a related topic to the agent-specific suffix.
+
+    The seed goes after the cached prefix so prompt caching is unaffected.
+    """
+    seed = SEED_TEMPLATE.format(topic=topic, content=content[:max_chars])
+    return replace(layout, user_suffix=layout.user_suffix + seed)
+
+
+def with_structured_output(layout: PromptLayout, tool: str = RESEARCH_TOOL["name"]) -> PromptLayout:
+    """Ask for the answer as a call to ``tool`` rather than markdown.
+
+    The instructions go in the agent-specific suffix; the tool definition
+    is the same for every agent, so cached prefixes stay shared.
+    """
+    return replace(layout, user_suffix=layout.user_suffix + STRUCTURED_INSTRUCTIONS, tool=tool)
+
+
+def with_context(layout: PromptLayout, passages: List[str]) -> PromptLayout:
+    """Add retrieved passages to the cached prefix shared by every agent in the run.
+
+    Retrieval happens once per run, so the prefix stays identical across
+    agents and remains cacheable.
+    """
+    if not passages:
+        return layout
+    numbered = "\n\n".join(f"[{i}] {passage}" for i, passage in enumerate(passages, 1))
+    context = KNOWN_CONTEXT_TEMPLATE.format(passages=numbered)
+    return replace(layout, cached_prefix=layout.cached_prefix + context)
@@ -0,0 +1,229 @@
+"""Incremental parsing of structured research output into sections and citations."""
+
+import json
+import re
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..models import Citation, Claim, ResearchSection
+
+
+# Characters that change the JSON nesting or string state; everything else is skipped
+_STRUCTURAL = re.compile(r'[{}\[\]"\\]')
+_KEY_BEFORE = re.compile(r'"(\w+)"\s*:\s*$')
+
+# Top-level arrays whose elements are emitted as soon as each one closes
+_STREAMED_ARRAYS = ("sections", "citations")
+
+
+def section_from_dict(data: Dict[str, Any]) -> ResearchSection:
+    return ResearchSection(
+        heading=str(data.get("heading", "")).strip(),
+        body=str(data.get("body", "")).strip(),
+        claims=[
+            Claim(
+                text=str(claim.get("text", "")).strip(),
+                citations=[str(c) for c in claim.get("citations") or []],
+                confidence=_unit(claim.get("confidence")),
+            )
+            for claim in data.get("claims") or [] if isinstance(claim, dict) and claim.get("text")
+        ],
+    )
+
+
+def citation_from_dict(data: Dict[str, Any]) -> Citation:
+    return Citation(
+        id=str(data.get("id", "")),
+        type=str(data.get("type") or ("web" if data.get("url") else "article")),
+        title=str(data.get("title", "")),
+        source=str(data.get("source", "")),
+        url=str(data.get("url") or ""),
+        authors=[str(a) for a in data.get("authors") or []],
+        date=str(data.get("date") or ""),
+        quote=str(data.get("quote") or ""),
+    )
+
+
+class ResearchParser:
+    """Builds ResearchSections and Citations from tool-call JSON as it streams in.
+
+    ``feed`` takes chunks in arrival order and returns the sections and
+    citations completed by that chunk, each decoded on its own as soon as
+    its closing brace arrives. Only structural characters are examined, so
+    long prose inside strings costs a regex scan rather than a Python loop.
+    Output cut short (``max_tokens``) keeps every element that did close.
+    """
+
+    def __init__(self):
+        self.sections: List[ResearchSection] = []
+        self.citations: List[Citation] = []
+        self.confidence: Optional[float] = None
+        self._chunks: List[str] = []
+        self._offsets: List[int] = []  # Start of each chunk in the whole text
+        self._length = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped_at = -1  # Position of the character a backslash escapes
+        self._array = ""  # Top-level array being read, if one of _STREAMED_ARRAYS
+        self._element_start = -1
+        self._spans: List[Tuple[int, int]] = []  # Elements already decoded
+        self._valid = True
+
+    @property
+    def length(self) -> int:
+        """Characters fed so far."""
+        return self._length
+
+    def feed(self, chunk: str) -> List[Union[ResearchSection, Citation]]:
+        """Consume the next chunk; returns the elements it completed."""
+        if not chunk:
+            return []
+        offset = self._length
+        self._chunks.append(chunk)
+        self._offsets.append(offset)
+        self._length += len(chunk)
+        completed = []
+        for match in _STRUCTURAL.finditer(chunk):
+            char = match.group()
+            position = offset + match.start()
+            if self._escaped_at >= 0:
+                # Most escapes (\n, \uXXXX) are not structural, so the escaped
+                # character is only skipped if it is the very next one
+                escaped, self._escaped_at = position == self._escaped_at, -1
+                if escaped:
+                    continue
+            if self._in_string:
+                if char == "\\":
+                    self._escaped_at = position + 1
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 2 and char == "[":
+                    key = _KEY_BEFORE.search(self._slice(max(0, position - 64), position))
+                    self._array = key.group(1) if key and key.group(1) in _STREAMED_ARRAYS else ""
+                elif self._depth == 3 and self._array and char == "{":
+                    self._element_start = position
+            else:
+                if self._depth == 3 and self._element_start >= 0 and char == "}":
+                    element = self._decode(self._element_start, position + 1)
+                    if element is not None:
+                        completed.append(element)
+                    self._element_start = -1
+                elif self._depth == 2:
+                    self._array = ""
+                self._depth -= 1
+                if self._depth < 0:
+                    self._valid = False
+        return completed
+
+    def finish(self) -> bool:
+        """Read the top-level fields once the stream has ended.
+
+        False if it was not research JSON or no section or citation decoded;
+        the response is then kept as markdown.
+        """
+        text = "".join(self._chunks)
+        if not text.lstrip().startswith("{") or not self._valid:
+            return False
+        # Decoded elements are blanked out, so only the small skeleton is parsed again
+        parts, last = [], 0
+        for start, end in self._spans:
+            parts.append(text[last:start])
+            parts.append("{}")
+            last = end
+        parts.append(text[last:])
+        try:
+            skeleton = json.loads("".join(parts))
+        except ValueError:
+            skeleton = {}
+        if isinstance(skeleton, dict) and "confidence" in skeleton:
+            self.confidence = _unit(skeleton.get("confidence"))
+        return bool(self.sections or self.citations)
+
+    def overall_confidence(self) -> float:
+        """The stated confidence, or the mean claim confidence when none was given."""
+        if self.confidence is not None:
+            return self.confidence
+        claims = [claim.confidence for section in self.sections for claim in section.claims]
+        return sum(claims) / len(claims) if claims else 0.0
+
+    def _decode(self, start: int, end: int) -> Optional[Union[ResearchSection, Citation]]:
+        try:
+            data = json.loads(self._slice(start, end))
+        except ValueError:
+            return None
+        self._spans.append((start, end))
+        if self._array == "sections":
+            element = section_from_dict(data)
+            self.sections.append(element)
+        else:
+            element = citation_from_dict(data)
+            self.citations.append(element)
+        return element
+
+    def _slice(self, start: int, end: int) -> str:
+        """Text between two absolute positions, joining only the chunks they span."""
+        first = bisect_right(self._offsets, start) - 1
+        last = bisect_right(self._offsets, end - 1) - 1
+        if first == last:
+            base = self._offsets[first]
+            return self._chunks[first][start - base:end - base]
+        parts = [self._chunks[first][start - self._offsets[first]:]]
+        parts.extend(self._chunks[first + 1:last])
+        parts.append(self._chunks[last][:end - self._offsets[last]])
+        return "".join(parts)
+
+
+def parse_research(text: str) -> Optional[ResearchParser]:
+    """Parse a complete structured response; None if ``text`` is not research JSON."""
+    parser = ResearchParser()
+    parser.feed(text)
+    return parser if parser.finish() else None
+
+
+def render_markdown(sections: List[ResearchSection], citations: List[Citation]) -> str:
+    """Markdown equivalent of structured research, for readers of ``content``."""
+    numbers = {citation.id: i for i, citation in enumerate(citations, 1)}
+    parts = []
+    for section in sections:
+        parts.append(f"### {section.heading}\n\n" if section.heading else "")
+        if section.body:
+            parts.append(section.body + "\n\n")
+        for claim in section.claims:
+            parts.append(f"- {claim.text}{citation_marks(claim, numbers)}\n")
+        if section.claims:
+            parts.append("\n")
+    if citations:
+        parts.append("### Sources\n\n")
+        for citation in citations:
+            parts.append(f"{numbers[citation.id]}. {format_citation(citation)}\n")
+    return "".join(parts).rstrip() + "\n"
+
+
+def citation_marks(claim: Claim, numbers: Dict[str, int]) -> str:
+    """Reference markers such as `` [1][3]`` for the claim's resolvable citations."""
+    marks = sorted({numbers[c] for c in claim.citations if c in numbers})
+    return " " + "".join(f"[{n}]" for n in marks) if marks else ""
+
+
+def format_citation(citation: Citation) -> str:
+    authors = ", ".join(citation.authors)
+    parts = [p for p in (authors, f"*{citation.title}*" if citation.title else "",
+                         citation.source, citation.date) if p]
+    text = ". ".join(parts)
+    if not citation.url:
+        return text
+    # Links that failed verification are flagged rather than dropped
+    flag = f" (link: {citation.status})" if citation.status not in ("", "ok") else ""
+    return f"{text}. {citation.url}{flag}"
+
+
+def _unit(value) -> float:
+    try:
+        return min(1.0, max(0.0, float(value)))
+    except (TypeError, ValueError):
+        return 0.0
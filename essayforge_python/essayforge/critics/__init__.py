@@ -0,0 +1,49 @@
+"""Critics package: evaluator agents and the prompts that act on their feedback."""
+
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .critics import Critic, CriticType, Verdict, aggregate, create_critics, parse_verdict
+    from .refinement import (
+        Section,
+        build_revision_layout,
+        build_section_layouts,
+        format_feedback,
+        split_sections,
+        stitch
+    )
+
+# Submodules are imported on first attribute access to keep startup fast
+_EXPORTS = {
+    'Critic': '.critics',
+    'CriticType': '.critics',
+    'Verdict': '.critics',
+    'aggregate': '.critics',
+    'create_critics': '.critics',
+    'parse_verdict': '.critics',
+    'Section': '.refinement',
+    'build_revision_layout': '.refinement',
+    'build_section_layouts': '.refinement',
+    'format_feedback': '.refinement',
+    'split_sections': '.refinement',
+    'stitch': '.refinement'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = [
+    'Critic',
+    'CriticType',
+    'Verdict',
+    'aggregate',
+    'create_critics',
+    'parse_verdict',
+    'Section',
+    'build_revision_layout',
+    'build_section_layouts',
+    'format_feedback',
+    'split_sections',
+    'stitch'
+]
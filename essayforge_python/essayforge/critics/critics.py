@@ -0,0 +1,150 @@
+"""Critic agents that score an essay draft along one quality dimension each."""
+
+import re
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List, Optional
+
+from ..agents.prompts import PromptLayout
+from ..models import QualityMetrics
+
+
+CRITIC_SYSTEM_PROMPT = """You are an evaluator agent in EssayForge, a multi-agent research synthesis system.
+Several critics review the same essay draft in parallel, each judging one aspect of its quality.
+Their verdicts decide whether the draft is refined further and tell the authors what to fix.
+
+Respond in exactly this format:
+Score: <a number from 0.00 to 1.00>
+Feedback:
+- <one specific, actionable problem per line, quoting the passage or naming the section>
+
+Judge only your assigned aspect. A score of 0.85 or higher means publication quality."""
+
+DRAFT_TEMPLATE = """Essay draft under review:
+
+<draft>
+{draft}
+</draft>"""
+
+_SCORE = re.compile(r"^\s*\**score\**\s*[:=]\s*([01](?:\.\d+)?)", re.IGNORECASE | re.MULTILINE)
+_FEEDBACK_ITEM = re.compile(r"^\s*(?:[-*]|\d+[.)])\s+(.+)$", re.MULTILINE)
+
+
+class CriticType(Enum):
+    """Quality dimensions judged by the critic network."""
+    FACTUAL_ACCURACY = "factual-accuracy"
+    COHERENCE = "argument-coherence"
+    CITATION_QUALITY = "citation-quality"
+    STRUCTURE = "structure-flow"
+    ORIGINALITY = "originality-insight"
+
+
+@dataclass
+class Critic:
+    """An evaluator agent with its instructions and weight in the overall score."""
+    type: CriticType
+    description: str
+    prompt_template: str
+    weight: float
+
+    def build_prompt(self, draft: str) -> PromptLayout:
+        """Build a layout whose cached prefix, the draft, is shared by every critic."""
+        return PromptLayout(
+            system=CRITIC_SYSTEM_PROMPT,
+            cached_prefix=DRAFT_TEMPLATE.format(draft=draft),
+            user_suffix=self.prompt_template,
+        )
+
+
+@dataclass
+class Verdict:
+    """One critic's judgement of a draft."""
+    critic: str
+    score: Optional[float]  # None when the response had no parsable score
+    feedback: List[str]
+
+
+def create_critics() -> List[Critic]:
+    """Create the five critics of the Actor-Critic network."""
+    return [
+        Critic(
+            type=CriticType.FACTUAL_ACCURACY,
+            description="Checks claims against known facts and flags unsupported ones",
+            prompt_template="""You are the factual accuracy critic. Assess:
+1. Whether factual claims, figures and dates are correct
+2. Claims stated with more certainty than the evidence allows
+3. Contradictions between sections""",
+            weight=0.25,
+        ),
+        Critic(
+            type=CriticType.COHERENCE,
+            description="Evaluates the logic and consistency of the argument",
+            prompt_template="""You are the argument coherence critic. Assess:
+1. Whether the thesis is clear and consistently supported
+2. Logical gaps, non sequiturs and circular reasoning
+3. Whether counter-arguments are addressed""",
+            weight=0.25,
+        ),
+        Critic(
+            type=CriticType.CITATION_QUALITY,
+            description="Reviews sourcing, attribution and reference quality",
+            prompt_template="""You are the citation quality critic. Assess:
+1. Whether every factual claim is attributed to a source
+2. The credibility and recency of the sources
+3. Consistency between in-text citations and the references""",
+            weight=0.2,
+        ),
+        Critic(
+            type=CriticType.STRUCTURE,
+            description="Judges organization, transitions and readability",
+            prompt_template="""You are the structure and flow critic. Assess:
+1. Whether sections are ordered logically and balanced in length
+2. Transitions between sections and paragraphs
+3. Repetition, redundancy and clarity of prose""",
+            weight=0.15,
+        ),
+        Critic(
+            type=CriticType.ORIGINALITY,
+            description="Looks for insight beyond summarizing the sources",
+            prompt_template="""You are the originality and insight critic. Assess:
+1. Whether the essay synthesizes rather than lists perspectives
+2. Non-obvious connections and conclusions
+3. Generic statements that add nothing""",
+            weight=0.15,
+        ),
+    ]
+
+
+def parse_verdict(critic: str, text: str) -> Verdict:
+    """Extract the score and feedback items from a critic's response."""
+    match = _SCORE.search(text)
+    score = min(1.0, float(match.group(1))) if match else None
+    feedback_at = text.lower().find("feedback")
+    feedback = _FEEDBACK_ITEM.findall(text[feedback_at:] if feedback_at >= 0 else text)
+    return Verdict(critic=critic, score=score, feedback=[item.strip() for item in feedback])
+
+
+def aggregate(verdicts: Dict[CriticType, Verdict], critics: List[Critic],
+              fallback: float, depth: float = 0.0) -> QualityMetrics:
+    """Combine critic verdicts into QualityMetrics.
+
+    Critics whose score could not be parsed count as ``fallback`` (a local
+    score of the draft), so one malformed response cannot stall the loop.
+    ``overall_score`` is the weighted mean over all critics.
+    """
+    scores = {}
+    for critic in critics:
+        verdict = verdicts.get(critic.type)
+        scores[critic.type] = verdict.score if verdict and verdict.score is not None else fallback
+    total_weight = sum(critic.weight for critic in critics) or 1.0
+    return QualityMetrics(
+        coherence=scores.get(CriticType.COHERENCE, fallback),
+        citation_quality=scores.get(CriticType.CITATION_QUALITY, fallback),
+        depth_score=depth,
+        originality=scores.get(CriticType.ORIGINALITY, fallback),
+        overall_score=round(
+            sum(scores[critic.type] * critic.weight for critic in critics) / total_weight, 4
+        ),
+        factual_accuracy=scores.get(CriticType.FACTUAL_ACCURACY, fallback),
+        structure=scores.get(CriticType.STRUCTURE, fallback),
+    )
@@ -0,0 +1,169 @@
+"""Actor prompts that revise a draft using the critics' feedback."""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from ..agents.prompts import PromptLayout
+from .critics import CriticType, Verdict
+
+
+REVISION_SYSTEM_PROMPT = """You are the refinement agent in EssayForge, a multi-agent research synthesis system.
+You revise essay drafts using feedback from a panel of critics, each judging one aspect of quality.
+
+Guidelines:
+- Address every feedback item that applies; ignore none silently.
+- Preserve the markdown structure, section headings and citations unless feedback says otherwise.
+- Do not invent sources or facts; soften or remove claims you cannot support.
+- Return only the revised text, without commentary."""
+
+REVISION_INSTRUCTIONS = """Revise the draft above using this critic feedback:
+
+{feedback}
+
+Return the complete revised essay."""
+
+GENERAL_FEEDBACK_TEMPLATE = """Critic feedback on the essay as a whole:
+
+{feedback}
+
+You will revise one section of this essay. Apply the feedback above where it concerns
+your section, and keep your section consistent with its neighbours."""
+
+SECTION_INSTRUCTIONS = """Section to revise:
+
+## {heading}
+
+{body}
+
+Neighbouring sections, for continuity only (do not rewrite them):
+- Before: {previous}
+- After: {following}
+
+Feedback on this section:
+{feedback}
+
+Return only the revised body of this section, without its heading."""
+
+_SECTION_HEADING = re.compile(r"^## (?!#)", re.MULTILINE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+# Sections passed through unchanged
+UNREVISED_SECTIONS = frozenset({"references", "bibliography"})
+
+
+@dataclass
+class Section:
+    """One ``##`` section of a draft."""
+    heading: str
+    body: str
+
+    def render(self) -> str:
+        return f"## {self.heading}\n\n{self.body.strip()}\n\n"
+
+
+def split_sections(draft: str) -> Tuple[str, List[Section]]:
+    """Split a draft on its ``##`` headings into (preamble, sections)."""
+    starts = [m.start() for m in _SECTION_HEADING.finditer(draft)]
+    if not starts:
+        return draft, []
+    sections = []
+    for start, end in zip(starts, starts[1:] + [len(draft)]):
+        heading, _, body = draft[start + 3:end].partition("\n")
+        sections.append(Section(heading.strip(), body.strip()))
+    return draft[:starts[0]], sections
+
+
+def stitch(preamble: str, sections: List[Section]) -> str:
+    """Reassemble a draft from its preamble and sections."""
+    return preamble + "".join(section.render() for section in sections).rstrip("\n") + "\n"
+
+
+def summarize(section: Optional[Section], max_chars: int = 300) -> str:
+    """A local, call-free summary: the heading and the section's opening sentences."""
+    if section is None:
+        return "(none)"
+    text = " ".join(line for line in section.body.splitlines() if not line.startswith("#"))
+    summary = ""
+    for sentence in _SENTENCE_END.split(" ".join(text.split())):
+        if summary and len(summary) + len(sentence) > max_chars:
+            break
+        summary = f"{summary} {sentence}".strip()
+    return f'"{section.heading}": {summary[:max_chars]}'
+
+
+def format_feedback(verdicts: Dict[CriticType, Verdict]) -> str:
+    """Render verdicts as a feedback list grouped by critic, weakest first."""
+    lines: List[str] = []
+    ordered = sorted(verdicts.values(), key=lambda v: v.score if v.score is not None else 1.0)
+    for verdict in ordered:
+        score = f"{verdict.score:.2f}" if verdict.score is not None else "n/a"
+        lines.append(f"{verdict.critic} (score {score}):")
+        lines.extend(f"- {item}" for item in verdict.feedback or ["No specific issues given."])
+    return "\n".join(lines)
+
+
+def route_feedback(verdicts: Dict[CriticType, Verdict],
+                   headings: List[str]) -> Tuple[Dict[CriticType, Verdict], Dict[str, List[str]]]:
+    """Split feedback into general verdicts and items that name a specific section."""
+    general: Dict[CriticType, Verdict] = {}
+    by_section: Dict[str, List[str]] = {heading: [] for heading in headings}
+    lowered = [(heading, heading.lower()) for heading in headings if heading]
+    for critic_type, verdict in verdicts.items():
+        remaining = []
+        for item in verdict.feedback:
+            named = [heading for heading, low in lowered if low in item.lower()]
+            for heading in named:
+                by_section[heading].append(f"{verdict.critic}: {item}")
+            if not named:
+                remaining.append(item)
+        general[critic_type] = Verdict(verdict.critic, verdict.score, remaining)
+    return general, by_section
+
+
+def build_section_layouts(sections: List[Section],
+                          verdicts: Dict[CriticType, Verdict]) -> List[Optional[PromptLayout]]:
+    """One revision layout per section (None for sections left as they are).
+
+    General feedback forms the cached prefix shared by every section call;
+    each suffix holds only its section, the feedback naming it, and short
+    summaries of its neighbours.
+    """
+    general, by_section = route_feedback(verdicts, [s.heading for s in sections])
+    prefix = GENERAL_FEEDBACK_TEMPLATE.format(feedback=format_feedback(general))
+    layouts: List[Optional[PromptLayout]] = []
+    for i, section in enumerate(sections):
+        if section.heading.lower() in UNREVISED_SECTIONS:
+            layouts.append(None)
+            continue
+        specific = by_section.get(section.heading) or ["None beyond the general feedback."]
+        layouts.append(PromptLayout(
+            system=REVISION_SYSTEM_PROMPT,
+            cached_prefix=prefix,
+            user_suffix=SECTION_INSTRUCTIONS.format(
+                heading=section.heading,
+                body=section.body,
+                previous=summarize(sections[i - 1] if i > 0 else None),
+                following=summarize(sections[i + 1] if i + 1 < len(sections) else None),
+                feedback="\n".join(f"- {item}" for item in specific),
+            ),
+        ))
+    return layouts
+
+
+def revised_body(section: Section, text: str) -> str:
+    """The revised body from a section reply, dropping a repeated heading."""
+    text = text.strip()
+    first, _, rest = text.partition("\n")
+    if first.lstrip("#").strip().lower() == section.heading.lower():
+        text = rest.strip()
+    return text or section.body
+
+
+def build_revision_layout(draft: str, verdicts: Dict[CriticType, Verdict]) -> PromptLayout:
+    """Layout for rewriting the whole draft; the draft is the cacheable prefix."""
+    return PromptLayout(
+        system=REVISION_SYSTEM_PROMPT,
+        cached_prefix=f"Essay draft:\n\n<draft>\n{draft}\n</draft>",
+        user_suffix=REVISION_INSTRUCTIONS.format(feedback=format_feedback(verdicts)),
+    )
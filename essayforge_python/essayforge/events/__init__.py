@@ -0,0 +1,64 @@
+"""Events package: typed progress events, the event bus and its sinks."""
+
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .bus import BLOCK, DROP_NEWEST, DROP_OLDEST, EventBus, Sink, Subscription
+    from .events import (
+        AgentFinished,
+        AgentRetry,
+        AgentStarted,
+        BudgetEvent,
+        DraftUpdated,
+        Event,
+        PhaseEvent,
+        TokenChunk
+    )
+    from .sinks import ConsoleSink, DashboardSink, MetricsSink, NDJSONSink
+
+# Submodules are imported on first attribute access to keep startup fast
+_EXPORTS = {
+    'EventBus': '.bus',
+    'Sink': '.bus',
+    'Subscription': '.bus',
+    'BLOCK': '.bus',
+    'DROP_OLDEST': '.bus',
+    'DROP_NEWEST': '.bus',
+    'Event': '.events',
+    'PhaseEvent': '.events',
+    'AgentStarted': '.events',
+    'TokenChunk': '.events',
+    'AgentRetry': '.events',
+    'AgentFinished': '.events',
+    'BudgetEvent': '.events',
+    'DraftUpdated': '.events',
+    'ConsoleSink': '.sinks',
+    'DashboardSink': '.sinks',
+    'MetricsSink': '.sinks',
+    'NDJSONSink': '.sinks'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = [
+    'EventBus',
+    'Sink',
+    'Subscription',
+    'BLOCK',
+    'DROP_OLDEST',
+    'DROP_NEWEST',
+    'Event',
+    'PhaseEvent',
+    'AgentStarted',
+    'TokenChunk',
+    'AgentRetry',
+    'AgentFinished',
+    'BudgetEvent',
+    'DraftUpdated',
+    'ConsoleSink',
+    'DashboardSink',
+    'MetricsSink',
+    'NDJSONSink'
+]
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""Thread-safe event bus delivering events to sinks on their own threads."""
+
+import threading
+from collections import deque
+from typing import Collection, List, Optional
+
+from .events import Event
+
+
+BLOCK = "block"  # Publisher waits for room (up to ``timeout``), then drops
+DROP_OLDEST = "drop_oldest"  # Evict the oldest queued event to make room
+DROP_NEWEST = "drop_newest"  # Discard the incoming event
+
+
+class Sink:
+    """Consumer of events; ``handle`` runs on the sink's delivery thread."""
+    
+    def handle(self, event: Event):
+        raise NotImplementedError
+    
+    def close(self):
+        """Called once on the delivery thread after the last event."""
+        pass
+
+
+class Subscription:
+    """A bounded queue and delivery thread feeding one sink.
+    
+    With ``kinds`` only events of those kinds are queued; the rest never
+    reach the sink and cannot fill its queue.
+    """
+    
+    def __init__(self, sink: Sink, maxsize: int = 1024, policy: str = DROP_OLDEST,
+                 timeout: Optional[float] = 1.0, kinds: Optional[Collection[str]] = None):
+        if policy not in (BLOCK, DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.sink = sink
+        self.kinds = frozenset(kinds) if kinds is not None else None
+        self.maxsize = maxsize
+        self.policy = policy
+        self.timeout = timeout
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name=f"sink-{type(sink).__name__}", daemon=True
+        )
+        self._thread.start()
+    
+    def offer(self, event: Event):
+        """Queue an event according to the overflow policy."""
+        if self.kinds is not None and event.kind not in self.kinds:
+            return
+        with self._cond:
+            if self._closed:
+                return
+            if len(self._queue) >= self.maxsize:
+                if self.policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return
+                if self.policy == DROP_OLDEST:
+                    self._queue.popleft()
+                    self.dropped += 1
+                elif not self._cond.wait_for(
+                    lambda: len(self._queue) < self.maxsize or self._closed, self.timeout
+                ) or self._closed:
+                    self.dropped += 1
+                    return
+            self._queue.append(event)
+            self._cond.notify_all()
+    
+    def close(self):
+        """Deliver everything still queued, close the sink and stop the thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    break
+                event = self._queue.popleft()
+                self._cond.notify_all()  # Wake publishers waiting for room
+            try:
+                self.sink.handle(event)
+                self.delivered += 1
+            except Exception:
+                self.errors += 1
+        try:
+            self.sink.close()
+        except Exception:
+            self.errors += 1
+
+
+class EventBus:
+    """Fan-out of typed events to asynchronously delivered sinks.
+    
+    ``publish`` never calls a sink directly: each subscription has its own
+    bounded queue and thread, so a slow sink can only delay itself. What
+    happens when its queue is full is chosen per subscription (block with a
+    timeout, drop the oldest, or drop the newest event), and so are the
+    kinds of event it receives.
+    """
+    
+    def __init__(self):
+        self.subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def subscribe(self, sink: Sink, maxsize: int = 1024, policy: str = DROP_OLDEST,
+                  timeout: Optional[float] = 1.0,
+                  kinds: Optional[Collection[str]] = None) -> Subscription:
+        """Attach a sink and start delivering events of ``kinds`` (default: all) to it."""
+        subscription = Subscription(sink, maxsize, policy, timeout, kinds)
+        with self._lock:
+            self.subscriptions.append(subscription)
+        return subscription
+    
+    def publish(self, event: Event):
+        """Offer the event to every subscribed sink."""
+        if self._closed:
+            return
+        for subscription in self.subscriptions:
+            subscription.offer(event)
+    
+    def close(self):
+        """Flush and close every subscription; later events are ignored."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            subscriptions = list(self.subscriptions)
+        for subscription in subscriptions:
+            subscription.close()
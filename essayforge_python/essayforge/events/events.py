@@ -0,0 +1,96 @@
+"""Typed progress events published by the orchestrator."""
+
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, ClassVar, Dict
+
+
+@dataclass
+class Event:
+    """Base class for all progress events."""
+    kind: ClassVar[str] = "event"
+    timestamp: float = field(default_factory=time.time, init=False)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable representation tagged with the event kind."""
+        data = asdict(self)
+        data["type"] = self.kind
+        return data
+
+
+@dataclass
+class PhaseEvent(Event):
+    """The pipeline entered a phase or advanced within it."""
+    kind: ClassVar[str] = "phase"
+    phase: str = ""  # research, synthesis, formatting, complete
+    percentage: float = 0.0  # Overall progress, 0-100
+    message: str = ""
+    total_agents: int = 0
+
+
+@dataclass
+class AgentStarted(Event):
+    """An agent call was dispatched to the model backend."""
+    kind: ClassVar[str] = "agent_started"
+    agent_id: str = ""
+    agent_type: str = ""
+    attempt: int = 0
+    model: str = ""
+
+
+@dataclass
+class TokenChunk(Event):
+    """A streamed chunk of agent output arrived."""
+    kind: ClassVar[str] = "token_chunk"
+    agent_id: str = ""
+    agent_type: str = ""
+    text: str = ""
+    tokens: int = 0  # Estimated tokens in this chunk
+
+
+@dataclass
+class AgentRetry(Event):
+    """An agent call failed and will be retried after ``delay`` seconds."""
+    kind: ClassVar[str] = "agent_retry"
+    agent_id: str = ""
+    agent_type: str = ""
+    attempt: int = 0
+    delay: float = 0.0
+    error: str = ""
+
+
+@dataclass
+class AgentFinished(Event):
+    """An agent completed or gave up after its final retry."""
+    kind: ClassVar[str] = "agent_finished"
+    agent_id: str = ""
+    agent_type: str = ""
+    status: str = "completed"  # completed, failed, cancelled
+    duration: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cache_read_tokens: int = 0
+    cost: float = 0.0
+    score: float = 0.0
+    error: str = ""
+    model: str = ""
+
+
+@dataclass
+class BudgetEvent(Event):
+    """Running token and cost totals against the configured limits."""
+    kind: ClassVar[str] = "budget"
+    total_tokens: int = 0
+    total_cost: float = 0.0
+    token_limit: int = 0
+    cost_limit: float = 0.0
+    exceeded: bool = False
+
+
+@dataclass
+class DraftUpdated(Event):
+    """The essay so far changed: research arrived, synthesis ran or a revision landed."""
+    kind: ClassVar[str] = "draft"
+    stage: str = ""  # research, synthesis or refinement
+    title: str = ""
+    content: str = ""  # The whole Markdown draft
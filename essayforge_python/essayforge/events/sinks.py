@@ -0,0 +1,175 @@
+"""Built-in event sinks: console, dashboard, NDJSON stream and metrics."""
+
+import json
+import os
+import threading
+from typing import Any, Dict, IO, Set, Union
+
+from ..models import Progress
+from .bus import Sink
+from .events import (
+    AgentFinished, AgentRetry, AgentStarted, BudgetEvent, Event, PhaseEvent, TokenChunk
+)
+
+# Row ids of the critic and refiner calls made while reviewing the draft
+_REVIEW_PREFIXES = ("critic:", "refiner")
+
+
+def _is_review(event: Union[AgentStarted, AgentFinished]) -> bool:
+    """True for a critic or refiner call rather than a research agent."""
+    return event.agent_id.startswith(_REVIEW_PREFIXES)
+
+
+class ConsoleSink(Sink):
+    """Plain line-per-update output used when the dashboard is disabled."""
+    
+    def handle(self, event: Event):
+        if isinstance(event, PhaseEvent):
+            print(f"[{event.percentage:3.0f}%] {event.message}")
+        elif isinstance(event, AgentFinished) and event.status == "failed":
+            print(f"Agent failed: {event.error}")
+        elif isinstance(event, BudgetEvent) and event.exceeded:
+            print(f"Budget exhausted: {event.total_tokens:,} tokens, ${event.total_cost:.2f}")
+
+
+class DashboardSink(Sink):
+    """Feeds a Dashboard or LiveDashboard from events.
+    
+    Agent counts and token totals are tallied from the events themselves
+    rather than derived from the overall percentage. Agents in flight are
+    kept by id, so a retry or a cascade to another model that starts the
+    same row again is not counted twice.
+    """
+    
+    def __init__(self, dashboard):
+        self.dashboard = dashboard
+        self.phase = PhaseEvent(phase="research")
+        self.in_flight: Set[str] = set()
+        self.completed = 0
+        self.tokens = 0
+        self.cost = 0.0
+        self.streamed: Dict[str, int] = {}
+    
+    def handle(self, event: Event):
+        if isinstance(event, PhaseEvent):
+            self.phase = event
+            self._refresh()
+        elif isinstance(event, AgentStarted):
+            self.in_flight.add(event.agent_id)
+            self.streamed[event.agent_id] = 0
+            self.dashboard.update_agent(event.agent_id, event.agent_type, "running")
+        elif isinstance(event, TokenChunk):
+            self.streamed[event.agent_id] = self.streamed.get(event.agent_id, 0) + event.tokens
+            self.dashboard.update_agent(
+                event.agent_id, event.agent_type, "running", self.streamed[event.agent_id]
+            )
+        elif isinstance(event, AgentRetry):
+            self.dashboard.update_agent(event.agent_id, event.agent_type, "retrying")
+        elif isinstance(event, AgentFinished):
+            self.in_flight.discard(event.agent_id)
+            self.completed += 1
+            self.dashboard.update_agent(
+                event.agent_id, event.agent_type, event.status, event.completion_tokens
+            )
+        elif isinstance(event, BudgetEvent):
+            self.tokens, self.cost = event.total_tokens, event.total_cost
+            self._refresh()
+    
+    def _refresh(self):
+        self.dashboard.update(Progress(
+            stage=self.phase.phase,
+            percentage=self.phase.percentage,
+            active_agents=self.phase.total_agents or len(self.in_flight),
+            completed_agents=self.completed,
+            tokens_used=self.tokens,
+            estimated_cost=self.cost,
+            message=self.phase.message,
+        ))
+    
+    def close(self):
+        self.dashboard.close()
+
+
+class NDJSONSink(Sink):
+    """Writes one JSON object per event to a file path, ``fd:N`` or open stream."""
+    
+    def __init__(self, target: Union[str, IO[str]]):
+        self._owned = isinstance(target, str)
+        if not self._owned:
+            self.stream = target
+        elif target.startswith("fd:"):
+            self.stream = os.fdopen(int(target[3:]), 'w', encoding='utf-8', buffering=1)
+        else:
+            self.stream = open(target, 'w', encoding='utf-8')
+    
+    def handle(self, event: Event):
+        self.stream.write(json.dumps(event.to_dict(), default=str) + "\n")
+    
+    def close(self):
+        self.stream.flush()
+        if self._owned:
+            self.stream.close()
+
+
+class MetricsSink(Sink):
+    """In-process aggregation of run metrics from events.
+    
+    ``failures`` counts research agents only; critic and refiner calls that
+    fail are counted in ``review_failures``.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+        self.by_agent_type: Dict[str, Dict[str, float]] = {}
+        self.phase_started: Dict[str, float] = {}
+        self.review_failed = 0
+        self.budget_exceeded = False
+    
+    def handle(self, event: Event):
+        with self._lock:
+            self.counts[event.kind] = self.counts.get(event.kind, 0) + 1
+            if isinstance(event, PhaseEvent):
+                self.phase_started.setdefault(event.phase, event.timestamp)
+            elif isinstance(event, AgentFinished):
+                if event.status == "failed" and _is_review(event):
+                    self.review_failed += 1
+                stats = self.by_agent_type.setdefault(event.agent_type, {
+                    "completed": 0, "failed": 0, "duration": 0.0,
+                    "completion_tokens": 0, "cache_read_tokens": 0, "cost": 0.0,
+                })
+                stats[event.status] = stats.get(event.status, 0) + 1
+                stats["duration"] += event.duration
+                stats["completion_tokens"] += event.completion_tokens
+                stats["cache_read_tokens"] += event.cache_read_tokens
+                stats["cost"] += event.cost
+            elif isinstance(event, BudgetEvent) and event.exceeded:
+                self.budget_exceeded = True
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a copy of the aggregated metrics."""
+        with self._lock:
+            return {
+                "counts": dict(self.counts),
+                "by_agent_type": {k: dict(v) for k, v in self.by_agent_type.items()},
+                "phase_started": dict(self.phase_started),
+                "review_failures": self.review_failed,
+                "budget_exceeded": self.budget_exceeded,
+            }
+    
+    @property
+    def retries(self) -> int:
+        return self.counts.get(AgentRetry.kind, 0)
+    
+    @property
+    def failures(self) -> int:
+        """Research agents that gave up after their final retry."""
+        with self._lock:
+            failed = sum(int(s.get("failed", 0)) for s in self.by_agent_type.values())
+            return failed - self.review_failed
+    
+    @property
+    def review_failures(self) -> int:
+        """Critic and refiner calls that gave up after their final retry."""
+        with self._lock:
+            return self.review_failed
@@ -0,0 +1,76 @@
+"""LLM client package for EssayForge model backends."""
+
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .batch_stub import BatchStubServer
+    from .batches import BatchAPIError, BatchesClient, BatchRequest, BatchResult, BatchStatus
+    from .cancellation import CancellationToken, CancelledError
+    from .cassette import CassetteMissError, RecordingClient, ReplayClient, ReplayedAPIError
+    from .client import LLMClient, LLMResponse, AnthropicClient
+    from .pricing import MODEL_PRICING, estimate_tokens, make_usage
+    from .simulated import SimulatedAPIError, SimulatedClient, SimulationProfile
+    from .singleflight import CoalescingClient, normalize_request
+    from .stub import StubClient
+    from .warmup import WarmClient
+
+# Submodules are imported on first attribute access to keep startup fast
+_EXPORTS = {
+    'CancellationToken': '.cancellation',
+    'CancelledError': '.cancellation',
+    'RecordingClient': '.cassette',
+    'ReplayClient': '.cassette',
+    'CassetteMissError': '.cassette',
+    'ReplayedAPIError': '.cassette',
+    'LLMClient': '.client',
+    'LLMResponse': '.client',
+    'AnthropicClient': '.client',
+    'StubClient': '.stub',
+    'WarmClient': '.warmup',
+    'SimulatedClient': '.simulated',
+    'SimulatedAPIError': '.simulated',
+    'SimulationProfile': '.simulated',
+    'CoalescingClient': '.singleflight',
+    'normalize_request': '.singleflight',
+    'BatchesClient': '.batches',
+    'BatchRequest': '.batches',
+    'BatchResult': '.batches',
+    'BatchStatus': '.batches',
+    'BatchAPIError': '.batches',
+    'BatchStubServer': '.batch_stub',
+    'MODEL_PRICING': '.pricing',
+    'estimate_tokens': '.pricing',
+    'make_usage': '.pricing'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = [
+    'CancellationToken',
+    'CancelledError',
+    'RecordingClient',
+    'ReplayClient',
+    'CassetteMissError',
+    'ReplayedAPIError',
+    'LLMClient',
+    'LLMResponse',
+    'AnthropicClient',
+    'StubClient',
+    'WarmClient',
+    'SimulatedClient',
+    'SimulatedAPIError',
+    'SimulationProfile',
+    'CoalescingClient',
+    'normalize_request',
+    'BatchesClient',
+    'BatchRequest',
+    'BatchResult',
+    'BatchStatus',
+    'BatchAPIError',
+    'BatchStubServer',
+    'MODEL_PRICING',
+    'estimate_tokens',
+    'make_usage'
+]
\ No newline at end of file
@@ -0,0 +1,216 @@
+"""Local HTTP stand-in for the Message Batches endpoints, for demos and verification."""
+
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from ..agents.prompts import PromptLayout
+from .client import LLMClient
+from .stub import StubClient
+
+
+def layout_from_params(params: Dict[str, Any]) -> PromptLayout:
+    """Rebuild the PromptLayout that ``PromptLayout.to_request`` serialized."""
+    system = params.get("system", "")
+    if isinstance(system, list):
+        system = "".join(block.get("text", "") for block in system)
+    tool = (params.get("tool_choice") or {}).get("name", "")
+    content = params["messages"][0]["content"]
+    if isinstance(content, str):
+        return PromptLayout(system, "", content, tool)
+    texts = [block.get("text", "") for block in content]
+    return PromptLayout(system, texts[0], "".join(texts[1:]), tool)
+
+
+class _Batch:
+    """A submitted batch and the results produced so far."""
+
+    def __init__(self, batch_id: str, requests: List[Dict[str, Any]]):
+        self.id = batch_id
+        self.requests = requests
+        self.results: List[Dict[str, Any]] = []
+        self.status = "in_progress"
+        self.created_at = time.time()
+        self.cancelled = threading.Event()
+
+    def to_json(self, base_url: str) -> Dict[str, Any]:
+        counts = {"processing": 0, "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0}
+        for result in self.results:
+            counts[result["result"]["type"]] += 1
+        if self.status != "ended":
+            counts["processing"] = len(self.requests) - len(self.results)
+        return {
+            "id": self.id,
+            "type": "message_batch",
+            "processing_status": self.status,
+            "request_counts": counts,
+            "results_url": (f"{base_url}/v1/messages/batches/{self.id}/results"
+                            if self.status == "ended" else None),
+        }
+
+
+class BatchStubServer:
+    """Serves the batch endpoints on localhost, answering requests with ``client``.
+
+    Requests of a batch are processed one after another in a background
+    thread, ``seconds_per_request`` apiece on top of the client's own
+    latency, and a fraction ``error_rate`` of them fail with
+    ``overloaded_error``. Results become available once the whole batch
+    has ended, as with the real API. ``created`` counts batches submitted,
+    which is how a resumed run can be seen not to resubmit.
+    """
+
+    _PATH = re.compile(r"^/v1/messages/batches(?:/([\w-]+)(?:/(cancel|results))?)?$")
+
+    def __init__(self, client: Optional[LLMClient] = None, seconds_per_request: float = 0.0,
+                 error_rate: float = 0.0, port: int = 0, seed: Optional[int] = None):
+        self.client = client or StubClient()
+        self.seconds_per_request = seconds_per_request
+        self.error_rate = error_rate
+        self.batches: Dict[str, _Batch] = {}
+        self.created = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="batch-stub", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        for batch in list(self.batches.values()):
+            batch.cancelled.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'BatchStubServer':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _create(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        requests = body.get("requests") or []
+        ids = [request.get("custom_id", "") for request in requests]
+        if not requests or len(set(ids)) != len(ids):
+            raise ValueError("requests must be non-empty with unique custom_id values")
+        batch = _Batch(f"msgbatch_{uuid.uuid4().hex[:24]}", requests)
+        with self._lock:
+            self.batches[batch.id] = batch
+            self.created += 1
+        threading.Thread(target=self._process, args=(batch,), daemon=True).start()
+        return batch.to_json(self.url)
+
+    def _process(self, batch: _Batch):
+        for request in batch.requests:
+            if batch.cancelled.is_set():
+                result = {"type": "canceled"}
+            else:
+                if self.seconds_per_request > 0:
+                    time.sleep(self.seconds_per_request)
+                result = self._answer(request["params"])
+            batch.results.append({"custom_id": request["custom_id"], "result": result})
+        batch.status = "ended"
+
+    def _answer(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            failed = self._rng.random() < self.error_rate
+        if failed:
+            return {"type": "errored", "error": {"type": "error", "error": {
+                "type": "overloaded_error", "message": "Overloaded"}}}
+        layout = layout_from_params(params)
+        try:
+            response = self.client.complete(
+                layout, params["model"],
+                max_tokens=params.get("max_tokens", 4096),
+                temperature=params.get("temperature", 1.0),
+            )
+        except Exception as e:
+            return {"type": "errored", "error": {"type": "error", "error": {
+                "type": "api_error", "message": str(e)}}}
+        usage = response.usage
+        content = {"type": "text", "text": response.text}
+        if layout.tool:
+            content = {"type": "tool_use", "id": f"toolu_{uuid.uuid4().hex[:24]}",
+                       "name": layout.tool, "input": json.loads(response.text)}
+        return {"type": "succeeded", "message": {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": params["model"],
+            "content": [content],
+            "stop_reason": "tool_use" if layout.tool else "end_turn",
+            "usage": {
+                "input_tokens": usage.prompt_tokens,
+                "output_tokens": usage.completion_tokens,
+                "cache_read_input_tokens": usage.cache_read_tokens,
+                "cache_creation_input_tokens": usage.cache_write_tokens,
+            },
+        }}
+
+    def _results_file(self, batch: _Batch) -> bytes:
+        """Body of an ended batch's results file: one JSON line per request."""
+        lines = "".join(json.dumps(result) + "\n" for result in batch.results)
+        return lines.encode("utf-8")
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                self._route("GET")
+
+            def do_POST(self):
+                self._route("POST")
+
+            def _route(self, method: str):
+                match = server._PATH.match(self.path)
+                if not match:
+                    return self._error(404, "not_found_error", "Unknown endpoint")
+                batch_id, action = match.groups()
+                try:
+                    if method == "POST" and batch_id is None:
+                        length = int(self.headers.get("content-length") or 0)
+                        return self._json(server._create(json.loads(self.rfile.read(length))))
+                    batch = server.batches.get(batch_id or "")
+                    if batch is None:
+                        return self._error(404, "not_found_error", "No such batch")
+                    if method == "GET" and action is None:
+                        return self._json(batch.to_json(server.url))
+                    if method == "POST" and action == "cancel":
+                        batch.cancelled.set()
+                        if batch.status != "ended":
+                            batch.status = "canceling"
+                        return self._json(batch.to_json(server.url))
+                    if method == "GET" and action == "results":
+                        if batch.status != "ended":
+                            return self._error(400, "invalid_request_error",
+                                               "Batch has not ended")
+                        return self._send(200, server._results_file(batch), "application/x-jsonl")
+                except ValueError as e:
+                    return self._error(400, "invalid_request_error", str(e))
+                return self._error(405, "invalid_request_error", "Method not allowed")
+
+            def _json(self, data: Dict[str, Any], code: int = 200):
+                self._send(code, json.dumps(data).encode("utf-8"), "application/json")
+
+            def _error(self, code: int, kind: str, message: str):
+                self._json({"type": "error", "error": {"type": kind, "message": message}}, code)
+
+            def _send(self, code: int, body: bytes, content_type: str):
+                self.send_response(code)
+                self.send_header("content-type", content_type)
+                self.send_header("content-length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
@@ -0,0 +1,248 @@
+"""Client for the Message Batches API: submit many requests, poll, stream results."""
+
+import json
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from ..agents.prompts import PromptLayout
+from .cancellation import CancellationToken
+from .client import LLMResponse
+from .pricing import make_usage, min_cacheable_tokens
+
+
+DEFAULT_BASE_URL = "https://api.anthropic.com"
+API_VERSION = "2023-06-01"
+
+# Error types worth submitting again; the rest would fail the same way
+RETRYABLE_ERRORS = frozenset({"overloaded_error", "api_error", "rate_limit_error", "expired"})
+
+
+class BatchAPIError(RuntimeError):
+    """The batch endpoints rejected a request or returned something unreadable.
+
+    ``status`` is the HTTP status code, or 0 if no response arrived.
+    """
+
+    def __init__(self, message: str, status: int = 0):
+        super().__init__(message)
+        self.status = status
+
+    @property
+    def transient(self) -> bool:
+        """Whether asking again may succeed: no response, rate limiting or a server error."""
+        return self.status == 0 or self.status == 429 or self.status >= 500
+
+
+@dataclass
+class BatchRequest:
+    """One Messages API call inside a batch."""
+    custom_id: str  # 1-64 characters of [A-Za-z0-9_-], unique within the batch
+    layout: PromptLayout
+    model: str
+    max_tokens: int = 4096
+    temperature: float = 1.0
+
+    def to_entry(self) -> Dict[str, Any]:
+        """The request as the batch create endpoint expects it."""
+        return {
+            "custom_id": self.custom_id,
+            "params": dict(model=self.model, max_tokens=self.max_tokens,
+                           temperature=self.temperature,
+                           **self.layout.to_request(min_cacheable_tokens(self.model))),
+        }
+
+
+@dataclass
+class BatchStatus:
+    """Processing state of a submitted batch."""
+    id: str
+    processing_status: str  # "in_progress", "canceling" or "ended"
+    counts: Dict[str, int] = field(default_factory=dict)
+    results_url: str = ""
+
+    @property
+    def ended(self) -> bool:
+        return self.processing_status == "ended"
+
+    @property
+    def processing(self) -> int:
+        return self.counts.get("processing", 0)
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> 'BatchStatus':
+        return cls(
+            id=data["id"],
+            processing_status=data["processing_status"],
+            counts=dict(data.get("request_counts") or {}),
+            results_url=data.get("results_url") or "",
+        )
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one request of an ended batch."""
+    custom_id: str
+    response: Optional[LLMResponse] = None
+    error_type: str = ""  # Set unless the request succeeded
+    error: str = ""
+
+    @property
+    def retryable(self) -> bool:
+        return self.response is None and self.error_type in RETRYABLE_ERRORS
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> 'BatchResult':
+        """Parse one line of the results file, pricing usage at the batch discount."""
+        result = data.get("result") or {}
+        kind = result.get("type", "")
+        if kind == "succeeded":
+            message = result["message"]
+            usage = message.get("usage") or {}
+            # A forced tool call comes back as its JSON input, as it streams live
+            text = "".join(
+                json.dumps(block.get("input", {})) if block.get("type") == "tool_use"
+                else block.get("text", "")
+                for block in message.get("content", [])
+                if block.get("type") in ("text", "tool_use")
+            )
+            return cls(data["custom_id"], LLMResponse(
+                text=text,
+                usage=make_usage(
+                    message.get("model", ""),
+                    prompt_tokens=usage.get("input_tokens", 0),
+                    completion_tokens=usage.get("output_tokens", 0),
+                    cache_read_tokens=usage.get("cache_read_input_tokens") or 0,
+                    cache_write_tokens=usage.get("cache_creation_input_tokens") or 0,
+                    batch=True,
+                ),
+            ))
+        if kind == "errored":
+            error = (result.get("error") or {}).get("error") or {}
+            return cls(data["custom_id"], error_type=error.get("type", "api_error"),
+                       error=error.get("message", "request failed"))
+        return cls(data["custom_id"], error_type=kind or "unknown", error=f"request {kind}")
+
+
+class BatchesClient:
+    """Message Batches endpoints over plain HTTPS.
+
+    ``base_url`` can point at a local stand-in such as ``BatchStubServer``,
+    which is how batch mode is exercised without an API key.
+    """
+
+    def __init__(self, api_key: str, base_url: str = DEFAULT_BASE_URL, timeout: float = 60.0):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def create(self, requests: List[BatchRequest]) -> BatchStatus:
+        """Submit ``requests`` as one batch."""
+        body = {"requests": [request.to_entry() for request in requests]}
+        return BatchStatus.from_json(self._json("POST", "/v1/messages/batches", body))
+
+    def retrieve(self, batch_id: str) -> BatchStatus:
+        return BatchStatus.from_json(self._json("GET", f"/v1/messages/batches/{batch_id}"))
+
+    def cancel(self, batch_id: str) -> BatchStatus:
+        return BatchStatus.from_json(self._json("POST", f"/v1/messages/batches/{batch_id}/cancel"))
+
+    def poll(self, batch_id: str, cancel: Optional[CancellationToken] = None,
+             on_status: Optional[Callable[[BatchStatus], None]] = None,
+             initial: float = 1.0, maximum: float = 60.0, factor: float = 1.5,
+             max_errors: int = 10) -> BatchStatus:
+        """Wait for a batch to end, backing off while it makes no progress.
+
+        The interval starts at ``initial`` and grows by ``factor`` up to
+        ``maximum`` each time the number of requests still processing is
+        unchanged, or a status check fails transiently (see
+        ``BatchAPIError.transient``); it stays put while requests are
+        finishing. Other errors, or ``max_errors`` transient ones in a row,
+        are raised. Raises CancelledError if ``cancel`` fires first; the
+        batch keeps running and can be resumed by its id.
+        """
+        delay = initial
+        last = None
+        errors = 0
+        while True:
+            if cancel is not None:
+                cancel.check()
+            try:
+                status = self.retrieve(batch_id)
+            except BatchAPIError as e:
+                errors += 1
+                if not e.transient or errors >= max_errors:
+                    raise
+                delay = min(delay * factor, maximum)
+            else:
+                errors = 0
+                if on_status:
+                    on_status(status)
+                if status.ended:
+                    return status
+                if last is not None and status.processing >= last:
+                    delay = min(delay * factor, maximum)
+                last = status.processing
+            if cancel is None:
+                time.sleep(delay)
+            elif cancel.wait(delay):
+                cancel.check()
+
+    def results(self, status: BatchStatus) -> Iterator[BatchResult]:
+        """Stream the results of an ended batch, one parsed line at a time.
+
+        A connection lost mid-stream or a line that is not a result raises
+        BatchAPIError, after the results read so far have been yielded.
+        """
+        url = status.results_url or f"{self.base_url}/v1/messages/batches/{status.id}/results"
+        with self._open("GET", url) as response:
+            lines = iter(response)
+            number = 0
+            while True:
+                try:
+                    line = next(lines, None)
+                except OSError as e:
+                    raise BatchAPIError(f"GET {url} failed after {number} lines: {e}") from e
+                if line is None:
+                    return
+                number += 1
+                if not line.strip():
+                    continue
+                try:
+                    result = BatchResult.from_json(json.loads(line))
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    raise BatchAPIError(f"Line {number} of {url} is not a batch result: {e}") from e
+                yield result
+
+    def _json(self, method: str, path: str, body: Optional[Dict] = None) -> Dict[str, Any]:
+        try:
+            with self._open(method, self.base_url + path, body) as response:
+                data = response.read()
+        except OSError as e:  # Connection reset or timed out while reading
+            raise BatchAPIError(f"{method} {path} failed: {e}") from e
+        try:
+            return json.loads(data)
+        except ValueError as e:
+            raise BatchAPIError(f"{method} {path} returned unreadable JSON: {e}") from e
+
+    def _open(self, method: str, url: str, body: Optional[Dict] = None):
+        request = urllib.request.Request(
+            url, method=method,
+            data=json.dumps(body).encode("utf-8") if body is not None else None,
+            headers={
+                "x-api-key": self.api_key,
+                "anthropic-version": API_VERSION,
+                "content-type": "application/json",
+            },
+        )
+        try:
+            return urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            detail = e.read().decode("utf-8", "replace")[:500]
+            raise BatchAPIError(f"{method} {url} failed with HTTP {e.code}: {detail}", e.code) from e
+        except urllib.error.URLError as e:
+            raise BatchAPIError(f"{method} {url} failed: {e.reason}") from e
+        except OSError as e:
+            raise BatchAPIError(f"{method} {url} failed: {e}") from e
@@ -0,0 +1,64 @@
+"""Cooperative cancellation for in-flight model calls."""
+
+import threading
+import time
+from typing import Optional
+
+
+class CancelledError(Exception):
+    """Raised inside a model call after its cancellation token fired."""
+
+
+class CancellationToken:
+    """Signal shared between the orchestrator and in-flight calls.
+    
+    The token is cancelled either explicitly or implicitly once its optional
+    absolute ``deadline`` (a ``time.time()`` timestamp) passes. Clients poll
+    ``check()`` between chunks and use ``wait()`` instead of ``time.sleep``
+    so that cancellation interrupts simulated latency and retry backoff.
+    ``reason`` tells the two apart: the one given to ``cancel()``, or
+    "deadline" once the deadline passed.
+    """
+    
+    def __init__(self, deadline: Optional[float] = None):
+        self.deadline = deadline
+        self._event = threading.Event()
+        self._reason = ""
+    
+    def cancel(self, reason: str = "cancelled"):
+        """Cancel every call observing this token."""
+        if not self._event.is_set():
+            self._reason = reason
+        self._event.set()
+    
+    @property
+    def reason(self) -> str:
+        """Why the token was cancelled, or "" while it has not been."""
+        if not self.cancelled:
+            return ""
+        return self._reason or "deadline"
+    
+    @property
+    def cancelled(self) -> bool:
+        if not self._event.is_set() and self.deadline is not None and time.time() >= self.deadline:
+            self._event.set()
+        return self._event.is_set()
+    
+    def remaining(self) -> Optional[float]:
+        """Seconds until the deadline, or None when there is no deadline."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+    
+    def check(self):
+        """Raise CancelledError if the token has been cancelled."""
+        if self.cancelled:
+            raise CancelledError(f"call cancelled: {self.reason}")
+    
+    def wait(self, seconds: float) -> bool:
+        """Sleep up to ``seconds``, waking early on cancellation; return True if cancelled."""
+        remaining = self.remaining()
+        if remaining is not None and remaining < seconds:
+            self._event.wait(remaining)
+            return self.cancelled
+        return self._event.wait(seconds) or self.cancelled
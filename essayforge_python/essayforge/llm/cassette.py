@@ -0,0 +1,203 @@
+"""Record model interactions to a cassette file and replay them offline."""
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import asdict
+from datetime import datetime
+from typing import IO, Callable, Deque, Dict, List, Optional
+
+from ..agents.prompts import PromptLayout
+from ..models import TokenUsage
+from .cancellation import CancellationToken, CancelledError
+from .client import LLMClient, LLMResponse
+
+
+CASSETTE_VERSION = 1
+
+
+class CassetteMissError(LookupError):
+    """A replayed request has no (remaining) recording in the cassette."""
+
+
+class ReplayedAPIError(RuntimeError):
+    """A call that failed while recording fails the same way on replay."""
+
+
+def request_keys(layout: PromptLayout, model: str, max_tokens: int,
+                 temperature: float) -> Dict[str, str]:
+    """Exact and loose match keys for a request.
+
+    The loose key leaves out the cached prefix (topic and retrieved context),
+    so a replay still finds each agent's response when only that changed.
+    """
+    # The tool is only part of the key when set, so older cassettes still match
+    tool = [layout.tool] if layout.tool else []
+    exact = json.dumps([layout.system, layout.cached_prefix, layout.user_suffix,
+                        model, max_tokens, temperature] + tool)
+    loose = json.dumps([layout.system, layout.user_suffix, model] + tool)
+    return {
+        "key": hashlib.sha256(exact.encode("utf-8")).hexdigest()[:32],
+        "loose_key": hashlib.sha256(loose.encode("utf-8")).hexdigest()[:32],
+    }
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    """Open a cassette, gzip-compressed when the name ends in ``.gz``."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class RecordingClient(LLMClient):
+    """Pass calls through to ``client`` and append each exchange to a cassette.
+
+    Every entry holds the request keys, the response text with the arrival
+    offset and length of each streamed chunk, usage, latency and
+    time-to-first-token, or the error the call raised. Entries are written
+    one JSON line at a time, so concurrent agents can share the recorder.
+    ``metadata`` (e.g. the run's settings) is stored in the header line.
+    """
+
+    def __init__(self, client: LLMClient, path: str, metadata: Optional[Dict] = None):
+        self.client = client
+        self.path = path
+        self.entries = 0  # Recorded calls
+        self._start = time.time()
+        self._lock = threading.Lock()
+        self._file = _open(path, "w")
+        self._write({"cassette": CASSETTE_VERSION,
+                     "created": datetime.now().isoformat(timespec="seconds"),
+                     "metadata": metadata or {}})
+
+    def complete(self, layout: PromptLayout, model: str, max_tokens: int = 4096,
+                 temperature: float = 1.0,
+                 on_text: Optional[Callable[[str], None]] = None,
+                 cancel: Optional[CancellationToken] = None) -> LLMResponse:
+        """Call the wrapped client, recording the chunks it streams."""
+        start = time.time()
+        chunks: List[List[int]] = []
+
+        def record_chunk(chunk: str):
+            chunks.append([round((time.time() - start) * 1000), len(chunk)])
+            if on_text:
+                on_text(chunk)
+
+        entry = dict(request_keys(layout, model, max_tokens, temperature),
+                     model=model, started=round(start - self._start, 3))
+        try:
+            response = self.client.complete(layout, model, max_tokens, temperature,
+                                            on_text=record_chunk, cancel=cancel)
+        except CancelledError:
+            raise  # Cut short by this run's deadline, not a property of the API
+        except Exception as e:
+            entry.update(latency=round(time.time() - start, 4), error=str(e))
+            self._write(entry)
+            raise
+        entry.update(
+            latency=round(response.latency, 4),
+            ttft=round(response.time_to_first_token, 4),
+            text=response.text,
+            chunks=chunks,
+            usage=asdict(response.usage),
+        )
+        self._write(entry)
+        return response
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def _write(self, entry: Dict):
+        with self._lock:
+            self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._file.flush()
+            self.entries += "key" in entry
+
+
+class ReplayClient(LLMClient):
+    """Serve recorded responses locally, with recorded or scaled timing.
+
+    Requests are matched on their exact key first and on the loose key
+    otherwise; repeated identical requests (best-of-N variations) get their
+    recordings in the original order. ``latency_scale`` multiplies every
+    recorded delay: 1.0 reproduces the original timing, 0 replays instantly.
+    """
+
+    def __init__(self, path: str, latency_scale: float = 1.0):
+        self.path = path
+        self.latency_scale = latency_scale
+        self.calls = 0
+        self.misses = 0
+        self._exact: Dict[str, Deque[Dict]] = {}
+        self._loose: Dict[str, Deque[Dict]] = {}
+        self._lock = threading.Lock()
+        with _open(path, "r") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("cassette") != CASSETTE_VERSION:
+                raise ValueError(f"{path} is not a version {CASSETTE_VERSION} cassette")
+            self.metadata: Dict = header.get("metadata", {})
+            for line in f:
+                entry = json.loads(line)
+                self._exact.setdefault(entry["key"], deque()).append(entry)
+                self._loose.setdefault(entry["loose_key"], deque()).append(entry)
+
+    def complete(self, layout: PromptLayout, model: str, max_tokens: int = 4096,
+                 temperature: float = 1.0,
+                 on_text: Optional[Callable[[str], None]] = None,
+                 cancel: Optional[CancellationToken] = None) -> LLMResponse:
+        """Replay the next recording for this request."""
+        start = time.time()
+        entry = self._take(request_keys(layout, model, max_tokens, temperature))
+        scale = self.latency_scale
+
+        if "error" in entry:
+            self._sleep(entry["latency"] * scale, cancel)
+            raise ReplayedAPIError(entry["error"])
+
+        text, offset = entry["text"], 0
+        first_token_at = 0.0
+        for at_ms, length in entry["chunks"] or [[entry["ttft"] * 1000, len(text)]]:
+            self._sleep(start + at_ms / 1000 * scale - time.time(), cancel)
+            if not first_token_at:
+                first_token_at = time.time()
+            if on_text:
+                on_text(text[offset:offset + length])
+            offset += length
+        self._sleep(start + entry["latency"] * scale - time.time(), cancel)
+        return LLMResponse(
+            text=text,
+            usage=TokenUsage(**entry["usage"]),
+            latency=time.time() - start,
+            time_to_first_token=(first_token_at or time.time()) - start,
+        )
+
+    def _take(self, keys: Dict[str, str]) -> Dict:
+        """Pop the next recording matching ``keys`` from both lookup tables."""
+        with self._lock:
+            self.calls += 1
+            for table, key in ((self._exact, keys["key"]), (self._loose, keys["loose_key"])):
+                queue = table.get(key)
+                if queue:
+                    entry = queue.popleft()
+                    other = self._loose if table is self._exact else self._exact
+                    other_key = entry["loose_key"] if table is self._exact else entry["key"]
+                    other[other_key].remove(entry)
+                    return entry
+            self.misses += 1
+        raise CassetteMissError(f"No recording left for request {keys['key']} in {self.path}")
+
+    def _sleep(self, seconds: float, cancel: Optional[CancellationToken]):
+        """Wait out a recorded delay, returning early with CancelledError on cancellation."""
+        if seconds <= 0:
+            if cancel is not None:
+                cancel.check()
+            return
+        if cancel is None:
+            time.sleep(seconds)
+        elif cancel.wait(seconds):
+            cancel.check()
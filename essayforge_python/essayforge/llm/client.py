@@ -0,0 +1,105 @@
+"""LLM client interface and the Anthropic Messages API implementation."""
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from ..agents.prompts import PromptLayout
+from ..models import TokenUsage
+from .cancellation import CancellationToken
+from .pricing import make_usage, min_cacheable_tokens
+
+
+@dataclass
+class LLMResponse:
+    """Text and accounting returned by a single model call."""
+    text: str
+    usage: TokenUsage = field(default_factory=TokenUsage)
+    latency: float = 0.0  # Seconds spent waiting for the response
+    time_to_first_token: float = 0.0  # Seconds until the first text arrived
+    saved: Optional[TokenUsage] = None  # Usage of another request's call this one shared
+
+
+class LLMClient:
+    """Base class for model backends used by the orchestrator."""
+    
+    def complete(self, layout: PromptLayout, model: str, max_tokens: int = 4096,
+                 temperature: float = 1.0,
+                 on_text: Optional[Callable[[str], None]] = None,
+                 cancel: Optional[CancellationToken] = None) -> LLMResponse:
+        """Run a single completion, passing streamed text chunks to ``on_text``.
+        
+        Implementations stop early with CancelledError once ``cancel`` fires.
+        """
+        raise NotImplementedError
+
+
+class AnthropicClient(LLMClient):
+    """Client for the Anthropic Messages API with prompt caching enabled."""
+    
+    def __init__(self, api_key: str):
+        try:
+            import anthropic
+        except ImportError as e:
+            raise RuntimeError(
+                "The 'anthropic' package is required for API calls. "
+                "Install it with: pip install anthropic"
+            ) from e
+        self._client = anthropic.Anthropic(api_key=api_key)
+    
+    def warm(self):
+        """Open the HTTPS connection ahead of the first real call (best effort)."""
+        try:
+            self._client.models.list(limit=1)
+        except Exception:
+            pass  # Older SDKs lack the endpoint; the first call will connect instead
+    
+    def complete(self, layout: PromptLayout, model: str, max_tokens: int = 4096,
+                 temperature: float = 1.0,
+                 on_text: Optional[Callable[[str], None]] = None,
+                 cancel: Optional[CancellationToken] = None) -> LLMResponse:
+        """Call the Messages API, marking the shared prefix as cacheable if it is long enough."""
+        start = time.time()
+        first_token_at = 0.0
+        chunks = []
+        options = {}
+        if cancel is not None:
+            cancel.check()
+            if cancel.remaining() is not None:
+                options["timeout"] = max(cancel.remaining(), 0.1)
+        with self._client.messages.stream(
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            **layout.to_request(min_cacheable_tokens(model)),
+            **options
+        ) as stream:
+            for chunk in (_tool_input_stream(stream) if layout.tool else stream.text_stream):
+                if cancel is not None:
+                    cancel.check()  # Leaving the block closes the connection
+                if not first_token_at:
+                    first_token_at = time.time()
+                chunks.append(chunk)
+                if on_text:
+                    on_text(chunk)
+            usage = stream.get_final_message().usage
+        return LLMResponse(
+            text="".join(chunks),
+            usage=make_usage(
+                model,
+                prompt_tokens=usage.input_tokens,
+                completion_tokens=usage.output_tokens,
+                cache_read_tokens=getattr(usage, "cache_read_input_tokens", 0) or 0,
+                cache_write_tokens=getattr(usage, "cache_creation_input_tokens", 0) or 0,
+            ),
+            latency=time.time() - start,
+            time_to_first_token=(first_token_at or time.time()) - start,
+        )
+
+
+def _tool_input_stream(stream):
+    """Yield the JSON input of a forced tool call as it streams, like ``text_stream`` does text."""
+    for event in stream:
+        if event.type == "content_block_delta" and event.delta.type == "input_json_delta":
+            if event.delta.partial_json:
+                yield event.delta.partial_json
@@ -0,0 +1,66 @@
+"""Model pricing and token accounting helpers."""
+
+from typing import Dict, Tuple
+
+from ..models import TokenUsage
+
+
+# USD per million tokens: (input, output)
+MODEL_PRICING: Dict[str, Tuple[float, float]] = {
+    'claude-3-opus-20240229': (15.00, 75.00),
+    'claude-3-sonnet-20240229': (3.00, 15.00),
+    'claude-3-haiku-20240307': (0.25, 1.25),
+}
+DEFAULT_MODEL = 'claude-3-sonnet-20240229'
+
+# Prompt caching multipliers relative to the base input price
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.10
+
+# Message Batches requests are billed at half the standard price
+BATCH_DISCOUNT = 0.5
+
+# Shortest prefix, in tokens, the API will cache; shorter breakpoints are ignored
+MIN_CACHEABLE_TOKENS = 1024
+MIN_CACHEABLE_TOKENS_HAIKU = 2048
+
+
+def model_pricing(model: str) -> Tuple[float, float]:
+    """Return (input, output) price per million tokens, defaulting to Sonnet."""
+    return MODEL_PRICING.get(model, MODEL_PRICING[DEFAULT_MODEL])
+
+
+def min_cacheable_tokens(model: str) -> int:
+    """Shortest prompt prefix ``model`` caches."""
+    return MIN_CACHEABLE_TOKENS_HAIKU if "haiku" in model else MIN_CACHEABLE_TOKENS
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of a piece of text."""
+    return max(1, len(text) // 4) if text else 0
+
+
+def make_usage(model: str, prompt_tokens: int, completion_tokens: int,
+               cache_read_tokens: int = 0, cache_write_tokens: int = 0,
+               batch: bool = False) -> TokenUsage:
+    """Build a TokenUsage with cached and uncached input priced separately."""
+    input_price, output_price = model_pricing(model)
+    if batch:
+        input_price, output_price = input_price * BATCH_DISCOUNT, output_price * BATCH_DISCOUNT
+    input_cost = (
+        prompt_tokens
+        + cache_write_tokens * CACHE_WRITE_MULTIPLIER
+        + cache_read_tokens * CACHE_READ_MULTIPLIER
+    ) * input_price
+    all_input = prompt_tokens + cache_read_tokens + cache_write_tokens
+    output_cost = completion_tokens * output_price
+    return TokenUsage(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=all_input + completion_tokens,
+        model=model,
+        cost=(input_cost + output_cost) / 1_000_000,
+        cache_read_tokens=cache_read_tokens,
+        cache_write_tokens=cache_write_tokens,
+        uncached_cost=(all_input * input_price + output_cost) / 1_000_000,
+    )
@@ -0,0 +1,56 @@
+"""Simulated model backend with configurable latency, length and error distributions."""
+
+import random
+import threading
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from .stub import StubClient
+
+
+class SimulatedAPIError(Exception):
+    """Transient failure injected by the simulated backend."""
+
+
+@dataclass
+class SimulationProfile:
+    """Distributions the simulated backend draws from for every call."""
+    latency_mean: float = 0.05  # Median call latency in seconds
+    latency_sigma: float = 0.5  # Log-normal shape; 0 makes latency constant
+    tokens_mean: int = 500  # Median completion length in tokens
+    tokens_sigma: float = 0.3  # Log-normal shape; 0 makes length constant
+    error_rate: float = 0.0  # Probability that a call fails
+    seed: Optional[int] = 0  # Seed for reproducible runs; None for random
+
+
+class SimulatedClient(StubClient):
+    """StubClient whose latency, output length and failures are random draws.
+    
+    Latency and completion length follow log-normal distributions (long
+    right tails, like real model calls); failures are Bernoulli trials that
+    raise SimulatedAPIError after part of the latency has elapsed.
+    """
+    
+    def __init__(self, profile: Optional[SimulationProfile] = None, cache_ttl: float = 300.0):
+        self.profile = profile or SimulationProfile()
+        super().__init__(
+            completion_tokens=self.profile.tokens_mean,
+            latency=self.profile.latency_mean,
+            cache_ttl=cache_ttl,
+            seed=self.profile.seed,
+        )
+        self.errors = 0
+        self._rng = random.Random(self.profile.seed)
+        self._rng_lock = threading.Lock()
+    
+    def _draw(self) -> Tuple[float, int, Optional[Exception]]:
+        """Draw latency, completion length and an optional failure."""
+        profile = self.profile
+        with self._rng_lock:
+            latency = profile.latency_mean * self._rng.lognormvariate(0.0, profile.latency_sigma)
+            tokens = profile.tokens_mean * self._rng.lognormvariate(0.0, profile.tokens_sigma)
+            failed = self._rng.random() < profile.error_rate
+            if failed:
+                self.errors += 1
+        error = SimulatedAPIError("simulated overloaded_error (529)") if failed else None
+        return latency, max(1, int(tokens)), error
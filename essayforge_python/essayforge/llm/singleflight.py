@@ -0,0 +1,182 @@
+"""In-flight request coalescing: identical concurrent calls share one upstream request."""
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..agents.prompts import PromptLayout
+from ..models import TokenUsage
+from .cancellation import CancellationToken, CancelledError
+from .client import LLMClient, LLMResponse
+
+
+def normalize_request(layout: PromptLayout, model: str, max_tokens: int,
+                      temperature: float) -> str:
+    """Key identifying a request regardless of incidental whitespace."""
+    parts = [" ".join(text.split()) for text in
+             (layout.system, layout.cached_prefix, layout.user_suffix)]
+    data = json.dumps(parts + [model, max_tokens, temperature] + ([layout.tool] if layout.tool else []))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    """One upstream call and the chunks it has streamed so far."""
+
+    __slots__ = ('chunks', 'done', 'response', 'error', 'condition')
+
+    def __init__(self):
+        self.chunks: List[str] = []
+        self.done = False
+        self.response: Optional[LLMResponse] = None
+        self.error: Optional[BaseException] = None
+        self.condition = threading.Condition()
+
+
+class CoalescingClient(LLMClient):
+    """Share one call among identical requests that are in flight together.
+
+    The first request for a key (the leader) calls ``client``; identical
+    requests arriving before it finishes wait for it, receive its streamed
+    chunks from the beginning, and get its text with zero usage, the usage
+    they would have paid in ``LLMResponse.saved``. A finished call is not
+    cached: later requests call again. Requests at a non-zero temperature
+    pass straight through unless ``sampled`` is set, because repeated
+    samples (best-of-N) are meant to differ. A failure is shared by every
+    waiter, except that a leader cancelled by its own token hands the call
+    to a waiter that is still live; that waiter's ``on_text`` does not see
+    the text it already received from the cancelled call a second time.
+    """
+
+    def __init__(self, client: LLMClient, sampled: bool = False):
+        self.client = client
+        self.sampled = sampled
+        self.calls = 0  # Upstream calls made
+        self.shared = 0  # Requests served by another request's call
+        self.saved_tokens = 0
+        self.saved_cost = 0.0
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def complete(self, layout: PromptLayout, model: str, max_tokens: int = 4096,
+                 temperature: float = 1.0,
+                 on_text: Optional[Callable[[str], None]] = None,
+                 cancel: Optional[CancellationToken] = None) -> LLMResponse:
+        """Join an identical in-flight call, or make it and let others join."""
+        if temperature > 0 and not self.sampled:
+            with self._lock:
+                self.calls += 1
+            return self.client.complete(layout, model, max_tokens, temperature,
+                                        on_text=on_text, cancel=cancel)
+        key = normalize_request(layout, model, max_tokens, temperature)
+        received = 0  # Characters already passed to on_text by a cancelled leader's call
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+                    self.calls += 1
+            if leader:
+                return self._lead(key, flight, layout, model, max_tokens, temperature,
+                                  _skipping(on_text, received), cancel)
+            response, forwarded = self._follow(flight, _skipping(on_text, received), cancel)
+            if response is not None:
+                return response
+            # The leader was cancelled by its own token; this request is still live
+            received = max(received, forwarded)
+
+    def _lead(self, key: str, flight: _Flight, layout: PromptLayout, model: str,
+              max_tokens: int, temperature: float,
+              on_text: Optional[Callable[[str], None]],
+              cancel: Optional[CancellationToken]) -> LLMResponse:
+        """Make the upstream call, publishing chunks to any followers."""
+        def relay(chunk: str):
+            with flight.condition:
+                flight.chunks.append(chunk)
+                flight.condition.notify_all()
+            if on_text:
+                on_text(chunk)
+
+        try:
+            response = self.client.complete(layout, model, max_tokens, temperature,
+                                            on_text=relay, cancel=cancel)
+        except BaseException as e:
+            self._land(key, flight, error=e)
+            raise
+        self._land(key, flight, response=response)
+        return response
+
+    def _land(self, key: str, flight: _Flight, response: Optional[LLMResponse] = None,
+              error: Optional[BaseException] = None):
+        """Retire the flight so new requests call again, then wake its followers."""
+        with self._lock:
+            del self._flights[key]
+        with flight.condition:
+            flight.response, flight.error, flight.done = response, error, True
+            flight.condition.notify_all()
+
+    def _follow(self, flight: _Flight, on_text: Optional[Callable[[str], None]],
+                cancel: Optional[CancellationToken]) -> Tuple[Optional[LLMResponse], int]:
+        """Wait for the leader; returns (response, characters of text streamed).
+
+        The response is None if the leader was cancelled and the call must be retried.
+        """
+        start = time.time()
+        first_token_at = 0.0
+        forwarded = 0
+        characters = 0
+        while True:
+            with flight.condition:
+                while forwarded == len(flight.chunks) and not flight.done:
+                    if cancel is not None and cancel.cancelled:
+                        break
+                    flight.condition.wait(0.05)
+                chunks = flight.chunks[forwarded:]
+                done = flight.done
+            if cancel is not None:
+                cancel.check()
+            if chunks and not first_token_at:
+                first_token_at = time.time()
+            forwarded += len(chunks)
+            characters += sum(len(chunk) for chunk in chunks)
+            if on_text:
+                for chunk in chunks:
+                    on_text(chunk)
+            if done and forwarded == len(flight.chunks):
+                break
+        if flight.error is not None:
+            if isinstance(flight.error, CancelledError):
+                return None, characters
+            raise flight.error
+        response = flight.response
+        with self._lock:
+            self.shared += 1
+            self.saved_tokens += response.usage.total_tokens
+            self.saved_cost += response.usage.cost
+        return replace(
+            response,
+            usage=TokenUsage(model=response.usage.model),
+            latency=time.time() - start,
+            time_to_first_token=(first_token_at or time.time()) - start,
+            saved=response.usage,
+        ), characters
+
+
+def _skipping(on_text: Optional[Callable[[str], None]],
+              count: int) -> Optional[Callable[[str], None]]:
+    """``on_text`` minus the first ``count`` characters streamed through it."""
+    if on_text is None or count == 0:
+        return on_text
+    remaining = [count]
+
+    def forward(chunk: str):
+        if remaining[0] >= len(chunk):
+            remaining[0] -= len(chunk)
+            return
+        chunk, remaining[0] = chunk[remaining[0]:], 0
+        on_text(chunk)
+
+    return forward
@@ -0,0 +1,159 @@
+"""In-process stand-in for the Messages API used for demos and verification."""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from ..agents.prompts import PromptLayout
+from .cancellation import CancellationToken
+from .client import LLMClient, LLMResponse
+from .pricing import estimate_tokens, make_usage, min_cacheable_tokens
+
+
+_WORDS = (
+    "analysis evidence research findings context impact framework adoption "
+    "outcomes policy data trend study sources perspective development model "
+    "practice review evaluation risk benefit approach system example result"
+).split()
+
+
+class StubClient(LLMClient):
+    """Simulated model backend that mimics provider-side prompt caching.
+
+    Each cache breakpoint of a PromptLayout (system, then system + topic
+    prefix) is remembered for ``cache_ttl`` seconds. A request whose prefix
+    was seen before is billed as a cache read; otherwise the prefix is billed
+    as a cache write, as the Messages API reports it. As with the API, a
+    breakpoint whose prefix is shorter than the model's minimum cacheable
+    length is ignored and its tokens are billed as uncached input.
+    """
+    
+    def __init__(self, completion_tokens: int = 500, latency: float = 0.0,
+                 cache_ttl: float = 300.0, seed: Optional[int] = None):
+        self.completion_tokens = completion_tokens
+        self.latency = latency
+        self.cache_ttl = cache_ttl
+        self.seed = seed
+        self.calls = 0
+        self._cache: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def complete(self, layout: PromptLayout, model: str, max_tokens: int = 4096,
+                 temperature: float = 1.0,
+                 on_text: Optional[Callable[[str], None]] = None,
+                 cancel: Optional[CancellationToken] = None) -> LLMResponse:
+        """Return generated text with usage priced as the API would."""
+        start = time.time()
+        # The provider keeps a separate prompt cache per model
+        keys = {name: f"{model}:{key}" for name, key in layout.cache_keys().items()}
+        tokens = layout.prefix_tokens()
+        cacheable = layout.cacheable(min_cacheable_tokens(model))
+        input_tokens = tokens["prefix"] + estimate_tokens(layout.user_suffix)
+        
+        with self._lock:
+            self.calls += 1
+            call_index = self.calls
+            latency, completion_tokens, error = self._draw()
+            now = time.time()
+            # The longest cached breakpoint is read; the longest cacheable one is written
+            read = next((name for name in reversed(cacheable) if self._is_cached(keys[name], now)), None)
+            cache_read = tokens[read] if read else 0
+            cache_write = tokens[cacheable[-1]] - cache_read if cacheable else 0
+            # Reads refresh the TTL, writes create the entry; failed calls do neither
+            if error is None:
+                for name in cacheable:
+                    self._cache[keys[name]] = now + self.cache_ttl
+        
+        # A fifth of the latency is spent before the first token arrives
+        if latency > 0:
+            self._sleep(latency * 0.2, cancel)
+        if error is not None:
+            raise error
+        first_token_at = time.time()
+        
+        completion_tokens = min(completion_tokens, max_tokens)
+        # Sampling at a non-zero temperature gives each call different text
+        variation = call_index if temperature > 0 else 0
+        text = self._generate(layout, completion_tokens, variation)
+        self._stream(text, latency * 0.8, on_text, cancel)
+        return LLMResponse(
+            text=text,
+            usage=make_usage(
+                model,
+                prompt_tokens=input_tokens - cache_read - cache_write,
+                completion_tokens=completion_tokens,
+                cache_read_tokens=cache_read,
+                cache_write_tokens=cache_write,
+            ),
+            latency=time.time() - start,
+            time_to_first_token=first_token_at - start,
+        )
+    
+    def _stream(self, text: str, duration: float, on_text: Optional[Callable[[str], None]],
+                cancel: Optional[CancellationToken] = None, chunks: int = 8):
+        """Spread generation time over a few chunks, reporting each one."""
+        step = max(1, -(-len(text) // chunks))
+        for i in range(0, len(text), step):
+            if duration > 0:
+                self._sleep(duration / chunks, cancel)
+            if on_text:
+                on_text(text[i:i + step])
+    
+    def _sleep(self, seconds: float, cancel: Optional[CancellationToken]):
+        """Simulate latency, returning early with CancelledError on cancellation."""
+        if cancel is None:
+            time.sleep(seconds)
+        elif cancel.wait(seconds):
+            cancel.check()
+    
+    def _draw(self) -> Tuple[float, int, Optional[Exception]]:
+        """Return (latency, completion tokens, error to raise) for one call."""
+        return self.latency, self.completion_tokens, None
+    
+    def _is_cached(self, key: str, now: float) -> bool:
+        """Check whether a cache entry exists and has not expired."""
+        expiry = self._cache.get(key)
+        return expiry is not None and expiry > now
+    
+    def _generate(self, layout: PromptLayout, completion_tokens: int, variation: int = 0) -> str:
+        """Produce deterministic markdown of roughly the requested length."""
+        digest = hashlib.sha256(layout.flatten().encode("utf-8")).hexdigest()
+        rng = random.Random(f"{self.seed}:{digest}:{variation}")
+        heading = layout.user_suffix.split("\n", 1)[0].rstrip(":. ")
+        if layout.tool:
+            return self._generate_structured(rng, heading, completion_tokens)
+        words = [rng.choice(_WORDS) for _ in range(int(completion_tokens * 0.75))]
+        paragraphs = [
+            " ".join(words[i:i + 60]).capitalize() + "."
+            for i in range(0, len(words), 60)
+        ]
+        return f"### {heading}\n\n" + "\n\n".join(paragraphs)
+    
+    def _generate_structured(self, rng: random.Random, heading: str, completion_tokens: int) -> str:
+        """Produce research tool input (sections, claims, citations) of roughly the requested length."""
+        words = [rng.choice(_WORDS) for _ in range(int(completion_tokens * 0.6))]
+        sources = [
+            {"id": f"s{i}", "type": "web", "title": f"{rng.choice(_WORDS).title()} {rng.choice(_WORDS)} report",
+             "source": f"{rng.choice(_WORDS).title()} Institute",
+             "url": f"https://example.org/{rng.choice(_WORDS)}-{rng.randrange(1000)}",
+             "date": str(rng.randrange(2015, 2025))}
+            for i in range(1, 5)
+        ]
+        sections = []
+        for i in range(0, len(words), 90):
+            chunk = words[i:i + 90]
+            sections.append({
+                "heading": f"{heading} {len(sections) + 1}" if heading else f"Section {len(sections) + 1}",
+                "body": " ".join(chunk[:60]).capitalize() + ".",
+                "claims": [
+                    {"text": " ".join(chunk[j:j + 15]).capitalize() + ".",
+                     "citations": [rng.choice(sources)["id"]],
+                     "confidence": round(rng.uniform(0.4, 0.95), 2)}
+                    for j in range(60, len(chunk), 15)
+                ],
+            })
+        return json.dumps({"sections": sections, "citations": sources,
+                           "confidence": round(rng.uniform(0.5, 0.9), 2)})
@@ -0,0 +1,45 @@
+"""Background construction and connection warm-up for model clients."""
+
+import threading
+from typing import Callable, Optional
+
+from .client import LLMClient
+
+
+class WarmClient(LLMClient):
+    """Client proxy whose backend is built and connected on a background thread.
+    
+    Importing the SDK and opening the TLS connection take a noticeable
+    fraction of a second; starting them early overlaps that cost with
+    argument parsing and agent construction. Calls block until the backend
+    is ready and re-raise any error raised while building it.
+    """
+    
+    def __init__(self, factory: Callable[[], LLMClient]):
+        self._client: Optional[LLMClient] = None
+        self._error: Optional[BaseException] = None
+        self._ready = threading.Event()
+        threading.Thread(target=self._warm, args=(factory,), name="client-warmup", daemon=True).start()
+    
+    def _warm(self, factory: Callable[[], LLMClient]):
+        try:
+            client = factory()
+            warm = getattr(client, "warm", None)
+            if warm is not None:
+                warm()
+            self._client = client
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._ready.set()
+    
+    def wait(self) -> LLMClient:
+        """Block until the backend is ready and return it."""
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        return self._client
+    
+    def complete(self, *args, **kwargs):
+        """Delegate to the warmed backend."""
+        return self.wait().complete(*args, **kwargs)
@@ -2,6 +2,8 @@
 
 from .models import (
     ResearchResult,
+    ResearchSection,
+    Claim,
     Essay,
     Citation,
     Metadata,
@@ -13,6 +15,8 @@ from .models import (
 
 __all__ = [
     'ResearchResult',
+    'ResearchSection',
+    'Claim',
     'Essay', 
     'Citation',
     'Metadata',
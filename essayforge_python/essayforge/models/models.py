@@ -27,16 +27,37 @@ class Citation:
     date: str = ""
     access_date: datetime = field(default_factory=datetime.now)
     quote: str = ""  # Relevant quote from the source
+    status: str = ""  # Link check verdict (ok, broken, restricted, ...); empty if unchecked
+    http_status: int = 0  # Final HTTP status of the link check, 0 if none was received
+
+
+@dataclass
+class Claim:
+    """A single assertion made by a research agent."""
+    text: str
+    citations: List[str] = field(default_factory=list)  # Ids of the supporting Citations
+    confidence: float = 0.0  # 0-1, the agent's own estimate
+
+
+@dataclass
+class ResearchSection:
+    """One section of structured research output."""
+    heading: str
+    body: str = ""
+    claims: List[Claim] = field(default_factory=list)
 
 
 @dataclass
 class TokenUsage:
     """Tracks API token consumption."""
-    prompt_tokens: int = 0
+    prompt_tokens: int = 0  # Uncached input tokens
     completion_tokens: int = 0
     total_tokens: int = 0
     model: str = ""
     cost: float = 0.0
+    cache_read_tokens: int = 0  # Input tokens served from the prompt cache
+    cache_write_tokens: int = 0  # Input tokens written to the prompt cache
+    uncached_cost: float = 0.0  # What the call would have cost without caching
 
 
 @dataclass
@@ -50,6 +71,8 @@ class ResearchResult:
     timestamp: datetime = field(default_factory=datetime.now)
     score: float = 0.0  # For best-of-n selection
     quality_score: float = 0.0  # 0-1 quality metric
+    sections: List[ResearchSection] = field(default_factory=list)  # Empty for markdown output
+    confidence: float = 0.0  # 0-1, the agent's overall confidence in structured output
 
 
 @dataclass
@@ -60,6 +83,8 @@ class QualityMetrics:
     depth_score: float = 0.0  # 0-1 score
     originality: float = 0.0  # 0-1 score
     overall_score: float = 0.0  # Weighted average
+    factual_accuracy: float = 0.0  # 0-1 score
+    structure: float = 0.0  # 0-1 score
 
 
 @dataclass
@@ -74,6 +99,8 @@ class Metadata:
     total_tokens: int
     estimated_cost: float
     quality_metrics: QualityMetrics = field(default_factory=QualityMetrics)
+    skipped_agents: List[str] = field(default_factory=list)  # Not finished by the deadline
+    refinement_iterations: int = 0  # Critic rounds run on the draft
 
 
 @dataclass
@@ -1,5 +1,34 @@
 """Orchestrator package for coordinating research agents."""
 
-from .orchestrator import Config, Orchestrator, TokenTracker
+from typing import TYPE_CHECKING
 
-__all__ = ['Config', 'Orchestrator', 'TokenTracker']
\ No newline at end of file
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .batching import BatchCheckpoint, BatchSession
+    from .offload import CPUPool
+    from .orchestrator import Config, Orchestrator, TokenTracker
+    from .routing import ModelRouter
+    from .scheduling import LatencyHistory
+    from .tenancy import FairScheduler, QuotaExceededError, TenantExecutor
+
+# Submodules are imported on first attribute access to keep startup fast
+_EXPORTS = {
+    'Config': '.orchestrator',
+    'Orchestrator': '.orchestrator',
+    'TokenTracker': '.orchestrator',
+    'LatencyHistory': '.scheduling',
+    'ModelRouter': '.routing',
+    'FairScheduler': '.tenancy',
+    'QuotaExceededError': '.tenancy',
+    'TenantExecutor': '.tenancy',
+    'BatchSession': '.batching',
+    'BatchCheckpoint': '.batching',
+    'CPUPool': '.offload'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = ['Config', 'Orchestrator', 'TokenTracker', 'LatencyHistory', 'ModelRouter',
+           'FairScheduler', 'QuotaExceededError', 'TenantExecutor', 'BatchSession',
+           'BatchCheckpoint', 'CPUPool']
\ No newline at end of file
@@ -0,0 +1,249 @@
+"""Research through the Message Batches API, shared by every run of a topic file."""
+
+import json
+import os
+import queue
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+from ..llm import CancellationToken, CancelledError, normalize_request
+from ..llm.batches import BatchAPIError, BatchesClient, BatchRequest, BatchResult
+
+
+DEFAULT_BATCH_CHECKPOINT = os.path.join(os.path.expanduser("~"), ".essayforge", "batches.json")
+
+
+class BatchCheckpoint:
+    """Submitted batches not yet consumed, so an interrupted run can resume them.
+
+    Each batch id maps its requests' custom ids to their normalized request
+    keys; a rerun whose requests match an entry polls that batch instead of
+    paying for the same requests again. Entries are removed once their
+    results have been handed out.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.batches: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        if path:
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.batches = json.load(f).get("batches", {})
+            except (OSError, ValueError):
+                pass
+
+    def match(self, keys: Dict[str, str]) -> List[str]:
+        """Ids of recorded batches whose every request is among ``keys`` (custom id -> key)."""
+        with self._lock:
+            return [batch_id for batch_id, entries in self.batches.items()
+                    if all(keys.get(custom_id) == key for custom_id, key in entries.items())]
+
+    def entries(self, batch_id: str) -> Dict[str, str]:
+        with self._lock:
+            return dict(self.batches.get(batch_id, {}))
+
+    def add(self, batch_id: str, keys: Dict[str, str]):
+        with self._lock:
+            self.batches[batch_id] = dict(keys)
+        self._save()
+
+    def remove(self, batch_id: str):
+        with self._lock:
+            if self.batches.pop(batch_id, None) is None:
+                return
+        self._save()
+
+    def _save(self):
+        """Write the checkpoint atomically; failure to write it never fails the run."""
+        if not self.path:
+            return
+        with self._lock:
+            data = {"batches": {k: dict(v) for k, v in self.batches.items()}}
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temporary = self.path + ".tmp"
+            with open(temporary, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(temporary, self.path)
+        except OSError as e:
+            print(f"Could not save the batch checkpoint: {e}")
+
+
+class BatchSession:
+    """Collects the research requests of one or more runs into shared batches.
+
+    Each run calls ``research`` from its own thread with all of its agent
+    requests. The session waits until ``participants`` runs have joined, or
+    ``gather`` seconds after the first one did, and submits everything
+    gathered as one batch; later requests go into a batch of their own.
+    Every batch is polled with backoff in a background thread and its
+    results are streamed back to the run that asked for them as soon as
+    the batch ends. Requests that fail with a transient error or expire
+    are submitted again, up to ``max_retries`` times, in a follow-up batch.
+    """
+
+    def __init__(self, batches: BatchesClient, participants: int = 1,
+                 checkpoint: Optional[str] = DEFAULT_BATCH_CHECKPOINT, max_retries: int = 2,
+                 gather: float = 2.0, poll_initial: float = 1.0, poll_max: float = 60.0):
+        self.batches = batches
+        self.participants = participants
+        self.checkpoint = BatchCheckpoint(checkpoint)
+        self.max_retries = max_retries
+        self.gather = gather
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.submitted: List[str] = []  # Batch ids created by this session
+        self.resumed: List[str] = []  # Batch ids picked up from the checkpoint
+        self.status: Dict[str, str] = {}  # Latest status line per batch, for progress reports
+        self._pending: List[BatchRequest] = []
+        self._routes: Dict[str, "queue.Queue[BatchResult]"] = {}
+        self._attempts: Dict[str, int] = {}
+        self._joined = 0
+        self._gather_until = 0.0
+        self._closed = CancellationToken()
+        self._condition = threading.Condition()
+
+    def research(self, requests: List[BatchRequest],
+                 cancel: Optional[CancellationToken] = None) -> Iterator[BatchResult]:
+        """Submit ``requests`` and yield one final result for each as results arrive.
+
+        Raises CancelledError if ``cancel`` fires first; the batch keeps
+        running and, since not all of its results reached a run, stays in
+        the checkpoint for a rerun to resume.
+        """
+        inbox: "queue.Queue[BatchResult]" = queue.Queue()
+        with self._condition:
+            for request in requests:
+                if request.custom_id in self._routes:
+                    raise ValueError(f"Duplicate batch request id: {request.custom_id}")
+                self._routes[request.custom_id] = inbox
+                self._attempts[request.custom_id] = 0
+            if not self._pending:
+                self._gather_until = time.monotonic() + self.gather
+            self._pending.extend(requests)
+            self._joined += 1
+            # Wait for the other runs, unless this one completes the group
+            while (self._pending and self._joined < self.participants
+                   and time.monotonic() < self._gather_until):
+                if cancel is not None and cancel.cancelled:
+                    break
+                self._condition.wait(min(0.1, self._gather_until - time.monotonic()))
+            self._flush()
+        try:
+            if cancel is not None:
+                cancel.check()
+            for _ in range(len(requests)):
+                while True:
+                    if cancel is not None:
+                        cancel.check()
+                    try:
+                        result = inbox.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    break
+                yield result
+        finally:
+            # Results for a run that stopped listening are not delivered
+            with self._condition:
+                for request in requests:
+                    self._routes.pop(request.custom_id, None)
+
+    def close(self):
+        """Stop polling; unconsumed batches stay in the checkpoint."""
+        self._closed.cancel()
+
+    def _flush(self):
+        """Submit (or resume) whatever is pending. Caller holds the condition."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        self._condition.notify_all()
+        threading.Thread(target=self._run, args=(pending,), name="batch-poll", daemon=True).start()
+
+    def _run(self, requests: List[BatchRequest]):
+        """Create or resume batches covering ``requests``, then route their results."""
+        keys = {request.custom_id: normalize_request(request.layout, request.model,
+                                                     request.max_tokens, request.temperature)
+                for request in requests}
+        jobs = []
+        remaining = dict(keys)
+        for batch_id in self.checkpoint.match(keys):
+            entries = self.checkpoint.entries(batch_id)
+            if entries and all(custom_id in remaining for custom_id in entries):
+                for custom_id in entries:
+                    del remaining[custom_id]
+                self.resumed.append(batch_id)
+                jobs.append((batch_id, list(entries)))
+        fresh = [request for request in requests if request.custom_id in remaining]
+        if fresh:
+            try:
+                status = self.batches.create(fresh)
+            except BatchAPIError as e:
+                self._fail([request.custom_id for request in fresh], e)
+                fresh = []
+            else:
+                self.submitted.append(status.id)
+                self.checkpoint.add(status.id, {r.custom_id: keys[r.custom_id] for r in fresh})
+                jobs.append((status.id, [r.custom_id for r in fresh]))
+
+        by_id = {request.custom_id: request for request in requests}
+        threads = [threading.Thread(target=self._consume, args=(batch_id, ids, by_id), daemon=True)
+                   for batch_id, ids in jobs[1:]]
+        for thread in threads:
+            thread.start()
+        if jobs:
+            self._consume(*jobs[0], by_id)
+
+    def _consume(self, batch_id: str, custom_ids: List[str], by_id: Dict[str, BatchRequest]):
+        """Poll one batch to the end and route each of its results as it is read."""
+        def report(status):
+            counts = ", ".join(f"{v} {k}" for k, v in status.counts.items() if v)
+            self.status[batch_id] = f"{status.processing_status} ({counts})"
+
+        unanswered = set(custom_ids)
+        retry = []
+        delivered = True
+        try:
+            status = self.batches.poll(batch_id, cancel=self._closed, on_status=report,
+                                       initial=self.poll_initial, maximum=self.poll_max)
+            for result in self.batches.results(status):
+                if result.custom_id not in unanswered:
+                    continue
+                unanswered.discard(result.custom_id)
+                if (result.retryable and result.custom_id in by_id
+                        and self._attempts[result.custom_id] < self.max_retries):
+                    self._attempts[result.custom_id] += 1
+                    retry.append(by_id[result.custom_id])
+                else:
+                    delivered = self._route(result) and delivered
+        except CancelledError:
+            return
+        except Exception as e:
+            # Every run waiting on this batch needs a final result, or it waits forever.
+            # The batch may still finish; leave it in the checkpoint for a rerun
+            self._fail(unanswered | {request.custom_id for request in retry}, e)
+            return
+        if delivered:
+            self.checkpoint.remove(batch_id)
+        self._fail(unanswered, "missing from the batch results")
+        if retry:
+            with self._condition:
+                self._pending.extend(retry)
+                self._flush()
+
+    def _fail(self, custom_ids, error):
+        for custom_id in list(custom_ids):
+            self._route(BatchResult(custom_id, error_type="batch_error", error=str(error)))
+
+    def _route(self, result: BatchResult) -> bool:
+        """Hand a final result to the run waiting for it; False if none is."""
+        with self._condition:
+            inbox = self._routes.pop(result.custom_id, None)
+        if inbox is None:
+            return False
+        inbox.put(result)
+        return True
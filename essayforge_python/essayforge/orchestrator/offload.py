@@ -0,0 +1,170 @@
+"""A process pool for CPU-bound post-processing, with large text passed through shared memory."""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, List, Optional, Tuple
+
+from ..agents import ResearchParser, render_markdown
+from ..models import Citation, Essay, OutputFormat, ResearchSection
+from ..output import Formatter
+from ..scoring import score_content, score_structured
+
+
+# Text of at least this many characters goes through shared memory instead of being pickled
+SHARED_MEMORY_THRESHOLD = 64 * 1024
+
+
+class SharedText:
+    """A handle to UTF-8 text in a named shared memory block, cheap to send to another process."""
+    __slots__ = ('name', 'size')
+
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+
+    def __getstate__(self):
+        return self.name, self.size
+
+    def __setstate__(self, state):
+        self.name, self.size = state
+
+    @classmethod
+    def create(cls, text: str) -> Tuple['SharedText', SharedMemory]:
+        """Copy ``text`` into a new block; the caller unlinks the block once it has been read."""
+        data = text.encode("utf-8")
+        block = SharedMemory(create=True, size=max(1, len(data)))
+        block.buf[:len(data)] = data
+        return cls(block.name, len(data)), block
+
+    def read(self, unlink: bool = False) -> str:
+        """Decode the text; with ``unlink`` the block is released as well."""
+        block = SharedMemory(self.name)
+        try:
+            return bytes(block.buf[:self.size]).decode("utf-8")
+        finally:
+            block.close()
+            if unlink:
+                block.unlink()
+
+
+def _share(value: Any, threshold: int, blocks: List[SharedMemory]) -> Any:
+    """Replace large strings in ``value`` (a str or a tuple of values) with SharedText handles."""
+    if isinstance(value, str) and len(value) >= threshold:
+        handle, block = SharedText.create(value)
+        blocks.append(block)
+        return handle
+    if isinstance(value, tuple):
+        return tuple(_share(item, threshold, blocks) for item in value)
+    return value
+
+
+def _unshare(value: Any, unlink: bool) -> Any:
+    """Undo ``_share``, reading each handle's text."""
+    if isinstance(value, SharedText):
+        return value.read(unlink)
+    if isinstance(value, tuple):
+        return tuple(_unshare(item, unlink) for item in value)
+    return value
+
+
+def _invoke(func: Callable, args: tuple, threshold: int) -> Any:
+    """Worker side of ``CPUPool.run``: read shared arguments, call, share a large result back."""
+    result = func(*_unshare(args, unlink=False))
+    blocks: List[SharedMemory] = []
+    shared = _share(result, threshold, blocks)
+    for block in blocks:
+        block.close()  # The parent reads and unlinks it
+    return shared
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+def analyze_research(text: str, structured: bool,
+                     parser: Optional[ResearchParser] = None
+                     ) -> Tuple[Optional[str], float, List[ResearchSection], List[Citation], float]:
+    """Parse and score one agent response.
+
+    Returns (markdown, score, sections, citations, confidence); markdown is
+    None when the response is kept as it is. ``parser`` is used only if it
+    was fed exactly ``text`` while the response streamed.
+    """
+    if structured:
+        if parser is None or parser.length != len(text):
+            parser = ResearchParser()
+            parser.feed(text)
+        if parser.finish():
+            return (render_markdown(parser.sections, parser.citations),
+                    score_structured(parser.sections, parser.citations),
+                    parser.sections, parser.citations, parser.overall_confidence())
+    return None, score_content(text), [], [], 0.0
+
+
+def format_essay(content: str, essay: Essay, format_type: OutputFormat) -> str:
+    """Format ``essay`` with ``content`` as its text, which is passed separately to be shared."""
+    essay.content = content
+    return Formatter().format(essay, format_type)
+
+
+class CPUPool:
+    """Worker processes for scoring, parsing and formatting, shared by concurrent runs.
+
+    Runs on threads all contend for one interpreter lock, so once several
+    topics run together their local post-processing no longer overlaps.
+    ``run`` ships a module-level function to one of ``workers`` processes
+    (one per core by default) and blocks the calling thread until it
+    returns. String arguments and results of ``threshold`` characters or more
+    are copied once into shared memory and only their names are pickled.
+    """
+
+    def __init__(self, workers: int = 0, threshold: int = SHARED_MEMORY_THRESHOLD):
+        self.workers = workers or os.cpu_count() or 1
+        self.threshold = threshold
+        self.calls = 0
+        self.shared_bytes = 0  # Text passed through shared memory rather than pickled
+        self._lock = threading.Lock()
+        # Forking a process that already runs threads can copy held locks into the child
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+
+    def run(self, func: Callable, *args) -> Any:
+        """Call ``func(*args)`` in a worker process and return its result."""
+        blocks: List[SharedMemory] = []
+        shared = _share(args, self.threshold, blocks)
+        try:
+            result = self._executor.submit(_invoke, func, shared, self.threshold).result()
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+        with self._lock:
+            self.calls += 1
+            self.shared_bytes += _shared_size(shared) + _shared_size(result)
+        return _unshare(result, unlink=True)
+
+    def warm(self) -> int:
+        """Start every worker now rather than on first use; returns how many are running."""
+        futures = [self._executor.submit(_ready) for _ in range(self.workers)]
+        return len({future.result() for future in futures})
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> 'CPUPool':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _shared_size(value: Any) -> int:
+    if isinstance(value, SharedText):
+        return value.size
+    if isinstance(value, tuple):
+        return sum(_shared_size(item) for item in value)
+    return 0
@@ -1,23 +1,59 @@
 """Orchestrator for coordinating research agents and synthesis."""
 
-import asyncio
+import hashlib
 import os
-import platform
-import subprocess
+import sys
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime, timedelta
-from typing import List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Dict, List, Optional
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
 
-from ..agents import create_agents
+from ..agents import (
+    ResearchParser, create_agents, with_context, with_seed, with_structured_output
+)
+from ..critics import (
+    aggregate, build_revision_layout, build_section_layouts, create_critics, parse_verdict,
+    split_sections, stitch
+)
+from ..critics.refinement import revised_body
+from ..events import (
+    BLOCK, DROP_OLDEST, AgentFinished, AgentRetry, AgentStarted, BudgetEvent, ConsoleSink,
+    DashboardSink, DraftUpdated, EventBus, MetricsSink, NDJSONSink, PhaseEvent, TokenChunk
+)
+from ..llm import (
+    AnthropicClient, CancellationToken, CancelledError, CoalescingClient, LLMClient,
+    estimate_tokens
+)
+from ..llm.batches import BatchRequest
+from ..llm.pricing import BATCH_DISCOUNT
+from ..llm.singleflight import normalize_request
 from ..models import (
-    Essay, Metadata, OutputFormat, Progress, QualityMetrics,
-    ResearchResult, TokenUsage
+    Essay, Metadata, OutputFormat, QualityMetrics, ResearchResult, TokenUsage
+)
+from ..output import Formatter, PreviewServer
+from ..scoring import CoverageGain, CoverageTracker, score_content
+from ..storage import (
+    KnowledgeStore, ResultRecord, ResultStore, RunGraph, TopicIndex, TopicMatch, node_key
+)
+from ..storage.runs import (
+    citations_from_json, citations_to_json, content_digest, result_from_json, result_to_json
 )
-from ..output import Formatter
 from ..synthesis import Synthesizer
-from ..ui import Dashboard
+from ..tracing import NULL_PROFILER, NULL_TRACER, PhaseProfiler, Tracer
+from ..ui import Dashboard, LiveDashboard
+from ..verification import LinkCache, LinkVerdict, LinkVerifier
+from .offload import CPUPool, analyze_research, format_essay
+from .routing import CASCADE_MODELS, ModelRouter, ModelStats
+from .scheduling import LatencyHistory, longest_first
+
+if TYPE_CHECKING:
+    from .batching import BatchSession
+    from .tenancy import FairScheduler
+
+
+_MAX_TOKENS = 4096  # What research calls ask for: the clients' default
 
 
 @dataclass
@@ -36,21 +72,85 @@ class Config:
     token_limit: int
     cost_limit: float
     claude_model: str
+    max_retries: int = 2
+    trace_file: str = ""
+    event_stream: str = ""  # NDJSON event output: a file path or fd:N
+    result_store_dir: str = ""  # Where large result bodies spill; temporary if empty
+    deadline: float = 0.0  # Seconds for the whole run (0 = no deadline)
+    deadline_reserve: float = 0.0  # Seconds kept for synthesis and formatting (0 = 15%)
+    dispatch_order: str = "lept"  # "lept" (longest expected first) or "fifo"
+    history_file: str = ""  # Persisted per-agent latency history; in-memory if empty
+    cascade: bool = False  # Try cheap models first, escalating on a low local score
+    cascade_threshold: float = 0.5  # Minimum local score to keep a cheaper model's output
+    model_overrides: Dict[str, str] = field(default_factory=dict)  # Agent type -> fixed model
+    topic_index_dir: str = ""  # Index of past topics for research reuse; disabled if empty
+    reuse_research: bool = False  # Let a past topic's results replace agent calls
+    reuse_threshold: float = 0.9  # Topic similarity at which past results replace agent calls
+    seed_threshold: float = 0.45  # Topic similarity at which past results seed agent prompts
+    knowledge_db: str = ""  # Full-text index of past passages; disabled if empty
+    knowledge_top_k: int = 5  # Passages retrieved into every agent prompt
+    max_iterations: int = 0  # Critic-guided revisions of the draft (0 = no critic phase)
+    quality_threshold: float = 0.85  # Overall critic score at which refinement stops
+    min_gain: float = 0.01  # Smallest per-revision score gain worth another round
+    refine_mode: str = "sections"  # "sections" (one call per ## section) or "whole"
+    refine_workers: int = 0  # Concurrent section revisions (0 = one per section)
+    adaptive: bool = False  # Start with core agents and add more while coverage grows
+    core_agents: int = 3  # Agents always run in adaptive mode
+    adaptive_threshold: float = 0.05  # Minimum coverage gain per 1k tokens to add an agent
+    tenant: str = "default"  # Whose queue and quota calls use on a shared FairScheduler
+    profile_dir: str = ""  # Per-phase cProfile and tracemalloc reports; disabled if empty
+    temperature: float = 1.0  # Sampling temperature of research agent calls
+    coalesce: bool = True  # Share one call among identical requests in flight together
+    structured: bool = False  # Agents answer with sections, claims and citations through a tool
+    verify_citations: bool = False  # Check every cited URL before the references are written
+    link_cache_file: str = ""  # Persisted link check verdicts; in-memory if empty
+    link_workers: int = 32  # Concurrent link checks
+    link_timeout: float = 5.0  # Seconds per link check connect or read
+    preview_port: int = 0  # Serve a live HTML preview of the draft on this port; disabled if 0
+    cpu_workers: int = 0  # Processes for scoring, parsing and formatting; in-thread if 0
+    run_graph_dir: str = ""  # Each topic's last run, for re-running only what changed; disabled if empty
+    full_rerun: bool = False  # Run every step even if the last run's output still applies
 
 
 class TokenTracker:
-    """Tracks token usage and costs."""
+    """Tracks token usage and costs.
     
-    def __init__(self, limit: int = 0, cost_limit: float = 0.0):
+    Usage added to a tracker with a ``parent`` is added to the parent too,
+    and the parent's limits apply as well, so one run's tracker can count
+    towards a quota shared by several runs.
+    """
+    
+    def __init__(self, limit: int = 0, cost_limit: float = 0.0,
+                 parent: Optional['TokenTracker'] = None):
         self.total_tokens = 0
         self.total_cost = 0.0
+        self.cache_read_tokens = 0
+        self.cache_write_tokens = 0
+        self.uncached_input_tokens = 0
+        self.uncached_cost = 0.0
         self.limit = limit
         self.cost_limit = cost_limit
+        self.parent = parent
+        self.calls = 0
+        self._lock = threading.Lock()
         
     def add(self, usage: TokenUsage):
         """Add token usage."""
-        self.total_tokens += usage.total_tokens
-        self.total_cost += usage.cost
+        with self._lock:
+            self.calls += 1
+            self.total_tokens += usage.total_tokens
+            self.total_cost += usage.cost
+            self.cache_read_tokens += usage.cache_read_tokens
+            self.cache_write_tokens += usage.cache_write_tokens
+            self.uncached_input_tokens += usage.prompt_tokens
+            self.uncached_cost += usage.uncached_cost or usage.cost
+        if self.parent is not None:
+            self.parent.add(usage)
+    
+    @property
+    def cache_savings(self) -> float:
+        """Cost saved by prompt caching compared to fully uncached calls."""
+        return self.uncached_cost - self.total_cost
         
     def check_limits(self):
         """Check if limits have been exceeded."""
@@ -58,50 +158,180 @@ class TokenTracker:
             raise Exception(f"Token limit exceeded: {self.total_tokens} >= {self.limit}")
         if self.cost_limit > 0 and self.total_cost >= self.cost_limit:
             raise Exception(f"Cost limit exceeded: ${self.total_cost:.2f} >= ${self.cost_limit:.2f}")
+        if self.parent is not None:
+            self.parent.check_limits()
 
 
 class Orchestrator:
-    """Orchestrates the research and synthesis process."""
+    """Orchestrates the research and synthesis process.
     
-    def __init__(self, config: Config):
+    Model calls run on the orchestrator's own thread pools unless a shared
+    ``scheduler`` is given; calls then wait in ``config.tenant``'s queue and
+    count towards that tenant's quota as well as this run's limits. With a
+    ``batch`` session the research calls go through the Message Batches API
+    instead, at half price and with results arriving when the batch ends.
+    Scoring, parsing and formatting run in the processes of ``cpu_pool``,
+    which concurrent runs should share, or of a pool of
+    ``config.cpu_workers`` processes of the run's own. With
+    ``config.run_graph_dir`` every step whose inputs are unchanged since the
+    topic's last run reuses that run's output instead of running again.
+    """
+    
+    def __init__(self, config: Config, client: Optional[LLMClient] = None,
+                 scheduler: Optional['FairScheduler'] = None,
+                 batch: Optional['BatchSession'] = None,
+                 cpu_pool: Optional[CPUPool] = None):
         self.config = config
+        self.batch = batch
+        self.owns_cpu_pool = cpu_pool is None and config.cpu_workers > 0
+        self.cpu_pool = CPUPool(config.cpu_workers) if self.owns_cpu_pool else cpu_pool
         self.agents = create_agents(config.intensity)
-        self.dashboard = Dashboard() if config.show_dashboard else None
-        self.token_tracker = TokenTracker(config.token_limit, config.cost_limit)
-        self.claude_client = None  # Would initialize Anthropic client here
+        self.dashboard = self._create_dashboard() if config.show_dashboard else None
+        self.scheduler = scheduler
+        self.token_tracker = TokenTracker(
+            config.token_limit, config.cost_limit,
+            parent=scheduler.tracker(config.tenant) if scheduler else None,
+        )
+        if client is None and not config.demo_mode:
+            client = AnthropicClient(config.api_key)
+        # Runs sharing a client should share its CoalescingClient too
+        if config.coalesce and client is not None and not isinstance(client, CoalescingClient):
+            client = CoalescingClient(client)
+        self.client = client
+        self.coalesced = TokenTracker()  # What calls shared with identical ones would have cost
+        self.batched = TokenTracker()  # Research usage billed at the batch discount
+        self.tracer = Tracer() if config.trace_file else NULL_TRACER
+        self.profiler = PhaseProfiler(config.profile_dir) if config.profile_dir else NULL_PROFILER
+        self.metrics = MetricsSink()
+        self.preview: Optional[PreviewServer] = None
+        if config.preview_port:
+            try:
+                self.preview = PreviewServer(config.preview_port)
+                print(f"Live preview at {self.preview.url}")
+            except OSError as e:
+                print(f"Could not start the preview server: {e}")
+        self.events = self._create_event_bus()
+        self.result_store: Optional[ResultStore] = None
+        self.cancel_token = CancellationToken()
+        self.skipped_agents: List[str] = []
+        self.latency_history = LatencyHistory(config.history_file or None)
+        self.router = ModelRouter(
+            config.claude_model,
+            cascade=CASCADE_MODELS if config.cascade else (),
+            threshold=config.cascade_threshold,
+            overrides=config.model_overrides,
+        )
+        self.model_stats = ModelStats()
+        self.topic_index: Optional[TopicIndex] = None
+        if config.topic_index_dir and not config.demo_mode:
+            self.topic_index = TopicIndex(config.topic_index_dir)
+        self.topic_match: Optional[TopicMatch] = None
+        self.reused_agents: List[str] = []
+        self.seeds: Dict[str, str] = {}
+        self.knowledge: Optional[KnowledgeStore] = None
+        if config.knowledge_db and not config.demo_mode:
+            self.knowledge = KnowledgeStore(config.knowledge_db)
+        self.known_context: List[str] = []
+        self.critics = create_critics()
+        self.quality_history: List[float] = []
+        self.refinement_stop = ""
+        self.coverage = CoverageTracker(config.topic)
+        self.unneeded_agents: List[str] = []  # Never dispatched by adaptive intensity
+        self.adaptive_stop = ""
+        self.link_verifier: Optional[LinkVerifier] = None
+        if config.verify_citations and not config.demo_mode:
+            self.link_verifier = LinkVerifier(
+                workers=config.link_workers, timeout=config.link_timeout,
+                cache=LinkCache(config.link_cache_file or None),
+            )
+        self.link_verdicts: Dict[str, LinkVerdict] = {}
+        self.link_seconds = 0.0
+        self.graph: Optional[RunGraph] = None
+        if config.run_graph_dir and not config.demo_mode:
+            self.graph = RunGraph(config.run_graph_dir, config.topic, reuse=not config.full_rerun)
         
-    def execute(self):
-        """Execute the research and synthesis process."""
+    def execute(self, deadline: Optional[float] = None):
+        """Execute the research and synthesis process.
+        
+        ``deadline`` (seconds, overriding ``Config.deadline``) bounds the whole
+        run: research is cancelled early enough to leave the reserve for
+        synthesis and formatting, and the essay is built from whatever
+        agents finished by then.
+        """
         start_time = time.time()
+        seconds = self.config.deadline if deadline is None else deadline
+        self.cancel_token = CancellationToken(self._research_cutoff(start_time, seconds))
+        self.skipped_agents = []
+        self.unneeded_agents = []
+        completed = False
+        failure: Optional[Exception] = None
         
         try:
             # Update progress
             self._update_progress("research", 0, "Starting research...")
             
             # Phase 1: Research
-            research_results = self._conduct_research()
+            with self.profiler.phase("research"), \
+                    self.tracer.span("research", "phase", agents=len(self.agents)):
+                research_results = self._conduct_research()
             
             # Phase 2: Synthesis
             self._update_progress("synthesis", 50, "Synthesizing research...")
-            essay = self._synthesize_results(research_results)
+            with self.profiler.phase("synthesis"), self.tracer.span("synthesis", "phase"):
+                essay = self._synthesize_results(research_results)
+            self._publish_draft("synthesis", essay.content)
+            
+            # Phase 3: Critique and refine
+            if self.config.max_iterations > 0 and not self.config.demo_mode:
+                self._update_progress("refinement", 60, "Critics reviewing the draft...")
+                with self.profiler.phase("refinement"), self.tracer.span("refinement", "phase"):
+                    essay = self._refine(essay)
             
-            # Phase 3: Format and save
+            # Phase 4: Format and save
             self._update_progress("formatting", 90, "Formatting output...")
-            self._save_essay(essay)
+            with self.profiler.phase("formatting"), self.tracer.span("formatting", "phase"):
+                self._save_essay(essay)
+            if self.graph is not None:
+                self._save_graph()
             
             # Complete
             self._update_progress("complete", 100, "Essay generation complete!")
-            
-            # Open file if requested
-            if self.config.auto_open:
-                self._open_file()
-                
-            # Print summary
-            self._print_summary(essay, time.time() - start_time)
+            completed = True
             
         except Exception as e:
-            print(f"\nError: {e}")
+            failure = e
             raise
+        finally:
+            # Flushes the queued progress lines, so they come before the summary or error
+            self.events.close()
+            if failure is not None:
+                print(f"\nError: {failure}")
+            elif completed:
+                # Open file if requested
+                if self.config.auto_open:
+                    self._open_file()
+                
+                # Print summary
+                self._print_summary(essay, time.time() - start_time)
+            if not self.config.demo_mode:
+                self._save_history()
+            if self.result_store:
+                self.result_store.close()
+                self.result_store = None
+            if self.knowledge:
+                self.knowledge.close()
+                self.knowledge = None
+            if self.link_verifier:
+                self.link_verifier.close()
+                self.link_verifier = None
+            if self.owns_cpu_pool:
+                self.cpu_pool.close()
+                self.cpu_pool = None
+                self.owns_cpu_pool = False
+            if self.config.trace_file:
+                self._write_trace()
+            if self.profiler.enabled:
+                self._print_profile()
             
     def _conduct_research(self) -> List[ResearchResult]:
         """Conduct parallel research using agents."""
@@ -119,80 +349,784 @@ class Orchestrator:
                 ))
             return results
         
-        # Real implementation would use ThreadPoolExecutor or asyncio
-        # to run agents in parallel with the Claude API
-        # For now, return placeholder
-        print(f"\nDeploying {len(self.agents)} research agents...")
+        self._update_progress("research", 0, f"Deploying {len(self.agents)} research agents...")
         
-        with ThreadPoolExecutor(max_workers=self.config.parallelism) as executor:
-            # Submit research tasks
-            futures = []
-            for agent in self.agents:
-                future = executor.submit(self._run_agent, agent)
-                futures.append(future)
+        variations = max(1, self.config.best_of_n)
+        unit = "agents" if variations == 1 else "agent variations"
+        # Every variation's text spills to disk; only slim records stay in memory
+        candidates: Dict[str, List[ResultRecord]] = {}
+        if self.result_store is None:
+            self.result_store = ResultStore(self.config.result_store_dir or None)
+        
+        # Research on a near-identical past topic replaces agent calls outright,
+        # and passages from earlier runs go into every prompt as known context
+        match, past = self._look_up_context()
+        for result in self._reuse_past_research(match, past):
+            candidates[result.agent_type] = [ResultRecord.from_result(self.result_store, result)]
+        
+        # Adaptive intensity holds back all but the core agents; each agent
+        # whose result still grows coverage enough releases the next one
+        pending_agents = [agent for agent in self.agents if agent.type.value not in candidates]
+        reserve = []
+        # A batch is submitted whole, so there is nothing to release agents into
+        if self.config.adaptive and self.batch is None:
+            for records in candidates.values():
+                self.coverage.add(records[0].agent_type, records[0].content, 0)
+            core = max(1, self.config.core_agents - len(candidates))
+            pending_agents, reserve = pending_agents[:core], pending_agents[core:]
+        
+        # Variations waiting for a worker; dispatched longest-expected-first
+        # (or in list order) only as workers free up, so the order can adapt
+        # to estimates that change while the run progresses.
+        queue = [(agent, variation) for agent in pending_agents for variation in range(variations)]
+        outstanding = {agent.type.value: variations for agent in pending_agents}
+        futures = {}
+        collected = set()
+        
+        def collect(future) -> bool:
+            collected.add(future)
+            agent = futures[future]
+            try:
+                result = future.result()
+            except Exception:
+                result = None  # Already reported through an AgentFinished event
+            else:
+                candidates.setdefault(agent.type.value, []).append(
+                    ResultRecord.from_result(self.result_store, result)
+                )
+                self.token_tracker.add(result.tokens_used)
+                self._prefetch_links(result)
+                self._publish_research_draft(candidates)
+            outstanding[agent.type.value] -= 1
+            if not self.config.adaptive or outstanding[agent.type.value]:
+                return result is not None
+            gain = self._score_coverage(agent.type.value, candidates.get(agent.type.value))
+            if reserve and not self.cancel_token.cancelled:
+                # An agent whose every variation failed says nothing about
+                # saturation, so it is replaced rather than ending the expansion
+                if gain is None or gain.gain_per_1k >= self.config.adaptive_threshold:
+                    released = reserve.pop(0)
+                    outstanding[released.type.value] = variations
+                    queue.extend((released, variation) for variation in range(variations))
+                else:
+                    self.adaptive_stop = (
+                        f"{gain.agent_type} added {gain.gain_per_1k:.2%} per 1k tokens "
+                        f"< {self.config.adaptive_threshold:.2%}"
+                    )
+                    self.unneeded_agents.extend(a.type.value for a in reserve)
+                    reserve.clear()
+            return result is not None
+        
+        if self.batch is not None:
+            self._research_in_batch(queue, candidates)
+        else:
+            with self._executor(self.config.parallelism) as executor:
+                def dispatch(in_flight: int):
+                    while queue and in_flight < self.config.parallelism and not self.cancel_token.cancelled:
+                        agent, variation = queue.pop(self._next_dispatch(queue))
+                        future = executor.submit(self._run_agent, agent, self.tracer.now(), variation)
+                        futures[future] = agent
+                        in_flight += 1
             
-            # Collect results
-            for future in as_completed(futures):
-                try:
-                    result = future.result()
-                    results.append(result)
+                # Collect results until done, over budget or out of time
+                dispatch(0)
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(
+                        pending, timeout=self.cancel_token.remaining(), return_when=FIRST_COMPLETED
+                    )
+                    if not done:
+                        self._update_progress("research", 50, "Deadline reached, using completed research")
+                        self._stop_research(pending, "deadline")
+                        break
+                    for future in done:
+                        collect(future)
+                    total = len(futures) + len(queue) + len(self.reused_agents)
+                    completed = sum(len(c) for c in candidates.values())
                     self._update_progress(
                         "research", 
-                        len(results) / len(self.agents) * 50,
-                        f"Completed {len(results)}/{len(self.agents)} agents"
+                        completed / total * 50,
+                        f"Completed {completed}/{total} {unit}"
                     )
-                except Exception as e:
-                    print(f"Agent failed: {e}")
+                    if not self._check_budget():
+                        self._stop_research(pending, "budget")
+                        break
+                    dispatch(len(pending))
+                    pending |= set(futures) - collected - pending
+        
+        # Harvest calls that finished while research was being stopped
+        for future in futures:
+            if future not in collected and future.done() and not future.cancelled():
+                collect(future)
+        
+        # Keep the best-scoring variation of each agent, in agent order
+        for agent in self.agents:
+            if agent.type.value in candidates:
+                results.append(max(candidates[agent.type.value], key=lambda r: r.score))
+            elif agent.type.value not in self.unneeded_agents:
+                self.skipped_agents.append(agent.type.value)
+        
+        if self.topic_index is not None and len(self.reused_agents) < len(results):
+            self._index_topic(results)
+        if self.knowledge is not None and len(self.reused_agents) < len(results):
+            with self.tracer.span("research.index", "research"):
+                self.knowledge.add_results(
+                    self.config.topic, [r for r in results if r.agent_type not in self.reused_agents]
+                )
                     
         return results
     
-    def _run_agent(self, agent) -> ResearchResult:
-        """Run a single agent (placeholder)."""
-        # In real implementation, this would call Claude API
-        prompt = agent.generate_prompt(self.config.topic)
+    def _executor(self, workers: int) -> Executor:
+        """A pool for concurrent model calls, or this tenant's share of the shared scheduler."""
+        if self.scheduler is not None:
+            return self.scheduler.executor(self.config.tenant)
+        return ThreadPoolExecutor(max_workers=workers)
+    
+    def _research_in_batch(self, queue, candidates: Dict[str, List[ResultRecord]]):
+        """Run every queued (agent, variation) as one request of a shared batch.
         
-        # Simulate some work
-        time.sleep(0.5)
+        Each agent uses its routed model without a cascade, since a batch
+        result cannot be escalated until the whole batch has ended. Results
+        are scored and kept as they stream in; a deadline or the budget
+        stops consuming them, but the batch itself runs to completion and
+        stays in the session's checkpoint for a rerun to pick up.
+        """
+        # Runs sharing a session write different files, so this is unique to the run
+        # yet the same when it is rerun and resumes its batch from the checkpoint
+        run = self.config.topic + "\x00" + self.config.output_file
+        digest = hashlib.sha256(run.encode("utf-8")).hexdigest()[:10]
+        requests, rows = [], {}
+        recalled = 0
+        submitted = time.time()
+        with self.tracer.span("research.batch_prepare", "research", requests=len(queue)):
+            for agent, variation in queue:
+                name = agent.type.value
+                custom_id = f"{digest}-{name}-{variation}"
+                model = self.router.model_for(name)
+                layout = self._build_layout(agent)
+                node, key = self._call_node(name, variation), self._call_key(layout, [model], variation)
+                result = self._recall_call(node, key)
+                if result is not None:
+                    self._publish_finished(self._row_id(agent, variation), name, submitted,
+                                           result.tokens_used, result.score)
+                    candidates.setdefault(name, []).append(
+                        ResultRecord.from_result(self.result_store, result)
+                    )
+                    recalled += 1
+                    continue
+                requests.append(BatchRequest(custom_id, layout, model,
+                                             temperature=self.config.temperature))
+                rows[custom_id] = (self._row_id(agent, variation), name, node, key)
+                self.events.publish(AgentStarted(
+                    agent_id=rows[custom_id][0], agent_type=name, attempt=0, model=model
+                ))
+        if recalled:
+            self._publish_research_draft(candidates)
         
-        return ResearchResult(
-            agent_id=agent.type.value,
-            agent_type=agent.type.value,
-            content=f"Research content for {agent.description} on {self.config.topic}",
-            score=0.85,
-            quality_score=0.85,
-            tokens_used=TokenUsage(
-                prompt_tokens=len(prompt.split()),
-                completion_tokens=500,
-                total_tokens=len(prompt.split()) + 500,
-                model=self.config.claude_model,
-                cost=0.01
+        total = len(requests) + len(self.reused_agents) + recalled
+        completed = len(self.reused_agents) + recalled
+        self._update_progress("research", 0, f"Submitted {len(requests)} requests as a batch...")
+        try:
+            for result in self.batch.research(requests, cancel=self.cancel_token):
+                row_id, name, node, key = rows[result.custom_id]
+                completed += 1
+                if result.response is None:
+                    self.events.publish(AgentFinished(
+                        agent_id=row_id, agent_type=name, status="failed",
+                        duration=time.time() - submitted,
+                        error=f"{result.error_type}: {result.error}",
+                    ))
+                else:
+                    response = result.response
+                    research = self._to_result(name, response.text, response.usage)
+                    self._record_node(node, key, result_to_json(research), ["context"])
+                    self.model_stats.record(response.usage, time.time() - submitted)
+                    self._publish_finished(row_id, name, submitted, response.usage, research.score)
+                    candidates.setdefault(name, []).append(
+                        ResultRecord.from_result(self.result_store, research)
+                    )
+                    self.token_tracker.add(response.usage)
+                    self.batched.add(response.usage)
+                    self._prefetch_links(research)
+                    self._publish_research_draft(candidates)
+                self._update_progress(
+                    "research", completed / total * 50, f"Completed {completed}/{total} batch requests"
+                )
+                if not self._check_budget():
+                    break
+        except CancelledError:
+            self._update_progress("research", 50, "Deadline reached, using completed research")
+    
+    def _publish_research_draft(self, candidates: Dict[str, List[ResultRecord]]):
+        """Show the best result of every agent finished so far in the live preview."""
+        if self.preview is None:
+            return
+        parts = [f"# Research Essay: {self.config.topic}\n\n"]
+        for agent in self.agents:
+            records = candidates.get(agent.type.value)
+            if records:
+                best = max(records, key=lambda r: r.score)
+                parts.append(f"## {agent.type.value.replace('-', ' ').title()}\n\n{best.content}\n\n")
+        self._publish_draft("research", "".join(parts))
+    
+    def _publish_draft(self, stage: str, content: str):
+        """Send the draft as it now stands to the live preview, if one is served."""
+        if self.preview is not None:
+            self.events.publish(DraftUpdated(
+                stage=stage, title=f"Research Essay: {self.config.topic}", content=content
+            ))
+    
+    def _prefetch_links(self, result: ResearchResult):
+        """Start checking a result's cited URLs while the other agents are still running."""
+        if self.link_verifier is not None:
+            self.link_verifier.prefetch(result.citations)
+    
+    def _verify_links(self, citations) -> Dict[str, LinkVerdict]:
+        """Mark every citation with its link check verdict, waiting at most the run's deadline."""
+        started = time.time()
+        with self.tracer.span("synthesis.verify_links", "synthesis", links=len(citations)):
+            remaining = self.cancel_token.remaining()
+            verdicts = self.link_verifier.verify(
+                citations, timeout=None if remaining is None else max(remaining, self.config.link_timeout)
             )
+        self.link_seconds = time.time() - started
+        return verdicts
+    
+    def _score_coverage(self, agent_type: str,
+                        records: Optional[List[ResultRecord]]) -> Optional[CoverageGain]:
+        """Add a finished agent's best result to the coverage; None if every variation failed."""
+        if not records:
+            return None
+        best = max(records, key=lambda r: r.score)
+        tokens = sum(record.tokens_used.total_tokens for record in records)
+        return self.coverage.add(agent_type, best.content, tokens)
+    
+    def _look_up_context(self):
+        """The closest past topic with its results, and known context from the knowledge store.
+        
+        Returns (match, results); the match is None below ``seed_threshold``.
+        With a run graph the last run's lookup stands while its inputs are
+        unchanged, so research indexed since then (including that run's own)
+        does not change every prompt and invalidate every agent call.
+        """
+        key = node_key(
+            "context", self.config.topic,
+            self.config.seed_threshold if self.topic_index is not None else None,
+            self.config.knowledge_top_k if self.knowledge is not None else None,
         )
+        stored = self.graph.recall("context", key) if self.graph is not None else None
+        if stored is not None:
+            self.known_context = stored["known_context"]
+            match = TopicMatch(**stored["match"]) if stored["match"] else None
+            return match, [result_from_json(r) for r in stored["past"]]
+        
+        match, past = None, []
+        if self.topic_index is not None:
+            match = self.topic_index.find(self.config.topic)
+            if match is not None and match.similarity >= self.config.seed_threshold:
+                past = self.topic_index.results(match.entry_id)
+            else:
+                match = None
+        if self.knowledge is not None:
+            with self.tracer.span("research.retrieve", "research"):
+                self.known_context = self._retrieve_known_context()
+        if self.graph is not None:
+            self._record_node("context", key, {
+                "match": match and {slot: getattr(match, slot) for slot in TopicMatch.__slots__},
+                "past": [result_to_json(r) for r in past],
+                "known_context": self.known_context,
+            })
+        return match, past
     
-    def _synthesize_results(self, results: List[ResearchResult]) -> Essay:
-        """Synthesize research results into an essay."""
-        synthesizer = Synthesizer()
+    def _reuse_past_research(self, match: Optional[TopicMatch],
+                             past: List[ResearchResult]) -> List[ResearchResult]:
+        """Reuse or seed from the results of the closest past topic.
         
-        # In real implementation, this would use Claude to synthesize
-        # For now, create a simple essay
-        content = f"# Research Essay: {self.config.topic}\n\n"
-        content += "## Introduction\n\n"
-        content += f"This essay explores {self.config.topic} through multiple perspectives.\n\n"
+        With ``reuse_research``, at ``reuse_threshold`` similarity and with
+        the same numerals and proper nouns in both topics, the stored results
+        are returned to stand in for their agents; otherwise, at
+        ``seed_threshold``, they are kept in ``seeds`` and appended to those
+        agents' prompts instead.
+        """
+        if match is None:
+            return []
+        self.topic_match = match
+        wanted = {agent.type.value for agent in self.agents}
+        past = [r for r in past if r.agent_type in wanted]
+        if (not self.config.reuse_research or match.similarity < self.config.reuse_threshold
+                or not match.same_subject(self.config.topic)):
+            self.seeds = {r.agent_type: r.content for r in past}
+            return []
+        for result in past:
+            result.tokens_used = TokenUsage()  # Nothing is spent this run
+            self.reused_agents.append(result.agent_type)
+        self._update_progress(
+            "research", 0,
+            f"Reusing {len(past)} agents from \"{match.topic}\" (similarity {match.similarity:.2f})"
+        )
+        return past
+    
+    def _retrieve_known_context(self) -> List[str]:
+        """Top-k passages and matching sources from the knowledge store."""
+        k = self.config.knowledge_top_k
+        context = [
+            f"({p.agent_type}, researching \"{p.topic}\") {p.content}"
+            for p in self.knowledge.search(self.config.topic, k)
+        ]
+        sources = self.knowledge.search_citations(self.config.topic, k)
+        if sources:
+            context.append("Sources cited before: " + "; ".join(
+                f"{c.title} ({c.source}{', ' + c.url if c.url else ''})" for c in sources
+            ))
+        return context
+    
+    def _index_topic(self, results: List[ResearchResult]):
+        """Remember this run's research for later similar topics."""
+        try:
+            self.topic_index.add(self.config.topic, [
+                r.to_result() if isinstance(r, ResultRecord) else r for r in results
+            ])
+        except OSError as e:
+            print(f"Could not update the topic index: {e}")
+    
+    def _next_dispatch(self, queue) -> int:
+        """Index of the queued (agent, variation) to dispatch next."""
+        if self.config.dispatch_order == "fifo":
+            return 0
+        estimates = [self.latency_history.estimate(agent.type.value) for agent, _ in queue]
+        return longest_first(queue, estimates)
+    
+    def _save_history(self):
+        """Persist latency history; failure to write it never fails the run."""
+        try:
+            self.latency_history.save()
+        except OSError as e:
+            print(f"Could not save agent latency history: {e}")
+    
+    def _stop_research(self, futures, reason: str):
+        """Cancel queued agent calls and signal in-flight ones to stop."""
+        self.cancel_token.cancel(reason)
+        for future in futures:
+            future.cancel()
+    
+    def _research_cutoff(self, start_time: float, seconds: float) -> Optional[float]:
+        """Absolute time by which research must stop, or None without a deadline."""
+        if seconds <= 0:
+            return None
+        reserve = self.config.deadline_reserve or seconds * 0.15
+        return start_time + max(0.0, seconds - reserve)
+    
+    def _run_agent(self, agent, submitted_at: float = 0.0, variation: int = 0) -> ResearchResult:
+        """Run a single agent on its routed models, retrying failures and escalating low scores."""
+        name = agent.type.value
+        row_id = self._row_id(agent, variation)
+        started = time.time()
+        if self.tracer.enabled and submitted_at:
+            self.tracer.record("agent.queue_wait", submitted_at, self.tracer.now(), "agent", agent=name)
+        
+        def on_text(chunk: str):
+            if self.config.structured:
+                parser.feed(chunk)
+            self.events.publish(TokenChunk(
+                agent_id=row_id, agent_type=name, text=chunk, tokens=estimate_tokens(chunk)
+            ))
+        
+        with self.tracer.span("agent", "agent", agent=name) as span:
+            with self.tracer.span("agent.prompt", "agent", agent=name):
+                layout = self._build_layout(agent)
+            
+            # Cheaper models first; a low local score escalates to the next one
+            models = self.router.models_for(name)
+            node, key = self._call_node(name, variation), self._call_key(layout, models, variation)
+            recalled = self._recall_call(node, key)
+            if recalled is not None:
+                self._publish_finished(row_id, name, started, recalled.tokens_used, recalled.score)
+                span.set(recalled=True)
+                return recalled
+            retries = 0
+            latency = 0.0
+            for level, model in enumerate(models):
+                parser = ResearchParser()
+                response, attempts = self._call_model(layout, model, row_id, name, started,
+                                                      on_text, self.config.temperature)
+                retries += attempts
+                latency += response.latency
+                result = self._to_result(name, response.text, response.usage, parser)
+                score = result.score
+                usage = response.usage
+                escalate = level + 1 < len(models) and not self.router.accept(score)
+                self.model_stats.record(usage, response.latency, escalated=escalate)
+                if not escalate:
+                    break
+                # The rejected output was still paid for
+                self.token_tracker.add(usage)
+            
+            self.latency_history.record(name, latency, usage.completion_tokens)
+            self._publish_finished(row_id, name, started, usage, score)
+            span.set(
+                retries=retries,
+                model=usage.model,
+                escalations=level,
+                ttft=response.time_to_first_token,
+                prompt_tokens=usage.prompt_tokens,
+                completion_tokens=usage.completion_tokens,
+                cache_read_tokens=usage.cache_read_tokens,
+                cache_write_tokens=usage.cache_write_tokens,
+                cache_hit=usage.cache_read_tokens > 0,
+                structured=bool(result.sections),
+            )
+        self._record_node(node, key, result_to_json(result), ["context"])
+        
+        return result
+    
+    def _to_result(self, name: str, text: str, usage: TokenUsage,
+                   parser: Optional[ResearchParser] = None) -> ResearchResult:
+        """Build an agent's ResearchResult, from its structured fields when it answered with the tool.
         
-        for result in results:
-            content += f"## {result.agent_type.replace('-', ' ').title()}\n\n"
-            content += f"{result.content}\n\n"
+        ``parser`` is the one fed while the response streamed; it is only
+        trusted if it saw exactly this text (a retry restarts the stream).
+        Output that is not research JSON is kept as markdown.
+        """
+        if self.cpu_pool is not None and (parser is None or parser.length != len(text)):
+            # Nothing was parsed while streaming, so all of the work can move
+            fields = self.cpu_pool.run(analyze_research, text, self.config.structured)
+        else:
+            fields = analyze_research(text, self.config.structured, parser)
+        markdown, score, sections, citations, confidence = fields
+        return ResearchResult(
+            agent_id=name,
+            agent_type=name,
+            content=text if markdown is None else markdown,
+            citations=citations,
+            sections=sections,
+            confidence=confidence,
+            score=score,
+            quality_score=score,
+            tokens_used=usage,
+        )
+    
+    def _build_layout(self, agent):
+        """The agent's prompt with known context and any seed from a similar past topic."""
+        name = agent.type.value
+        layout = agent.build_prompt(self.config.topic)
+        layout = with_context(layout, self.known_context)
+        if name in self.seeds:
+            layout = with_seed(layout, self.topic_match.topic, self.seeds[name])
+        if self.config.structured:
+            layout = with_structured_output(layout)
+        return layout
+    
+    def _call_node(self, name: str, variation: int) -> str:
+        """Run graph node name of one agent variation's call."""
+        return f"agent:{name}#{variation}"
+    
+    def _call_key(self, layout, models: List[str], variation: int) -> str:
+        """Run graph key of an agent call: its request to every model it may try."""
+        return node_key(
+            "agent",
+            [normalize_request(layout, model, _MAX_TOKENS, self.config.temperature) for model in models],
+            self.router.threshold if len(models) > 1 else None,
+            variation,
+        )
+    
+    def _recall_call(self, node: str, key: str) -> Optional[ResearchResult]:
+        """The last run's result of an unchanged agent call, at no cost this run."""
+        if self.graph is None:
+            return None
+        stored = self.graph.recall(node, key, ["context"])
+        return None if stored is None else result_from_json(stored)
+    
+    def _record_node(self, name: str, key: str, value, deps=()):
+        """Add a step's output to the run graph; failure to write it never fails the run."""
+        if self.graph is None:
+            return
+        try:
+            self.graph.record(name, key, value, deps)
+        except OSError as e:
+            print(f"Could not save the output of {name} to the run graph: {e}")
+    
+    def _save_graph(self):
+        """Keep this run's graph for the next run of the topic to compare with."""
+        try:
+            self.graph.save()
+        except OSError as e:
+            print(f"Could not save the run graph: {e}")
+    
+    def _publish_finished(self, row_id: str, name: str, started: float, usage: TokenUsage,
+                          score: float):
+        """Report a successful call through an AgentFinished event."""
+        self.events.publish(AgentFinished(
+            agent_id=row_id,
+            agent_type=name,
+            duration=time.time() - started,
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            cache_read_tokens=usage.cache_read_tokens,
+            cost=usage.cost,
+            score=score,
+            model=usage.model,
+        ))
+    
+    def _call_model(self, layout, model: str, row_id: str, name: str, started: float, on_text,
+                    temperature: float = 1.0):
+        """Call one model, retrying failures; returns (response, retries used)."""
+        attempt = 0
+        while True:
+            try:
+                self.cancel_token.check()
+                self.events.publish(AgentStarted(
+                    agent_id=row_id, agent_type=name, attempt=attempt, model=model
+                ))
+                with self.tracer.span("agent.call", "agent", agent=name, attempt=attempt,
+                                      model=model) as call:
+                    response = self.client.complete(
+                        layout, model=model, temperature=temperature, on_text=on_text,
+                        cancel=self.cancel_token
+                    )
+                    call.set(ttft=response.time_to_first_token,
+                             generation=response.latency - response.time_to_first_token,
+                             coalesced=response.saved is not None)
+                if response.saved is not None:
+                    self.coalesced.add(response.saved)
+                return response, attempt
+            except CancelledError as e:
+                self.events.publish(AgentFinished(
+                    agent_id=row_id, agent_type=name, status="cancelled",
+                    duration=time.time() - started, error=str(e), model=model
+                ))
+                raise
+            except Exception as e:
+                if attempt >= self.config.max_retries:
+                    self.events.publish(AgentFinished(
+                        agent_id=row_id, agent_type=name, status="failed",
+                        duration=time.time() - started, error=str(e), model=model
+                    ))
+                    raise
+                attempt += 1
+                delay = min(0.5 * 2 ** (attempt - 1), 8.0)
+                self.events.publish(AgentRetry(
+                    agent_id=row_id, agent_type=name, attempt=attempt, delay=delay, error=str(e)
+                ))
+                with self.tracer.span("agent.retry_backoff", "agent", agent=name, attempt=attempt):
+                    self.cancel_token.wait(delay)
+    
+    def _refine(self, essay: Essay) -> Essay:
+        """Critique and revise the draft until it is good enough or stops improving.
+        
+        Each round every critic scores the current draft concurrently. The
+        loop stops once the overall score reaches ``quality_threshold``, when
+        a revision gained less than ``min_gain`` over the draft it replaced,
+        after ``max_iterations`` revisions, or when the budget or deadline
+        runs out. The best-scoring draft is kept.
+        """
+        key = None
+        if self.graph is not None:
+            key = node_key(
+                "refinement", self.graph.output("synthesis"), self.config.max_iterations,
+                self.config.quality_threshold, self.config.min_gain, self.config.refine_mode,
+                [self.router.model_for(critic.type.value) for critic in self.critics],
+                self.router.model_for("refinement"), self.config.token_limit, self.config.cost_limit,
+            )
+            stored = self.graph.recall("refinement", key, ["synthesis"])
+            if stored is not None:
+                return self._restore_refinement(essay, stored)
+        
+        draft = essay.content
+        best, best_metrics = draft, None
+        previous = None
+        for round_index in range(self.config.max_iterations + 1):
+            if not self._check_budget():
+                self.refinement_stop = "budget"
+                break
+            try:
+                metrics, verdicts = self._critique(draft, round_index)
+            except CancelledError:
+                self.refinement_stop = self.cancel_token.reason or "deadline"
+                break
+            self.quality_history.append(metrics.overall_score)
+            if best_metrics is None or metrics.overall_score > best_metrics.overall_score:
+                best, best_metrics = draft, metrics
+            
+            if metrics.overall_score >= self.config.quality_threshold:
+                self.refinement_stop = "quality threshold met"
+                break
+            if previous is not None and metrics.overall_score - previous < self.config.min_gain:
+                self.refinement_stop = "converged"
+                break
+            if round_index == self.config.max_iterations:
+                self.refinement_stop = "max iterations"
+                break
+            if not self._check_budget():
+                self.refinement_stop = "budget"
+                break
+            
+            previous = metrics.overall_score
+            self._update_progress(
+                "refinement",
+                60 + 30 * (round_index + 1) / (self.config.max_iterations + 1),
+                f"Revising draft (score {metrics.overall_score:.2f})..."
+            )
+            try:
+                draft = self._revise(draft, verdicts, round_index)
+                self._publish_draft("refinement", draft)
+            except CancelledError:
+                self.refinement_stop = self.cancel_token.reason or "deadline"
+                break
+            except Exception:
+                self.refinement_stop = "revision failed"
+                break
+        
+        essay.content = best
+        essay.word_count = len(best.split())
+        if best != draft:
+            self._publish_draft("refinement", best)  # An earlier draft scored higher
+        if best_metrics is not None and essay.metadata is not None:
+            essay.metadata.quality_metrics = best_metrics
+            essay.metadata.refinement_iterations = len(self.quality_history)
+        # The limits are part of the key, so a loop the budget cut short is reused by
+        # runs with the same limits; one cut short by time or a failure runs again
+        if key is not None and self.refinement_stop not in ("deadline", "revision failed"):
+            self._record_node("refinement", key, {
+                "content": best,
+                "metrics": asdict(best_metrics) if best_metrics is not None else None,
+                "history": self.quality_history,
+                "stop": self.refinement_stop,
+            }, ["synthesis"])
+        return essay
+    
+    def _restore_refinement(self, essay: Essay, stored) -> Essay:
+        """Apply the last run's refinement of an unchanged draft."""
+        self.quality_history = list(stored["history"])
+        self.refinement_stop = stored["stop"]
+        essay.content = stored["content"]
+        essay.word_count = len(essay.content.split())
+        if stored["metrics"] is not None and essay.metadata is not None:
+            essay.metadata.quality_metrics = QualityMetrics(**stored["metrics"])
+            essay.metadata.refinement_iterations = len(self.quality_history)
+        self._publish_draft("refinement", essay.content)
+        return essay
+    
+    def _critique(self, draft: str, round_index: int):
+        """Score ``draft`` with every critic at once; returns (QualityMetrics, verdicts)."""
+        local = self._score(draft)
+        verdicts = {}
+        with self._executor(len(self.critics)) as executor:
+            futures = {
+                executor.submit(self._run_critic, critic, draft, round_index): critic
+                for critic in self.critics
+            }
+            for future, critic in futures.items():
+                try:
+                    verdicts[critic.type] = future.result()
+                except CancelledError:
+                    raise
+                except Exception:
+                    pass  # Reported through AgentFinished; scored with the local fallback
+        return aggregate(verdicts, self.critics, fallback=local, depth=local), verdicts
+    
+    def _run_critic(self, critic, draft: str, round_index: int):
+        """Run one critic on the draft and parse its verdict."""
+        name = critic.type.value
+        row_id = f"critic:{name} #{round_index + 1}"
+        started = time.time()
+        with self.tracer.span("critic", "critic", critic=name, round=round_index):
+            response, _ = self._call_model(
+                critic.build_prompt(draft), self.router.model_for(name), row_id, name, started, None
+            )
+        self._account(response)
+        verdict = parse_verdict(name, response.text)
+        self._publish_finished(row_id, name, started, response.usage, verdict.score or 0.0)
+        return verdict
+    
+    def _revise(self, draft: str, verdicts, round_index: int) -> str:
+        """Rewrite the draft with the critics' feedback.
         
-        content += "## Conclusion\n\n"
-        content += "This comprehensive analysis provides insights into the topic.\n"
+        In "sections" mode every ``##`` section is revised by its own
+        concurrent call, given only that section, the feedback that applies
+        to it and summaries of its neighbours, so a round takes about as long
+        as one section regardless of essay length. A section whose call
+        fails keeps its current text.
+        """
+        preamble, sections = split_sections(draft)
+        if self.config.refine_mode != "sections" or len(sections) < 2:
+            return self._revision_call(
+                build_revision_layout(draft, verdicts), f"refiner #{round_index + 1}", round_index
+            ) or draft
+        
+        layouts = build_section_layouts(sections, verdicts)
+        workers = self.config.refine_workers or len(sections)
+        with self._executor(workers) as executor:
+            futures = {
+                executor.submit(
+                    self._revision_call, layout, f"refiner:{section.heading[:20]} #{round_index + 1}",
+                    round_index, section.heading
+                ): section
+                for section, layout in zip(sections, layouts) if layout is not None
+            }
+            for future, section in futures.items():
+                try:
+                    section.body = revised_body(section, future.result())
+                except CancelledError:
+                    raise
+                except Exception:
+                    pass  # Reported through AgentFinished; the section stays as it was
+        return stitch(preamble, sections)
+    
+    def _revision_call(self, layout, row_id: str, round_index: int, section: str = "") -> str:
+        """One refinement call; returns the revised text."""
+        started = time.time()
+        with self.tracer.span("refine", "refinement", round=round_index, section=section):
+            response, _ = self._call_model(
+                layout, self.router.model_for("refinement"), row_id, "refinement", started, None
+            )
+        self._account(response)
+        self._publish_finished(row_id, "refinement", started, response.usage,
+                               self._score(response.text))
+        return response.text.strip()
+    
+    def _score(self, text: str) -> float:
+        """Local quality score of ``text``, in the CPU pool when there is one."""
+        if self.cpu_pool is not None:
+            return self.cpu_pool.run(score_content, text)
+        return score_content(text)
+    
+    def _account(self, response):
+        """Charge a call made outside the research phase to the budget and model stats."""
+        self.token_tracker.add(response.usage)
+        self.model_stats.record(response.usage, response.latency)
+    
+    def _row_id(self, agent, variation: int) -> str:
+        """Dashboard row label for one agent variation."""
+        if self.config.best_of_n <= 1:
+            return agent.type.value
+        return f"{agent.type.value} #{variation + 1}"
+    
+    def _synthesize_results(self, results: List[ResearchResult]) -> Essay:
+        """Synthesize research results into an essay, or reuse the last run's from the same results."""
+        stored = None
+        if self.graph is not None:
+            key = node_key("synthesis", self.config.topic, self.link_verifier is not None, [
+                content_digest(result_to_json(r.to_result() if isinstance(r, ResultRecord) else r))
+                for r in results
+            ])
+            deps = ["context"] + [name for name in self.graph.nodes if name.startswith("agent:")]
+            stored = self.graph.recall("synthesis", key, deps)
+        if stored is not None:
+            content, citations = stored["content"], citations_from_json(stored["citations"])
+        else:
+            content, citations = self._compose_essay(results)
+            if self.graph is not None:
+                self._record_node("synthesis", key, {
+                    "content": content, "citations": citations_to_json(citations)
+                }, deps)
         
         # Create metadata
         metadata = Metadata(
             topic=self.config.topic,
             research_depth=f"{len(self.agents)} agents",
-            agents_used=len(self.agents),
+            agents_used=len(results),
             total_variations=self.config.best_of_n,
-            synthesis_method="parallel",
+            synthesis_method="parallel" if not self.skipped_agents else "parallel (partial)",
             generation_time=timedelta(seconds=60),
             total_tokens=self.token_tracker.total_tokens,
             estimated_cost=self.token_tracker.total_cost,
@@ -202,26 +1136,97 @@ class Orchestrator:
                 depth_score=0.90,
                 originality=0.75,
                 overall_score=0.83
-            )
+            ),
+            skipped_agents=list(self.skipped_agents)
         )
         
         return Essay(
             title=f"Research Essay: {self.config.topic}",
             content=content,
+            citations=citations,
             metadata=metadata,
             word_count=len(content.split())
         )
     
+    def _compose_essay(self, results: List[ResearchResult]):
+        """The essay text and its merged citations; returns (content, citations)."""
+        synthesizer = Synthesizer(tracer=self.tracer)
+        
+        # In real implementation, this would use Claude to synthesize
+        # For now, create a simple essay. Parts are joined once at the end
+        # so the essay is never copied while it grows.
+        parts = [
+            f"# Research Essay: {self.config.topic}\n\n",
+            "## Introduction\n\n",
+            f"This essay explores {self.config.topic} through multiple perspectives.\n\n",
+        ]
+        
+        # Structured results are merged field by field: sources are
+        # deduplicated and renumbered across agents, repeated claims dropped
+        citations, numbers = synthesizer.merge_citations(results)
+        if self.link_verifier is not None and citations:
+            self.link_verdicts = self._verify_links(citations)
+        seen_claims = set()
+        for result, result_numbers in zip(results, numbers):
+            parts.append(f"## {result.agent_type.replace('-', ' ').title()}\n\n")
+            if result.sections:
+                parts.append(synthesizer.compose_structured(result, result_numbers, seen_claims))
+            else:
+                parts.append(f"{result.content}\n\n")
+        
+        parts.append("## Conclusion\n\n")
+        parts.append("This comprehensive analysis provides insights into the topic.\n")
+        if citations:
+            parts.append("\n## References\n\n")
+            parts.append(synthesizer.format_references(citations))
+        return "".join(parts), citations
+    
     def _save_essay(self, essay: Essay):
-        """Save the essay to file."""
-        formatter = Formatter()
-        formatted_content = formatter.format(essay, self.config.output_format)
+        """Save the essay to file, reusing the last run's output if nothing it shows has changed.
+        
+        The generation time in the output is not part of its run graph key,
+        so reused output keeps the time of the run that formatted it.
+        """
+        stored = key = None
+        if self.graph is not None:
+            meta = essay.metadata
+            key = node_key(
+                "format", self.config.output_format.value, essay.title, content_digest(essay.content),
+                essay.word_count, meta.topic, meta.agents_used, meta.skipped_agents,
+                meta.quality_metrics and asdict(meta.quality_metrics), meta.refinement_iterations,
+            )
+            upstream = ["refinement" if "refinement" in self.graph.nodes else "synthesis"]
+            stored = self.graph.recall("format", key, upstream)
+        if stored is not None:
+            formatted_content = stored
+        elif self.cpu_pool is not None:
+            # The text travels separately so it can go through shared memory
+            with self.tracer.span(f"format.{self.config.output_format.value}", "formatting",
+                                  words=essay.word_count, offloaded=True):
+                formatted_content = self.cpu_pool.run(
+                    format_essay, essay.content, replace(essay, content=""),
+                    self.config.output_format
+                )
+        else:
+            formatter = Formatter(tracer=self.tracer)
+            formatted_content = formatter.format(essay, self.config.output_format)
+        if key is not None and stored is None:
+            self._record_node("format", key, formatted_content, upstream)
         
         with open(self.config.output_file, 'w', encoding='utf-8') as f:
             f.write(formatted_content)
     
+    def _create_dashboard(self):
+        """Use the live multi-agent dashboard on terminals, the simple one otherwise."""
+        if sys.stdout.isatty():
+            return LiveDashboard()
+        return Dashboard()
+    
     def _open_file(self):
         """Open the generated file."""
+        import platform
+        import subprocess
+        
         try:
             if platform.system() == 'Darwin':  # macOS
                 subprocess.run(['open', self.config.output_file])
@@ -233,20 +1238,52 @@ class Orchestrator:
             print(f"Could not open file automatically: {e}")
     
     def _update_progress(self, stage: str, percentage: float, message: str):
-        """Update progress display."""
+        """Publish a phase progress event."""
+        self.events.publish(PhaseEvent(
+            phase=stage,
+            percentage=percentage,
+            message=message,
+            total_agents=len(self.agents) * max(1, self.config.best_of_n)
+        ))
+    
+    def _check_budget(self) -> bool:
+        """Publish running totals; return False once a token or cost limit is hit."""
+        tracker = self.token_tracker
+        try:
+            tracker.check_limits()
+            exceeded = False
+        except Exception:
+            exceeded = True
+        self.events.publish(BudgetEvent(
+            total_tokens=tracker.total_tokens,
+            total_cost=tracker.total_cost,
+            token_limit=tracker.limit,
+            cost_limit=tracker.cost_limit,
+            exceeded=exceeded
+        ))
+        return not exceeded
+    
+    def _create_event_bus(self) -> EventBus:
+        """Subscribe the progress display, optional NDJSON stream and metrics."""
+        bus = EventBus()
         if self.dashboard:
-            progress = Progress(
-                stage=stage,
-                percentage=percentage,
-                active_agents=len(self.agents),
-                completed_agents=int(percentage / 50 * len(self.agents)),
-                tokens_used=self.token_tracker.total_tokens,
-                estimated_cost=self.token_tracker.total_cost,
-                message=message
-            )
-            self.dashboard.update(progress)
+            bus.subscribe(DashboardSink(self.dashboard), maxsize=8192, policy=DROP_OLDEST)
         else:
-            print(f"[{percentage:3.0f}%] {message}")
+            # Console lines are few and should all appear, in order; a paused
+            # terminal holds up a publisher for at most a second per line
+            bus.subscribe(ConsoleSink(), policy=BLOCK, timeout=1.0,
+                          kinds=(PhaseEvent.kind, AgentFinished.kind, BudgetEvent.kind))
+        if self.config.event_stream:
+            # A stalled reader costs each publisher a moment, then loses events
+            bus.subscribe(NDJSONSink(self.config.event_stream), maxsize=8192, policy=BLOCK,
+                          timeout=0.05)
+        if self.preview is not None:
+            # Each draft event carries the whole draft, so losing an older one costs nothing
+            bus.subscribe(self.preview, maxsize=8192, policy=DROP_OLDEST,
+                          kinds=(DraftUpdated.kind, PhaseEvent.kind))
+        bus.subscribe(self.metrics, maxsize=8192, policy=BLOCK, timeout=1.0,
+                      kinds=(PhaseEvent.kind, AgentRetry.kind, AgentFinished.kind, BudgetEvent.kind))
+        return bus
     
     def _print_summary(self, essay: Essay, duration: float):
         """Print generation summary."""
@@ -256,9 +1293,100 @@ class Orchestrator:
         print(f"Topic: {self.config.topic}")
         print(f"Output: {self.config.output_file}")
         print(f"Word Count: {essay.word_count:,}")
-        print(f"Agents Used: {len(self.agents)}")
+        used = len(self.agents) - len(self.skipped_agents) - len(self.unneeded_agents)
+        print(f"Agents Used: {used}")
+        if self.skipped_agents:
+            print(f"Skipped Agents: {', '.join(self.skipped_agents)}")
+        if self.config.adaptive and not self.config.demo_mode:
+            print(f"Adaptive: {used}/{len(self.agents)} agents, coverage "
+                  f"{len(self.coverage.covered):,} concepts"
+                  + (f" (stopped: {self.adaptive_stop})" if self.adaptive_stop else ""))
+            for gain in self.coverage.gains:
+                if gain.tokens:
+                    print(f"  {gain.agent_type:<24} novelty {gain.novelty:.0%} | "
+                          f"+{gain.gain:.1%} coverage | {gain.gain_per_1k:.2%} per 1k tokens")
         print(f"Generation Time: {duration:.1f}s")
         if not self.config.demo_mode:
             print(f"Tokens Used: {self.token_tracker.total_tokens:,}")
             print(f"Estimated Cost: ${self.token_tracker.total_cost:.2f}")
-        print("="*60)
\ No newline at end of file
+            metrics = self.metrics
+            if metrics.retries or metrics.failures or metrics.review_failures:
+                print(f"Retries: {metrics.retries} | Failed Agents: {metrics.failures}"
+                      + (f" | Failed Reviews: {metrics.review_failures}"
+                         if metrics.review_failures else ""))
+            tracker = self.token_tracker
+            if tracker.cache_read_tokens or tracker.cache_write_tokens:
+                print(f"Input Tokens: {tracker.uncached_input_tokens:,} uncached, "
+                      f"{tracker.cache_read_tokens:,} cache reads, "
+                      f"{tracker.cache_write_tokens:,} cache writes")
+                print(f"Cache Savings: ${tracker.cache_savings:.4f}")
+            if self.scheduler is not None:
+                row = next(r for r in self.scheduler.stats() if r['tenant'] == self.config.tenant)
+                print(f"Tenant {row['tenant']}: queue wait p50 {row['wait_p50']:.2f}s, "
+                      f"p95 {row['wait_p95']:.2f}s | {row['tokens']:,} tokens, "
+                      f"${row['cost']:.2f} across runs")
+            if self.batched.calls:
+                saved = self.batched.total_cost * (1 / BATCH_DISCOUNT - 1)
+                print(f"Batch API: {self.batched.calls} requests at the batch discount, "
+                      f"saving ${saved:.4f}")
+            if self.coalesced.calls:
+                print(f"Coalesced: {self.coalesced.calls} calls shared an identical in-flight "
+                      f"request, saving {self.coalesced.total_tokens:,} tokens "
+                      f"(${self.coalesced.total_cost:.4f})")
+            if self.topic_match is not None:
+                how = (f"Reused {len(self.reused_agents)} agents" if self.reused_agents
+                       else f"Seeded {len(self.seeds)} agents")
+                print(f"{how} from \"{self.topic_match.topic}\" "
+                      f"(similarity {self.topic_match.similarity:.2f})")
+            if self.quality_history:
+                trend = " -> ".join(f"{score:.2f}" for score in self.quality_history)
+                print(f"Quality: {trend} over {len(self.quality_history)} critic rounds "
+                      f"({self.refinement_stop})")
+            if self.known_context:
+                print(f"Known Context: {len(self.known_context)} passages from past research")
+            if self.graph is not None and self.graph.previous:
+                calls = sum(name.startswith("agent:") for name in self.graph.executed)
+                ran = ([f"{calls} agent calls"] if calls else []) + [
+                    name for name in self.graph.executed if not name.startswith("agent:")
+                ]
+                print(f"Incremental: {len(self.graph.reused)}/{len(self.graph.nodes)} steps reused "
+                      f"from the last run, {len(self.graph.invalidated())} invalidated"
+                      + (f"; ran {', '.join(ran)}" if ran else ""))
+            if self.link_verdicts and self.link_verifier is not None:
+                counts = self.link_verifier.summary(self.link_verdicts)
+                breakdown = ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+                print(f"Citations: {len(self.link_verdicts)} links checked in "
+                      f"{self.link_seconds:.1f}s: {breakdown} "
+                      f"({self.link_verifier.cache_hits} cached)")
+            rows = self.model_stats.summary()
+            if len(rows) > 1 or self.config.cascade:
+                print("Models:")
+                for row in rows:
+                    print(f"  {row['model']:<28} {row['calls']:>3} calls "
+                          f"({row['escalated']} escalated) | {row['tokens']:>8,} tokens | "
+                          f"${row['cost']:.4f} | p50 {row['p50_latency']:.2f}s")
+        print("="*60)
+    
+    def _print_profile(self):
+        """Print the one-screen profile summary; failing to never hides how the run ended."""
+        try:
+            summary = self.profiler.format_summary()
+        except Exception as e:
+            print(f"Could not summarize the profile: {e}")
+            return
+        print(f"\nProfile reports written to {self.config.profile_dir}/")
+        print(summary)
+    
+    def _write_trace(self):
+        """Write the Chrome trace file and print the per-phase summary.
+        
+        Called from ``execute``'s finally block, so a write error is reported
+        rather than raised over the run's own exception.
+        """
+        try:
+            self.tracer.write(self.config.trace_file)
+        except OSError as e:
+            print(f"Could not write the trace file: {e}")
+            return
+        print(f"\nTrace written to {self.config.trace_file}")
+        print(self.tracer.format_summary())
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""Model routing: run agents on a cheap model first and escalate on low scores."""
+
+import threading
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from ..models import TokenUsage
+
+
+# Cheapest and fastest first
+CASCADE_MODELS = (
+    'claude-3-haiku-20240307',
+    'claude-3-sonnet-20240229',
+    'claude-3-opus-20240229',
+)
+
+
+class ModelRouter:
+    """Chooses the models an agent is tried on, in order.
+
+    Without a cascade every agent runs on ``default_model``. With one, an
+    agent starts on the first cascade model and moves to the next only when
+    the local score of its output is below ``threshold``. ``overrides`` pins
+    an agent type to a single model in either mode.
+    """
+
+    def __init__(self, default_model: str, cascade: Sequence[str] = (),
+                 threshold: float = 0.5, overrides: Optional[Mapping[str, str]] = None):
+        self.default_model = default_model
+        self.cascade = list(cascade)
+        self.threshold = threshold
+        self.overrides = dict(overrides or {})
+
+    def models_for(self, agent_type: str) -> List[str]:
+        """Models to try for ``agent_type``, cheapest first."""
+        if agent_type in self.overrides:
+            return [self.overrides[agent_type]]
+        return list(self.cascade) or [self.default_model]
+
+    def model_for(self, role: str) -> str:
+        """Single model for a role that is never cascaded, such as a critic or the refiner."""
+        return self.overrides.get(role, self.default_model)
+
+    def accept(self, score: float) -> bool:
+        """Whether output with this local score is good enough to keep."""
+        return score >= self.threshold
+
+
+class ModelStats:
+    """Per-model call counts, tokens, cost and latency for the run summary."""
+
+    def __init__(self):
+        self.models: Dict[str, Dict[str, float]] = {}
+        self.latencies: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, usage: TokenUsage, latency: float, escalated: bool = False):
+        """Add one call; ``escalated`` marks output that was rejected for a larger model."""
+        with self._lock:
+            stats = self.models.setdefault(
+                usage.model, {"calls": 0, "escalated": 0, "tokens": 0, "cost": 0.0}
+            )
+            stats["calls"] += 1
+            stats["escalated"] += int(escalated)
+            stats["tokens"] += usage.total_tokens
+            stats["cost"] += usage.cost
+            self.latencies.setdefault(usage.model, []).append(latency)
+
+    def summary(self) -> List[Dict[str, float]]:
+        """One row per model, in order of first use, with p50 latency."""
+        with self._lock:
+            rows = []
+            for model, stats in self.models.items():
+                latencies = sorted(self.latencies[model])
+                rows.append(dict(stats, model=model, p50_latency=latencies[len(latencies) // 2]))
+            return rows
@@ -0,0 +1,104 @@
+"""Latency history and longest-expected-processing-time-first dispatch."""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, TypeVar
+
+
+T = TypeVar('T')
+
+DEFAULT_HISTORY_FILE = os.path.join(os.path.expanduser("~"), ".essayforge", "agent_history.json")
+
+
+class LatencyHistory:
+    """Per-agent-type moving averages of call latency and output length.
+    
+    Estimates are exponentially weighted (``alpha`` is the weight of the
+    newest sample) so they track model and prompt changes. With a ``path``
+    the history is loaded on creation and written back by ``save``.
+    """
+    
+    def __init__(self, path: Optional[str] = None, alpha: float = 0.3):
+        self.path = path
+        self.alpha = alpha
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        if path:
+            self.load()
+    
+    def load(self):
+        """Read history from ``path``, ignoring a missing or corrupt file."""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            self.stats = {k: dict(v) for k, v in data.get("agents", {}).items()}
+    
+    def save(self):
+        """Write history to ``path`` atomically."""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {"agents": {k: dict(v) for k, v in self.stats.items()}}
+        temporary = self.path + ".tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(temporary, self.path)
+    
+    def record(self, agent_type: str, latency: float, output_tokens: int):
+        """Fold one completed call into the averages."""
+        with self._lock:
+            stats = self.stats.get(agent_type)
+            if stats is None:
+                self.stats[agent_type] = {
+                    "latency": latency, "output_tokens": float(output_tokens), "samples": 1
+                }
+                return
+            a = self.alpha
+            stats["latency"] = a * latency + (1 - a) * stats["latency"]
+            stats["output_tokens"] = a * output_tokens + (1 - a) * stats["output_tokens"]
+            stats["samples"] += 1
+    
+    def estimate(self, agent_type: str) -> float:
+        """Expected latency in seconds; unseen types get the mean of known ones."""
+        with self._lock:
+            stats = self.stats.get(agent_type)
+            if stats is not None:
+                return stats["latency"]
+            if not self.stats:
+                return 0.0
+            return sum(s["latency"] for s in self.stats.values()) / len(self.stats)
+
+
+def longest_first(queue: Sequence[T], estimates: Sequence[float]) -> int:
+    """Index of the item with the longest expected time; ties keep queue order."""
+    best = 0
+    for i in range(1, len(queue)):
+        if estimates[i] > estimates[best]:
+            best = i
+    return best
+
+
+def simulate_makespan(durations: List[float], parallelism: int,
+                      estimates: Optional[List[float]] = None) -> float:
+    """Makespan of running ``durations`` on ``parallelism`` workers.
+    
+    Without ``estimates`` jobs start in list (FIFO) order; with them, each
+    free worker takes the remaining job with the largest estimate.
+    """
+    remaining = list(range(len(durations)))
+    workers = [0.0] * max(1, parallelism)
+    while remaining:
+        index = 0 if estimates is None else longest_first(
+            remaining, [estimates[j] for j in remaining]
+        )
+        job = remaining.pop(index)
+        worker = workers.index(min(workers))
+        workers[worker] += durations[job]
+    return max(workers)
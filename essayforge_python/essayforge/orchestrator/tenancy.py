@@ -0,0 +1,255 @@
+"""Weighted fair scheduling of agent calls across tenants sharing one deployment."""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, wait as wait_for_futures
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+
+from .orchestrator import TokenTracker
+
+
+class QuotaExceededError(RuntimeError):
+    """A tenant's token or cost quota is used up; its queued calls are refused."""
+
+
+class _Job:
+    __slots__ = ('tenant', 'fn', 'args', 'kwargs', 'future', 'start', 'finish', 'seq', 'enqueued')
+
+    def __init__(self, tenant: str, fn: Callable, args: tuple, kwargs: dict, future: Future,
+                 start: float, finish: float, seq: int):
+        self.tenant = tenant
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = future
+        self.start = start  # Virtual start and finish times
+        self.finish = finish
+        self.seq = seq  # Arrival order, for FIFO and tie-breaking
+        self.enqueued = time.monotonic()
+
+
+class _Tenant:
+    """One tenant's queue, fairness state, quota and statistics."""
+
+    def __init__(self, name: str, weight: float, tracker: TokenTracker, service: float):
+        self.name = name
+        self.weight = weight
+        self.tracker = tracker
+        self.queue: Deque[_Job] = deque()
+        self.last_finish = 0.0
+        self.service = service  # Moving average of call duration, the cost of the next call
+        self.max_depth = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.waits: Deque[float] = deque(maxlen=4096)  # Queue waits of recent calls
+
+
+class FairScheduler:
+    """A shared pool of ``workers`` threads serving per-tenant queues.
+
+    Calls are ordered by weighted fair queuing: each call gets a virtual
+    finish time of ``max(virtual clock, tenant's last finish) + cost /
+    weight`` and the call with the earliest finish runs next; the virtual
+    clock is the start time of the call dispatched last. The cost of a
+    call is the moving average of that tenant's call durations (of all
+    tenants' calls until it has its own), so a tenant with a deep queue of
+    long calls gets its weighted share of worker time and no more, while a
+    tenant with a few calls is served almost at once.
+    ``policy="fifo"`` serves calls in arrival order instead, as separate
+    per-job thread pools effectively do.
+
+    Every tenant has a TokenTracker with its quota; orchestrators of that
+    tenant chain their own tracker to it, and once it is exhausted the
+    tenant's remaining queued calls fail with QuotaExceededError.
+    """
+
+    def __init__(self, workers: int, policy: str = "fair"):
+        if policy not in ("fair", "fifo"):
+            raise ValueError(f"Unknown scheduling policy: {policy}")
+        self.workers = workers
+        self.policy = policy
+        self.tenants: Dict[str, _Tenant] = {}
+        self._clock = 0.0  # Virtual time
+        self._service = 1.0  # Moving average of call duration over all tenants
+        self._seq = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"fair-scheduler-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def register(self, tenant: str, weight: float = 1.0, token_limit: int = 0,
+                 cost_limit: float = 0.0) -> TokenTracker:
+        """Add or update a tenant; returns its quota tracker."""
+        if weight <= 0:
+            raise ValueError("Tenant weight must be positive")
+        with self._condition:
+            state = self.tenants.get(tenant)
+            if state is None:
+                state = self.tenants[tenant] = _Tenant(
+                    tenant, weight, TokenTracker(token_limit, cost_limit), self._service
+                )
+            else:
+                state.weight = weight
+                state.tracker.limit = token_limit
+                state.tracker.cost_limit = cost_limit
+            return state.tracker
+
+    def tracker(self, tenant: str) -> TokenTracker:
+        """The tenant's quota tracker, registering it with defaults if unknown."""
+        with self._condition:
+            if tenant in self.tenants:
+                return self.tenants[tenant].tracker
+        return self.register(tenant)
+
+    def submit(self, tenant: str, fn: Callable, *args, **kwargs) -> Future:
+        """Queue ``fn(*args, **kwargs)`` for ``tenant``."""
+        self.tracker(tenant)
+        future: Future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Cannot submit to a closed scheduler")
+            state = self.tenants[tenant]
+            start = max(self._clock, state.last_finish)
+            state.last_finish = start + state.service / state.weight
+            self._seq += 1
+            state.queue.append(
+                _Job(tenant, fn, args, kwargs, future, start, state.last_finish, self._seq)
+            )
+            state.submitted += 1
+            state.max_depth = max(state.max_depth, len(state.queue))
+            self._condition.notify()
+        return future
+
+    def executor(self, tenant: str) -> 'TenantExecutor':
+        """An Executor submitting to this scheduler on behalf of ``tenant``."""
+        return TenantExecutor(self, tenant)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Queue depth, wait times, throughput and spend per tenant."""
+        with self._condition:
+            rows = []
+            for state in self.tenants.values():
+                waits = sorted(state.waits)
+                rows.append({
+                    "tenant": state.name,
+                    "weight": state.weight,
+                    "queued": len(state.queue),
+                    "max_depth": state.max_depth,
+                    "submitted": state.submitted,
+                    "completed": state.completed,
+                    "rejected": state.rejected,
+                    "wait_mean": sum(waits) / len(waits) if waits else 0.0,
+                    "wait_p50": _percentile(waits, 0.5),
+                    "wait_p95": _percentile(waits, 0.95),
+                    "tokens": state.tracker.total_tokens,
+                    "cost": state.tracker.total_cost,
+                })
+            return rows
+
+    def format_stats(self) -> str:
+        """One line per tenant for logs and run summaries."""
+        return "\n".join(
+            f"{row['tenant']:<16} w={row['weight']:<4g} queued {row['queued']:>4} "
+            f"(max {row['max_depth']:>4}) | {row['completed']:>5} done, {row['rejected']} refused | "
+            f"wait p50 {row['wait_p50']:.2f}s p95 {row['wait_p95']:.2f}s | "
+            f"{row['tokens']:,} tokens ${row['cost']:.2f}"
+            for row in self.stats()
+        )
+
+    def close(self, wait: bool = True):
+        """Stop accepting calls; queued calls still run before the workers exit."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self) -> 'FairScheduler':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _next(self) -> Optional[_Job]:
+        """Pop the next call to run, or None once closed and drained."""
+        with self._condition:
+            while True:
+                heads = [state for state in self.tenants.values() if state.queue]
+                if heads:
+                    if self.policy == "fifo":
+                        state = min(heads, key=lambda s: s.queue[0].seq)
+                    else:
+                        state = min(heads, key=lambda s: (s.queue[0].finish, s.queue[0].seq))
+                    job = state.queue.popleft()
+                    self._clock = max(self._clock, job.start)
+                    state.waits.append(time.monotonic() - job.enqueued)
+                    return job
+                if self._closed:
+                    return None
+                self._condition.wait()
+
+    def _work(self):
+        while True:
+            job = self._next()
+            if job is None:
+                return
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            state = self.tenants[job.tenant]
+            try:
+                state.tracker.check_limits()
+            except Exception as e:
+                with self._condition:
+                    state.rejected += 1
+                job.future.set_exception(QuotaExceededError(f"Tenant {state.name}: {e}"))
+                continue
+            started = time.monotonic()
+            try:
+                result = job.fn(*job.args, **job.kwargs)
+            except BaseException as e:
+                job.future.set_exception(e)
+            else:
+                job.future.set_result(result)
+            duration = time.monotonic() - started
+            with self._condition:
+                state.completed += 1
+                state.service = 0.7 * state.service + 0.3 * duration
+                self._service = 0.7 * self._service + 0.3 * duration
+
+
+class TenantExecutor(Executor):
+    """One tenant's view of a FairScheduler, usable wherever a thread pool is.
+
+    ``shutdown`` waits only for calls submitted through this executor, so an
+    orchestrator can use it as a context manager like its own pool.
+    """
+
+    def __init__(self, scheduler: FairScheduler, tenant: str):
+        self.scheduler = scheduler
+        self.tenant = tenant
+        self._futures: Set[Future] = set()
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future = self.scheduler.submit(self.tenant, fn, *args, **kwargs)
+        self._futures.add(future)
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        if cancel_futures:
+            for future in self._futures:
+                future.cancel()
+        if wait:
+            wait_for_futures(self._futures)
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
@@ -1,5 +1,19 @@
 """Output formatting package for EssayForge."""
 
-from .formatter import Formatter
+from typing import TYPE_CHECKING
 
-__all__ = ['Formatter']
\ No newline at end of file
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .formatter import Formatter
+    from .preview import PreviewServer
+
+# Submodules are imported on first attribute access to keep startup fast
+_EXPORTS = {
+    'Formatter': '.formatter',
+    'PreviewServer': '.preview'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = ['Formatter', 'PreviewServer']
\ No newline at end of file
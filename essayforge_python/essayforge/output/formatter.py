@@ -4,13 +4,22 @@ from datetime import datetime
 from typing import List
 
 from ..models import Essay, OutputFormat, Citation
+from ..tracing import NULL_TRACER
 
 
 class Formatter:
     """Formats essays into different output formats."""
     
+    def __init__(self, tracer=NULL_TRACER):
+        self.tracer = tracer
+    
     def format(self, essay: Essay, format_type: OutputFormat) -> str:
         """Format an essay according to the specified output format."""
+        with self.tracer.span(f"format.{format_type.value}", "formatting", words=essay.word_count):
+            return self._format(essay, format_type)
+    
+    def _format(self, essay: Essay, format_type: OutputFormat) -> str:
+        """Dispatch to the formatter for the given output format."""
         if format_type == OutputFormat.MARKDOWN:
             return self._format_markdown(essay)
         elif format_type == OutputFormat.LATEX:
@@ -52,8 +61,12 @@ class Formatter:
         
         return output
     
-    def _format_html(self, essay: Essay) -> str:
-        """Format essay as HTML."""
+    def render_html(self, markdown: str) -> str:
+        """Convert a Markdown fragment, such as one section, to the HTML used in pages."""
+        return self._markdown_to_html(markdown)
+    
+    def html_page(self, title: str, body: str, head: str = "") -> str:
+        """Wrap already rendered ``body`` in the styled page; ``head`` is added to <head>."""
         output = """<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -91,22 +104,24 @@ class Formatter:
             font-size: 0.9em;
         }}
     </style>
-</head>
+{head}</head>
 <body>
-""".format(title=essay.title)
-        
+""".format(title=title, head=head)
+        output += body
+        output += "\n</body>\n</html>"
+        return output
+    
+    def _format_html(self, essay: Essay) -> str:
+        """Format essay as HTML."""
         # Convert markdown to HTML (simplified)
         html_content = self._markdown_to_html(essay.content)
-        output += html_content
         
         # Add metadata
-        output += '<div class="metadata">'
-        output += self._format_metadata_html(essay)
-        output += '</div>'
+        html_content += '<div class="metadata">'
+        html_content += self._format_metadata_html(essay)
+        html_content += '</div>'
         
-        output += "\n</body>\n</html>"
-        
-        return output
+        return self.html_page(essay.title, html_content)
     
     def _escape_latex(self, text: str) -> str:
         """Escape special LaTeX characters."""
@@ -189,6 +204,8 @@ class Formatter:
         output += f"**Topic:** {meta.topic}\n\n"
         output += f"**Word Count:** {essay.word_count:,}\n\n"
         output += f"**Research Depth:** {meta.agents_used} agents\n\n"
+        if meta.skipped_agents:
+            output += f"**Skipped Agents:** {', '.join(meta.skipped_agents)}\n\n"
         
         if meta.quality_metrics:
             output += "**Quality Metrics:**\n"
@@ -196,6 +213,11 @@ class Formatter:
             output += f"- Coherence: {meta.quality_metrics.coherence:.2f}\n"
             output += f"- Depth: {meta.quality_metrics.depth_score:.2f}\n"
             output += f"- Originality: {meta.quality_metrics.originality:.2f}\n"
+            if meta.refinement_iterations:
+                output += f"- Factual Accuracy: {meta.quality_metrics.factual_accuracy:.2f}\n"
+                output += f"- Citation Quality: {meta.quality_metrics.citation_quality:.2f}\n"
+                output += f"- Structure: {meta.quality_metrics.structure:.2f}\n"
+                output += f"\n**Critic Rounds:** {meta.refinement_iterations}\n"
         
         return output
     
@@ -206,6 +228,8 @@ class Formatter:
         output += f"<p><strong>Topic:</strong> {meta.topic}</p>"
         output += f"<p><strong>Word Count:</strong> {essay.word_count:,}</p>"
         output += f"<p><strong>Research Depth:</strong> {meta.agents_used} agents</p>"
+        if meta.skipped_agents:
+            output += f"<p><strong>Skipped Agents:</strong> {', '.join(meta.skipped_agents)}</p>"
         
         if meta.quality_metrics:
             output += "<p><strong>Quality Metrics:</strong></p><ul>"
@@ -213,6 +237,12 @@ class Formatter:
             output += f"<li>Coherence: {meta.quality_metrics.coherence:.2f}</li>"
             output += f"<li>Depth: {meta.quality_metrics.depth_score:.2f}</li>"
             output += f"<li>Originality: {meta.quality_metrics.originality:.2f}</li>"
+            if meta.refinement_iterations:
+                output += f"<li>Factual Accuracy: {meta.quality_metrics.factual_accuracy:.2f}</li>"
+                output += f"<li>Citation Quality: {meta.quality_metrics.citation_quality:.2f}</li>"
+                output += f"<li>Structure: {meta.quality_metrics.structure:.2f}</li>"
             output += "</ul>"
+            if meta.refinement_iterations:
+                output += f"<p><strong>Critic Rounds:</strong> {meta.refinement_iterations}</p>"
         
         return output
\ No newline at end of file
@@ -0,0 +1,276 @@
+"""Live HTML preview of the essay in progress, updated over server-sent events."""
+
+import hashlib
+import json
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ..critics import split_sections
+from ..events import DraftUpdated, Event, PhaseEvent, Sink
+from .formatter import Formatter
+
+
+_CLIENT_BACKLOG = 256  # Messages queued per browser before it is sent a fresh snapshot
+_KEEPALIVE = 15.0  # Seconds between comment lines that keep idle connections open
+
+_SCRIPT = """<style>
+        #preview-status {{ position: sticky; top: 0; background: #fff; color: #777;
+            font-size: 0.85em; padding: 6px 0; border-bottom: 1px solid #eee; }}
+        section.updated {{ animation: flash 1.2s ease-out; }}
+        @keyframes flash {{ from {{ background: #fdf6d8; }} to {{ background: transparent; }} }}
+    </style>
+    <script>
+    window.addEventListener("DOMContentLoaded", () => {{
+        const root = document.getElementById("preview");
+        const status = document.getElementById("preview-status");
+        const source = new EventSource("/events?since={version}");
+        const section = (id) => {{
+            let element = document.getElementById(id);
+            if (!element) {{
+                element = document.createElement("section");
+                element.id = id;
+                root.appendChild(element);
+            }}
+            return element;
+        }};
+        source.addEventListener("section", (e) => {{
+            const data = JSON.parse(e.data);
+            const element = section(data.id);
+            element.innerHTML = data.html;
+            element.classList.remove("updated");
+            void element.offsetWidth;
+            element.classList.add("updated");
+        }});
+        source.addEventListener("order", (e) => {{
+            const ids = JSON.parse(e.data);
+            for (const element of Array.from(root.children)) {{
+                if (!ids.includes(element.id)) element.remove();
+            }}
+            for (const id of ids) root.appendChild(section(id));
+        }});
+        source.addEventListener("status", (e) => {{
+            const data = JSON.parse(e.data);
+            status.textContent = `${{Math.round(data.percentage)}}% · ${{data.message}}`;
+        }});
+        source.addEventListener("done", (e) => {{
+            status.textContent = JSON.parse(e.data).message;
+            source.close();
+        }});
+    }});
+    </script>
+"""
+
+
+class _Client:
+    """One connected browser: its pending messages and whether it fell behind."""
+
+    def __init__(self):
+        self.messages: "queue.Queue[Optional[str]]" = queue.Queue(_CLIENT_BACKLOG)
+        self.resync = False
+
+
+class PreviewServer(Sink):
+    """Serves the essay so far on localhost and pushes changes to open pages.
+
+    Subscribed to the orchestrator's event bus, it receives a DraftUpdated
+    event whenever research arrives, synthesis runs or a revision lands.
+    Each draft is split on its ``##`` headings and only sections whose text
+    changed since the last draft are rendered through ``Formatter`` and
+    sent to browsers as server-sent events; unchanged sections are neither
+    rendered nor sent. Progress events update a status line. A page opened
+    mid-run gets the current draft at once, and a browser that reconnects
+    or falls behind is sent a full snapshot.
+    """
+
+    def __init__(self, port: int = 0, host: str = "127.0.0.1",
+                 formatter: Optional[Formatter] = None):
+        self.formatter = formatter or Formatter()
+        self.title = "Essay preview"
+        self.version = 0  # Bumped on every draft that changed something
+        self.rendered = 0  # Sections rendered to HTML so far
+        self.drafts = 0
+        self._sections: Dict[str, Tuple[str, str]] = {}  # Section id -> (digest, html)
+        self._order: List[str] = []
+        self._status = {"percentage": 0.0, "message": "Starting..."}
+        self._clients: List[_Client] = []
+        self._closed = False
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://{host}:{self._server.server_address[1]}/"
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="preview", daemon=True)
+        self._thread.start()
+
+    def handle(self, event: Event):
+        if isinstance(event, DraftUpdated):
+            self.update(event.content, event.title)
+        elif isinstance(event, PhaseEvent):
+            with self._lock:
+                self._status = {"percentage": event.percentage, "message": event.message}
+                self._broadcast("status", self._status)
+
+    def update(self, content: str, title: str = "") -> int:
+        """Apply a new draft; returns the number of sections that had to be rendered."""
+        preamble, sections = split_sections(content)
+        parts = [("preamble", preamble)] if preamble.strip() else []
+        seen: Dict[str, int] = {}
+        for section in sections:
+            # Repeated headings get their own ids, in order of appearance
+            seen[section.heading] = seen.get(section.heading, 0) + 1
+            key = f"{section.heading}\0{seen[section.heading]}"
+            parts.append((key, section.render()))
+        changed = []
+        order = []
+        for key, markdown in parts:
+            section_id = "s-" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+            digest = hashlib.sha1(markdown.encode("utf-8")).hexdigest()
+            order.append(section_id)
+            previous = self._sections.get(section_id)
+            if previous is None or previous[0] != digest:
+                changed.append((section_id, digest, self.formatter.render_html(markdown)))
+        with self._lock:
+            self.drafts += 1
+            if title:
+                self.title = title
+            if not changed and order == self._order:
+                return 0
+            self.version += 1
+            self.rendered += len(changed)
+            for section_id, digest, html in changed:
+                self._sections[section_id] = (digest, html)
+                self._broadcast("section", {"id": section_id, "html": html})
+            if order != self._order:
+                for section_id in set(self._order) - set(order):
+                    self._sections.pop(section_id, None)
+                self._order = order
+                self._broadcast("order", order)
+        return len(changed)
+
+    def page(self) -> str:
+        """The full page as it stands, with the script that keeps it current."""
+        with self._lock:
+            body = "".join(f'<section id="{section_id}">{self._sections[section_id][1]}</section>\n'
+                           for section_id in self._order)
+            status = f'{self._status["percentage"]:.0f}% · {self._status["message"]}'
+            version, title = self.version, self.title
+        return self.formatter.html_page(
+            title,
+            f'<div id="preview-status">{status}</div>\n<div id="preview">\n{body}</div>',
+            head="    " + _SCRIPT.format(version=version),
+        )
+
+    def close(self):
+        """Tell open pages the run is over, then stop serving."""
+        with self._lock:
+            self._closed = True
+            self._broadcast("done", {"message": "Essay generation complete."})
+            for client in self._clients:
+                try:
+                    client.messages.put_nowait(None)
+                except queue.Full:
+                    client.resync = True
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _broadcast(self, name: str, data):
+        """Queue a message for every client. Caller holds the lock."""
+        message = f"id: {self.version}\nevent: {name}\ndata: {json.dumps(data)}\n\n"
+        for client in self._clients:
+            if client.resync:
+                continue
+            try:
+                client.messages.put_nowait(message)
+            except queue.Full:
+                client.resync = True  # It gets a snapshot instead of the backlog
+
+    def _snapshot(self) -> List[str]:
+        """Messages that bring a page from any state to the current one. Caller holds the lock."""
+        messages = [
+            f"id: {self.version}\nevent: section\ndata: "
+            f"{json.dumps({'id': section_id, 'html': self._sections[section_id][1]})}\n\n"
+            for section_id in self._order
+        ]
+        messages.append(f"id: {self.version}\nevent: order\ndata: {json.dumps(self._order)}\n\n")
+        messages.append(f"id: {self.version}\nevent: status\ndata: {json.dumps(self._status)}\n\n")
+        return messages
+
+    def _connect(self, since: Optional[int]) -> Tuple[_Client, List[str]]:
+        client = _Client()
+        with self._lock:
+            self._clients.append(client)
+            initial = [] if since == self.version else self._snapshot()
+        return client, initial
+
+    def _disconnect(self, client: _Client):
+        with self._lock:
+            if client in self._clients:
+                self._clients.remove(client)
+
+    def _resync(self, client: _Client) -> List[str]:
+        """Drop a lagging client's backlog and return a snapshot to send instead."""
+        with self._lock:
+            while True:
+                try:
+                    client.messages.get_nowait()
+                except queue.Empty:
+                    break
+            client.resync = False
+            return self._snapshot()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path == "/":
+                    body = server.page().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.send_header("Cache-Control", "no-store")
+                    self.end_headers()
+                    self.wfile.write(body)
+                elif url.path == "/events":
+                    self._stream(parse_qs(url.query).get("since", [""])[0]
+                                 or self.headers.get("Last-Event-ID", ""))
+                else:
+                    self.send_error(404)
+
+            def _stream(self, since: str):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                client, pending = server._connect(int(since) if since.isdigit() else None)
+                try:
+                    for message in pending:
+                        self.wfile.write(message.encode("utf-8"))
+                    self.wfile.flush()
+                    while True:
+                        if client.resync:
+                            for message in server._resync(client):
+                                self.wfile.write(message.encode("utf-8"))
+                        if server._closed and client.messages.empty():
+                            break
+                        try:
+                            message = client.messages.get(timeout=_KEEPALIVE)
+                        except queue.Empty:
+                            message = ": keep-alive\n\n"
+                        if message is None:
+                            break
+                        self.wfile.write(message.encode("utf-8"))
+                        self.wfile.flush()
+                except OSError:
+                    pass  # The browser went away
+                finally:
+                    server._disconnect(client)
+
+        return Handler
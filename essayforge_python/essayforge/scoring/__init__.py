@@ -0,0 +1,22 @@
+"""Scoring package for local quality estimates of generated text."""
+
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .coverage import CoverageGain, CoverageTracker, concepts
+    from .scorer import score_content, score_structured
+
+# Submodules are imported on first attribute access to keep startup fast
+_EXPORTS = {
+    'CoverageGain': '.coverage',
+    'CoverageTracker': '.coverage',
+    'concepts': '.coverage',
+    'score_content': '.scorer',
+    'score_structured': '.scorer'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = ['CoverageGain', 'CoverageTracker', 'concepts', 'score_content', 'score_structured']
\ No newline at end of file
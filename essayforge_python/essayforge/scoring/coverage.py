@@ -0,0 +1,71 @@
+"""Local topical coverage and novelty of collected research, for adaptive agent dispatch."""
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import List, Set
+
+
+_WORD = re.compile(r"[a-z][a-z0-9'-]+")
+
+# Frequent words of four letters or more that say nothing about the content
+_STOP_WORDS = frozenset(
+    "about also been both could does each even from have here however into "
+    "many more most much must only other over same should some such than that "
+    "their them then there these they this those through very were what when "
+    "where which while will with within would your".split()
+)
+
+
+def concepts(text: str) -> Set[str]:
+    """Distinct content words of ``text``: four letters or more, stop words removed."""
+    words = (w.strip("'-") for w in _WORD.findall(text.lower()))
+    return {w for w in words if len(w) >= 4 and w not in _STOP_WORDS}
+
+
+@dataclass
+class CoverageGain:
+    """What one agent's result added to the research collected before it."""
+    agent_type: str
+    novelty: float  # Share of the result's concepts not seen before, 0-1
+    relevance: float  # Share of the topic's words the result mentions, 0-1
+    gain: float  # Relative growth of the covered concepts, weighted by relevance
+    tokens: int
+
+    @property
+    def gain_per_1k(self) -> float:
+        """Coverage gain per 1,000 tokens spent; unbounded for free (reused) results."""
+        return self.gain / self.tokens * 1000 if self.tokens else float("inf")
+
+
+class CoverageTracker:
+    """Union of concepts covered by the results collected so far.
+
+    Each added result is scored by how much it grows that union relative to
+    its size, weighted by how much of the topic it addresses. Growth shrinks
+    as the research saturates, which is the signal for adaptive intensity
+    to stop adding agents.
+    """
+
+    def __init__(self, topic: str):
+        self.topic_words = concepts(topic)
+        self.covered: Set[str] = set()
+        self.gains: List[CoverageGain] = []
+        self._lock = threading.Lock()
+
+    def add(self, agent_type: str, text: str, tokens: int) -> CoverageGain:
+        """Merge one result into the covered concepts and return what it added."""
+        found = concepts(text)
+        with self._lock:
+            new = found - self.covered
+            self.covered |= new
+            novelty = len(new) / len(found) if found else 0.0
+            mentioned = len(self.topic_words & found) / len(self.topic_words) if self.topic_words else 1.0
+            # Off-topic text halves the gain rather than zeroing it; the topic
+            # is often phrased differently from how sources discuss it
+            relevance = 0.5 + 0.5 * mentioned
+            gain = relevance * len(new) / len(self.covered) if self.covered else 0.0
+            result = CoverageGain(agent_type, round(novelty, 4), round(mentioned, 4),
+                                  round(gain, 4), tokens)
+            self.gains.append(result)
+        return result
@@ -0,0 +1,48 @@
+"""Local, API-free quality scoring for agent output."""
+
+import re
+from typing import List
+
+from ..models import Citation, ResearchSection
+
+
+_CITATION_PATTERN = re.compile(r'\[\d+\]|https?://\S+|\([A-Z][A-Za-z-]+(?: et al\.)?,? \d{4}\)')
+
+
+def score_content(text: str) -> float:
+    """Score research output on a 0-1 scale from length, structure, sourcing and vocabulary."""
+    words = text.split()
+    if not words:
+        return 0.0
+    
+    length = min(1.0, len(words) / 400)
+    headings = sum(1 for line in text.splitlines() if line.lstrip().startswith('#'))
+    structure = min(1.0, headings / 3)
+    sourcing = min(1.0, len(_CITATION_PATTERN.findall(text)) / 5)
+    vocabulary = min(1.0, len({word.lower() for word in words}) / len(words) * 2)
+    
+    return round(0.4 * length + 0.2 * structure + 0.2 * sourcing + 0.2 * vocabulary, 4)
+
+
+def score_structured(sections: List[ResearchSection], citations: List[Citation]) -> float:
+    """Score structured research on the same scale as ``score_content``, without parsing text.
+    
+    Sourcing counts distinct citations and the share of claims backed by a
+    citation that exists, so invented or dangling references do not score.
+    """
+    words = [word for section in sections
+             for text in [section.body] + [claim.text for claim in section.claims]
+             for word in text.split()]
+    if not words:
+        return 0.0
+    
+    known = {citation.id for citation in citations}
+    claims = [claim for section in sections for claim in section.claims]
+    supported = sum(1 for claim in claims if known.intersection(claim.citations))
+    
+    length = min(1.0, len(words) / 400)
+    structure = min(1.0, len(sections) / 3)
+    sourcing = min(1.0, len(known) / 5) * (supported / len(claims) if claims else 0.5)
+    vocabulary = min(1.0, len({word.lower() for word in words}) / len(words) * 2)
+    
+    return round(0.4 * length + 0.2 * structure + 0.2 * sourcing + 0.2 * vocabulary, 4)
@@ -0,0 +1,40 @@
+"""Storage package: spill-to-disk result bodies, past topics, the knowledge store and run graphs."""
+
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .knowledge import KnowledgeStore, Passage
+    from .runs import RunGraph, node_key
+    from .store import ResultRecord, ResultStore, TextRef
+    from .topics import TopicIndex, TopicMatch, normalize_topic
+
+# Submodules are imported on first attribute access to keep startup fast
+_EXPORTS = {
+    'KnowledgeStore': '.knowledge',
+    'Passage': '.knowledge',
+    'RunGraph': '.runs',
+    'node_key': '.runs',
+    'ResultStore': '.store',
+    'ResultRecord': '.store',
+    'TextRef': '.store',
+    'TopicIndex': '.topics',
+    'TopicMatch': '.topics',
+    'normalize_topic': '.topics'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = [
+    'KnowledgeStore',
+    'Passage',
+    'RunGraph',
+    'node_key',
+    'ResultStore',
+    'ResultRecord',
+    'TextRef',
+    'TopicIndex',
+    'TopicMatch',
+    'normalize_topic'
+]
\ No newline at end of file
@@ -0,0 +1,257 @@
+"""Full-text knowledge store of past research passages and citations (SQLite FTS5)."""
+
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, List, Tuple
+
+from ..models import Citation, ResearchResult
+from .topics import normalize_topic
+
+
+DEFAULT_KNOWLEDGE_DB = os.path.join(os.path.expanduser("~"), ".essayforge", "knowledge.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS passages (
+    id INTEGER PRIMARY KEY,
+    hash TEXT UNIQUE NOT NULL,
+    topic TEXT NOT NULL,
+    agent_type TEXT NOT NULL,
+    created TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS passages_fts USING fts5(
+    content, content='passages', content_rowid='id'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS passages_vocab USING fts5vocab(passages_fts, 'row');
+CREATE TABLE IF NOT EXISTS citations (
+    id INTEGER PRIMARY KEY,
+    hash TEXT UNIQUE NOT NULL,
+    title TEXT NOT NULL,
+    source TEXT NOT NULL,
+    url TEXT NOT NULL,
+    authors TEXT NOT NULL,
+    date TEXT NOT NULL,
+    quote TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS citations_fts USING fts5(
+    title, source, quote, content='citations', content_rowid='id'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS citations_vocab USING fts5vocab(citations_fts, 'row');
+"""
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+@dataclass
+class Passage:
+    """A retrieved passage of earlier research."""
+    topic: str
+    agent_type: str
+    content: str
+    rank: float  # bm25 score; lower is more relevant
+
+
+def split_passages(text: str, max_chars: int = 1200) -> List[str]:
+    """Split research text into paragraph-sized passages of at most ``max_chars``.
+
+    Short paragraphs are merged with the following ones so a heading stays
+    with the text it introduces.
+    """
+    passages, current = [], ""
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        while len(paragraph) > max_chars:
+            cut = paragraph.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                passages.append(current)
+                current = ""
+            passages.append(paragraph[:cut])
+            paragraph = paragraph[cut:].lstrip()
+        if current and len(current) + len(paragraph) + 2 > max_chars:
+            passages.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        passages.append(current)
+    return passages
+
+
+def query_terms(text: str) -> List[str]:
+    """Unique significant words of ``text``, in order."""
+    return list(dict.fromkeys(normalize_topic(text).split()))
+
+
+def match_query(terms: Iterable[str]) -> str:
+    """FTS5 MATCH expression OR-ing ``terms``."""
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+class KnowledgeStore:
+    """Every research passage and citation from past runs, full-text indexed.
+
+    Passages and citations are deduplicated by content hash, so indexing
+    the same result twice is a no-op and indexing is incremental. The FTS5
+    tables use external content, keeping one copy of each text.
+    
+    Query words found in more than ``common_fraction`` of passages (at most
+    ``max_doc_fraction`` of a large index) carry almost no ranking signal
+    but make the match set (and bm25 scoring) span much of the index, so
+    they are dropped unless nothing rarer is left. A passage is returned
+    only if its bm25 score reaches ``min_relevance`` times the score of one
+    that contains every remaining query word once, so sharing a single
+    word with the query is not enough to count as related research.
+    Citations are matched the same way against their own index.
+    """
+
+    def __init__(self, path: str = DEFAULT_KNOWLEDGE_DB, max_doc_fraction: float = 0.01,
+                 common_fraction: float = 0.25, min_relevance: float = 0.3):
+        self.path = path
+        self.max_doc_fraction = max_doc_fraction
+        self.common_fraction = common_fraction
+        self.min_relevance = min_relevance
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def add_results(self, topic: str, results: Iterable[ResearchResult]) -> int:
+        """Index the passages and citations of ``results``; returns passages added."""
+        created = datetime.now().isoformat(timespec="seconds")
+        passages: List[Tuple[str, str, str]] = []
+        citations: List[Citation] = []
+        for result in results:
+            # Structured results split on their own section boundaries
+            texts = ([f"{s.heading}\n\n{s.body}\n\n" + "\n".join(c.text for c in s.claims)
+                      for s in result.sections] if result.sections else [result.content])
+            passages.extend(
+                (result.agent_type, passage, _digest(passage))
+                for text in texts for passage in split_passages(text)
+            )
+            citations.extend(result.citations)
+        with self._lock, self._conn:
+            added = 0
+            for agent_type, content, digest in passages:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO passages (hash, topic, agent_type, created, content) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (digest, topic, agent_type, created, content),
+                )
+                if cursor.rowcount:
+                    self._conn.execute(
+                        "INSERT INTO passages_fts (rowid, content) VALUES (?, ?)",
+                        (cursor.lastrowid, content),
+                    )
+                    added += 1
+            for citation in citations:
+                self._add_citation(citation)
+        return added
+
+    def search(self, text: str, k: int = 5) -> List[Passage]:
+        """Return the ``k`` passages most relevant to ``text``, best first."""
+        terms = query_terms(text)
+        if not terms or k <= 0:
+            return []
+        with self._lock:
+            terms, min_score = self._selective(terms, "passages")
+            rows = self._conn.execute(
+                "SELECT p.topic, p.agent_type, p.content, passages_fts.rank "
+                "FROM passages_fts JOIN passages p ON p.id = passages_fts.rowid "
+                "WHERE passages_fts MATCH ? ORDER BY passages_fts.rank LIMIT ?",
+                (match_query(terms), k),
+            ).fetchall()
+        # Rows come best first, so the cut keeps the k best passages that qualify
+        return [Passage(*row) for row in rows if -row[3] >= min_score]
+
+    def search_citations(self, text: str, k: int = 5) -> List[Citation]:
+        """Return the ``k`` stored citations most relevant to ``text``, filtered like ``search``."""
+        terms = query_terms(text)
+        if not terms or k <= 0:
+            return []
+        with self._lock:
+            terms, min_score = self._selective(terms, "citations")
+            rows = self._conn.execute(
+                "SELECT c.hash, c.title, c.source, c.url, c.authors, c.date, c.quote, "
+                "citations_fts.rank "
+                "FROM citations_fts JOIN citations c ON c.id = citations_fts.rowid "
+                "WHERE citations_fts MATCH ? ORDER BY citations_fts.rank LIMIT ?",
+                (match_query(terms), k),
+            ).fetchall()
+        return [
+            Citation(id=digest[:12], type="web" if url else "article", title=title,
+                     source=source, url=url, authors=[a for a in authors.split("; ") if a],
+                     date=date, quote=quote)
+            for digest, title, source, url, authors, date, quote, rank in rows
+            if -rank >= min_score
+        ]
+
+    def count(self) -> int:
+        """Number of indexed passages."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM passages").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> 'KnowledgeStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _selective(self, terms: List[str], table: str) -> Tuple[List[str], float]:
+        """Drop terms present in too many rows of ``table``, keeping at least the rarest one.
+
+        ``table`` is "passages" or "citations". Returns the terms to match and
+        the lowest bm25 score (as a positive number) a row needs to be returned.
+        """
+        total = self._conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0] or 0
+        frequencies = {}
+        for term in terms:
+            row = self._conn.execute(
+                f"SELECT doc FROM {table}_vocab WHERE term = ?", (term,)
+            ).fetchone()
+            frequencies[term] = row[0] if row else 0
+        # Large indexes cap the match set; small ones still skip words most passages share
+        limit = max(total * self.max_doc_fraction, min(1000, total * self.common_fraction))
+        selective = [t for t in terms if frequencies[t] <= limit]
+        selective = selective or [min(terms, key=frequencies.get)]
+        # bm25 of a passage of average length containing each term once, with FTS5's idf
+        ideal = sum(
+            max(1e-6, math.log((total - frequencies[t] + 0.5) / (frequencies[t] + 0.5)))
+            for t in selective
+        )
+        return selective, ideal * self.min_relevance
+    
+    def _add_citation(self, citation: Citation):
+        """Insert one citation unless an identical one is already indexed."""
+        authors = "; ".join(citation.authors)
+        digest = _digest("\x00".join([citation.title, citation.source, citation.url, citation.quote]))
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO citations (hash, title, source, url, authors, date, quote) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (digest, citation.title, citation.source, citation.url, authors,
+             citation.date, citation.quote),
+        )
+        if cursor.rowcount:
+            self._conn.execute(
+                "INSERT INTO citations_fts (rowid, title, source, quote) VALUES (?, ?, ?, ?)",
+                (cursor.lastrowid, citation.title, citation.source, citation.quote),
+            )
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
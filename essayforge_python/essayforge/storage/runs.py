@@ -0,0 +1,143 @@
+"""Content-addressed dependency graph of a topic's last run, for incremental re-runs."""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, replace
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..models import Citation, ResearchResult, TokenUsage
+from .topics import normalize_topic, result_from_dict, result_to_dict, write_json_atomic
+
+
+DEFAULT_RUNS_DIR = os.path.join(os.path.expanduser("~"), ".essayforge", "runs")
+
+
+def node_key(kind: str, *inputs) -> str:
+    """Key of a step from everything that determines its output."""
+    data = json.dumps([kind, *inputs], sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def content_digest(value: Any) -> str:
+    """Digest of a JSON value, which is also its name in the object store."""
+    data = json.dumps(value, sort_keys=True)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def result_to_json(result: ResearchResult) -> Dict:
+    """A result as stored in the graph; usage is left out since a recalled result costs nothing."""
+    return result_to_dict(replace(result, tokens_used=TokenUsage()))
+
+
+def result_from_json(data: Dict) -> ResearchResult:
+    """Rebuild a result stored by ``result_to_json``."""
+    return result_from_dict(data)
+
+
+def citations_to_json(citations: Sequence[Citation]) -> List[Dict]:
+    """Citations as stored in the graph, access dates as ISO strings."""
+    return [dict(asdict(c), access_date=c.access_date.isoformat()) for c in citations]
+
+
+def citations_from_json(data: List[Dict]) -> List[Citation]:
+    """Rebuild citations stored by ``citations_to_json``."""
+    return [Citation(**dict(c, access_date=datetime.fromisoformat(c["access_date"]))) for c in data]
+
+
+class RunGraph:
+    """The steps of a topic's latest run, each keyed by its inputs and pointing at its output.
+
+    A node is one step: an agent call, the synthesis, the refinement or the
+    formatted output. Its key hashes every input that determines the
+    output, including the outputs of the nodes it depends on, and the
+    output itself is stored once under its own digest. Before running a
+    step the orchestrator asks ``recall`` for the output the previous run
+    produced under the same key; only on a miss does it run the step and
+    ``record`` the result. ``save`` replaces the topic's graph with this
+    run's and drops outputs no node refers to any more. With ``reuse``
+    false nothing is recalled, but the run is still recorded for the next.
+    """
+
+    def __init__(self, directory: Optional[str], topic: str, reuse: bool = True):
+        topic_id = hashlib.sha256(normalize_topic(topic).encode("utf-8")).hexdigest()[:16]
+        self.directory = os.path.join(directory or DEFAULT_RUNS_DIR, topic_id)
+        self.previous: Dict[str, Dict] = {}  # Node name -> {"key", "output", "deps"}
+        self.nodes: Dict[str, Dict] = {}
+        self.reused: List[str] = []
+        self.executed: List[str] = []
+        self._outputs: Dict[str, str] = {}  # Key -> output digest, from the previous run
+        self._lock = threading.Lock()
+        self._load(reuse)
+
+    def recall(self, name: str, key: str, deps: Sequence[str] = ()) -> Optional[Any]:
+        """The previous run's output for ``key``, or None if the step has to run."""
+        digest = self._outputs.get(key)
+        if digest is None:
+            return None
+        try:
+            with open(self._object_path(digest), encoding='utf-8') as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            self.nodes[name] = {"key": key, "output": digest, "deps": list(deps)}
+            self.reused.append(name)
+        return value
+
+    def record(self, name: str, key: str, value: Any, deps: Sequence[str] = ()) -> str:
+        """Store the output of a step that ran; returns its digest.
+
+        The node is added before the output is written, so a failed write
+        (an OSError) only means the next run has to run the step again.
+        """
+        digest = content_digest(value)
+        with self._lock:
+            self.nodes[name] = {"key": key, "output": digest, "deps": list(deps)}
+            self.executed.append(name)
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_json_atomic(path, value)
+        return digest
+
+    def output(self, name: str) -> str:
+        """Output digest of a node of this run, for the keys of the nodes that depend on it."""
+        return self.nodes[name]["output"]
+
+    def invalidated(self) -> List[str]:
+        """Nodes of the previous run whose inputs changed or that this run no longer has."""
+        return [
+            name for name, node in self.previous.items()
+            if self.nodes.get(name, {}).get("key") != node["key"]
+        ]
+
+    def save(self):
+        """Make this run the one the next run is compared with."""
+        os.makedirs(os.path.join(self.directory, "objects"), exist_ok=True)
+        write_json_atomic(os.path.join(self.directory, "graph.json"), {
+            "saved_at": datetime.now().isoformat(),
+            "nodes": self.nodes,
+        })
+        live = {node["output"] for node in self.nodes.values()}
+        objects = os.path.join(self.directory, "objects")
+        for filename in os.listdir(objects):
+            if filename.endswith(".json") and filename[:-len(".json")] not in live:
+                try:
+                    os.remove(os.path.join(objects, filename))
+                except OSError:
+                    pass
+
+    def _load(self, reuse: bool):
+        try:
+            with open(os.path.join(self.directory, "graph.json"), encoding='utf-8') as f:
+                self.previous = json.load(f).get("nodes", {})
+        except (OSError, ValueError):
+            self.previous = {}
+        if reuse:
+            self._outputs = {node["key"]: node["output"] for node in self.previous.values()}
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", f"{digest}.json")
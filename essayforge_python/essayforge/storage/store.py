@@ -0,0 +1,205 @@
+"""Spill-to-disk storage for large research text bodies."""
+
+import json
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from ..models import Citation, Claim, ResearchResult, ResearchSection, TokenUsage
+
+
+class TextRef:
+    """Location of one text body: inline, or a slice of a segment file."""
+    
+    __slots__ = ('segment', 'offset', 'length', 'compressed', 'inline')
+    
+    def __init__(self, segment: int = -1, offset: int = 0, length: int = 0,
+                 compressed: bool = False, inline: Optional[str] = None):
+        self.segment = segment
+        self.offset = offset
+        self.length = length
+        self.compressed = compressed
+        self.inline = inline
+
+
+class ResultStore:
+    """Append-only segment files holding text bodies, read back through mmap.
+    
+    Bodies shorter than ``inline_threshold`` characters stay in memory; larger
+    ones are (optionally zlib-compressed and) appended to the current segment
+    file, which rolls over once it passes ``segment_size`` bytes. Reads map
+    the segment lazily and decode only the requested slice, so keeping
+    thousands of results costs one small TextRef each.
+    """
+    
+    def __init__(self, directory: Optional[str] = None, compress: bool = True,
+                 segment_size: int = 64 * 1024 * 1024, inline_threshold: int = 2048):
+        self._owns_directory = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix="essayforge-results-")
+        os.makedirs(self.directory, exist_ok=True)
+        self.compress = compress
+        self.segment_size = segment_size
+        self.inline_threshold = inline_threshold
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+        self._segment = -1
+        self._segment_bytes = 0
+        self._fd: Optional[int] = None
+        self._maps: Dict[int, mmap.mmap] = {}
+    
+    def put(self, text: str) -> TextRef:
+        """Store a text body and return a reference to it."""
+        if len(text) < self.inline_threshold:
+            return TextRef(inline=text)
+        data = text.encode("utf-8")
+        if self.compress:
+            data = zlib.compress(data, 1)
+        with self._lock:
+            if self._fd is None or self._segment_bytes >= self.segment_size:
+                self._open_segment()
+            offset = self._segment_bytes
+            os.write(self._fd, data)
+            self._segment_bytes += len(data)
+            self.bytes_written += len(data)
+            return TextRef(self._segment, offset, len(data), self.compress)
+    
+    def get(self, ref: TextRef) -> str:
+        """Read a text body back from memory or its segment."""
+        if ref.inline is not None:
+            return ref.inline
+        with self._lock:
+            view = self._map(ref.segment, ref.offset + ref.length)
+            data = view[ref.offset:ref.offset + ref.length]
+        if ref.compressed:
+            data = zlib.decompress(data)
+        return data.decode("utf-8")
+    
+    def close(self):
+        """Release maps and file handles; remove the directory if it was temporary."""
+        with self._lock:
+            for view in self._maps.values():
+                view.close()
+            self._maps.clear()
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def __enter__(self) -> 'ResultStore':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"segment-{segment:05d}.dat")
+    
+    def _open_segment(self):
+        if self._fd is not None:
+            os.close(self._fd)
+        self._segment += 1
+        self._segment_bytes = 0
+        self._fd = os.open(self._segment_path(self._segment),
+                           os.O_CREAT | os.O_WRONLY | os.O_APPEND | getattr(os, 'O_BINARY', 0), 0o600)
+    
+    def _map(self, segment: int, needed: int) -> mmap.mmap:
+        """Return a read-only map of a segment covering at least ``needed`` bytes."""
+        view = self._maps.get(segment)
+        if view is None or len(view) < needed:
+            if view is not None:
+                view.close()
+            with open(self._segment_path(segment), 'rb') as f:
+                view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = view
+        return view
+
+
+class ResultRecord:
+    """Slim in-memory metadata for a ResearchResult whose content lives in a store.
+    
+    Exposes the same attributes as ResearchResult; ``content`` and the
+    structured ``sections`` are read from the store on each access and are
+    not cached.
+    """
+    
+    __slots__ = ('store', 'ref', 'agent_id', 'agent_type', 'citations',
+                 'tokens_used', 'timestamp', 'score', 'quality_score', 'sections_ref',
+                 'confidence')
+    
+    def __init__(self, store: ResultStore, ref: TextRef, agent_id: str, agent_type: str,
+                 citations: List[Citation], tokens_used: TokenUsage, timestamp: datetime,
+                 score: float, quality_score: float, sections_ref: Optional[TextRef] = None,
+                 confidence: float = 0.0):
+        self.store = store
+        self.ref = ref
+        self.agent_id = agent_id
+        self.agent_type = agent_type
+        self.citations = citations
+        self.tokens_used = tokens_used
+        self.timestamp = timestamp
+        self.score = score
+        self.quality_score = quality_score
+        self.sections_ref = sections_ref
+        self.confidence = confidence
+    
+    @classmethod
+    def from_result(cls, store: ResultStore, result: ResearchResult) -> 'ResultRecord':
+        """Move a result's content into the store and keep only its metadata."""
+        return cls(
+            store=store,
+            ref=store.put(result.content),
+            agent_id=result.agent_id,
+            agent_type=result.agent_type,
+            citations=result.citations,
+            tokens_used=result.tokens_used,
+            timestamp=result.timestamp,
+            score=result.score,
+            quality_score=result.quality_score,
+            sections_ref=(store.put(json.dumps([asdict(s) for s in result.sections]))
+                          if result.sections else None),
+            confidence=result.confidence,
+        )
+    
+    @property
+    def content(self) -> str:
+        return self.store.get(self.ref)
+    
+    @property
+    def sections(self) -> List[ResearchSection]:
+        if self.sections_ref is None:
+            return []
+        return sections_from_json(json.loads(self.store.get(self.sections_ref)))
+    
+    def to_result(self) -> ResearchResult:
+        """Materialize a full ResearchResult, loading the content."""
+        return ResearchResult(
+            agent_id=self.agent_id,
+            agent_type=self.agent_type,
+            content=self.content,
+            citations=self.citations,
+            tokens_used=self.tokens_used,
+            timestamp=self.timestamp,
+            score=self.score,
+            quality_score=self.quality_score,
+            sections=self.sections,
+            confidence=self.confidence,
+        )
+
+
+def sections_from_json(data: List[Dict]) -> List[ResearchSection]:
+    """Rebuild ResearchSections from their ``asdict`` form."""
+    return [
+        ResearchSection(
+            heading=section["heading"],
+            body=section.get("body", ""),
+            claims=[Claim(**claim) for claim in section.get("claims", [])],
+        )
+        for section in data
+    ]
@@ -0,0 +1,202 @@
+"""Persistent index of past topics for reusing research on near-identical ones."""
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from ..models import Citation, ResearchResult, TokenUsage
+from .store import sections_from_json
+
+
+DEFAULT_TOPIC_INDEX_DIR = os.path.join(os.path.expanduser("~"), ".essayforge", "topics")
+
+# Words that change a topic's phrasing but not what it is about
+_STOP_WORDS = frozenset(
+    "a an and as at by for from in into its of on or s the to with".split()
+)
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_WORD = re.compile(r"[A-Za-z0-9]+")
+_ROMAN_NUMERAL = re.compile(r"[IVXLC]+")
+_ORDINALS = frozenset(
+    "first second third fourth fifth sixth seventh eighth ninth tenth eleventh twelfth "
+    "thirteenth fourteenth fifteenth sixteenth seventeenth eighteenth nineteenth twentieth".split()
+)
+
+
+def normalize_topic(topic: str) -> str:
+    """Lower-case, strip punctuation and stop words, and collapse whitespace."""
+    words = _NON_ALNUM.sub(" ", topic.lower().replace("'s", " ")).split()
+    return " ".join(word for word in words if word not in _STOP_WORDS)
+
+
+def significant_terms(topic: str) -> FrozenSet[str]:
+    """Words that name what a topic is about and that no near-miss may change.
+
+    Numerals, ordinals, Roman numerals and capitalized words (proper nouns
+    and acronyms; a first word counts only if capitals follow its first
+    letter). "World War I" and "World War II" share most of their trigrams
+    but not these, and neither do "Roman Empire" and "Ottoman Empire".
+    """
+    terms = set()
+    for position, word in enumerate(_WORD.findall(topic.replace("'s", " "))):
+        lower = word.lower()
+        if (any(c.isdigit() for c in word) or lower in _ORDINALS
+                or _ROMAN_NUMERAL.fullmatch(word)
+                or any(c.isupper() for c in (word[1:] if position == 0 else word))):
+            terms.add(lower)
+    return frozenset(terms)
+
+
+def ngram_vector(text: str, n: int = 3) -> Counter:
+    """Character n-gram counts of ``text`` with spaces removed.
+
+    Dropping spaces makes "health care" and "healthcare" share their grams.
+    """
+    text = text.replace(" ", "")
+    if len(text) < n:
+        return Counter([text]) if text else Counter()
+    return Counter(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+def cosine_similarity(a: Counter, b: Counter) -> float:
+    """Cosine similarity of two n-gram count vectors, 0-1."""
+    if not a or not b:
+        return 0.0
+    if len(a) > len(b):
+        a, b = b, a
+    dot = sum(count * b[gram] for gram, count in a.items())
+    norm = math.sqrt(sum(c * c for c in a.values()) * sum(c * c for c in b.values()))
+    return dot / norm
+
+
+class TopicMatch:
+    """A past topic similar to the requested one."""
+
+    __slots__ = ('topic', 'similarity', 'entry_id', 'created')
+
+    def __init__(self, topic: str, similarity: float, entry_id: str, created: str):
+        self.topic = topic
+        self.similarity = similarity
+        self.entry_id = entry_id
+        self.created = created
+
+    def same_subject(self, topic: str) -> bool:
+        """Whether ``topic`` names the same things as the match, however similar they look."""
+        return significant_terms(self.topic) == significant_terms(topic)
+
+
+class TopicIndex:
+    """Past topics and their research results, stored as JSON in ``directory``.
+
+    ``index.json`` lists every topic with its normalized form; each topic's
+    results live in their own file so lookups never read result bodies.
+    Topics that normalize to the same text share one entry, newest wins.
+    """
+
+    def __init__(self, directory: str = DEFAULT_TOPIC_INDEX_DIR, ngram: int = 3):
+        self.directory = directory
+        self.ngram = ngram
+        self.entries: Dict[str, Dict[str, str]] = {}
+        self._vectors: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def find(self, topic: str) -> Optional[TopicMatch]:
+        """Return the most similar past topic, or None if the index is empty."""
+        vector = ngram_vector(normalize_topic(topic), self.ngram)
+        best: Optional[Tuple[float, str]] = None
+        with self._lock:
+            for entry_id, entry_vector in self._vectors.items():
+                similarity = cosine_similarity(vector, entry_vector)
+                if best is None or similarity > best[0]:
+                    best = (similarity, entry_id)
+            if best is None:
+                return None
+            entry = self.entries[best[1]]
+        return TopicMatch(entry["topic"], best[0], best[1], entry["created"])
+
+    def results(self, entry_id: str) -> List[ResearchResult]:
+        """Load the stored results of one past topic."""
+        try:
+            with open(self._results_path(entry_id), encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return []
+        return [result_from_dict(item) for item in data.get("results", [])]
+
+    def add(self, topic: str, results: List[ResearchResult]):
+        """Store ``topic`` and its results, replacing an entry with the same normalized topic."""
+        normalized = normalize_topic(topic)
+        entry_id = hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+        os.makedirs(self.directory, exist_ok=True)
+        write_json_atomic(self._results_path(entry_id),
+                    {"results": [result_to_dict(result) for result in results]})
+        with self._lock:
+            self.entries[entry_id] = {
+                "topic": topic,
+                "normalized": normalized,
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "agents": [result.agent_type for result in results],
+            }
+            self._vectors[entry_id] = ngram_vector(normalized, self.ngram)
+            index = {"topics": self.entries}
+            write_json_atomic(os.path.join(self.directory, "index.json"), index)
+
+    def _load(self):
+        """Read ``index.json``, ignoring a missing or corrupt file."""
+        try:
+            with open(os.path.join(self.directory, "index.json"), encoding='utf-8') as f:
+                self.entries = json.load(f).get("topics", {})
+        except (OSError, ValueError):
+            return
+        self._vectors = {
+            entry_id: ngram_vector(entry["normalized"], self.ngram)
+            for entry_id, entry in self.entries.items()
+        }
+
+    def _results_path(self, entry_id: str) -> str:
+        return os.path.join(self.directory, f"{entry_id}.json")
+
+
+def write_json_atomic(path: str, data):
+    """Write JSON atomically so a crash never leaves a half-written file."""
+    temporary = path + ".tmp"
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(temporary, path)
+
+
+def result_to_dict(result: ResearchResult) -> Dict:
+    """A result as JSON-serializable data, dates as ISO strings."""
+    data = asdict(result)
+    data["timestamp"] = result.timestamp.isoformat()
+    for citation in data["citations"]:
+        citation["access_date"] = citation["access_date"].isoformat()
+    return data
+
+
+def result_from_dict(data: Dict) -> ResearchResult:
+    """Rebuild a result written by ``result_to_dict``."""
+    citations = [
+        Citation(**dict(c, access_date=datetime.fromisoformat(c["access_date"])))
+        for c in data.get("citations", [])
+    ]
+    return ResearchResult(
+        agent_id=data["agent_id"],
+        agent_type=data["agent_type"],
+        content=data["content"],
+        citations=citations,
+        tokens_used=TokenUsage(**data.get("tokens_used", {})),
+        timestamp=datetime.fromisoformat(data["timestamp"]),
+        score=data.get("score", 0.0),
+        quality_score=data.get("quality_score", 0.0),
+        sections=sections_from_json(data.get("sections", [])),
+        confidence=data.get("confidence", 0.0),
+    )
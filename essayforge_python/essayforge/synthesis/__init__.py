@@ -1,5 +1,17 @@
 """Synthesis package for combining research results."""
 
-from .synthesis import Synthesizer
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .synthesis import Synthesizer
+
+# Submodules are imported on first attribute access to keep startup fast
+_EXPORTS = {
+    'Synthesizer': '.synthesis'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = ['Synthesizer']
\ No newline at end of file
@@ -1,14 +1,30 @@
 """Synthesis module for combining research results into essays."""
 
-from typing import List
+import re
+from typing import Dict, List, Set, Tuple
 
-from ..models import ResearchResult, Essay
+from ..agents.structured import citation_marks, format_citation
+from ..models import Citation, ResearchResult, Essay
+from ..tracing import NULL_TRACER
+
+
+def citation_key(citation: Citation) -> str:
+    """Identity of a source across agents: its URL without scheme or ``www``, else title and source."""
+    if citation.url:
+        url = re.sub(r'^https?://(www\.)?', '', citation.url.strip().lower())
+        return url.rstrip('/')
+    return re.sub(r'\W+', ' ', f"{citation.title} {citation.source}".lower()).strip()
+
+
+def claim_key(text: str) -> str:
+    return re.sub(r'\W+', ' ', text.lower()).strip()
 
 
 class Synthesizer:
     """Synthesizes research results into a coherent essay."""
     
-    def __init__(self):
+    def __init__(self, tracer=NULL_TRACER):
+        self.tracer = tracer
         self.synthesis_prompt_template = """
 You are an expert research synthesizer. Your task is to combine multiple research perspectives into a coherent, well-structured essay.
 
@@ -37,54 +53,121 @@ Structure the essay with:
         # In a real implementation, this would use Claude API
         # For now, return a placeholder
         
-        research_content = self._format_research_results(results)
-        prompt = self.synthesis_prompt_template.format(
-            topic=topic,
-            research_content=research_content
-        )
+        with self.tracer.span("synthesis.prompt", "synthesis", results=len(results)):
+            research_content = self._format_research_results(results)
+            prompt = self.synthesis_prompt_template.format(
+                topic=topic,
+                research_content=research_content
+            )
         
         # Placeholder synthesis
-        return self._create_placeholder_essay(topic, results)
+        with self.tracer.span("synthesis.compose", "synthesis"):
+            return self._create_placeholder_essay(topic, results)
+    
+    def merge_citations(self, results: List[ResearchResult]) -> Tuple[List[Citation], List[Dict[str, int]]]:
+        """Deduplicate citations across results.
+        
+        Returns the distinct citations, numbered from 1 in first-cited
+        order, and for each result a map from its own citation ids to those
+        numbers.
+        """
+        merged: List[Citation] = []
+        numbers: Dict[str, int] = {}
+        maps = []
+        for result in results:
+            local = {}
+            for citation in result.citations:
+                key = citation_key(citation)
+                if key not in numbers:
+                    merged.append(citation)
+                    numbers[key] = len(merged)
+                local[citation.id] = numbers[key]
+            maps.append(local)
+        return merged, maps
+    
+    def compose_structured(self, result: ResearchResult, numbers: Dict[str, int],
+                           seen_claims: Set[str]) -> str:
+        """Markdown for one structured result with essay-wide citation numbers.
+        
+        Claims already made by an earlier agent are left out and added to
+        ``seen_claims`` otherwise.
+        """
+        parts = []
+        for section in result.sections:
+            if section.heading:
+                parts.append(f"### {section.heading}\n\n")
+            if section.body:
+                parts.append(f"{section.body}\n\n")
+            claims = []
+            for claim in section.claims:
+                key = claim_key(claim.text)
+                if key in seen_claims:
+                    continue
+                seen_claims.add(key)
+                claims.append(f"- {claim.text}{citation_marks(claim, numbers)}\n")
+            if claims:
+                parts.extend(claims)
+                parts.append("\n")
+        return "".join(parts)
+    
+    def format_references(self, citations: List[Citation]) -> str:
+        """The numbered reference list for ``citations``."""
+        return "".join(f"{i}. {format_citation(c)}\n" for i, c in enumerate(citations, 1))
     
     def _format_research_results(self, results: List[ResearchResult]) -> str:
         """Format research results for the synthesis prompt."""
+        citations, maps = self.merge_citations(results)
+        seen: Set[str] = set()
         formatted = []
-        for result in results:
-            formatted.append(f"### {result.agent_type}\n{result.content}\n")
+        for result, numbers in zip(results, maps):
+            content = (self.compose_structured(result, numbers, seen) if result.sections
+                       else result.content)
+            formatted.append(f"### {result.agent_type}\n{content}\n")
+        if citations:
+            formatted.append(f"### Sources\n{self.format_references(citations)}")
         return "\n".join(formatted)
     
     def _create_placeholder_essay(self, topic: str, results: List[ResearchResult]) -> str:
         """Create a placeholder essay structure."""
-        essay = f"# {topic}\n\n"
-        essay += "## Abstract\n\n"
-        essay += f"This comprehensive analysis examines {topic} from multiple perspectives, "
-        essay += "integrating findings from specialized research agents to provide "
-        essay += "a thorough understanding of the subject.\n\n"
+        # Collect parts and join once, so the essay is not copied as it grows
+        essay = [f"# {topic}\n\n"]
+        essay.append("## Abstract\n\n")
+        essay.append(
+            f"This comprehensive analysis examines {topic} from multiple perspectives, "
+            "integrating findings from specialized research agents to provide "
+            "a thorough understanding of the subject.\n\n"
+        )
         
-        essay += "## Introduction\n\n"
-        essay += f"The topic of {topic} represents a significant area of study that "
-        essay += "warrants careful examination from various angles. This essay synthesizes "
-        essay += "research from multiple specialized perspectives to provide a comprehensive "
-        essay += "understanding of the subject matter.\n\n"
+        essay.append("## Introduction\n\n")
+        essay.append(
+            f"The topic of {topic} represents a significant area of study that "
+            "warrants careful examination from various angles. This essay synthesizes "
+            "research from multiple specialized perspectives to provide a comprehensive "
+            "understanding of the subject matter.\n\n"
+        )
         
         # Add sections from research results
-        for i, result in enumerate(results, 1):
+        for result in results:
             section_title = result.agent_type.replace('-', ' ').title()
-            essay += f"## {section_title}\n\n"
-            essay += f"{result.content}\n\n"
+            essay.append(f"## {section_title}\n\n")
+            essay.append(f"{result.content}\n\n")
         
-        essay += "## Synthesis and Analysis\n\n"
-        essay += "The diverse perspectives presented above reveal the multifaceted nature "
-        essay += f"of {topic}. By integrating these various viewpoints, we can develop "
-        essay += "a more nuanced understanding of the subject.\n\n"
+        essay.append("## Synthesis and Analysis\n\n")
+        essay.append(
+            "The diverse perspectives presented above reveal the multifaceted nature "
+            f"of {topic}. By integrating these various viewpoints, we can develop "
+            "a more nuanced understanding of the subject.\n\n"
+        )
         
-        essay += "## Conclusion\n\n"
-        essay += f"This comprehensive examination of {topic} demonstrates the importance "
-        essay += "of approaching complex topics from multiple angles. The synthesis of "
-        essay += "these perspectives provides valuable insights that would not be apparent "
-        essay += "from any single viewpoint alone.\n\n"
+        essay.append("## Conclusion\n\n")
+        essay.append(
+            f"This comprehensive examination of {topic} demonstrates the importance "
+            "of approaching complex topics from multiple angles. The synthesis of "
+            "these perspectives provides valuable insights that would not be apparent "
+            "from any single viewpoint alone.\n\n"
+        )
         
-        essay += "## References\n\n"
-        essay += "[References would be listed here]\n"
+        essay.append("## References\n\n")
+        essay.append("[References would be listed here]\n")
         
-        return essay
\ No newline at end of file
+        return "".join(essay)
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""Tracing package for per-phase and per-agent timing spans."""
+
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .profiler import NULL_PROFILER, NullProfiler, PhaseProfile, PhaseProfiler
+    from .tracer import NULL_TRACER, NullTracer, Span, Tracer
+
+# Submodules are imported on first attribute access to keep startup fast
+_EXPORTS = {
+    'NULL_PROFILER': '.profiler',
+    'NullProfiler': '.profiler',
+    'PhaseProfile': '.profiler',
+    'PhaseProfiler': '.profiler',
+    'NULL_TRACER': '.tracer',
+    'NullTracer': '.tracer',
+    'Span': '.tracer',
+    'Tracer': '.tracer'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = ['NULL_PROFILER', 'NullProfiler', 'PhaseProfile', 'PhaseProfiler',
+           'NULL_TRACER', 'NullTracer', 'Span', 'Tracer']
\ No newline at end of file
@@ -0,0 +1,200 @@
+"""Per-phase CPU (cProfile) and memory (tracemalloc) profiling of a run."""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from typing import List
+
+
+# Frames of the profilers themselves, left out of allocation reports
+_ALLOCATION_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+# Built-ins where threads block waiting for others; their time is idle, not hot
+_BLOCKING = frozenset((
+    "<method 'acquire' of '_thread.lock' objects>",
+    "<method 'acquire' of '_thread.RLock' objects>",
+    "<method 'get' of '_queue.SimpleQueue' objects>",
+    "<built-in method time.sleep>",
+    "<built-in method select.select>",
+    "<method 'poll' of 'select.poll' objects>",
+))
+
+
+class _NullPhase:
+    """Phase stand-in used when profiling is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullPhase':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class NullProfiler:
+    """Profiler that measures nothing; ``phase`` returns a shared no-op context."""
+
+    enabled = False
+
+    def phase(self, name: str) -> _NullPhase:
+        return _NULL_PHASE
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class PhaseProfile:
+    """Measurements of one profiled phase."""
+
+    def __init__(self, name: str, wall: float, cpu: float, peak_memory: int,
+                 stats: pstats.Stats, allocations: List[tracemalloc.Statistic]):
+        self.name = name
+        self.wall = wall
+        self.cpu = cpu  # Process CPU seconds, all threads
+        self.peak_memory = peak_memory  # Peak traced Python allocation, bytes
+        self.stats = stats
+        self.allocations = allocations
+
+
+class _Phase:
+    """Profiles the enclosed block, including threads it starts.
+
+    cProfile only sees the thread that enables it, so before Python 3.12
+    every thread started inside the phase (the agent and critic pools)
+    gets its own profiler through ``threading.setprofile`` and their stats
+    are merged. From 3.12 one profiler already covers every thread.
+    Threads that existed before the phase, such as a shared scheduler's
+    workers, are not profiled there.
+    """
+
+    def __init__(self, profiler: 'PhaseProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._own_tracing = False
+
+    def __enter__(self) -> '_Phase':
+        self._own_tracing = not tracemalloc.is_tracing()
+        if self._own_tracing:
+            tracemalloc.start()
+        if sys.version_info < (3, 12):
+            threading.setprofile(self._profile_thread)
+        self._main = cProfile.Profile()
+        self._wall, self._cpu = time.perf_counter(), time.process_time()
+        self._main.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._main.disable()
+        wall, cpu = time.perf_counter() - self._wall, time.process_time() - self._cpu
+        if sys.version_info < (3, 12):
+            threading.setprofile(None)
+        snapshot = tracemalloc.take_snapshot().filter_traces(_ALLOCATION_FILTERS)
+        peak = tracemalloc.get_traced_memory()[1]
+        if self._own_tracing:
+            tracemalloc.stop()
+        stats = pstats.Stats(self._main, stream=io.StringIO())
+        with self._lock:
+            for profile in self._profiles:
+                stats.add(profile)
+        self.profiler._finish(PhaseProfile(
+            self.name, wall, cpu, peak, stats,
+            snapshot.statistics("lineno")[:self.profiler.top],
+        ))
+        return False
+
+    def _profile_thread(self, frame, event, arg):
+        """First profile event of a new thread: hand the thread to its own cProfile."""
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        with self._lock:
+            self._profiles.append(profile)
+        profile.enable()
+
+
+class PhaseProfiler:
+    """Profiles named phases and writes their reports to ``directory``.
+
+    For each phase ``<n>-<phase>.pstats`` holds the cProfile stats (open
+    with ``python -m pstats`` or snakeviz) and ``<n>-<phase>-alloc.txt``
+    the ``top`` source lines by memory allocated and still held at the end
+    of the phase. ``format_summary`` condenses all phases to one screen.
+    """
+
+    enabled = True
+
+    def __init__(self, directory: str, top: int = 20):
+        self.directory = directory
+        self.top = top
+        self.phases: List[PhaseProfile] = []
+        os.makedirs(directory, exist_ok=True)
+
+    def phase(self, name: str) -> _Phase:
+        """Return a context manager that profiles the enclosed block as ``name``."""
+        return _Phase(self, name)
+
+    def format_summary(self, functions: int = 8, allocators: int = 5) -> str:
+        """Phase totals, the hottest functions and the biggest allocators."""
+        lines = [f"{'Phase':<14} {'Wall':>8} {'CPU':>8} {'Peak mem':>10} {'Calls':>10}"]
+        lines.append("-" * len(lines[0]))
+        for phase in self.phases:
+            lines.append(f"{phase.name:<14} {phase.wall:>7.2f}s {phase.cpu:>7.2f}s "
+                         f"{phase.peak_memory / 1e6:>8.1f}MB {phase.stats.total_calls:>10,}")
+
+        combined = pstats.Stats(stream=io.StringIO())
+        for phase in self.phases:
+            combined.add(phase.stats)
+        if combined.stats:
+            lines.append("")
+            lines.append(f"{'Hottest functions (excluding waits)':<52} "
+                         f"{'Calls':>9} {'Own':>8} {'Cumul':>8}")
+            rows = sorted(
+                (item for item in combined.stats.items() if item[0][2] not in _BLOCKING),
+                key=lambda item: item[1][2], reverse=True,
+            )
+            for (path, line, function), (_, calls, own, cumulative, _) in rows[:functions]:
+                where = f"{function} ({os.path.basename(path)}:{line})"
+                lines.append(f"{where[:52]:<52} {calls:>9,} {own:>7.3f}s {cumulative:>7.3f}s")
+
+        allocations = sorted(
+            ((stat, phase.name) for phase in self.phases for stat in phase.allocations),
+            key=lambda item: item[0].size, reverse=True,
+        )
+        if allocations:
+            lines.append("")
+            lines.append(f"{'Biggest allocators':<52} {'Phase':>12} {'Size':>10}")
+            for stat, phase_name in allocations[:allocators]:
+                frame = stat.traceback[0]
+                where = f"{os.path.basename(frame.filename)}:{frame.lineno}"
+                lines.append(f"{where:<52} {phase_name:>12} {stat.size / 1e3:>8.1f}kB")
+        return "\n".join(lines)
+
+    def _finish(self, phase: PhaseProfile):
+        """Keep a finished phase and write its report files."""
+        self.phases.append(phase)
+        prefix = os.path.join(self.directory, f"{len(self.phases):02d}-{phase.name}")
+        # Runs inside the phase's __exit__, where an error would replace the phase's own
+        try:
+            phase.stats.dump_stats(prefix + ".pstats")
+            with open(prefix + "-alloc.txt", "w", encoding="utf-8") as f:
+                f.write(f"Top {len(phase.allocations)} allocations held at the end of {phase.name} "
+                        f"(peak {phase.peak_memory / 1e6:.1f} MB)\n\n")
+                for stat in phase.allocations:
+                    f.write(f"{stat}\n")
+        except OSError as e:
+            print(f"Could not write the {phase.name} profile report: {e}")
@@ -0,0 +1,178 @@
+"""Lightweight span tracing with Chrome trace-event export."""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class Span:
+    """A timed interval with arbitrary key/value annotations."""
+    
+    __slots__ = ('tracer', 'name', 'category', 'start', 'end', 'tid', 'args')
+    
+    def __init__(self, tracer: 'Tracer', name: str, category: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.start = 0.0
+        self.end = 0.0
+        self.tid = 0
+        self.args = args
+    
+    def set(self, **args):
+        """Attach annotations (tokens, cache hits, retries, ...) to the span."""
+        self.args.update(args)
+    
+    @property
+    def duration(self) -> float:
+        """Span duration in seconds."""
+        return self.end - self.start
+    
+    def __enter__(self) -> 'Span':
+        self.tid = threading.get_ident()
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        if exc_type is not None:
+            self.args['error'] = f"{exc_type.__name__}: {exc}"
+        self.tracer._record(self)
+        return False
+
+
+class _NullSpan:
+    """Span stand-in used when tracing is disabled."""
+    
+    __slots__ = ()
+    
+    def set(self, **args):
+        pass
+    
+    def __enter__(self) -> '_NullSpan':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullTracer:
+    """Tracer that records nothing; every call is a constant-time no-op."""
+    
+    enabled = False
+    
+    def span(self, name: str, category: str = "", **args) -> _NullSpan:
+        return _NULL_SPAN
+    
+    def record(self, name: str, start: float, end: float, category: str = "", **args):
+        pass
+    
+    def now(self) -> float:
+        return 0.0
+
+
+NULL_TRACER = NullTracer()
+
+
+class Tracer:
+    """Collects spans from any thread and exports them as Chrome trace events.
+    
+    Timestamps come from ``time.perf_counter`` and are reported relative to
+    the tracer's creation, in microseconds, as the trace-event format expects.
+    """
+    
+    enabled = True
+    
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._thread_names: Dict[int, str] = {}
+    
+    def span(self, name: str, category: str = "", **args) -> Span:
+        """Return a context manager that times the enclosed block."""
+        return Span(self, name, category, args)
+    
+    def record(self, name: str, start: float, end: float, category: str = "", **args):
+        """Record an interval measured elsewhere (e.g. time spent queued)."""
+        span = Span(self, name, category, args)
+        span.start, span.end = start, end
+        span.tid = threading.get_ident()
+        self._record(span)
+    
+    def now(self) -> float:
+        """Current timestamp on the tracer's clock."""
+        return time.perf_counter()
+    
+    def _record(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+            if span.tid not in self._thread_names:
+                self._thread_names[span.tid] = threading.current_thread().name
+    
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Return the collected spans in Chrome trace-event (JSON object) format."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+            thread_names = dict(self._thread_names)
+        tids = {ident: i for i, ident in enumerate(thread_names, 1)}
+        
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tids[ident],
+             "args": {"name": name}}
+            for ident, name in thread_names.items()
+        ]
+        for span in spans:
+            events.append({
+                "name": span.name,
+                "cat": span.category or "default",
+                "ph": "X",
+                "ts": round((span.start - self.origin) * 1e6, 3),
+                "dur": round(span.duration * 1e6, 3),
+                "pid": pid,
+                "tid": tids.get(span.tid, 0),
+                "args": span.args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+    
+    def write(self, path: str):
+        """Write the trace to ``path``; open it in chrome://tracing or Perfetto."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+    
+    def summary(self) -> List[Dict[str, Any]]:
+        """Aggregate span durations by name, longest total first."""
+        groups: Dict[str, List[float]] = {}
+        with self._lock:
+            for span in self.spans:
+                groups.setdefault(span.name, []).append(span.duration)
+        rows = []
+        for name, durations in groups.items():
+            durations.sort()
+            rows.append({
+                "name": name,
+                "count": len(durations),
+                "total": sum(durations),
+                "mean": sum(durations) / len(durations),
+                "p50": durations[len(durations) // 2],
+                "max": durations[-1],
+            })
+        rows.sort(key=lambda row: row["total"], reverse=True)
+        return rows
+    
+    def format_summary(self, limit: Optional[int] = None) -> str:
+        """Render the per-phase summary as a fixed-width table."""
+        lines = [f"{'Span':<28} {'Count':>6} {'Total':>9} {'Mean':>9} {'P50':>9} {'Max':>9}"]
+        lines.append("-" * len(lines[0]))
+        for row in self.summary()[:limit]:
+            lines.append(
+                f"{row['name']:<28} {row['count']:>6} {row['total']:>8.3f}s "
+                f"{row['mean']:>8.3f}s {row['p50']:>8.3f}s {row['max']:>8.3f}s"
+            )
+        return "\n".join(lines)
@@ -1,5 +1,19 @@
 """UI package for EssayForge dashboard and progress display."""
 
-from .dashboard import Dashboard
+from typing import TYPE_CHECKING
 
-__all__ = ['Dashboard']
\ No newline at end of file
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .dashboard import Dashboard
+    from .live_dashboard import LiveDashboard
+
+# Submodules are imported on first attribute access to keep startup fast
+_EXPORTS = {
+    'Dashboard': '.dashboard',
+    'LiveDashboard': '.live_dashboard'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = ['Dashboard', 'LiveDashboard']
\ No newline at end of file
@@ -13,6 +13,7 @@ class Dashboard:
     def __init__(self):
         self.last_update = time.time()
         self.last_stage = ""
+        self.closed = False
         
     def update(self, progress: Progress):
         """Update the dashboard with new progress information."""
@@ -44,8 +45,15 @@ class Dashboard:
         if progress.stage != self.last_stage or progress.percentage >= 100:
             sys.stdout.write('\n')
             self.last_stage = progress.stage
+    
+    def update_agent(self, agent_id: str, agent_type: str, status: str, tokens: int = 0):
+        """Per-agent rows are only shown by LiveDashboard; ignored here."""
+        pass
             
     def close(self):
         """Close the dashboard."""
+        if self.closed:
+            return
+        self.closed = True
         sys.stdout.write('\n')
         sys.stdout.flush()
\ No newline at end of file
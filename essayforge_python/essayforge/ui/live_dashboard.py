@@ -0,0 +1,193 @@
+"""Multi-agent dashboard rendered on a background thread."""
+
+import queue
+import shutil
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, TextIO
+
+from ..models import Progress
+
+
+_STATUS_COLORS = {
+    "queued": "\033[90m",
+    "running": "\033[33m",
+    "retrying": "\033[35m",
+    "completed": "\033[32m",
+    "failed": "\033[31m",
+    "cancelled": "\033[90m",
+}
+_RESET = "\033[0m"
+_CLEAR_LINE = "\033[K"
+_STOP = object()
+
+
+@dataclass
+class AgentRow:
+    """Display state for a single agent."""
+    agent_id: str
+    agent_type: str
+    status: str = "queued"
+    tokens: int = 0
+    start_time: float = 0.0
+    end_time: float = 0.0
+
+    def elapsed(self, now: float) -> float:
+        """Seconds the agent has been (or was) running."""
+        if not self.start_time:
+            return 0.0
+        return (self.end_time or now) - self.start_time
+
+    def tokens_per_second(self, now: float) -> float:
+        """Output rate over the agent's running time."""
+        elapsed = self.elapsed(now)
+        return self.tokens / elapsed if elapsed > 0 else 0.0
+
+
+class LiveDashboard:
+    """Dashboard that renders agent rows on its own thread at a capped frame rate.
+
+    ``update`` and ``update_agent`` only enqueue an event, so worker threads
+    never block on terminal I/O. The render thread drains the queue, applies
+    every pending event, and redraws at most ``fps`` times per second, and
+    only when something changed or an agent is running. Each frame is built
+    in memory and written with a single call, overwriting the previous frame
+    in place, which keeps hundreds of rows flicker-free.
+    """
+
+    def __init__(self, fps: float = 10.0, stream: Optional[TextIO] = None,
+                 max_rows: Optional[int] = None):
+        self.frame_interval = 1.0 / fps
+        self.stream = stream or sys.stdout
+        self.max_rows = max_rows
+        self.start_time = time.time()
+        self.progress = Progress(stage="starting")
+        self.agents: Dict[str, AgentRow] = {}
+        self._events: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lines_drawn = 0
+
+    def start(self):
+        """Start the background render thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._render_loop, name="dashboard", daemon=True)
+            self._thread.start()
+
+    def update(self, progress: Progress):
+        """Queue an overall progress update."""
+        self.start()
+        self._events.put(("progress", progress, time.time()))
+
+    def update_agent(self, agent_id: str, agent_type: str, status: str, tokens: int = 0):
+        """Queue a status change for one agent."""
+        self.start()
+        self._events.put(("agent", (agent_id, agent_type, status, tokens), time.time()))
+
+    def close(self):
+        """Stop the render thread after drawing the final frame."""
+        if self._thread is not None:
+            self._events.put((_STOP, None, time.time()))
+            self._thread.join()
+            self._thread = None
+
+    def _render_loop(self):
+        """Drain events and redraw at most once per frame interval."""
+        self.stream.write("\033[?25l")  # Hide the cursor while redrawing
+        dirty = True
+        last_frame = 0.0
+        try:
+            while True:
+                now = time.time()
+                running = any(row.status in ("running", "retrying") for row in self.agents.values())
+                if dirty and now - last_frame >= self.frame_interval:
+                    self._draw(now)
+                    last_frame, dirty = now, False
+                # Wake for the next frame while agents run, otherwise only on events
+                wait = max(0.0, last_frame + self.frame_interval - now) if (dirty or running) else 1.0
+                try:
+                    event = self._events.get(timeout=wait)
+                except queue.Empty:
+                    dirty = dirty or running
+                    continue
+                while True:
+                    if event[0] is _STOP:
+                        self._draw(time.time())
+                        return
+                    self._apply(event)
+                    dirty = True
+                    try:
+                        event = self._events.get_nowait()
+                    except queue.Empty:
+                        break
+        finally:
+            self.stream.write("\033[?25h\n")
+            self.stream.flush()
+
+    def _apply(self, event):
+        """Apply one queued event to the display state."""
+        kind, payload, at = event
+        if kind == "progress":
+            self.progress = payload
+            return
+        agent_id, agent_type, status, tokens = payload
+        row = self.agents.get(agent_id)
+        if row is None:
+            row = self.agents[agent_id] = AgentRow(agent_id, agent_type)
+        if status == "running" and not row.start_time:
+            row.start_time = at
+        if status in ("completed", "failed", "cancelled"):
+            row.end_time = at
+        row.status = status
+        row.tokens = tokens or row.tokens
+
+    def _draw(self, now: float):
+        """Overwrite the previous frame with the current one in a single write."""
+        lines = self._frame(now)
+        out = []
+        if self._lines_drawn:
+            out.append(f"\033[{self._lines_drawn}F")  # Back to the first line of the last frame
+        out.extend(line + _CLEAR_LINE + "\n" for line in lines)
+        out.append("\033[J")  # Clear anything left below a shorter frame
+        self.stream.write("".join(out))
+        self.stream.flush()
+        self._lines_drawn = len(lines)
+
+    def _frame(self, now: float) -> List[str]:
+        """Build the lines of one frame."""
+        progress = self.progress
+        bar_length = 30
+        filled = int(bar_length * progress.percentage / 100)
+        bar = '█' * filled + '░' * (bar_length - filled)
+        lines = [
+            f"[{bar}] {progress.percentage:3.0f}% | {progress.stage.upper()}: {progress.message}",
+            f"Elapsed: {now - self.start_time:5.1f}s | Tokens: {progress.tokens_used:,}"
+            f" | Cost: ${progress.estimated_cost:.2f}",
+        ]
+        if not self.agents:
+            return lines
+
+        counts: Dict[str, int] = {}
+        for row in self.agents.values():
+            counts[row.status] = counts.get(row.status, 0) + 1
+        lines.append("Agents: " + ", ".join(f"{n} {status}" for status, n in sorted(counts.items())))
+        lines.append(f"{'Agent':<32} {'Status':<10} {'Elapsed':>8} {'Tokens':>8} {'Tok/s':>8}")
+
+        # Running agents first, then the most recently finished
+        order = {"running": 0, "retrying": 0, "failed": 1, "cancelled": 1, "completed": 2, "queued": 3}
+        rows = sorted(
+            self.agents.values(),
+            key=lambda r: (order.get(r.status, 4), -(r.end_time or r.start_time))
+        )
+        room = self.max_rows or max(5, shutil.get_terminal_size().lines - len(lines) - 2)
+        shown, hidden = rows[:room], rows[room:]
+        for row in shown:
+            color = _STATUS_COLORS.get(row.status, "")
+            lines.append(
+                f"{row.agent_id[:32]:<32} {color}{row.status:<10}{_RESET} "
+                f"{row.elapsed(now):>7.1f}s {row.tokens:>8,} {row.tokens_per_second(now):>8.1f}"
+            )
+        if hidden:
+            lines.append(f"... {len(hidden)} more agents not shown")
+        return lines
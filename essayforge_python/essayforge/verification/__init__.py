@@ -0,0 +1,21 @@
+"""Verification package for checking cited sources."""
+
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .links import DEFAULT_LINK_CACHE, LinkCache, LinkVerdict, LinkVerifier, classify
+
+# Submodules are imported on first attribute access to keep startup fast
+_EXPORTS = {
+    'DEFAULT_LINK_CACHE': '.links',
+    'LinkCache': '.links',
+    'LinkVerdict': '.links',
+    'LinkVerifier': '.links',
+    'classify': '.links'
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+__all__ = ['DEFAULT_LINK_CACHE', 'LinkCache', 'LinkVerdict', 'LinkVerifier', 'classify']
\ No newline at end of file
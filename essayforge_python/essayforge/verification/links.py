@@ -0,0 +1,387 @@
+"""Concurrent citation link checking over pooled keep-alive connections, with a verdict cache."""
+
+import http.client
+import json
+import os
+import socket
+import ssl
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, wait as wait_for_futures
+from dataclasses import asdict, dataclass
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from ..models import Citation
+
+
+DEFAULT_LINK_CACHE = os.path.join(os.path.expanduser("~"), ".essayforge", "link_cache.json")
+
+# Verdicts that may change on the next attempt; cached only briefly
+TRANSIENT = frozenset({"error", "timeout", "unreachable"})
+
+# Servers that refuse HEAD, or answer it wrongly, get a GET instead
+_HEAD_REFUSED = frozenset({400, 403, 405, 501})
+
+_GET_LIMIT = 65536  # Body bytes read after a fallback GET before giving up the connection
+
+
+@dataclass
+class LinkVerdict:
+    """Outcome of checking one URL."""
+    url: str
+    status: str  # ok, restricted, broken, error, timeout, unreachable or invalid
+    code: int = 0  # Final HTTP status, 0 if none was received
+    final_url: str = ""  # Where redirects led, if anywhere else
+    checked_at: float = 0.0
+
+    @property
+    def transient(self) -> bool:
+        return self.status in TRANSIENT
+
+
+def classify(code: int) -> str:
+    """Verdict for a final (non-redirect) HTTP status code."""
+    if 200 <= code < 300:
+        return "ok"
+    if code in (401, 402, 403, 429, 451):
+        return "restricted"  # The page exists but this client may not read it
+    if 400 <= code < 500 or 300 <= code < 400:
+        return "broken"
+    return "error"
+
+
+class LinkCache:
+    """Verdicts from earlier checks, kept in a JSON file across runs.
+
+    Definitive verdicts stay valid for ``ttl`` seconds; timeouts, server
+    errors and unreachable hosts only for ``transient_ttl``, since they
+    are often gone on the next run.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 7 * 86400,
+                 transient_ttl: float = 3600):
+        self.path = path
+        self.ttl = ttl
+        self.transient_ttl = transient_ttl
+        self.verdicts: Dict[str, LinkVerdict] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path:
+            self.load()
+
+    def load(self):
+        """Read verdicts from ``path``, ignoring a missing or corrupt file."""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            self.verdicts = {url: LinkVerdict(**v) for url, v in data.get("links", {}).items()}
+
+    def get(self, url: str, now: Optional[float] = None) -> Optional[LinkVerdict]:
+        """The cached verdict for ``url`` if it has not expired."""
+        with self._lock:
+            verdict = self.verdicts.get(url)
+        if verdict is None:
+            return None
+        age = (now or time.time()) - verdict.checked_at
+        return verdict if age < (self.transient_ttl if verdict.transient else self.ttl) else None
+
+    def put(self, verdict: LinkVerdict):
+        with self._lock:
+            self.verdicts[verdict.url] = verdict
+            self._dirty = True
+
+    def save(self):
+        """Write unexpired verdicts to ``path`` atomically, if anything changed."""
+        if not self.path or not self._dirty:
+            return
+        now = time.time()
+        with self._lock:
+            data = {"links": {
+                url: asdict(v) for url, v in self.verdicts.items()
+                if now - v.checked_at < (self.transient_ttl if v.transient else self.ttl)
+            }}
+            self._dirty = False
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = self.path + ".tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(temporary, self.path)
+
+
+class _HostPool:
+    """Idle keep-alive connections to one host, at most ``size`` in use at once."""
+
+    def __init__(self, scheme: str, netloc: str, size: int, timeout: float):
+        self.scheme = scheme
+        self.netloc = netloc
+        self.timeout = timeout
+        self.slots = threading.BoundedSemaphore(size)
+        self.idle: List[http.client.HTTPConnection] = []
+        self.lock = threading.Lock()
+        self.opened = 0
+
+    def take(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """An idle connection (reused=True) or a new one. Caller holds a slot."""
+        with self.lock:
+            if self.idle:
+                return self.idle.pop(), True
+            self.opened += 1
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.netloc, timeout=self.timeout,
+                                               context=ssl.create_default_context()), False
+        return http.client.HTTPConnection(self.netloc, timeout=self.timeout), False
+
+    def give(self, connection: http.client.HTTPConnection, reusable: bool):
+        if reusable:
+            with self.lock:
+                self.idle.append(connection)
+        else:
+            connection.close()
+
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for connection in idle:
+            connection.close()
+
+
+class LinkVerifier:
+    """Checks URLs concurrently, at most ``per_host`` at a time against any one host.
+
+    ``workers`` threads take URLs from per-host queues, round robin over the
+    hosts that have a free slot, so a citation list dominated by one site
+    neither overloads it nor holds up the other hosts. Connections are kept
+    alive and reused per host. Each URL gets a HEAD request, a GET if the
+    server refuses HEAD, and redirects are followed up to
+    ``max_redirects``. ``timeout`` bounds every connect and read. Identical
+    URLs are checked once, and verdicts found in ``cache`` are not checked
+    again.
+    """
+
+    def __init__(self, workers: int = 32, per_host: int = 4, timeout: float = 5.0,
+                 max_redirects: int = 5, cache: Optional[LinkCache] = None,
+                 user_agent: str = "EssayForge-LinkCheck/1.0"):
+        self.workers = workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.cache = cache or LinkCache()
+        self.user_agent = user_agent
+        self.checked = 0  # URLs checked over the network
+        self.cache_hits = 0
+        self.requests = 0
+        self._futures: Dict[str, Future] = {}
+        self._queues: Dict[str, Deque[Tuple[str, Future]]] = {}
+        self._active: Dict[str, int] = {}
+        self._hosts: Deque[str] = deque()  # Round-robin order of hosts with queued URLs
+        self._pools: Dict[Tuple[str, str], _HostPool] = {}
+        self._closed = False
+        self._condition = threading.Condition()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def connections(self) -> int:
+        """Connections opened so far; fewer than ``requests`` when keep-alive works."""
+        return sum(pool.opened for pool in self._pools.values())
+
+    def submit(self, url: str) -> Future:
+        """Queue ``url`` for checking; a URL already submitted shares the first check."""
+        with self._condition:
+            future = self._futures.get(url)
+            if future is not None:
+                return future
+            future = self._futures[url] = Future()
+            cached = self.cache.get(url)
+            if cached is not None:
+                self.cache_hits += 1
+                future.set_result(cached)
+                return future
+            host = urlsplit(url).netloc.lower()
+            if host not in self._queues:
+                self._queues[host] = deque()
+                self._active.setdefault(host, 0)
+            if not self._queues[host]:
+                self._hosts.append(host)
+            self._queues[host].append((url, future))
+            self._start_workers()
+            self._condition.notify()
+        return future
+
+    def prefetch(self, citations: Iterable[Citation]):
+        """Start checking the citations' URLs without waiting for them."""
+        for citation in citations:
+            if citation.url:
+                self.submit(citation.url)
+
+    def verify(self, citations: List[Citation],
+               timeout: Optional[float] = None) -> Dict[str, LinkVerdict]:
+        """Check every citation's URL and set its ``status`` and ``http_status``.
+
+        Citations without a URL are left unchecked. Returns the verdicts by
+        URL; a URL still unchecked after ``timeout`` seconds gets
+        ``timeout``.
+        """
+        futures = {c.url: self.submit(c.url) for c in citations if c.url}
+        wait_for_futures(list(futures.values()), timeout=timeout)
+        verdicts = {
+            url: future.result() if future.done() else LinkVerdict(url, "timeout", checked_at=time.time())
+            for url, future in futures.items()
+        }
+        for citation in citations:
+            verdict = verdicts.get(citation.url)
+            if verdict is not None:
+                citation.status = verdict.status
+                citation.http_status = verdict.code
+        return verdicts
+
+    def check(self, url: str) -> LinkVerdict:
+        """Check one URL now, in the calling thread."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            return LinkVerdict(url, "invalid", checked_at=time.time())
+        current = url
+        try:
+            for _ in range(self.max_redirects + 1):
+                code, location = self._request(current, "HEAD")
+                if code in _HEAD_REFUSED:
+                    code, location = self._request(current, "GET")
+                if 300 <= code < 400 and location:
+                    current = urljoin(current, location)
+                    if urlsplit(current).scheme not in ("http", "https"):
+                        return LinkVerdict(url, "invalid", code, current, time.time())
+                    continue
+                return LinkVerdict(url, classify(code), code,
+                                   current if current != url else "", time.time())
+            return LinkVerdict(url, "broken", code, current, time.time())  # Redirect loop
+        except socket.timeout:
+            return LinkVerdict(url, "timeout", checked_at=time.time())
+        except (OSError, http.client.HTTPException, ValueError):
+            return LinkVerdict(url, "unreachable", checked_at=time.time())
+
+    def summary(self, verdicts: Dict[str, LinkVerdict]) -> Dict[str, int]:
+        """Number of verdicts per status."""
+        counts: Dict[str, int] = {}
+        for verdict in verdicts.values():
+            counts[verdict.status] = counts.get(verdict.status, 0) + 1
+        return counts
+
+    def close(self):
+        """Drop unstarted checks, wait for running ones, close connections and save the cache."""
+        with self._condition:
+            self._closed = True
+            for queued in self._queues.values():
+                for _, future in queued:
+                    future.cancel()
+                queued.clear()
+            self._hosts.clear()
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join()
+        for pool in self._pools.values():
+            pool.close()
+        try:
+            self.cache.save()
+        except OSError as e:
+            print(f"Could not save the link cache: {e}")
+
+    def __enter__(self) -> 'LinkVerifier':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _request(self, url: str, method: str) -> Tuple[int, str]:
+        """Send one request over a pooled connection; returns (status, Location header)."""
+        parts = urlsplit(url)
+        pool = self._pool(parts.scheme, parts.netloc.lower())
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        headers = {"User-Agent": self.user_agent, "Accept": "*/*"}
+        if not pool.slots.acquire(timeout=self.timeout):
+            raise socket.timeout(f"no free connection to {parts.netloc}")
+        try:
+            for attempt in range(2):
+                connection, reused = pool.take()
+                try:
+                    connection.request(method, path, headers=headers)
+                    response = connection.getresponse()
+                    if method == "HEAD":
+                        response.read()
+                        complete = True
+                    else:
+                        response.read(_GET_LIMIT)
+                        complete = response.isclosed()
+                except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                    connection.close()
+                    if reused and attempt == 0:
+                        continue  # The server dropped the idle connection; retry on a new one
+                    raise
+                except BaseException:
+                    connection.close()
+                    raise
+                with self._condition:
+                    self.requests += 1
+                pool.give(connection, complete and not response.will_close)
+                return response.status, response.getheader("Location") or ""
+        finally:
+            pool.slots.release()
+        raise http.client.HTTPException("unreachable")
+
+    def _pool(self, scheme: str, netloc: str) -> _HostPool:
+        with self._condition:
+            pool = self._pools.get((scheme, netloc))
+            if pool is None:
+                pool = self._pools[(scheme, netloc)] = _HostPool(
+                    scheme, netloc, self.per_host, self.timeout)
+            return pool
+
+    def _start_workers(self):
+        """Start another worker while there are fewer than ``workers``. Caller holds the lock."""
+        if len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"link-check-{len(self._threads)}",
+                                      daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _next(self) -> Optional[Tuple[str, str, Future]]:
+        """The next URL whose host has a free slot, or None once closed and drained."""
+        with self._condition:
+            while True:
+                for _ in range(len(self._hosts)):
+                    host = self._hosts[0]
+                    self._hosts.rotate(-1)
+                    if self._active[host] < self.per_host:
+                        url, future = self._queues[host].popleft()
+                        if not self._queues[host]:
+                            self._hosts.remove(host)
+                        self._active[host] += 1
+                        return host, url, future
+                if self._closed and not self._hosts:
+                    return None
+                self._condition.wait(0.5)
+
+    def _work(self):
+        while True:
+            job = self._next()
+            if job is None:
+                return
+            host, url, future = job
+            try:
+                verdict = self.check(url)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                self.cache.put(verdict)
+                with self._condition:
+                    self.checked += 1
+                future.set_result(verdict)
+            finally:
+                with self._condition:
+                    self._active[host] -= 1
+                    self._condition.notify_all()
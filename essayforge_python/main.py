@@ -11,11 +11,21 @@ publication-quality essays.
 import argparse
 import os
 import sys
-from pathlib import Path
 
 from essayforge import __version__
-from essayforge.models import OutputFormat
-from essayforge.orchestrator import Config, Orchestrator
+
+# Heavier modules (orchestrator, agents, the Anthropic SDK) are imported
+# inside the commands that need them, so `version` and `models` start fast.
+SUBCOMMANDS = ('version', 'models', 'estimate')
+
+# Config fields stored in a cassette's header; they decide which calls a run makes
+CASSETTE_SETTINGS = (
+    'topic', 'intensity', 'parallelism', 'best_of_n', 'claude_model', 'cascade',
+    'cascade_threshold', 'model_overrides', 'max_iterations', 'quality_threshold', 'min_gain',
+    'refine_mode', 'temperature', 'structured', 'adaptive', 'core_agents', 'adaptive_threshold',
+)
+# Settings a replay takes from the command line even though they were recorded
+REPLAY_OVERRIDABLE = ('topic', 'parallelism')
 
 
 def create_parser():
@@ -40,14 +50,22 @@ Features:
     parser.add_argument(
         '-t', '--topic',
         type=str,
-        required=True,
-        help='Research topic (required)'
+        help='Research topic (required unless --topics-file is given)'
+    )
+    parser.add_argument(
+        '--topics-file',
+        type=str,
+        default='',
+        metavar='FILE',
+        help='Research every topic in FILE, one per line; outputs are named after --output '
+             'with the topic appended'
     )
     parser.add_argument(
         '-i', '--intensity',
         type=int,
-        default=5,
-        help='Number of specialized research agents to deploy (1-10)'
+        default=None,
+        help='Number of specialized research agents to deploy (1-10, default: 5; '
+             'with --adaptive the most it may add, default: 10)'
     )
     parser.add_argument(
         '-p', '--parallel',
@@ -61,6 +79,72 @@ Features:
         default=1,
         help='Number of variations to generate for best-of-n selection'
     )
+    parser.add_argument(
+        '--temperature',
+        type=float,
+        default=1.0,
+        help='Sampling temperature of research agents (default: 1.0); at 0, identical '
+             'requests in flight together share one call'
+    )
+    parser.add_argument(
+        '--no-coalesce',
+        action='store_true',
+        help='Make a separate call for every request, even identical concurrent ones'
+    )
+    parser.add_argument(
+        '--structured',
+        action='store_true',
+        help='Have agents return sections, claims, citations and confidence through a tool call '
+             'instead of free-form markdown'
+    )
+    parser.add_argument(
+        '--cpu-workers',
+        type=int,
+        default=None,
+        metavar='N',
+        help='Processes for scoring, parsing and formatting (default: one per core when '
+             'several topics run together with --batch-api, otherwise none; 0 runs them on '
+             'the research threads)'
+    )
+    parser.add_argument(
+        '--serve-preview',
+        type=int,
+        nargs='?',
+        const=8765,
+        default=0,
+        metavar='PORT',
+        help='Serve a live HTML preview of the essay in progress on localhost (default port: 8765)'
+    )
+    parser.add_argument(
+        '--verify-citations',
+        action='store_true',
+        help='Check every cited URL concurrently and flag broken or unreachable links '
+             'in the references (verdicts are cached across runs)'
+    )
+    parser.add_argument(
+        '--link-timeout',
+        type=float,
+        default=5.0,
+        help='Seconds per link check connect or read (default: 5.0)'
+    )
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        help='Start with core agents and add more only while they still broaden coverage'
+    )
+    parser.add_argument(
+        '--core-agents',
+        type=int,
+        default=3,
+        help='Agents always run in adaptive mode (default: 3)'
+    )
+    parser.add_argument(
+        '--adaptive-threshold',
+        type=float,
+        default=0.05,
+        help='Coverage gain per 1k tokens an agent must add for another to be dispatched '
+             '(default: 0.05)'
+    )
     
     # Output options
     parser.add_argument(
@@ -99,6 +183,139 @@ Features:
         help='Preview cost estimate without running the generation'
     )
     
+    parser.add_argument(
+        '--trace',
+        type=str,
+        default='',
+        metavar='FILE',
+        help='Write a Chrome trace-event JSON file of per-agent and per-phase timings'
+    )
+    parser.add_argument(
+        '--profile',
+        type=str,
+        nargs='?',
+        const='essayforge-profile',
+        default='',
+        metavar='DIR',
+        help='Profile CPU and memory per phase and write pstats and allocation reports '
+             'to DIR (default: essayforge-profile)'
+    )
+    parser.add_argument(
+        '--events',
+        type=str,
+        default='',
+        metavar='PATH|fd:N',
+        help='Stream progress events as NDJSON to a file or an open file descriptor'
+    )
+    parser.add_argument(
+        '--batch-api',
+        action='store_true',
+        help='Submit research calls through the Message Batches API at half price; with '
+             '--topics-file all topics share one batch. Interrupted runs resume their batch'
+    )
+    parser.add_argument(
+        '--batch-url',
+        type=str,
+        default='',
+        metavar='URL',
+        help='Base URL of the batch endpoints (default: the Anthropic API)'
+    )
+    parser.add_argument(
+        '--dispatch',
+        type=str,
+        default='lept',
+        choices=['lept', 'fifo'],
+        help='Agent dispatch order: longest expected latency first (learned from past runs) or fifo'
+    )
+    
+    # Critic-guided refinement
+    parser.add_argument(
+        '--max-iterations',
+        type=int,
+        default=0,
+        help='Maximum critic-guided revisions of the draft (default: 0, no critic phase)'
+    )
+    parser.add_argument(
+        '--quality-threshold',
+        type=float,
+        default=0.85,
+        help='Overall critic score (0-1) at which refinement stops (default: 0.85)'
+    )
+    parser.add_argument(
+        '--min-gain',
+        type=float,
+        default=0.01,
+        help='Stop refining when a revision improves the score by less than this (default: 0.01)'
+    )
+    parser.add_argument(
+        '--refine-mode',
+        type=str,
+        default='sections',
+        choices=['sections', 'whole'],
+        help='Revise each ## section concurrently (default) or the whole essay in one call'
+    )
+    
+    # Research reuse across similar topics
+    reuse = parser.add_mutually_exclusive_group()
+    reuse.add_argument(
+        '--reuse',
+        action='store_true',
+        help='Let research from a near-identical past topic replace agent calls'
+    )
+    reuse.add_argument(
+        '--no-reuse',
+        action='store_true',
+        help='Do not reuse or record research for similar past topics'
+    )
+    parser.add_argument(
+        '--reuse-threshold',
+        type=float,
+        default=0.9,
+        help='Topic similarity (0-1) at which --reuse replaces agent calls (default: 0.9)'
+    )
+    parser.add_argument(
+        '--seed-threshold',
+        type=float,
+        default=0.45,
+        help='Topic similarity (0-1) at which past research seeds agent prompts (default: 0.45)'
+    )
+    
+    parser.add_argument(
+        '--knowledge-top-k',
+        type=int,
+        default=5,
+        help='Passages of past research retrieved into every agent prompt (0 = off, default: 5)'
+    )
+    
+    # Incremental re-runs of the same topic
+    parser.add_argument(
+        '--full-rerun',
+        action='store_true',
+        help='Run every step again instead of reusing unchanged ones from the last run of the topic'
+    )
+    
+    # Cassettes of model interactions
+    parser.add_argument(
+        '--record',
+        type=str,
+        default='',
+        metavar='FILE',
+        help='Record every model request/response with timings to a cassette (.gz to compress)'
+    )
+    parser.add_argument(
+        '--replay',
+        type=str,
+        default='',
+        metavar='FILE',
+        help='Serve model calls from a recorded cassette instead of the API'
+    )
+    parser.add_argument(
+        '--replay-latency-scale',
+        type=float,
+        default=1.0,
+        help='Multiply recorded latencies during --replay (1 = original, 0 = instant)'
+    )
+    
     # Resource limits
     parser.add_argument(
         '--token-limit',
@@ -106,6 +323,13 @@ Features:
         default=0,
         help='Maximum tokens to use (0 = unlimited)'
     )
+    parser.add_argument(
+        '--deadline',
+        type=float,
+        default=0,
+        metavar='SECONDS',
+        help='Finish within this many seconds, synthesizing whatever research completed (0 = none)'
+    )
     parser.add_argument(
         '--cost-limit',
         type=float,
@@ -120,6 +344,24 @@ Features:
         default='claude-3-sonnet-20240229',
         help='Claude model to use'
     )
+    parser.add_argument(
+        '--cascade',
+        action='store_true',
+        help='Run agents on haiku first and escalate to sonnet, then opus, when output scores low'
+    )
+    parser.add_argument(
+        '--cascade-threshold',
+        type=float,
+        default=0.5,
+        help='Minimum local score (0-1) to keep a cheaper model\'s output (default: 0.5)'
+    )
+    parser.add_argument(
+        '--model-for',
+        action='append',
+        default=[],
+        metavar='AGENT=MODEL',
+        help='Always run one agent type on a given model, e.g. data-analysis=claude-3-opus-20240229'
+    )
     
     # Subcommands
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
@@ -136,8 +378,30 @@ Features:
     return parser
 
 
-def run_research(args):
+def start_client_warmup(argv):
+    """Start building and connecting the API client before args are parsed.
+    
+    Returns None when the command line cannot lead to API calls.
+    """
+    api_key = os.environ.get('ANTHROPIC_API_KEY')
+    skip = {'--demo', '--dry-run', '-h', '--help'}.union(SUBCOMMANDS)
+    if not api_key or skip.intersection(argv) or any(a.startswith('--replay') for a in argv):
+        return None
+    
+    from essayforge.llm import AnthropicClient, WarmClient
+    return WarmClient(lambda: AnthropicClient(api_key))
+
+
+def run_research(args, client=None):
     """Run the research generation process."""
+    from essayforge.models import OutputFormat
+    from essayforge.orchestrator import Config, Orchestrator
+    from essayforge.orchestrator.scheduling import DEFAULT_HISTORY_FILE
+    from essayforge.storage.knowledge import DEFAULT_KNOWLEDGE_DB
+    from essayforge.storage.runs import DEFAULT_RUNS_DIR
+    from essayforge.storage.topics import DEFAULT_TOPIC_INDEX_DIR
+    from essayforge.verification import DEFAULT_LINK_CACHE
+    
     if args.dry_run:
         print("\n\033[33mThis is a dry run. No essay will be generated.\033[0m")
         print("\033[90mRemove --dry-run to proceed with generation.\033[0m")
@@ -167,16 +431,44 @@ def run_research(args):
         }
         output_file += extensions.get(output_format, '.md')
     
+    topics = [args.topic] if args.topic else []
+    if args.topics_file:
+        try:
+            with open(args.topics_file, encoding='utf-8') as f:
+                topics += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        except OSError as e:
+            print(f"Error: cannot read topics file: {e}")
+            sys.exit(1)
+        if not topics:
+            print(f"Error: no topics in {args.topics_file}")
+            sys.exit(1)
+        # A topic listed twice would run twice and write the same output file
+        unique = list(dict.fromkeys(topics))
+        if len(unique) < len(topics):
+            print(f"Skipping {len(topics) - len(unique)} duplicate topic(s)")
+            topics = unique
+    
+    # Per-agent model overrides
+    model_overrides = {}
+    for override in args.model_for:
+        agent_type, _, model = override.partition('=')
+        if not agent_type or not model:
+            print(f"Error: invalid --model-for '{override}'. Use AGENT=MODEL")
+            sys.exit(1)
+        model_overrides[agent_type.strip()] = model.strip()
+    
     # Check API key
     api_key = os.environ.get('ANTHROPIC_API_KEY')
-    if not api_key and not args.demo:
+    if not api_key and not args.demo and not args.replay:
         print("Error: ANTHROPIC_API_KEY environment variable not set.")
         sys.exit(1)
     
+    concurrent = len(topics) > 1 and args.batch_api and not args.demo
+    
     # Create configuration
     config = Config(
-        topic=args.topic,
-        intensity=args.intensity,
+        topic=topics[0],
+        intensity=args.intensity or (10 if args.adaptive else 5),
         parallelism=args.parallel,
         best_of_n=args.best_of,
         output_file=output_file,
@@ -187,16 +479,147 @@ def run_research(args):
         show_dashboard=not args.no_dashboard,
         token_limit=args.token_limit,
         cost_limit=args.cost_limit,
-        claude_model=args.model
+        claude_model=args.model,
+        trace_file=args.trace,
+        profile_dir=args.profile,
+        event_stream=args.events,
+        deadline=args.deadline,
+        dispatch_order=args.dispatch,
+        history_file=DEFAULT_HISTORY_FILE,
+        cascade=args.cascade,
+        cascade_threshold=args.cascade_threshold,
+        model_overrides=model_overrides,
+        # Recordings and replays must issue every call of the run, so skip reuse and retrieval
+        topic_index_dir=('' if args.no_reuse or args.replay or args.record
+                         else DEFAULT_TOPIC_INDEX_DIR),
+        reuse_research=args.reuse,
+        reuse_threshold=args.reuse_threshold,
+        seed_threshold=args.seed_threshold,
+        knowledge_db=('' if args.knowledge_top_k <= 0 or args.replay or args.record
+                      else DEFAULT_KNOWLEDGE_DB),
+        knowledge_top_k=args.knowledge_top_k,
+        max_iterations=args.max_iterations,
+        quality_threshold=args.quality_threshold,
+        min_gain=args.min_gain,
+        refine_mode=args.refine_mode,
+        adaptive=args.adaptive,
+        core_agents=args.core_agents,
+        adaptive_threshold=args.adaptive_threshold,
+        temperature=args.temperature,
+        coalesce=not args.no_coalesce,
+        structured=args.structured,
+        verify_citations=args.verify_citations,
+        link_cache_file=DEFAULT_LINK_CACHE,
+        link_timeout=args.link_timeout,
+        preview_port=args.serve_preview,
+        # Only topics running together in batch mode contend for the interpreter lock
+        cpu_workers=(args.cpu_workers if args.cpu_workers is not None
+                     else (os.cpu_count() or 1) if concurrent else 0),
+        run_graph_dir='' if args.replay else DEFAULT_RUNS_DIR,
+        # A cassette should hold every call of the run
+        full_rerun=args.full_rerun or bool(args.record)
     )
     
-    # Create and run orchestrator
+    warmup = client
+    recorder = None
     try:
-        orchestrator = Orchestrator(config)
-        orchestrator.execute()
+        # Serve calls from a cassette, or record them to one
+        if args.replay:
+            from essayforge.llm import ReplayClient
+            client = ReplayClient(args.replay, args.replay_latency_scale)
+            config = replay_config(config, client.metadata)
+        if args.record and not args.demo:
+            from essayforge.llm import AnthropicClient, RecordingClient
+            client = recorder = RecordingClient(
+                client or AnthropicClient(api_key), args.record, metadata=cassette_metadata(config)
+            )
+        
+        batch = None
+        if args.batch_api and not args.demo:
+            from essayforge.llm import BatchesClient
+            from essayforge.llm.batches import DEFAULT_BASE_URL
+            from essayforge.orchestrator import BatchSession
+            from essayforge.orchestrator.batching import DEFAULT_BATCH_CHECKPOINT
+            batch = BatchSession(
+                BatchesClient(api_key, args.batch_url or DEFAULT_BASE_URL),
+                participants=len(topics), checkpoint=DEFAULT_BATCH_CHECKPOINT,
+            )
+        
+        # Create and run orchestrator
+        if warmup is not None:
+            warmup.wait()
+        if len(topics) == 1:
+            Orchestrator(config, client=client, batch=batch).execute()
+        else:
+            run_topics(config, topics, client, batch)
     except Exception as e:
         print(f"\nResearch failed: {e}")
         sys.exit(1)
+    finally:
+        if recorder is not None:
+            recorder.close()
+            print(f"Recorded {recorder.entries} model calls to {args.record}")
+
+
+def cassette_metadata(config):
+    """The settings a cassette records, so a replay makes the same calls."""
+    return {name: getattr(config, name) for name in CASSETTE_SETTINGS}
+
+
+def replay_config(config, metadata):
+    """``config`` with the settings recorded in a cassette's header applied."""
+    from dataclasses import replace
+    recorded = {
+        name: value for name, value in metadata.items()
+        if name in CASSETTE_SETTINGS and name not in REPLAY_OVERRIDABLE
+    }
+    return replace(config, **recorded)
+
+
+def run_topics(config, topics, client=None, batch=None):
+    """Research several topics; with a batch session they run together so their calls share it."""
+    import re
+    import threading
+    from dataclasses import replace
+    from essayforge.orchestrator import CPUPool, Orchestrator
+    
+    stem, extension = os.path.splitext(config.output_file)
+    # Topics run together in batch mode, so each gets its own preview port
+    configs = [
+        replace(config, topic=topic, show_dashboard=False, auto_open=False,
+                output_file=f"{stem}-{re.sub(r'[^a-z0-9]+', '-', topic.lower()).strip('-')[:40]}"
+                            f"{extension}",
+                preview_port=config.preview_port + i if config.preview_port else 0)
+        for i, topic in enumerate(topics)
+    ]
+    # One pool of worker processes serves every topic
+    pool = CPUPool(config.cpu_workers) if config.cpu_workers > 0 else None
+    try:
+        if batch is None:
+            for topic_config in configs:
+                Orchestrator(topic_config, client=client, cpu_pool=pool).execute()
+            return
+        
+        failures = []
+        
+        def run(topic_config):
+            try:
+                Orchestrator(topic_config, client=client, batch=batch, cpu_pool=pool).execute()
+            except Exception as e:
+                failures.append(f"{topic_config.topic}: {e}")
+        
+        threads = [threading.Thread(target=run, args=(c,), name=f"topic-{i}")
+                   for i, c in enumerate(configs)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        if pool is not None:
+            pool.close()
+    if failures:
+        raise RuntimeError(f"{len(failures)} of {len(topics)} topics failed: "
+                           + "; ".join(failures))
 
 
 def show_version():
@@ -210,6 +633,8 @@ def show_models():
     print("  - claude-3-opus-20240229     (Most capable, higher cost)")
     print("  - claude-3-sonnet-20240229   (Balanced performance/cost) [default]")
     print("  - claude-3-haiku-20240307    (Fastest, lowest cost)")
+    print("\nWith --cascade, agents run on haiku first and escalate to sonnet, then opus,")
+    print("only when the locally scored output falls below --cascade-threshold.")
 
 
 def show_estimate():
@@ -219,6 +644,7 @@ def show_estimate():
 
 def main():
     """Main entry point."""
+    client = start_client_warmup(sys.argv[1:])
     parser = create_parser()
     args = parser.parse_args()
     
@@ -231,10 +657,10 @@ def main():
         show_estimate()
     else:
         # Main research command
-        if not args.topic and args.command is None:
+        if not args.topic and not args.topics_file and args.command is None:
             parser.print_help()
             sys.exit(1)
-        run_research(args)
+        run_research(args, client)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,36 @@
+"""Shared fixtures for the EssayForge test suite."""
+
+import os
+import sys
+
+import pytest
+
+# Tests import the package from the source tree, like ``python main.py`` does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from essayforge.models import OutputFormat  # noqa: E402
+from essayforge.orchestrator import Config  # noqa: E402
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    """Build an offline orchestrator config writing into the test's temporary directory."""
+    def build(**overrides) -> Config:
+        options = dict(
+            topic="the impact of artificial intelligence on healthcare",
+            intensity=3,
+            parallelism=3,
+            best_of_n=1,
+            output_file=str(tmp_path / "essay.md"),
+            demo_mode=False,
+            auto_open=False,
+            api_key="",
+            output_format=OutputFormat.MARKDOWN,
+            show_dashboard=False,
+            token_limit=0,
+            cost_limit=0,
+            claude_model="claude-3-sonnet-20240229",
+        )
+        options.update(overrides)
+        return Config(**options)
+    return build
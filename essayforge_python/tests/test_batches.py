@@ -0,0 +1,143 @@
+"""Batch sessions against the local BatchStubServer."""
+
+import threading
+import urllib.error
+
+import pytest
+
+from essayforge.agents.prompts import build_layout
+from essayforge.llm import BatchesClient, BatchStubServer, StubClient
+from essayforge.llm.batches import BatchAPIError, BatchRequest
+from essayforge.orchestrator import BatchSession, Orchestrator
+
+
+@pytest.fixture
+def server():
+    with BatchStubServer(StubClient(), seed=1) as server:
+        yield server
+
+
+class _FlakyClient(BatchesClient):
+    """Fails the first ``failures`` status checks as given by ``error``."""
+
+    def __init__(self, url: str, failures: int, error):
+        super().__init__("key", url)
+        self.failures = failures
+        self.error = error
+        self.checks = 0
+
+    def retrieve(self, batch_id):
+        self.checks += 1
+        if self.checks <= self.failures:
+            raise self.error
+        return super().retrieve(batch_id)
+
+
+def _requests(count: int):
+    return [BatchRequest(f"req-{i}", build_layout("batch topic", f"Instructions {i}"),
+                         "claude-3-haiku-20240307") for i in range(count)]
+
+
+@pytest.mark.parametrize("error", [
+    BatchAPIError("GET failed with HTTP 503: overloaded", 503),
+    BatchAPIError("GET failed with HTTP 429: slow down", 429),
+    BatchAPIError("GET failed: connection refused"),
+])
+def test_poll_rides_out_transient_errors(server, error):
+    client = _FlakyClient(server.url, 3, error)
+    batch = client.create(_requests(2))
+    status = client.poll(batch.id, initial=0.01, maximum=0.02)
+    assert status.ended and client.checks > 3
+
+
+def test_poll_fails_at_once_on_client_errors(server):
+    client = _FlakyClient(server.url, 0, None)
+    with pytest.raises(BatchAPIError) as raised:
+        client.poll("msgbatch_unknown", initial=0.01)
+    assert raised.value.status == 404 and client.checks == 1
+
+
+def test_poll_gives_up_after_repeated_transient_errors(server):
+    client = _FlakyClient(server.url, 100, BatchAPIError("GET failed with HTTP 500", 500))
+    with pytest.raises(BatchAPIError):
+        client.poll(client.create(_requests(1)).id, initial=0.001, maximum=0.001, max_errors=4)
+    assert client.checks == 4
+
+
+def test_unreachable_server_is_a_transient_error():
+    client = BatchesClient("key", "http://127.0.0.1:9", timeout=1)
+    with pytest.raises(BatchAPIError) as raised:
+        client.retrieve("msgbatch_x")
+    assert raised.value.transient
+    assert isinstance(raised.value.__cause__, (urllib.error.URLError, OSError))
+
+
+def test_session_retries_failed_requests_and_routes_every_result(tmp_path):
+    with BatchStubServer(StubClient(), error_rate=0.3, seed=3) as server:
+        session = BatchSession(BatchesClient("key", server.url), participants=1,
+                               checkpoint=str(tmp_path / "batches.json"), max_retries=5,
+                               poll_initial=0.01, poll_max=0.05)
+        results = list(session.research(_requests(8)))
+    assert sorted(r.custom_id for r in results) == [f"req-{i}" for i in range(8)]
+    assert all(r.response is not None for r in results)
+    assert len(session.submitted) > 1  # Errored requests went into follow-up batches
+    assert session.checkpoint.batches == {}
+
+
+def test_runs_of_the_same_topic_share_a_session(server, make_config, tmp_path):
+    session = BatchSession(BatchesClient("key", server.url), participants=2, checkpoint=None,
+                           poll_initial=0.01, poll_max=0.05)
+    runs = [Orchestrator(make_config(output_file=str(tmp_path / f"essay-{i}.md")),
+                         client=StubClient(), batch=session)
+            for i in range(2)]
+    threads = [threading.Thread(target=run.execute) for run in runs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert server.created == 1
+    assert all(run.batched.calls == 3 for run in runs)
+
+
+class _DamagedResults(BatchStubServer):
+    """Serves results files cut off mid-line, or with one line garbled."""
+
+    def __init__(self, damage: str):
+        super().__init__(StubClient(), seed=2)
+        self.damage = damage
+
+    def _results_file(self, batch):
+        body = super()._results_file(batch)
+        lines = body.splitlines(keepends=True)
+        if self.damage == "truncated":
+            return b"".join(lines[:2]) + lines[2][:40]
+        return b"".join(lines[:1] + [b'{"custom_id": "req-1", "result": \xff\n'] + lines[2:])
+
+
+@pytest.mark.parametrize("damage", ["truncated", "garbled"])
+def test_damaged_results_file_raises_after_the_good_lines(damage):
+    with _DamagedResults(damage) as server:
+        client = BatchesClient("key", server.url)
+        status = client.poll(client.create(_requests(4)).id, initial=0.01, maximum=0.02)
+        read = []
+        with pytest.raises(BatchAPIError):
+            for result in client.results(status):
+                read.append(result.custom_id)
+    assert read == (["req-0", "req-1"] if damage == "truncated" else ["req-0"])
+
+
+@pytest.mark.parametrize("damage", ["truncated", "garbled"])
+def test_damaged_results_file_still_answers_every_request(damage, tmp_path):
+    results = []
+    with _DamagedResults(damage) as server:
+        session = BatchSession(BatchesClient("key", server.url), checkpoint=str(tmp_path / "b.json"),
+                               poll_initial=0.01, poll_max=0.02)
+        reader = threading.Thread(target=lambda: results.extend(session.research(_requests(4))),
+                                  daemon=True)
+        reader.start()
+        reader.join(10)
+        assert not reader.is_alive()
+    assert sorted(r.custom_id for r in results) == [f"req-{i}" for i in range(4)]
+    failed = [r for r in results if r.response is None]
+    assert failed and all(r.error_type == "batch_error" for r in failed)
+    assert session.checkpoint.batches  # Left for a rerun to pick up
@@ -0,0 +1,57 @@
+"""Recording a run to a cassette and replaying it with the recorded settings."""
+
+import main
+from essayforge.llm import RecordingClient, ReplayClient, StubClient
+from essayforge.orchestrator import Orchestrator
+
+
+RECORDED = dict(max_iterations=1, quality_threshold=1.1, refine_mode="whole",
+                temperature=0.4, structured=True)
+
+
+def _record(make_config, path):
+    config = make_config(**RECORDED)
+    recorder = RecordingClient(StubClient(), str(path), metadata=main.cassette_metadata(config))
+    orchestrator = Orchestrator(config, client=recorder)
+    orchestrator.execute()
+    recorder.close()
+    return orchestrator, recorder
+
+
+def _replay(make_config, path, apply_settings=True):
+    client = ReplayClient(str(path), latency_scale=0)
+    config = make_config()
+    if apply_settings:
+        config = main.replay_config(config, client.metadata)
+    orchestrator = Orchestrator(config, client=client)
+    orchestrator.execute()
+    return orchestrator, client
+
+
+def test_round_trip_replays_every_recorded_call(make_config, tmp_path):
+    path = tmp_path / "run.jsonl.gz"
+    recorded, recorder = _record(make_config, path)
+    replayed, client = _replay(make_config, path)
+    assert client.misses == 0
+    assert client.calls == recorder.entries
+    assert replayed.token_tracker.total_tokens == recorded.token_tracker.total_tokens
+    assert replayed.quality_history == recorded.quality_history
+    assert (tmp_path / "essay.md").exists()
+
+
+def test_header_holds_the_settings_that_decide_the_calls(make_config, tmp_path):
+    path = tmp_path / "run.jsonl"
+    _record(make_config, path)
+    metadata = ReplayClient(str(path)).metadata
+    for name, value in RECORDED.items():
+        assert metadata[name] == value
+    # Without them a replay makes different calls than were recorded
+    _, client = _replay(make_config, path, apply_settings=False)
+    assert client.misses > 0
+
+
+def test_replay_keeps_topic_and_parallelism_from_the_command_line(make_config):
+    config = make_config(topic="new topic", parallelism=7)
+    metadata = main.cassette_metadata(make_config(topic="old topic", parallelism=2, intensity=8))
+    replayed = main.replay_config(config, dict(metadata, unknown_setting=1))
+    assert (replayed.topic, replayed.parallelism, replayed.intensity) == ("new topic", 7, 8)
@@ -0,0 +1,52 @@
+"""The live dashboard draws on its own thread and never blocks the callers."""
+
+import io
+import re
+import threading
+import time
+
+from essayforge.models import Progress
+from essayforge.ui import LiveDashboard
+
+
+class _SlowTerminal(io.StringIO):
+    """A stream that takes a while per write and remembers which thread wrote."""
+
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+        self.writers = set()
+
+    def write(self, text: str) -> int:
+        self.writers.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        return super().write(text)
+
+
+def test_rendering_happens_off_the_callers_thread():
+    terminal = _SlowTerminal(delay=0.05)
+    dashboard = LiveDashboard(fps=50, stream=terminal, max_rows=10)
+    started = time.monotonic()
+    for i in range(20):
+        dashboard.update_agent(f"agent #{i}", "fact-gatherer", "running", tokens=i)
+        dashboard.update(Progress(stage="research", percentage=i * 2, message="Researching"))
+    # Forty updates against a terminal taking 50ms per write return at once
+    assert time.monotonic() - started < 0.2
+
+    for i in range(20):
+        dashboard.update_agent(f"agent #{i}", "fact-gatherer", "completed", tokens=100)
+    dashboard.close()
+
+    assert terminal.writers == {"dashboard"}
+    assert not any(t.name == "dashboard" for t in threading.enumerate())
+    output = terminal.getvalue()
+    final = re.split(r"\033\[\d+F", output)[-1]  # Frames redraw from the first line up
+    assert "Agents: 20 completed" in final
+    assert output.endswith("\033[?25h\n")  # The cursor is shown again
+
+
+def test_close_without_updates_is_a_no_op():
+    terminal = io.StringIO()
+    dashboard = LiveDashboard(stream=terminal)
+    dashboard.close()
+    assert terminal.getvalue() == ""
@@ -0,0 +1,146 @@
+"""Event bus overflow policies, kind filters and the orchestrator's subscriptions."""
+
+import threading
+import time
+
+from essayforge.events import (
+    BLOCK, DROP_NEWEST, DROP_OLDEST, AgentFinished, AgentStarted, DashboardSink, EventBus,
+    MetricsSink, PhaseEvent, Sink, TokenChunk
+)
+from essayforge.llm import StubClient
+from essayforge.orchestrator import Orchestrator
+
+
+class _Recorder(Sink):
+    """Collects events; ``gate`` holds delivery until it is set."""
+
+    def __init__(self, gate: threading.Event = None):
+        self.events = []
+        self.gate = gate
+        self.closed = False
+
+    def handle(self, event):
+        if self.gate is not None:
+            self.gate.wait()
+        self.events.append(event)
+
+    def close(self):
+        self.closed = True
+
+
+def _phase(i: int) -> PhaseEvent:
+    return PhaseEvent(phase="research", percentage=i, message=str(i))
+
+
+def _fill(policy: str, count: int, **options):
+    """Publish ``count`` events to a stalled sink with room for 2, then release it."""
+    gate = threading.Event()
+    sink = _Recorder(gate)
+    bus = EventBus()
+    subscription = bus.subscribe(sink, maxsize=2, policy=policy, **options)
+    bus.publish(_phase(0))
+    time.sleep(0.05)  # The delivery thread takes the first event and stalls on it
+    for i in range(1, count):
+        bus.publish(_phase(i))
+    gate.set()
+    bus.close()
+    return [e.percentage for e in sink.events], subscription
+
+
+def test_drop_oldest_keeps_the_latest_events():
+    delivered, subscription = _fill(DROP_OLDEST, 6)
+    assert delivered == [0, 4, 5]
+    assert subscription.dropped == 3
+
+
+def test_drop_newest_keeps_the_earliest_events():
+    delivered, subscription = _fill(DROP_NEWEST, 6)
+    assert delivered == [0, 1, 2]
+    assert subscription.dropped == 3
+
+
+def test_block_waits_at_most_the_timeout_then_drops():
+    started = time.monotonic()
+    delivered, subscription = _fill(BLOCK, 5, timeout=0.05)
+    assert time.monotonic() - started < 1.0
+    assert delivered == [0, 1, 2]
+    assert subscription.dropped == 2
+
+
+def test_kinds_filter_what_a_sink_receives():
+    sink = _Recorder()
+    bus = EventBus()
+    bus.subscribe(sink, kinds=(PhaseEvent.kind,))
+    bus.publish(TokenChunk(agent_id="a", agent_type="a", text="x", tokens=1))
+    bus.publish(_phase(1))
+    bus.close()
+    assert [e.kind for e in sink.events] == [PhaseEvent.kind]
+    assert sink.closed
+
+
+def test_close_flushes_queued_events_once():
+    sink = _Recorder()
+    bus = EventBus()
+    bus.subscribe(sink, policy=BLOCK)
+    for i in range(100):
+        bus.publish(_phase(i))
+    bus.close()
+    bus.close()
+    bus.publish(_phase(101))
+    assert len(sink.events) == 100
+
+
+def test_console_and_metrics_never_get_token_chunks(make_config):
+    orchestrator = Orchestrator(make_config(), client=StubClient())
+    by_sink = {type(s.sink).__name__: s for s in orchestrator.events.subscriptions}
+    for name in ("ConsoleSink", "MetricsSink"):
+        assert TokenChunk.kind not in by_sink[name].kinds
+        assert by_sink[name].timeout is not None
+    orchestrator.execute()
+    assert TokenChunk.kind not in orchestrator.metrics.counts
+    assert orchestrator.metrics.counts[AgentFinished.kind] == 3
+
+
+class _Dashboard:
+    """Records the Progress values a DashboardSink hands on."""
+
+    def __init__(self):
+        self.progress = []
+
+    def update(self, progress):
+        self.progress.append(progress)
+
+    def update_agent(self, *args):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_dashboard_counts_a_restarted_row_once():
+    dashboard = _Dashboard()
+    sink = DashboardSink(dashboard)
+    # A cascade starts the same row on a second model with attempt 0 again
+    sink.handle(AgentStarted(agent_id="fact-gatherer", agent_type="fact-gatherer", model="a"))
+    sink.handle(AgentStarted(agent_id="fact-gatherer", agent_type="fact-gatherer", model="b"))
+    sink.handle(AgentStarted(agent_id="case-studies", agent_type="case-studies", attempt=1))
+    sink.handle(PhaseEvent(phase="research"))
+    assert dashboard.progress[-1].active_agents == 2
+    sink.handle(AgentFinished(agent_id="fact-gatherer", agent_type="fact-gatherer"))
+    sink.handle(AgentFinished(agent_id="case-studies", agent_type="case-studies"))
+    sink.handle(PhaseEvent(phase="research"))
+    assert dashboard.progress[-1].active_agents == 0
+    assert dashboard.progress[-1].completed_agents == 2
+
+
+def test_metrics_count_review_failures_apart_from_agents():
+    sink = MetricsSink()
+    for agent_id, agent_type in (("fact-gatherer", "fact-gatherer"),
+                                 ("critic:structure-flow #1", "structure-flow"),
+                                 ("refiner #1", "refinement"),
+                                 ("refiner:Introduction #1", "refinement")):
+        sink.handle(AgentFinished(agent_id=agent_id, agent_type=agent_type, status="failed"))
+    sink.handle(AgentFinished(agent_id="case-studies", agent_type="case-studies"))
+    assert sink.failures == 1
+    assert sink.review_failures == 3
+    assert sink.snapshot()["review_failures"] == 3
@@ -0,0 +1,47 @@
+"""Importing the package and the fast CLI commands load no heavy modules."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the fast paths must not load
+HEAVY = ("anthropic", "essayforge.orchestrator.orchestrator", "essayforge.agents.agents")
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    """Run a fresh interpreter in the source root, where ``essayforge`` is importable."""
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True,
+                          timeout=60, check=True)
+
+
+def _loaded(modules):
+    return [m for m in modules if m in HEAVY or m.startswith(tuple(h + "." for h in HEAVY))]
+
+
+@pytest.mark.parametrize("statement", [
+    "import essayforge",
+    "import essayforge.orchestrator, essayforge.llm, essayforge.events, essayforge.agents",
+])
+def test_import_loads_no_heavy_modules(statement):
+    run = _python("-c", f"{statement}; import json, sys; print(json.dumps(sorted(sys.modules)))")
+    assert _loaded(json.loads(run.stdout)) == []
+
+
+def test_lazy_export_loads_its_module_on_first_use():
+    run = _python("-c", "import essayforge.orchestrator as o, json, sys; o.Orchestrator; "
+                        "print(json.dumps(sorted(sys.modules)))")
+    assert "essayforge.orchestrator.orchestrator" in json.loads(run.stdout)
+
+
+def test_version_command_loads_no_heavy_modules():
+    run = _python("-X", "importtime", "main.py", "version")
+    imported = [line.rsplit("|", 1)[-1].strip() for line in run.stderr.splitlines()
+                if line.startswith("import time:")]
+    assert "essayforge" in imported
+    assert _loaded(imported) == []
@@ -0,0 +1,85 @@
+"""Retrieval from the knowledge store of past research."""
+
+import pytest
+
+from essayforge.models import Citation, ResearchResult
+from essayforge.storage import KnowledgeStore
+
+
+HEALTHCARE = [
+    "Machine learning models now read chest radiographs and flag pneumonia for radiologists.",
+    "Hospitals deploy artificial intelligence triage tools that shorten emergency waits.",
+    "Regulators require clinical validation before diagnostic algorithms reach patients.",
+    "Bias in training data can make diagnostic models less accurate for minority patients.",
+]
+JAZZ = [
+    "The impact of bebop on jazz was a faster, harmonically dense style of improvisation.",
+    "New Orleans brass bands shaped the rhythm of early jazz recordings.",
+    "Miles Davis recorded Kind of Blue in 1959, popularizing modal jazz.",
+]
+
+SOURCES = {
+    "AI in healthcare": [
+        Citation(id="r1", type="article", title="Deep learning for chest radiograph diagnosis",
+                 source="Radiology", quote="Algorithms matched radiologists on pneumonia."),
+        Citation(id="r2", type="report", title="Clinical validation of diagnostic software",
+                 source="FDA"),
+    ],
+    "history of jazz": [
+        Citation(id="j1", type="book", title="The impact of bebop on modern jazz",
+                 source="Jazz Press", quote="Bebop changed improvisation."),
+        Citation(id="j2", type="article", title="Brass bands of New Orleans", source="Archive"),
+    ],
+}
+
+
+def _result(agent_type, paragraphs, citations=()):
+    return ResearchResult(agent_id=agent_type, agent_type=agent_type,
+                          content="\n\n".join(paragraphs), citations=list(citations))
+
+
+@pytest.fixture
+def store(tmp_path):
+    with KnowledgeStore(str(tmp_path / "knowledge.db")) as store:
+        # Passages are merged up to 1200 characters, so index them one result each
+        for i, paragraph in enumerate(HEALTHCARE):
+            store.add_results("AI in healthcare", [_result(f"clinical-{i}", [paragraph])])
+        for i, paragraph in enumerate(JAZZ):
+            store.add_results("history of jazz", [_result(f"music-{i}", [paragraph])])
+        for topic, citations in SOURCES.items():
+            store.add_results(topic, [_result("sources", [], citations)])
+        yield store
+
+
+def test_related_passages_are_retrieved(store):
+    passages = store.search("diagnostic algorithms for patients", 5)
+    assert passages and all(p.topic == "AI in healthcare" for p in passages)
+
+
+def test_passage_sharing_one_word_with_an_unrelated_topic_is_not_retrieved(store):
+    # "impact" is the only word of this topic anywhere in the store
+    assert store.search("the impact of social media on teenagers", 5) == []
+
+
+def test_common_words_of_a_small_store_do_not_select_passages(store):
+    for i in range(4):
+        store.add_results("history of jazz", [_result(
+            f"history-{i}", [f"Jazz history, part {i}: clubs, records and radio spread the music."]
+        )])
+    passages = store.search("history of the printing press", 5)
+    assert passages == []
+
+
+def test_topic_with_no_indexed_words_retrieves_nothing(store):
+    assert store.search("volcanic eruptions of Iceland", 5) == []
+
+
+def test_related_citations_are_retrieved(store):
+    titles = [c.title for c in store.search_citations("diagnostic radiograph algorithms", 5)]
+    assert titles and set(titles) <= {c.title for c in SOURCES["AI in healthcare"]}
+
+
+def test_unrelated_topic_yields_no_citations(store):
+    # Only "impact" is shared, with the jazz book's title
+    assert store.search_citations("the impact of social media on teenagers", 5) == []
+    assert store.search_citations("volcanic eruptions of Iceland", 5) == []
@@ -0,0 +1,96 @@
+"""Citation link checks against a local HTTP server."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from essayforge.models import Citation
+from essayforge.verification import LinkCache, LinkVerifier
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves a few fixed paths and records every request it answers."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, like most real servers
+
+    def do_HEAD(self):
+        self._answer(head=True)
+
+    def do_GET(self):
+        self._answer(head=False)
+
+    def _answer(self, head: bool):
+        self.server.requests.append((self.command, self.path))
+        if self.path == "/moved":
+            self._send(301, location="/article")
+        elif self.path == "/no-head" and head:
+            self._send(405)
+        elif self.path in ("/article", "/no-head"):
+            self._send(200, b"<html>An article</html>", head)
+        else:
+            self._send(404)
+
+    def _send(self, code: int, body: bytes = b"", head: bool = True, location: str = ""):
+        self.send_response(code)
+        if location:
+            self.send_header("Location", location)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.requests = []
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _citation(url: str) -> Citation:
+    return Citation(id="s1", type="web", title="An article", source="Example", url=url)
+
+
+def test_redirect_is_followed_to_the_final_page(server):
+    with LinkVerifier(timeout=2.0) as verifier:
+        verdict = verifier.check(server.url + "/moved")
+    assert (verdict.status, verdict.code) == ("ok", 200)
+    assert verdict.final_url == server.url + "/article"
+    assert server.requests == [("HEAD", "/moved"), ("HEAD", "/article")]
+
+
+def test_head_refused_falls_back_to_get(server):
+    with LinkVerifier(timeout=2.0) as verifier:
+        verdict = verifier.check(server.url + "/no-head")
+    assert (verdict.status, verdict.code) == ("ok", 200)
+    assert server.requests == [("HEAD", "/no-head"), ("GET", "/no-head")]
+    # Both requests went over one kept-alive connection
+    assert verifier.connections == 1
+
+
+def test_cached_verdict_is_not_fetched_again(server, tmp_path):
+    path = str(tmp_path / "links.json")
+    citations = [_citation(server.url + "/article"), _citation(server.url + "/missing"),
+                 _citation(server.url + "/article")]
+    with LinkVerifier(timeout=2.0, cache=LinkCache(path)) as verifier:
+        first = verifier.verify(citations)
+    assert sorted(server.requests) == [("HEAD", "/article"), ("HEAD", "/missing")]
+    assert [c.status for c in citations] == ["ok", "broken", "ok"]
+
+    citations = [_citation(server.url + "/article"), _citation(server.url + "/missing")]
+    with LinkVerifier(timeout=2.0, cache=LinkCache(path)) as verifier:
+        again = verifier.verify(citations)
+    assert len(server.requests) == 2
+    assert (verifier.cache_hits, verifier.checked) == (2, 0)
+    assert again == first
+    assert [c.http_status for c in citations] == [200, 404]
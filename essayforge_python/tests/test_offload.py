@@ -0,0 +1,42 @@
+"""Calls in the CPU pool's worker processes, with large text in shared memory."""
+
+import os
+
+import pytest
+
+from essayforge.orchestrator.offload import SHARED_MEMORY_THRESHOLD, CPUPool, analyze_research
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with CPUPool(workers=1) as pool:
+        yield pool
+
+
+def _blocks():
+    """Names of the shared memory blocks that currently exist."""
+    return set(os.listdir("/dev/shm"))
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="shared memory is not listed in /dev/shm")
+def test_large_text_round_trips_through_shared_memory(pool):
+    text = "Évidence and données. " * (SHARED_MEMORY_THRESHOLD // 10)
+    before = _blocks()
+    shared = pool.shared_bytes
+
+    assert pool.run(str.upper, text) == text.upper()
+    # Both the argument and the result went through shared memory, and both were released
+    assert pool.shared_bytes - shared == 2 * len(text.encode("utf-8"))
+    assert _blocks() <= before
+
+
+def test_small_text_is_pickled(pool):
+    shared = pool.shared_bytes
+    assert pool.run(str.upper, "short") == "SHORT"
+    assert pool.shared_bytes == shared
+
+
+def test_research_analysis_matches_in_process(pool):
+    text = "### Findings\n\n" + "Research evidence from a study [1]. " * 3000
+    assert len(text) > SHARED_MEMORY_THRESHOLD
+    assert pool.run(analyze_research, text, False) == analyze_research(text, False)
@@ -0,0 +1,91 @@
+"""The live preview renders and pushes only the sections a draft changed."""
+
+import http.client
+import json
+from urllib.parse import urlsplit
+from urllib.request import urlopen
+
+import pytest
+
+from essayforge.output import Formatter, PreviewServer
+
+
+DRAFT = """# Title
+
+An introduction.
+
+## Background
+
+Where the topic comes from.
+
+## Outlook
+
+Where it is going.
+"""
+
+
+class _CountingFormatter(Formatter):
+    """Formatter that remembers the Markdown it was asked to render."""
+
+    def __init__(self):
+        super().__init__()
+        self.rendered = []
+
+    def render_html(self, markdown: str) -> str:
+        self.rendered.append(markdown)
+        return super().render_html(markdown)
+
+
+@pytest.fixture
+def preview():
+    server = PreviewServer(formatter=_CountingFormatter())
+    yield server
+    server.close()
+
+
+def _read_event(response) -> dict:
+    """The next server-sent event as its fields, skipping keep-alive comments."""
+    fields = {}
+    while True:
+        line = response.readline().decode("utf-8").rstrip("\n")
+        if not line:
+            if fields:
+                return fields
+        elif not line.startswith(":"):
+            name, _, value = line.partition(": ")
+            fields[name] = value
+
+
+def test_update_renders_only_changed_sections(preview):
+    assert preview.update(DRAFT) == 3
+    preview.formatter.rendered.clear()
+
+    assert preview.update(DRAFT.replace("is going", "is heading")) == 1
+    assert len(preview.formatter.rendered) == 1
+    assert "is heading" in preview.formatter.rendered[0]
+
+    version = preview.version
+    assert preview.update(DRAFT.replace("is going", "is heading")) == 0
+    assert preview.version == version
+    assert preview.rendered == 4
+
+
+def test_open_page_is_sent_only_the_changed_section(preview):
+    preview.update(DRAFT)
+    page = urlopen(preview.url, timeout=5).read().decode("utf-8")
+    assert "Where the topic comes from." in page
+
+    url = urlsplit(preview.url)
+    connection = http.client.HTTPConnection(url.hostname, url.port, timeout=5)
+    connection.request("GET", f"/events?since={preview.version}")
+    response = connection.getresponse()
+    assert response.status == 200
+    preview.update(DRAFT.replace("is going", "is heading"))
+
+    event = _read_event(response)
+    assert event["event"] == "section"
+    assert "is heading" in json.loads(event["data"])["html"]
+    preview.update(DRAFT.replace("is going", "is heading") + "\n## Sources\n\nA list.\n")
+    assert _read_event(response)["event"] == "section"
+    assert len(json.loads(_read_event(response)["data"])) == 4  # The new order of sections
+    connection.close()
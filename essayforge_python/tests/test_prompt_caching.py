@@ -0,0 +1,60 @@
+"""Prompt cache breakpoints and the stub's cache billing."""
+
+from essayforge.agents.prompts import build_layout, with_context, with_structured_output
+from essayforge.llm import StubClient
+from essayforge.llm.batch_stub import layout_from_params
+from essayforge.llm.pricing import min_cacheable_tokens
+
+SONNET = "claude-3-sonnet-20240229"
+HAIKU = "claude-3-haiku-20240307"
+
+
+def _marked(request):
+    """(system marked, prefix marked) in a to_request() result."""
+    return ("cache_control" in request["system"][0],
+            "cache_control" in request["messages"][0]["content"][0])
+
+
+def test_short_prefix_has_no_breakpoints():
+    layout = build_layout("urban heat islands", "Gather the facts.")
+    assert layout.prefix_tokens()["prefix"] < min_cacheable_tokens(SONNET)
+    assert _marked(layout.to_request(min_cacheable_tokens(SONNET))) == (False, False)
+
+
+def test_known_context_makes_the_prefix_cacheable():
+    layout = with_context(build_layout("urban heat islands", "Gather the facts."),
+                          ["A long passage about surface temperatures. " * 120])
+    assert _marked(layout.to_request(min_cacheable_tokens(SONNET))) == (False, True)
+    # Haiku needs twice as long a prefix
+    assert _marked(layout.to_request(min_cacheable_tokens(HAIKU))) == (False, False)
+
+
+def test_request_round_trips_through_the_batch_stub():
+    layout = with_structured_output(with_context(
+        build_layout("urban heat islands", "Gather the facts."), ["passage " * 800]
+    ))
+    assert layout_from_params(layout.to_request(min_cacheable_tokens(SONNET))) == layout
+
+
+def test_stub_bills_short_prefixes_as_uncached_input():
+    client = StubClient()
+    layout = build_layout("urban heat islands", "Gather the facts.")
+    for _ in range(2):
+        usage = client.complete(layout, SONNET).usage
+        assert usage.cache_read_tokens == usage.cache_write_tokens == 0
+        assert usage.prompt_tokens == layout.prefix_tokens()["prefix"] + 4
+
+
+def test_stub_writes_then_reads_a_long_prefix():
+    client = StubClient()
+    layout = with_context(build_layout("urban heat islands", "Gather the facts."),
+                          ["A long passage about surface temperatures. " * 120])
+    prefix = layout.prefix_tokens()["prefix"]
+    first = client.complete(layout, SONNET).usage
+    second = client.complete(layout, SONNET).usage
+    assert (first.cache_write_tokens, first.cache_read_tokens) == (prefix, 0)
+    assert (second.cache_write_tokens, second.cache_read_tokens) == (0, prefix)
+    assert second.cost < first.cost
+    # The same prefix is below Haiku's minimum, so nothing is cached there
+    haiku = client.complete(layout, HAIKU).usage
+    assert haiku.cache_read_tokens == haiku.cache_write_tokens == 0
@@ -0,0 +1,47 @@
+"""How the refinement loop stops, and when its result is reused."""
+
+from essayforge.llm import CancellationToken, StubClient
+from essayforge.orchestrator import Orchestrator
+
+
+def _run(make_config, tmp_path, **overrides):
+    options = dict(max_iterations=2, quality_threshold=1.1, min_gain=-1.0,
+                   run_graph_dir=str(tmp_path / "runs"))
+    options.update(overrides)
+    client = StubClient()
+    orchestrator = Orchestrator(make_config(**options), client=client)
+    orchestrator.execute()
+    return orchestrator, client
+
+
+def test_budget_spent_in_research_stops_refinement_as_budget(make_config, tmp_path):
+    orchestrator, _ = _run(make_config, tmp_path, token_limit=1)
+    assert orchestrator.cancel_token.reason == "budget"
+    assert orchestrator.refinement_stop == "budget"
+
+
+def test_budget_spent_while_refining_stops_it_as_budget(make_config, tmp_path):
+    unlimited, _ = _run(make_config, tmp_path / "unlimited")
+    orchestrator, _ = _run(make_config, tmp_path, token_limit=20000)
+    assert orchestrator.refinement_stop == "budget"
+    assert len(orchestrator.quality_history) < len(unlimited.quality_history)
+
+
+def test_refinement_cut_short_by_the_budget_is_reused_under_the_same_limits(make_config, tmp_path):
+    first, _ = _run(make_config, tmp_path, token_limit=20000)
+    again, client = _run(make_config, tmp_path, token_limit=20000)
+    assert client.calls == 0
+    assert again.refinement_stop == "budget"
+    assert again.quality_history == first.quality_history
+
+    _, raised = _run(make_config, tmp_path, token_limit=40000)
+    assert raised.calls > 0
+
+
+def test_cancellation_reason():
+    assert CancellationToken().reason == ""
+    assert CancellationToken(deadline=0.0).reason == "deadline"
+    token = CancellationToken()
+    token.cancel("budget")
+    token.cancel("deadline")
+    assert token.reason == "budget"
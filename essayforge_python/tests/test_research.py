@@ -0,0 +1,174 @@
+"""How the research phase schedules, stops and routes agent calls."""
+
+import json
+import threading
+import time
+
+from essayforge.agents import create_agents
+from essayforge.llm import StubClient
+from essayforge.orchestrator import Orchestrator
+from essayforge.orchestrator.routing import CASCADE_MODELS
+
+
+# Instructions of every agent type, to tell from a prompt which agent sent it
+_TEMPLATES = {agent.type.value: agent.prompt_template for agent in create_agents(10)}
+
+
+class _AgentClient(StubClient):
+    """StubClient that knows which agent each call is for.
+
+    ``delays`` adds seconds to the calls of an agent type, cut short by
+    cancellation like the stub's own latency. ``weak`` maps a model to the
+    agent types whose answers it cuts to a few words, which score low.
+    Answers of the agent types in ``novel`` end with words no other agent
+    uses; the stub's own text draws on one small vocabulary, so without
+    them every answer after the first adds almost nothing to the coverage.
+    ``order`` records the agent type of every call as it arrives and
+    ``models`` the models each agent type was called on.
+    """
+
+    def __init__(self, delays=None, weak=None, novel=(), **options):
+        super().__init__(**options)
+        self.delays = delays or {}
+        self.weak = weak or {}
+        self.novel = set(novel)
+        self.order = []
+        self.models = {}
+        self._order_lock = threading.Lock()
+
+    def complete(self, layout, model, max_tokens=4096, temperature=1.0, on_text=None,
+                 cancel=None):
+        prompt = layout.flatten()
+        agent_type = next(name for name, template in _TEMPLATES.items() if template in prompt)
+        with self._order_lock:
+            self.order.append(agent_type)
+            self.models.setdefault(agent_type, []).append(model)
+        if self.delays.get(agent_type):
+            self._sleep(self.delays[agent_type], cancel)
+        if agent_type in self.weak.get(model, ()):
+            max_tokens = 20
+        response = super().complete(layout, model, max_tokens, temperature, on_text, cancel)
+        if agent_type in self.novel:
+            response.text += "\n\n" + " ".join(f"{agent_type}-finding-{i}" for i in range(100))
+        return response
+
+
+def test_deadline_keeps_the_agents_that_finished(make_config, tmp_path):
+    client = _AgentClient(delays={"current-state": 10.0})
+    orchestrator = Orchestrator(make_config(deadline_reserve=0.5), client=client)
+    started = time.monotonic()
+    orchestrator.execute(deadline=1.0)
+
+    assert time.monotonic() - started < 5.0
+    assert orchestrator.cancel_token.reason == "deadline"
+    assert orchestrator.skipped_agents == ["current-state"]
+    finished = orchestrator.metrics.snapshot()["by_agent_type"]
+    assert finished["current-state"].get("cancelled") == 1
+    assert finished["fact-gatherer"]["completed"] == finished["expert-opinions"]["completed"] == 1
+    essay = (tmp_path / "essay.md").read_text(encoding="utf-8")
+    assert "**Skipped Agents:** current-state" in essay
+
+
+def test_no_deadline_waits_for_every_agent(make_config):
+    orchestrator = Orchestrator(make_config(), client=_AgentClient(delays={"current-state": 0.2}))
+    orchestrator.execute()
+    assert orchestrator.cancel_token.reason == ""
+    assert orchestrator.skipped_agents == []
+
+
+def _history(tmp_path, latencies):
+    """A latency history file with one sample per agent type."""
+    path = tmp_path / "history.json"
+    path.write_text(json.dumps({"agents": {
+        name: {"latency": latency, "output_tokens": 500.0, "samples": 1}
+        for name, latency in latencies.items()
+    }}), encoding="utf-8")
+    return str(path)
+
+
+def test_dispatch_starts_the_longest_expected_agent_first(make_config, tmp_path):
+    history = _history(tmp_path, {"fact-gatherer": 1.0, "current-state": 3.0,
+                                  "expert-opinions": 2.0})
+    client = _AgentClient()
+    Orchestrator(make_config(parallelism=1, history_file=history), client=client).execute()
+    assert client.order == ["current-state", "expert-opinions", "fact-gatherer"]
+
+
+def test_fifo_dispatch_ignores_the_history(make_config, tmp_path):
+    history = _history(tmp_path, {"fact-gatherer": 1.0, "current-state": 3.0,
+                                  "expert-opinions": 2.0})
+    client = _AgentClient()
+    config = make_config(parallelism=1, history_file=history, dispatch_order="fifo")
+    Orchestrator(config, client=client).execute()
+    assert client.order == ["fact-gatherer", "current-state", "expert-opinions"]
+
+
+def test_history_learned_in_one_run_orders_the_next(make_config, tmp_path):
+    history = str(tmp_path / "history.json")
+    slow = _AgentClient(delays={"expert-opinions": 0.2})
+    Orchestrator(make_config(parallelism=1, history_file=history), client=slow).execute()
+    assert slow.order == ["fact-gatherer", "current-state", "expert-opinions"]
+
+    client = _AgentClient()
+    Orchestrator(make_config(parallelism=1, history_file=history), client=client).execute()
+    assert client.order[0] == "expert-opinions"
+
+
+def test_cascade_escalates_only_low_scoring_output(make_config):
+    haiku, sonnet = CASCADE_MODELS[:2]
+    client = _AgentClient(weak={haiku: {"fact-gatherer"}})
+    orchestrator = Orchestrator(make_config(cascade=True, cascade_threshold=0.4), client=client)
+    orchestrator.execute()
+
+    assert client.models == {
+        "fact-gatherer": [haiku, sonnet],
+        "current-state": [haiku],
+        "expert-opinions": [haiku],
+    }
+    stats = {row["model"]: row for row in orchestrator.model_stats.summary()}
+    assert (stats[haiku]["calls"], stats[haiku]["escalated"]) == (3, 1)
+    assert (stats[sonnet]["calls"], stats[sonnet]["escalated"]) == (1, 0)
+    # The rejected answer was paid for as well
+    assert orchestrator.token_tracker.calls == 4
+
+
+def test_cascade_keeps_the_last_model_output_whatever_its_score(make_config):
+    haiku, sonnet, opus = CASCADE_MODELS
+    client = _AgentClient(weak={model: {"fact-gatherer"} for model in CASCADE_MODELS})
+    orchestrator = Orchestrator(make_config(cascade=True, cascade_threshold=0.4), client=client)
+    orchestrator.execute()
+    assert client.models["fact-gatherer"] == [haiku, sonnet, opus]
+    assert orchestrator.skipped_agents == []
+
+
+def test_override_pins_an_agent_to_one_model(make_config):
+    haiku = CASCADE_MODELS[0]
+    client = _AgentClient(weak={haiku: {"fact-gatherer"}})
+    config = make_config(cascade=True, cascade_threshold=0.4,
+                         model_overrides={"fact-gatherer": haiku})
+    Orchestrator(config, client=client).execute()
+    assert client.models["fact-gatherer"] == [haiku]
+
+
+def test_adaptive_stops_releasing_agents_once_coverage_saturates(make_config):
+    client = _AgentClient()
+    orchestrator = Orchestrator(make_config(adaptive=True, core_agents=1, adaptive_threshold=0.2), client=client)
+    orchestrator.execute()
+
+    assert client.order == ["fact-gatherer", "current-state"]
+    assert orchestrator.unneeded_agents == ["expert-opinions"]
+    assert orchestrator.skipped_agents == []
+    assert orchestrator.adaptive_stop.startswith("current-state added")
+
+
+def test_adaptive_releases_an_agent_for_each_coverage_gap(make_config):
+    agents = ("fact-gatherer", "current-state", "expert-opinions")
+    client = _AgentClient(novel=agents)
+    orchestrator = Orchestrator(make_config(adaptive=True, core_agents=1, adaptive_threshold=0.2), client=client)
+    orchestrator.execute()
+
+    # Reserve agents wait for the result that releases them, even with free workers
+    assert client.order == list(agents)
+    assert orchestrator.unneeded_agents == []
+    assert orchestrator.adaptive_stop == ""
+    assert [gain.agent_type for gain in orchestrator.coverage.gains] == list(agents)
@@ -0,0 +1,80 @@
+"""Incremental re-runs from a topic's recorded run graph."""
+
+import os
+
+from essayforge.llm import StubClient
+from essayforge.models import OutputFormat
+from essayforge.orchestrator import Orchestrator
+from essayforge.storage import RunGraph, node_key
+
+
+def _run(make_config, tmp_path, **overrides):
+    options = dict(run_graph_dir=str(tmp_path / "runs"))
+    options.update(overrides)
+    client = StubClient()
+    orchestrator = Orchestrator(make_config(**options), client=client)
+    orchestrator.execute()
+    return orchestrator, client
+
+
+def test_unchanged_rerun_makes_no_calls(make_config, tmp_path):
+    first, _ = _run(make_config, tmp_path)
+    again, client = _run(make_config, tmp_path)
+    assert client.calls == 0
+    assert again.graph.executed == []
+    assert sorted(again.graph.reused) == sorted(first.graph.nodes)
+    with open(tmp_path / "essay.md", encoding="utf-8") as f:
+        assert f.read()
+
+
+def test_added_agents_run_with_what_depends_on_them(make_config, tmp_path):
+    _run(make_config, tmp_path, intensity=3)
+    orchestrator, client = _run(make_config, tmp_path, intensity=5)
+    new_agents = [n for n in orchestrator.graph.executed if n.startswith("agent:")]
+    assert len(new_agents) == 2
+    assert client.calls == 2  # Synthesis and formatting are local
+    assert {"synthesis", "format"} <= set(orchestrator.graph.executed)
+    assert "context" in orchestrator.graph.reused
+
+
+def test_format_change_runs_only_the_formatter(make_config, tmp_path):
+    _run(make_config, tmp_path)
+    orchestrator, client = _run(make_config, tmp_path, output_format=OutputFormat.HTML)
+    assert client.calls == 0
+    assert orchestrator.graph.executed == ["format"]
+    assert orchestrator.graph.invalidated() == ["format"]
+
+
+def test_full_rerun_runs_everything_and_records_it(make_config, tmp_path):
+    _, first = _run(make_config, tmp_path)
+    again, client = _run(make_config, tmp_path, full_rerun=True)
+    assert again.graph.reused == []
+    assert client.calls == first.calls
+    _, client = _run(make_config, tmp_path)
+    assert client.calls == 0
+
+
+def test_save_drops_outputs_no_node_refers_to(tmp_path):
+    graph = RunGraph(str(tmp_path), "topic")
+    graph.record("a", node_key("a", 1), {"value": 1})
+    graph.record("b", node_key("b", 1), {"value": 2})
+    graph.save()
+    objects = os.path.join(graph.directory, "objects")
+    assert len(os.listdir(objects)) == 2
+
+    graph = RunGraph(str(tmp_path), "topic")
+    assert graph.recall("a", node_key("a", 1)) == {"value": 1}
+    graph.record("b", node_key("b", 2), {"value": 3})
+    assert graph.invalidated() == ["b"]
+    graph.save()
+    assert len(os.listdir(objects)) == 2  # {"value": 2} is gone
+
+
+def test_unreadable_output_means_the_step_runs_again(tmp_path):
+    graph = RunGraph(str(tmp_path), "topic")
+    digest = graph.record("a", "key", {"value": 1})
+    graph.save()
+    with open(os.path.join(graph.directory, "objects", f"{digest}.json"), "w") as f:
+        f.write("{truncated")
+    assert RunGraph(str(tmp_path), "topic").recall("a", "key") is None
+    assert RunGraph(str(tmp_path), "topic", reuse=False).recall("a", "key") is None
@@ -0,0 +1,116 @@
+"""Coalescing identical in-flight model calls."""
+
+import threading
+import time
+
+import pytest
+
+from essayforge.agents.prompts import build_layout
+from essayforge.llm import CancellationToken, CancelledError, CoalescingClient, StubClient
+from essayforge.llm.client import LLMClient
+
+
+LAYOUT = build_layout("coalesced topic", "Summarize the evidence.")
+MODEL = "claude-3-haiku-20240307"
+
+
+def _together(client, count, temperature=0.0, tokens=None, stagger=0.02):
+    """Issue ``count`` identical requests from separate threads; returns (responses, chunks)."""
+    responses, chunks, errors = [None] * count, [[] for _ in range(count)], [None] * count
+
+    def call(i):
+        try:
+            responses[i] = client.complete(
+                LAYOUT, MODEL, temperature=temperature, on_text=chunks[i].append,
+                cancel=tokens[i] if tokens else None,
+            )
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+        time.sleep(stagger)  # The first thread leads
+    for thread in threads:
+        thread.join()
+    return responses, chunks, errors
+
+
+def test_identical_requests_share_one_call():
+    client = CoalescingClient(StubClient(latency=0.3))
+    responses, chunks, errors = _together(client, 4)
+    assert errors == [None] * 4
+    assert client.calls == 1 and client.shared == 3
+    assert len({r.text for r in responses}) == 1
+    assert all("".join(c) == responses[0].text for c in chunks)
+    leader, followers = responses[0], responses[1:]
+    assert leader.usage.total_tokens > 0 and leader.saved is None
+    assert all(f.usage.total_tokens == 0 and f.saved == leader.usage for f in followers)
+    assert client.saved_tokens == 3 * leader.usage.total_tokens
+
+
+def test_sampled_requests_pass_through_unless_asked():
+    client = CoalescingClient(StubClient(latency=0.2))
+    _together(client, 3, temperature=1.0)
+    assert client.calls == 3 and client.shared == 0
+    client = CoalescingClient(StubClient(latency=0.2), sampled=True)
+    _together(client, 3, temperature=1.0)
+    assert client.calls == 1
+
+
+def test_finished_calls_are_not_cached():
+    upstream = StubClient()
+    client = CoalescingClient(upstream)
+    client.complete(LAYOUT, MODEL, temperature=0.0)
+    client.complete(LAYOUT, MODEL, temperature=0.0)
+    assert upstream.calls == 2 and client.shared == 0
+
+
+class _Failing(LLMClient):
+    def __init__(self):
+        self.calls = 0
+
+    def complete(self, layout, model, max_tokens=4096, temperature=1.0, on_text=None,
+                 cancel=None):
+        self.calls += 1
+        time.sleep(0.2)
+        raise RuntimeError("upstream overloaded")
+
+
+def test_failure_is_shared_by_every_waiter():
+    upstream = _Failing()
+    _, _, errors = _together(CoalescingClient(upstream), 3)
+    assert upstream.calls == 1
+    assert all(isinstance(e, RuntimeError) for e in errors)
+
+
+def test_live_waiter_takes_over_from_a_cancelled_leader():
+    upstream = StubClient(latency=0.4)
+    client = CoalescingClient(upstream)
+    tokens = [CancellationToken(), CancellationToken()]
+    threading.Timer(0.15, tokens[0].cancel).start()
+    responses, chunks, errors = _together(client, 2, tokens=tokens)
+    assert isinstance(errors[0], CancelledError)
+    assert errors[1] is None and responses[1].text
+    assert responses[1].usage.total_tokens > 0  # It made the call itself
+    assert upstream.calls == 2
+    # Text relayed from the cancelled call is not streamed again
+    assert "".join(chunks[1]) == responses[1].text
+
+
+@pytest.mark.parametrize("change", [
+    dict(model="claude-3-opus-20240229"),
+    dict(max_tokens=100),
+])
+def test_different_requests_do_not_share(change):
+    client = CoalescingClient(StubClient(latency=0.2))
+    threads = [
+        threading.Thread(target=client.complete, args=(LAYOUT, MODEL), kwargs=dict(temperature=0.0)),
+        threading.Thread(target=client.complete, args=(LAYOUT,),
+                         kwargs=dict(dict(model=MODEL, temperature=0.0), **change)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert client.calls == 2 and client.shared == 0
@@ -0,0 +1,71 @@
+"""Research text spilled to segment files and read back through mmap."""
+
+import os
+
+import pytest
+
+from essayforge.models import Citation, Claim, ResearchResult, ResearchSection, TokenUsage
+from essayforge.storage import ResultRecord, ResultStore
+
+
+LARGE = "Évidence from a cohort study of 4,000 patients. " * 100  # Past the inline threshold
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_text_above_the_threshold_spills_and_reads_back(tmp_path, compress):
+    with ResultStore(str(tmp_path), compress=compress) as store:
+        small = store.put("A short note.")
+        large = store.put(LARGE)
+        assert small.inline == "A short note."
+        assert large.inline is None and large.compressed == compress
+        assert store.get(large) == LARGE
+        assert store.get(small) == "A short note."
+        size = len(LARGE.encode("utf-8"))
+        assert store.bytes_written < size if compress else store.bytes_written == size
+        assert os.path.getsize(tmp_path / "segment-00000.dat") == store.bytes_written
+
+
+def test_segments_roll_over_and_stay_readable(tmp_path):
+    with ResultStore(str(tmp_path), compress=False, segment_size=4096) as store:
+        texts = [f"{i} {LARGE}" for i in range(5)]
+        refs = []
+        for text in texts:
+            refs.append(store.put(text))
+            # Reading between writes maps a segment that later grows
+            assert store.get(refs[0]) == texts[0]
+        assert [ref.segment for ref in refs] == [0, 1, 2, 3, 4]
+        assert [store.get(ref) for ref in refs] == texts
+
+
+def test_record_round_trips_a_result(tmp_path):
+    result = ResearchResult(
+        agent_id="fact-gatherer #2",
+        agent_type="fact-gatherer",
+        content=LARGE,
+        citations=[Citation(id="s1", type="web", title="Cohort study", source="A journal")],
+        tokens_used=TokenUsage(prompt_tokens=900, completion_tokens=1200),
+        score=0.8,
+        quality_score=0.75,
+        sections=[ResearchSection(
+            heading="Findings", body=LARGE,
+            claims=[Claim(text="Outcomes improved.", citations=["s1"], confidence=0.9)],
+        )],
+        confidence=0.85,
+    )
+    with ResultStore(str(tmp_path)) as store:
+        record = ResultRecord.from_result(store, result)
+        assert record.ref.inline is None and record.sections_ref.inline is None
+        assert record.to_result() == result
+
+
+def test_close_removes_only_a_temporary_directory(tmp_path):
+    store = ResultStore()
+    store.put(LARGE)
+    temporary = store.directory
+    store.close()
+    assert not os.path.exists(temporary)
+
+    store = ResultStore(str(tmp_path / "kept"))
+    store.put(LARGE)
+    store.close()
+    assert os.listdir(tmp_path / "kept") == ["segment-00000.dat"]
@@ -0,0 +1,85 @@
+"""Streaming research JSON into sections and citations."""
+
+import json
+
+import pytest
+
+from essayforge.agents import ResearchParser, parse_research
+
+
+DOCUMENT = {
+    "sections": [
+        {"heading": "Background", "body": "Line one.\nLine two:\ttabbed, caf\u00e9 \u2014 done.",
+         "claims": [{"text": "A \"quoted\" claim", "citations": ["c1"], "confidence": 0.8}]},
+        {"heading": "Path C:\\data\\", "body": "Ends in a backslash \\",
+         "claims": [{"text": "Braces { and [ in prose", "citations": ["c2"], "confidence": 0.6}]},
+    ],
+    "citations": [
+        {"id": "c1", "title": "Report\non two lines", "source": "Journal"},
+        {"id": "c2", "title": "Second", "source": "Site", "url": "https://example.org/a?b=\"c\""},
+    ],
+    "confidence": 0.7,
+}
+# ensure_ascii turns the accented and dash characters into \uXXXX escapes
+TEXT = json.dumps(DOCUMENT)
+
+
+def _feed(chunks):
+    parser = ResearchParser()
+    emitted = []
+    for chunk in chunks:
+        emitted.extend(parser.feed(chunk))
+    return parser, emitted
+
+
+def _assert_parsed(parser, emitted):
+    assert parser.finish()
+    assert len(emitted) == 4
+    assert [s.body for s in parser.sections] == [s["body"] for s in DOCUMENT["sections"]]
+    assert [s.heading for s in parser.sections] == [s["heading"] for s in DOCUMENT["sections"]]
+    assert [c.title for c in parser.citations] == ["Report\non two lines", "Second"]
+    assert parser.sections[0].claims[0].text == 'A "quoted" claim'
+    assert parser.confidence == 0.7
+
+
+def test_escaped_newlines_tabs_and_unicode():
+    parser = parse_research(TEXT)
+    assert parser is not None
+    _assert_parsed(parser, parser.sections + parser.citations)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_any_chunking_gives_the_same_elements(size):
+    _assert_parsed(*_feed(TEXT[i:i + size] for i in range(0, len(TEXT), size)))
+
+
+def test_chunk_boundary_between_backslash_and_escaped_character():
+    splits = [i + 1 for i, char in enumerate(TEXT) if char == "\\"]
+    chunks, last = [], 0
+    for split in splits:
+        chunks.append(TEXT[last:split])
+        last = split
+    chunks.append(TEXT[last:])
+    assert all(chunk.endswith("\\") for chunk in chunks[:-1])
+    _assert_parsed(*_feed(chunks))
+
+
+def test_elements_are_emitted_as_they_close():
+    cut = TEXT.rindex('"citations"')
+    parser, emitted = _feed([TEXT[:cut]])
+    assert len(emitted) == 2 and not parser.citations
+
+
+def test_output_cut_short_keeps_closed_elements():
+    parser, _ = _feed([TEXT[:TEXT.index('"Second"')]])
+    assert parser.finish()
+    assert len(parser.sections) == 2 and len(parser.citations) == 1
+
+
+@pytest.mark.parametrize("text", [
+    "## Findings\n\nPlain markdown.",
+    json.dumps({"sections": [], "citations": [], "confidence": 0.9}),
+    json.dumps({"summary": "not research"}),
+])
+def test_falls_back_to_markdown_when_nothing_decodes(text):
+    assert parse_research(text) is None
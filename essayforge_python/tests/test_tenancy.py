@@ -0,0 +1,74 @@
+"""Weighted fair sharing of one scheduler between tenants, and tenant quotas."""
+
+import threading
+
+import pytest
+
+from essayforge.llm import StubClient
+from essayforge.llm.pricing import make_usage
+from essayforge.orchestrator import FairScheduler, Orchestrator, QuotaExceededError
+
+
+def _usage(tokens: int):
+    return make_usage("claude-3-haiku-20240307", prompt_tokens=tokens, completion_tokens=0)
+
+
+def test_weights_share_a_contended_worker_in_ratio():
+    served = []
+    gate = threading.Event()
+    with FairScheduler(workers=1) as scheduler:
+        scheduler.register("heavy", weight=2)
+        scheduler.register("light", weight=1)
+        # Hold the worker until both tenants have a deep queue
+        scheduler.submit("gate", gate.wait)
+        futures = [
+            scheduler.submit(tenant, served.append, tenant)
+            for _ in range(30) for tenant in ("light", "heavy")
+        ]
+        gate.set()
+        for future in futures:
+            future.result()
+
+    assert served[:30].count("heavy") == 20
+    assert served[:30].count("light") == 10
+    assert served.count("heavy") == served.count("light") == 30
+
+
+def test_fifo_serves_in_arrival_order():
+    served = []
+    gate = threading.Event()
+    with FairScheduler(workers=1, policy="fifo") as scheduler:
+        scheduler.register("heavy", weight=2)
+        scheduler.submit("gate", gate.wait)
+        futures = [scheduler.submit("light", served.append, "light") for _ in range(10)]
+        futures += [scheduler.submit("heavy", served.append, "heavy") for _ in range(10)]
+        gate.set()
+        for future in futures:
+            future.result()
+    assert served == ["light"] * 10 + ["heavy"] * 10
+
+
+def test_tenant_over_quota_is_refused_and_others_are_not():
+    with FairScheduler(workers=2) as scheduler:
+        tracker = scheduler.register("small", token_limit=100)
+        scheduler.submit("small", tracker.add, _usage(150)).result()
+        refused = scheduler.submit("small", lambda: "ran")
+        with pytest.raises(QuotaExceededError, match="small"):
+            refused.result()
+        assert scheduler.submit("other", lambda: "ran").result() == "ran"
+        rows = {row["tenant"]: row for row in scheduler.stats()}
+    assert rows["small"]["rejected"] == 1
+    assert rows["other"]["rejected"] == 0
+
+
+def test_run_of_a_tenant_over_quota_makes_no_calls(make_config):
+    client = StubClient()
+    with FairScheduler(workers=3) as scheduler:
+        scheduler.register("small", token_limit=100).add(_usage(150))
+        orchestrator = Orchestrator(make_config(tenant="small"), client=client,
+                                    scheduler=scheduler)
+        orchestrator.execute()
+        rows = {row["tenant"]: row for row in scheduler.stats()}
+    assert client.calls == 0
+    assert rows["small"]["rejected"] == 3
+    assert orchestrator.skipped_agents == ["fact-gatherer", "current-state", "expert-opinions"]
@@ -0,0 +1,52 @@
+"""Which past topics may stand in for a new one."""
+
+import pytest
+
+from essayforge.llm import StubClient
+from essayforge.orchestrator import Orchestrator
+from essayforge.storage.topics import significant_terms
+
+
+@pytest.mark.parametrize("past, topic", [
+    ("The causes of World War I", "The causes of World War II"),
+    ("fall of the Roman Empire", "fall of the Ottoman Empire"),
+    ("economic growth in Africa", "economic growth in Asia"),
+    ("the 2008 financial crisis", "the 2020 financial crisis"),
+    ("the first crusade", "the third crusade"),
+])
+def test_topics_naming_different_things_differ(past, topic):
+    assert significant_terms(past) != significant_terms(topic)
+
+
+def test_rephrasing_keeps_significant_terms():
+    assert significant_terms("The impact of AI on healthcare") == {"ai"}
+    assert significant_terms("AI's impact on health care") == {"ai"}
+
+
+def _run(make_config, tmp_path, topic, **overrides):
+    client = StubClient()
+    orchestrator = Orchestrator(
+        make_config(topic=topic, topic_index_dir=str(tmp_path / "topics"), **overrides),
+        client=client,
+    )
+    orchestrator.execute()
+    return orchestrator, client
+
+
+def test_reuse_is_opt_in(make_config, tmp_path):
+    _run(make_config, tmp_path, "The impact of AI on healthcare")
+    orchestrator, client = _run(make_config, tmp_path, "impact of AI on health care")
+    assert orchestrator.reused_agents == []
+    assert orchestrator.seeds
+    orchestrator, client = _run(make_config, tmp_path, "impact of AI on health care",
+                                reuse_research=True)
+    assert len(orchestrator.reused_agents) == 3
+
+
+def test_similar_topic_about_something_else_is_not_reused(make_config, tmp_path):
+    _run(make_config, tmp_path, "The causes of World War I")
+    orchestrator, client = _run(make_config, tmp_path, "The causes of World War II",
+                                reuse_research=True)
+    assert orchestrator.topic_match.similarity >= 0.9
+    assert orchestrator.reused_agents == []
+    assert client.calls >= 3
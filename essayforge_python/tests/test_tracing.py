@@ -0,0 +1,94 @@
+"""Trace and profile output, which never replaces how a run ended."""
+
+import json
+import pstats
+import threading
+
+import pytest
+
+from essayforge.llm import StubClient
+from essayforge.orchestrator import Orchestrator
+from essayforge.tracing import PhaseProfiler
+
+
+def test_traced_run_writes_a_chrome_trace_with_a_span_per_agent(make_config, tmp_path):
+    trace = tmp_path / "trace.json"
+    orchestrator = Orchestrator(make_config(trace_file=str(trace)), client=StubClient())
+    orchestrator.execute()
+
+    events = json.loads(trace.read_text(encoding="utf-8"))["traceEvents"]
+    spans = [e for e in events if e["ph"] == "X"]
+    threads = {e["tid"] for e in events if e["ph"] == "M" and e["name"] == "thread_name"}
+    for span in spans:
+        assert isinstance(span["name"], str) and isinstance(span["pid"], int)
+        assert span["ts"] >= 0 and span["dur"] >= 0
+        assert span["tid"] in threads
+    agents = [agent.type.value for agent in orchestrator.agents]
+    for name in ("agent", "agent.call"):
+        assert sorted(s["args"]["agent"] for s in spans if s["name"] == name) == sorted(agents)
+    assert {"research", "synthesis", "formatting"} <= {
+        s["name"] for s in spans if s["cat"] == "phase"
+    }
+
+
+def test_unwritable_trace_is_reported_not_raised(make_config, tmp_path, capsys):
+    config = make_config(trace_file=str(tmp_path / "missing" / "trace.json"))
+    Orchestrator(config, client=StubClient()).execute()
+    assert "Could not write the trace file" in capsys.readouterr().out
+    assert (tmp_path / "essay.md").exists()
+
+
+def test_trace_error_does_not_mask_the_run_error(make_config, tmp_path):
+    config = make_config(trace_file=str(tmp_path / "missing" / "trace.json"))
+    orchestrator = Orchestrator(config, client=StubClient())
+    
+    def fail(results):
+        raise RuntimeError("boom")
+    # Fail after research, in synthesis, so the trace is written from finally
+    orchestrator._synthesize_results = fail
+    with pytest.raises(RuntimeError, match="boom"):
+        orchestrator.execute()
+
+
+def test_unwritable_profile_reports_are_reported(make_config, tmp_path, capsys):
+    profile_dir = tmp_path / "profile"
+    orchestrator = Orchestrator(make_config(profile_dir=str(profile_dir)), client=StubClient())
+    profile_dir.rmdir()
+    (tmp_path / "profile").write_text("not a directory")
+    orchestrator.execute()
+    assert "Could not write the research profile report" in capsys.readouterr().out
+
+
+def _build_table(rows: int):
+    return [str(i) * 10 for i in range(rows)]
+
+
+def test_profiled_phase_writes_stats_and_allocations(tmp_path):
+    profiler = PhaseProfiler(str(tmp_path))
+    with profiler.phase("build"):
+        held = _build_table(20000)
+        # Work on threads started inside the phase is profiled as well
+        worker = threading.Thread(target=_build_table, args=(100,))
+        worker.start()
+        worker.join()
+
+    stats = pstats.Stats(str(tmp_path / "01-build.pstats"))
+    calls = {function: counts[0] for (_, _, function), counts in stats.stats.items()}
+    assert calls["_build_table"] == 2
+    report = (tmp_path / "01-build-alloc.txt").read_text(encoding="utf-8")
+    assert report.startswith("Top ")
+    assert "held at the end of build" in report
+    assert "test_tracing.py" in report
+    assert profiler.phases[0].peak_memory > 0
+    assert "_build_table" in profiler.format_summary()
+    assert len(held) == 20000
+
+
+def test_profiled_run_reports_every_phase(make_config, tmp_path):
+    profile_dir = tmp_path / "profile"
+    Orchestrator(make_config(profile_dir=str(profile_dir)), client=StubClient()).execute()
+    assert sorted(p.name for p in profile_dir.iterdir()) == [
+        "01-research-alloc.txt", "01-research.pstats",
+        "02-synthesis-alloc.txt", "02-synthesis.pstats",
+        "03-formatting-alloc.txt", "03-formatting.pstats",
+    ]